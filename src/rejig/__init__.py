@@ -111,6 +111,15 @@ TextMatch
 Transaction
     Atomic batch operations with commit/rollback.
 
+Baseline
+    Accepted findings, for reporting only new ones in incremental runs.
+
+WatchSession
+    Re-runs analyzers on changed files and reports finding deltas.
+
+Fleet
+    Applies one script to many repositories in parallel worker processes.
+
 Packaging
 ---------
 Dependency
@@ -160,6 +169,15 @@ ImportGraph
 CircularImport
     Represents a circular import chain.
 
+ImportCycleGroup
+    A group of mutually importing modules and its minimal cycles.
+
+ImportProfiler
+    Measure import time with ``-X importtime`` and map it onto the graph.
+
+LazyImportConverter
+    Move imports of heavy modules into functions, ``TYPE_CHECKING`` or ``__getattr__``.
+
 Project Management
 ------------------
 PythonProject
@@ -237,9 +255,18 @@ OptimizeFinding
 DRYAnalyzer
     Detect duplicate code, expressions, and literals.
 
+CloneDetector
+    Detect copy-pasted and near-duplicate code with token fingerprints.
+
 LoopOptimizer
     Find loops that can be replaced with comprehensions or builtins.
 
+PerformanceAnalyzer
+    Find runtime performance anti-patterns such as repeated work in loops.
+
+NPlusOneAnalyzer
+    Find N+1 queries in Django and SQLAlchemy loops and add eager loading.
+
 Patching
 --------
 Patch
@@ -300,16 +327,21 @@ SQLAlchemyProject
 """
 from __future__ import annotations
 
-from .core import BatchResult, ErrorResult, Rejig, Result
+from .core import Baseline, BatchResult, ErrorResult, FindingDelta, Rejig, Result, WatchSession
 from .core.transaction import Transaction
+from .fleet import Fleet, FleetResult, RepoResult
 from .imports import (
     CircularImport,
     ImportAnalyzer,
+    ImportCycleGroup,
     ImportGraph,
     ImportInfo,
     ImportOrganizer,
+    ImportProfile,
+    ImportProfiler,
     ImportTarget,
     ImportTargetList,
+    LazyImportConverter,
 )
 from .packaging import (
     Dependency,
@@ -341,11 +373,16 @@ from .analysis import (
     AnalysisTargetList,
     AnalysisReport,
     AnalysisReporter,
+    CallGraph,
+    CallGraphNode,
+    CallSite,
     ComplexityAnalyzer,
     ComplexityResult,
     NestingResult,
     DeadCodeAnalyzer,
     UnusedCodeResult,
+    ImpactAnalyzer,
+    ImpactSelection,
     PatternFinder,
     PatternMatch,
     CodeMetrics,
@@ -369,12 +406,15 @@ from .frameworks import (
     SQLAlchemyProject,
 )
 from .optimize import (
+    CloneDetector,
     DRYAnalyzer,
     LoopOptimizer,
+    NPlusOneAnalyzer,
     OptimizeFinding,
     OptimizeTarget,
     OptimizeTargetList,
     OptimizeType,
+    PerformanceAnalyzer,
 )
 from .patching import (
     Change,
@@ -427,6 +467,15 @@ __all__ = [
     "BatchResult",
     # Transaction support
     "Transaction",
+    # Baselines
+    "Baseline",
+    # Watch mode
+    "WatchSession",
+    "FindingDelta",
+    # Fleet mode
+    "Fleet",
+    "FleetResult",
+    "RepoResult",
     # Target base classes
     "Target",
     "ErrorTarget",
@@ -470,6 +519,10 @@ __all__ = [
     "ImportOrganizer",
     "ImportGraph",
     "CircularImport",
+    "ImportCycleGroup",
+    "ImportProfiler",
+    "ImportProfile",
+    "LazyImportConverter",
     # Project Management
     "PythonProject",
     "PyprojectTarget",
@@ -490,11 +543,16 @@ __all__ = [
     "AnalysisFinding",
     "AnalysisReport",
     "AnalysisReporter",
+    "CallGraph",
+    "CallGraphNode",
+    "CallSite",
     "ComplexityAnalyzer",
     "ComplexityResult",
     "NestingResult",
     "DeadCodeAnalyzer",
     "UnusedCodeResult",
+    "ImpactAnalyzer",
+    "ImpactSelection",
     "PatternFinder",
     "PatternMatch",
     "CodeMetrics",
@@ -515,7 +573,10 @@ __all__ = [
     "OptimizeType",
     "OptimizeFinding",
     "DRYAnalyzer",
+    "CloneDetector",
     "LoopOptimizer",
+    "PerformanceAnalyzer",
+    "NPlusOneAnalyzer",
     # Patching
     "Patch",
     "FilePatch",
@@ -0,0 +1,4 @@
+"""Allow ``python -m rejig``."""
+from rejig.cli import main
+
+raise SystemExit(main())
@@ -4,8 +4,15 @@ This module provides tools for analyzing Python code:
 - Pattern detection (missing type hints, docstrings, bare excepts, etc.)
 - Complexity analysis (cyclomatic complexity, nesting depth, etc.)
 - Dead code detection (unused functions, classes, variables)
+- Call graph construction with reachability queries
+- Test impact selection from changed files
 - Code metrics collection and reporting
 """
+from rejig.analysis.call_graph import (
+    CallGraph,
+    CallGraphNode,
+    CallSite,
+)
 from rejig.analysis.complexity import (
     ComplexityAnalyzer,
     ComplexityResult,
@@ -15,6 +22,10 @@ from rejig.analysis.dead_code import (
     DeadCodeAnalyzer,
     UnusedCodeResult,
 )
+from rejig.analysis.impact import (
+    ImpactAnalyzer,
+    ImpactSelection,
+)
 from rejig.analysis.metrics import (
     CodeMetrics,
     FileMetrics,
@@ -40,6 +51,8 @@ __all__ = [
     "PatternFinder",
     "CodeMetrics",
     "AnalysisReporter",
+    "CallGraph",
+    "ImpactAnalyzer",
     # Results
     "ComplexityResult",
     "NestingResult",
@@ -48,6 +61,9 @@ __all__ = [
     "FileMetrics",
     "ModuleMetrics",
     "AnalysisReport",
+    "CallGraphNode",
+    "CallSite",
+    "ImpactSelection",
     # Targets
     "AnalysisTarget",
     "AnalysisTargetList",
@@ -0,0 +1,781 @@
+"""Call graph construction and queries.
+
+Builds a project-wide call graph from a single scope-resolved pass over each
+file (LibCST ``QualifiedNameProvider``):
+- Nodes are functions and methods, plus one ``<module>`` node per file for
+  code that runs at import time
+- Edges are call sites whose target could be resolved to a project function
+- Calls through unknown objects, subscripts, ``getattr`` and the like are
+  kept as dynamic call sites instead of being silently dropped
+
+Per-file results are stored in the Rejig analysis cache, so rebuilding the
+graph after an edit only re-parses the edited files.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import libcst as cst
+from libcst.metadata import (
+    MetadataWrapper,
+    PositionProvider,
+    QualifiedNameProvider,
+    QualifiedNameSource,
+)
+
+from rejig.core.graphs import reachable, strongly_connected_components
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+
+# Cache namespace for per-file call data
+CACHE_NAMESPACE = "call_graph"
+
+# Local name of the pseudo-function holding module-level code
+MODULE_NODE = "<module>"
+
+# How a call site's target was expressed (stored per call in the cache)
+_KIND_LOCAL = "local"  # Name defined in the same module ("helper", "Cls.method")
+_KIND_IMPORT = "import"  # Imported name, possibly relative ("..pkg.func")
+_KIND_BUILTIN = "builtin"  # Builtin ("builtins.len")
+_KIND_SELF = "self"  # self.x() / cls.x() inside a method
+_KIND_SUPER = "super"  # super().x() inside a method
+_KIND_DYNAMIC = "dynamic"  # Target can't be determined statically
+
+_SOURCE_KINDS = {
+    QualifiedNameSource.LOCAL: _KIND_LOCAL,
+    QualifiedNameSource.IMPORT: _KIND_IMPORT,
+    QualifiedNameSource.BUILTIN: _KIND_BUILTIN,
+}
+
+
+@dataclass
+class CallGraphNode:
+    """A function, method or module body in the call graph.
+
+    Attributes
+    ----------
+    name : str
+        Fully qualified name (e.g., "myapp.models.User.save").
+    kind : str
+        "function", "method" or "module".
+    file_path : Path
+        Path to the file containing the definition.
+    line_number : int
+        1-based line number of the definition.
+    end_line : int
+        1-based last line of the definition.
+    """
+
+    name: str
+    kind: str
+    file_path: Path
+    line_number: int
+    end_line: int = 0
+
+    @property
+    def short_name(self) -> str:
+        """The unqualified name (last dotted component)."""
+        return self.name.rsplit(".", 1)[-1]
+
+
+@dataclass
+class CallSite:
+    """A single call expression.
+
+    Attributes
+    ----------
+    caller : str
+        Qualified name of the calling function (or ``<module>`` node).
+    callee : str | None
+        Qualified name of the call target, if it could be determined. May
+        name something outside the project (e.g., "os.path.join").
+    expression : str
+        Source text of the called expression.
+    file_path : Path
+        Path to the file containing the call.
+    line_number : int
+        1-based line number of the call.
+    dynamic : bool
+        True if the target could not be determined statically.
+    """
+
+    caller: str
+    callee: str | None
+    expression: str
+    file_path: Path
+    line_number: int
+    dynamic: bool = False
+
+    @property
+    def location(self) -> str:
+        """Return a formatted location string."""
+        return f"{self.file_path}:{self.line_number}"
+
+
+class CallCollector(cst.CSTVisitor):
+    """Collect definitions and call sites from one module.
+
+    The result is plain JSON-compatible data (see ``to_data``) so it can be
+    stored in the analysis cache and linked with other files later.
+    """
+
+    METADATA_DEPENDENCIES = (PositionProvider, QualifiedNameProvider)
+
+    def __init__(self) -> None:
+        super().__init__()
+        # [local_qualname, kind, line, end_line]
+        self.functions: list[list[Any]] = []
+        # local class qualname -> [[name_kind, qualified name], ...] of its bases
+        self.classes: dict[str, list[list[str]]] = {}
+        # module-level binding -> qualified name it refers to (imports)
+        self.aliases: dict[str, str] = {}
+        # [caller_local, call_kind, target, enclosing_class, expression, line]
+        self.calls: list[list[Any]] = []
+        self._scope: list[str] = []
+        self._func_stack: list[str] = [MODULE_NODE]
+        self._class_stack: list[str | None] = [None]
+
+    # ----- definitions -----
+
+    def _qualify(self, name: str) -> str:
+        return ".".join(self._scope + [name])
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> bool:
+        qualname = self._qualify(node.name.value)
+        bases = []
+        for arg in node.bases:
+            base = self._qualified_base(arg.value)
+            if base is not None:
+                bases.append(base)
+        self.classes[qualname] = bases
+        return True
+
+    def visit_ClassDef_body(self, node: cst.ClassDef) -> None:
+        self._scope.append(node.name.value)
+        self._class_stack.append(".".join(self._scope))
+
+    def leave_ClassDef_body(self, node: cst.ClassDef) -> None:
+        self._scope.pop()
+        self._class_stack.pop()
+
+    def visit_FunctionDef(self, node: cst.FunctionDef) -> bool:
+        qualname = self._qualify(node.name.value)
+        pos = self.get_metadata(PositionProvider, node)
+        in_class = bool(self._scope) and self._class_stack[-1] == ".".join(self._scope)
+        kind = "method" if in_class else "function"
+        self.functions.append([qualname, kind, pos.start.line, pos.end.line])
+        return True
+
+    def visit_FunctionDef_body(self, node: cst.FunctionDef) -> None:
+        # Decorators and defaults run in the enclosing scope, so the function
+        # only becomes the caller once we enter its body.
+        qualname = self._qualify(node.name.value)
+        enclosing_class = self._class_stack[-1]
+        is_method = enclosing_class is not None and enclosing_class == ".".join(self._scope)
+        self._scope.extend([node.name.value, "<locals>"])
+        self._func_stack.append(qualname)
+        self._class_stack.append(enclosing_class if is_method else None)
+
+    def leave_FunctionDef_body(self, node: cst.FunctionDef) -> None:
+        del self._scope[-2:]
+        self._func_stack.pop()
+        self._class_stack.pop()
+
+    # ----- module-level import aliases (for re-export resolution) -----
+
+    def visit_Import(self, node: cst.Import) -> bool:
+        if len(self._func_stack) == 1 and not self._scope:
+            for alias in node.names:
+                full = _dotted_name(alias.name)
+                if alias.asname and isinstance(alias.asname.name, cst.Name):
+                    self.aliases[alias.asname.name.value] = full
+        return False
+
+    def visit_ImportFrom(self, node: cst.ImportFrom) -> bool:
+        if len(self._func_stack) != 1 or self._scope or isinstance(node.names, cst.ImportStar):
+            return False
+        module = "." * len(node.relative) + (_dotted_name(node.module) if node.module else "")
+        for alias in node.names:
+            name = _dotted_name(alias.name)
+            bound = name
+            if alias.asname and isinstance(alias.asname.name, cst.Name):
+                bound = alias.asname.name.value
+            sep = "" if module.endswith(".") else "."
+            self.aliases[bound] = f"{module}{sep}{name}"
+        return False
+
+    # ----- calls -----
+
+    def visit_Call(self, node: cst.Call) -> bool:
+        pos = self.get_metadata(PositionProvider, node)
+        kind, target = self._classify_target(node.func)
+        self.calls.append(
+            [
+                self._func_stack[-1],
+                kind,
+                target,
+                self._class_stack[-1],
+                _expression_text(node.func),
+                pos.start.line,
+            ]
+        )
+        return True
+
+    def _classify_target(self, func: cst.BaseExpression) -> tuple[str, str | None]:
+        """Work out how a called expression should be resolved."""
+        enclosing_class = self._class_stack[-1]
+        if isinstance(func, cst.Attribute) and enclosing_class is not None:
+            value = func.value
+            if isinstance(value, cst.Name) and value.value in ("self", "cls"):
+                return _KIND_SELF, func.attr.value
+            if (
+                isinstance(value, cst.Call)
+                and isinstance(value.func, cst.Name)
+                and value.func.value == "super"
+            ):
+                return _KIND_SUPER, func.attr.value
+
+        if isinstance(func, (cst.Name, cst.Attribute)):
+            names = self._qualified_name_objects(func)
+            if names:
+                return _SOURCE_KINDS.get(names[0].source, _KIND_LOCAL), names[0].name
+        return _KIND_DYNAMIC, None
+
+    def _qualified_name_objects(self, node: cst.CSTNode) -> list:
+        names = self.get_metadata(QualifiedNameProvider, node, set())
+        return sorted(names, key=lambda q: q.name)
+
+    def _qualified_base(self, node: cst.CSTNode) -> list[str] | None:
+        names = self._qualified_name_objects(node)
+        if not names:
+            return None
+        return [_SOURCE_KINDS.get(names[0].source, _KIND_LOCAL), names[0].name]
+
+    def to_data(self, end_line: int) -> dict[str, Any]:
+        """Return the collected data in cacheable form."""
+        return {
+            "functions": [[MODULE_NODE, "module", 1, end_line]] + self.functions,
+            "classes": self.classes,
+            "aliases": self.aliases,
+            "calls": self.calls,
+        }
+
+
+def _dotted_name(node: cst.CSTNode) -> str:
+    """Get a dotted name from a Name/Attribute node."""
+    if isinstance(node, cst.Name):
+        return node.value
+    if isinstance(node, cst.Attribute):
+        return f"{_dotted_name(node.value)}.{node.attr.value}"
+    return ""
+
+
+def _expression_text(node: cst.CSTNode) -> str:
+    """Render a short source snippet for a called expression."""
+    text = _dotted_name(node) or cst.Module(body=[]).code_for_node(node)
+    return text if len(text) <= 80 else text[:77] + "..."
+
+
+class CallGraph:
+    """Project-wide call graph with caller/callee and reachability queries.
+
+    Node lookups accept either a fully qualified name
+    ("myapp.cli.main") or a bare name ("main"), in which case every node
+    with that short name matches.
+
+    Examples
+    --------
+    >>> graph = rj.get_call_graph()
+    >>> graph.get_callers("save")
+    >>> live = graph.reachable_from("myapp.cli.main")
+    >>> for cycle in graph.find_recursive_groups():
+    ...     print(" -> ".join(cycle))
+    """
+
+    def __init__(self, rejig: Rejig) -> None:
+        self._rejig = rejig
+        self._nodes: list[CallGraphNode] = []
+        self._index: dict[str, int] = {}
+        self._by_short_name: dict[str, list[int]] = {}
+        self._successors: list[list[int]] = []
+        self._predecessors: list[list[int]] = []
+        self._call_sites: list[CallSite] = []
+        self._built = False
+
+    # ===== Building =====
+
+    def build(self) -> None:
+        """Build (or incrementally rebuild) the graph from the working set."""
+        cache = self._rejig.cache
+        per_file: dict[Path, tuple[str, bool, dict[str, Any]]] = {}
+        package_dirs: dict[str, bool] = {}
+        seen_modules: set[str] = set()
+
+        for file_path in self._rejig.files:
+            module = _path_to_module(file_path, package_dirs)
+            if module in seen_modules:
+                module = _relative_module(self._rejig.root, file_path)
+            if not module:
+                continue
+            seen_modules.add(module)
+            data = cache.get(CACHE_NAMESPACE, file_path)
+            if data is None:
+                data = self._collect_file(file_path)
+                if data is None:
+                    continue
+                cache.put(CACHE_NAMESPACE, file_path, data)
+            per_file[file_path] = (module, file_path.name == "__init__.py", data)
+
+        cache.prune(CACHE_NAMESPACE, set(per_file))
+        cache.save()
+        self._link(per_file)
+        self._built = True
+
+    def _collect_file(self, file_path: Path) -> dict[str, Any] | None:
+        """Parse one file and collect its definitions and calls."""
+        try:
+            content = file_path.read_text()
+            wrapper = MetadataWrapper(cst.parse_module(content))
+            collector = CallCollector()
+            wrapper.visit(collector)
+        except Exception:
+            return None
+        return collector.to_data(max(1, content.count("\n")))
+
+    def _link(self, per_file: dict[Path, tuple[str, bool, dict[str, Any]]]) -> None:
+        """Turn per-file data into global nodes and resolved edges."""
+        nodes: list[CallGraphNode] = []
+        index: dict[str, int] = {}
+        classes: dict[str, list[str]] = {}
+        aliases: dict[str, str] = {}
+        modules: set[str] = set()
+
+        # Pass 1: nodes, classes and import aliases under global names
+        for file_path, (module, is_package, data) in per_file.items():
+            modules.add(module)
+            for local, kind, line, end_line in data["functions"]:
+                name = f"{module}.{local}"
+                index[name] = len(nodes)
+                nodes.append(CallGraphNode(name, kind, file_path, line, end_line))
+            for local, bases in data["classes"].items():
+                classes[f"{module}.{local}"] = [
+                    _absolutize(base_kind, base, module, is_package) for base_kind, base in bases
+                ]
+            for bound, target in data["aliases"].items():
+                aliases[f"{module}.{bound}"] = _absolutize(_KIND_IMPORT, target, module, is_package)
+
+        def resolve_symbol(name: str) -> str:
+            """Follow import aliases (``pkg.f`` -> ``pkg.impl.f``)."""
+            for _ in range(8):
+                if name in index or name in classes:
+                    return name
+                parts = name.split(".")
+                # Rewrite the longest aliased prefix of the dotted name
+                for i in range(len(parts) - 1, 0, -1):
+                    prefix = ".".join(parts[:i + 1])
+                    if prefix in aliases:
+                        rest = ".".join(parts[i + 1:])
+                        name = aliases[prefix] + (f".{rest}" if rest else "")
+                        break
+                else:
+                    return name
+            return name
+
+        def lookup_method(class_name: str, attr: str) -> str | None:
+            """Find ``attr`` on a class or its bases (depth-first MRO)."""
+            stack = [class_name]
+            seen: set[str] = set()
+            while stack:
+                current = resolve_symbol(stack.pop())
+                if current in seen:
+                    continue
+                seen.add(current)
+                candidate = f"{current}.{attr}"
+                if candidate in index:
+                    return candidate
+                stack.extend(reversed(classes.get(current, [])))
+            return None
+
+        def resolve_callable(name: str) -> str | None:
+            """Map a target name to a node id name (classes map to __init__)."""
+            name = resolve_symbol(name)
+            if name in index:
+                return name
+            if name in classes:
+                return lookup_method(name, "__init__")
+            owner, _, attr = name.rpartition(".")
+            if owner:
+                owner = resolve_symbol(owner)
+                if owner in classes:
+                    return lookup_method(owner, attr)
+            return None
+
+        subclasses: dict[str, list[str]] = {}
+        for class_name, bases in classes.items():
+            for base in bases:
+                subclasses.setdefault(resolve_symbol(base), []).append(class_name)
+
+        def overrides(class_name: str, attr: str) -> list[str]:
+            """Find overrides of ``attr`` in (transitive) subclasses."""
+            found = []
+            stack = list(subclasses.get(class_name, []))
+            seen: set[str] = set()
+            while stack:
+                current = stack.pop()
+                if current in seen:
+                    continue
+                seen.add(current)
+                if f"{current}.{attr}" in index:
+                    found.append(f"{current}.{attr}")
+                stack.extend(subclasses.get(current, []))
+            return found
+
+        successors: list[set[int]] = [set() for _ in nodes]
+        call_sites: list[CallSite] = []
+
+        # Pass 2: resolve call sites
+        for file_path, (module, is_package, data) in per_file.items():
+            for caller_local, kind, target, enclosing, expression, line in data["calls"]:
+                caller = f"{module}.{caller_local}"
+                callee: str | None = None
+                dynamic = False
+
+                if kind == _KIND_BUILTIN:
+                    callee = target
+                elif kind in (_KIND_LOCAL, _KIND_IMPORT):
+                    absolute = _absolutize(kind, target, module, is_package)
+                    callee = resolve_callable(absolute)
+                    if callee is None:
+                        absolute = resolve_symbol(absolute)
+                        if absolute in classes:
+                            # Class without an __init__ of its own in the project
+                            callee = absolute
+                        elif kind == _KIND_IMPORT and _is_external(absolute, modules):
+                            callee = absolute
+                        else:
+                            # A local variable, parameter or instance attribute:
+                            # the target depends on runtime values.
+                            dynamic = True
+                elif kind in (_KIND_SELF, _KIND_SUPER):
+                    owner = f"{module}.{enclosing}"
+                    if kind == _KIND_SELF:
+                        callee = lookup_method(owner, target)
+                    else:
+                        for base in classes.get(owner, []):
+                            callee = lookup_method(base, target)
+                            if callee:
+                                break
+                    dynamic = callee is None
+                else:
+                    dynamic = True
+
+                call_sites.append(CallSite(caller, callee, expression, file_path, line, dynamic))
+                if callee is not None and callee in index and caller in index:
+                    caller_id = index[caller]
+                    successors[caller_id].add(index[callee])
+                    if kind == _KIND_SELF:
+                        # self.x() may dispatch to any subclass override
+                        for override in overrides(f"{module}.{enclosing}", target):
+                            successors[caller_id].add(index[override])
+
+        self._nodes = nodes
+        self._index = index
+        self._successors = [sorted(s) for s in successors]
+        predecessors: list[list[int]] = [[] for _ in nodes]
+        for i, succs in enumerate(self._successors):
+            for j in succs:
+                predecessors[j].append(i)
+        self._predecessors = predecessors
+        self._call_sites = call_sites
+        self._by_short_name = {}
+        for i, node in enumerate(nodes):
+            self._by_short_name.setdefault(node.short_name, []).append(i)
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            self.build()
+
+    def _resolve(self, name: str) -> list[int]:
+        """Map a qualified or bare name to node ids."""
+        self._ensure_built()
+        if name in self._index:
+            return [self._index[name]]
+        return list(self._by_short_name.get(name, []))
+
+    # ===== Queries =====
+
+    def get_node(self, name: str) -> CallGraphNode | None:
+        """Get a node by name (the first match for bare names).
+
+        Parameters
+        ----------
+        name : str
+            Qualified or bare function name.
+
+        Returns
+        -------
+        CallGraphNode | None
+            The node, or None if not found.
+        """
+        ids = self._resolve(name)
+        return self._nodes[ids[0]] if ids else None
+
+    def get_nodes(self) -> list[CallGraphNode]:
+        """Get all nodes in the graph.
+
+        Returns
+        -------
+        list[CallGraphNode]
+            All functions, methods and module bodies.
+        """
+        self._ensure_built()
+        return list(self._nodes)
+
+    def get_callers(self, name: str) -> set[str]:
+        """Get the functions that call a given function directly.
+
+        Parameters
+        ----------
+        name : str
+            Qualified or bare function name.
+
+        Returns
+        -------
+        set[str]
+            Qualified names of direct callers.
+        """
+        return {self._nodes[j].name for i in self._resolve(name) for j in self._predecessors[i]}
+
+    def get_callees(self, name: str) -> set[str]:
+        """Get the project functions a given function calls directly.
+
+        Parameters
+        ----------
+        name : str
+            Qualified or bare function name.
+
+        Returns
+        -------
+        set[str]
+            Qualified names of direct callees.
+        """
+        return {self._nodes[j].name for i in self._resolve(name) for j in self._successors[i]}
+
+    def reachable_from(self, *entry_points: str) -> set[str]:
+        """Get every function transitively callable from the entry points.
+
+        Parameters
+        ----------
+        *entry_points : str
+            Qualified or bare names to start from (e.g., "main").
+
+        Returns
+        -------
+        set[str]
+            Qualified names of all reachable functions (entries included).
+        """
+        sources = [i for name in entry_points for i in self._resolve(name)]
+        return {self._nodes[i].name for i in reachable(self._successors, sources)}
+
+    def callers_of(self, *names: str) -> set[str]:
+        """Get every function that can transitively reach the given ones.
+
+        This is the impact set of a change: everything whose behaviour may
+        change if one of ``names`` changes.
+
+        Parameters
+        ----------
+        *names : str
+            Qualified or bare function names.
+
+        Returns
+        -------
+        set[str]
+            Qualified names of all transitive callers (targets included).
+        """
+        sources = [i for name in names for i in self._resolve(name)]
+        return {self._nodes[i].name for i in reachable(self._predecessors, sources)}
+
+    def can_reach(self, source: str, target: str) -> bool:
+        """Check whether ``target`` is transitively callable from ``source``.
+
+        Parameters
+        ----------
+        source : str
+            Qualified or bare name of the caller.
+        target : str
+            Qualified or bare name of the callee.
+
+        Returns
+        -------
+        bool
+            True if a call path exists.
+        """
+        targets = set(self._resolve(target))
+        if not targets:
+            return False
+        return any(i in targets for i in reachable(self._successors, self._resolve(source)))
+
+    def strongly_connected_components(self) -> list[list[str]]:
+        """Get all strongly connected components of the graph.
+
+        Returns
+        -------
+        list[list[str]]
+            Components in reverse topological order (callees before callers).
+        """
+        self._ensure_built()
+        return [
+            sorted(self._nodes[i].name for i in component)
+            for component in strongly_connected_components(self._successors)
+        ]
+
+    def find_recursive_groups(self) -> list[list[str]]:
+        """Get groups of functions that call each other recursively.
+
+        Includes directly recursive functions as single-member groups.
+
+        Returns
+        -------
+        list[list[str]]
+            Sorted lists of qualified names, one per recursive group.
+        """
+        self._ensure_built()
+        groups = []
+        for component in strongly_connected_components(self._successors):
+            if len(component) > 1 or component[0] in self._successors[component[0]]:
+                groups.append(sorted(self._nodes[i].name for i in component))
+        return groups
+
+    def get_call_sites(self, name: str | None = None) -> list[CallSite]:
+        """Get call sites, optionally only those inside one function.
+
+        Parameters
+        ----------
+        name : str | None
+            Qualified or bare name of the calling function.
+
+        Returns
+        -------
+        list[CallSite]
+            Matching call sites.
+        """
+        self._ensure_built()
+        if name is None:
+            return list(self._call_sites)
+        callers = {self._nodes[i].name for i in self._resolve(name)}
+        return [site for site in self._call_sites if site.caller in callers]
+
+    def get_dynamic_calls(self) -> list[CallSite]:
+        """Get call sites whose target could not be resolved statically.
+
+        Returns
+        -------
+        list[CallSite]
+            Dynamic call sites (``obj.method()``, ``handlers[key]()``, ...).
+        """
+        self._ensure_built()
+        return [site for site in self._call_sites if site.dynamic]
+
+    def to_dict(self) -> dict[str, list[str]]:
+        """Export the graph as a dictionary.
+
+        Returns
+        -------
+        dict[str, list[str]]
+            Mapping of qualified names to the names they call.
+        """
+        self._ensure_built()
+        return {
+            node.name: [self._nodes[j].name for j in self._successors[i]]
+            for i, node in enumerate(self._nodes)
+        }
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return len(self._nodes)
+
+    def __contains__(self, name: str) -> bool:
+        self._ensure_built()
+        return name in self._index
+
+    def __repr__(self) -> str:
+        edges = sum(len(s) for s in self._successors)
+        return f"CallGraph({len(self._nodes)} nodes, {edges} edges)"
+
+
+def _path_to_module(path: Path, package_dirs: dict[str, bool] | None = None) -> str | None:
+    """Convert a file path to its importable dotted module name.
+
+    Walks up through directories containing ``__init__.py``, so files in a
+    ``src/`` layout map to their real package names. ``package_dirs`` memoizes
+    the per-directory checks across calls.
+    """
+    name = path.name
+    if not name.endswith(".py"):
+        return None
+    if package_dirs is None:
+        package_dirs = {}
+    parts = [] if name == "__init__.py" else [name[:-3]]
+    directory = os.path.dirname(str(path))
+    while True:
+        is_package = package_dirs.get(directory)
+        if is_package is None:
+            is_package = os.path.dirname(directory) != directory and os.path.exists(
+                os.path.join(directory, "__init__.py")
+            )
+            package_dirs[directory] = is_package
+        if not is_package:
+            break
+        parts.append(os.path.basename(directory))
+        directory = os.path.dirname(directory)
+    return ".".join(reversed(parts)) or None
+
+
+def _relative_module(root: Path, path: Path) -> str | None:
+    """Convert a file path to a dotted name relative to root.
+
+    Used to disambiguate files whose importable names collide (e.g. two
+    ``tests/*/test_utils.py`` without ``__init__.py``).
+    """
+    try:
+        parts = list(path.relative_to(root).with_suffix("").parts)
+    except ValueError:
+        return None
+    if parts and parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts) or None
+
+
+def _absolutize(kind: str, name: str, module: str, is_package: bool) -> str:
+    """Turn a collected name into a project-wide qualified name.
+
+    Local names ("helper", "Cls.method") are prefixed with their module,
+    relative imports ("..pkg.f") are resolved against the module's package,
+    and absolute imports and builtins are returned unchanged.
+    """
+    if kind == _KIND_LOCAL:
+        return f"{module}.{name}"
+    if kind == _KIND_IMPORT and name.startswith("."):
+        level = len(name) - len(name.lstrip("."))
+        package = module.split(".") if is_package else module.split(".")[:-1]
+        if level > 1:
+            package = package[: max(0, len(package) - (level - 1))]
+        rest = name[level:]
+        return ".".join([*package, rest] if rest else package)
+    return name
+
+
+def _is_external(name: str, modules: set[str]) -> bool:
+    """Check whether a name points outside the project."""
+    if name.startswith("builtins."):
+        return True
+    parts = name.split(".")
+    for i in range(len(parts), 0, -1):
+        if ".".join(parts[:i]) in modules:
+            return False
+    return True
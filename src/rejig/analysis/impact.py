@@ -0,0 +1,527 @@
+"""Test impact analysis: select the tests affected by a change.
+
+Maps changed files to the test files (or individual tests) that could observe
+the change:
+- Changed modules are found from an explicit file list or ``git diff``
+- The reverse transitive import closure of those modules is computed over a
+  module graph that uses real package names (``src/`` layouts included)
+- Test files inside the closure are selected, plus any test files that
+  changed themselves or sit below a changed ``conftest.py``
+- Optionally, the call graph narrows selected test files down to the test
+  functions that statically reach a changed function
+
+Per-file import data is kept in the Rejig analysis cache, so repeated
+selections on a large tree only re-parse files that changed.
+"""
+from __future__ import annotations
+
+import fnmatch
+import re
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import libcst as cst
+
+from rejig.analysis.call_graph import MODULE_NODE, _path_to_module, _relative_module
+from rejig.core.graphs import reachable
+from rejig.imports.analyzer import ImportCollector
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+
+# Cache namespace for per-file import data
+CACHE_NAMESPACE = "impact_imports"
+
+# Default patterns identifying test files
+DEFAULT_TEST_PATTERNS = ("test_*.py", "*_test.py")
+
+# Non-Python files whose change affects every test
+DEFAULT_GLOBAL_FILES = (
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "pytest.ini",
+    "tox.ini",
+    "requirements*.txt",
+)
+
+_HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+@dataclass
+class ImpactSelection:
+    """Tests selected for a set of changes.
+
+    Attributes
+    ----------
+    changed_files : list[Path]
+        Files considered changed (deleted files included).
+    affected_modules : list[str]
+        Modules in the reverse import closure of the changed modules.
+    test_files : list[Path]
+        Test files that should be run.
+    node_ids : list[str]
+        Pytest arguments: test file paths relative to the project root, or
+        ``path::Class::test`` node IDs when narrowed by the call graph.
+    run_all : bool
+        True if the change can't be scoped and every test should run.
+    reason : str | None
+        Why ``run_all`` was set.
+    """
+
+    changed_files: list[Path] = field(default_factory=list)
+    affected_modules: list[str] = field(default_factory=list)
+    test_files: list[Path] = field(default_factory=list)
+    node_ids: list[str] = field(default_factory=list)
+    run_all: bool = False
+    reason: str | None = None
+
+    def to_pytest_args(self) -> list[str]:
+        """Return arguments to pass to pytest.
+
+        Returns
+        -------
+        list[str]
+            Selected node IDs / files.
+        """
+        return list(self.node_ids)
+
+    def __bool__(self) -> bool:
+        return bool(self.node_ids)
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+
+class ImpactAnalyzer:
+    """Select tests affected by changed files.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The Rejig instance whose working set includes both sources and tests.
+    test_patterns : tuple[str, ...]
+        Glob patterns (matched against file names) identifying test files.
+    global_files : tuple[str, ...]
+        Glob patterns for non-Python files whose change selects every test.
+    """
+
+    def __init__(
+        self,
+        rejig: Rejig,
+        test_patterns: tuple[str, ...] = DEFAULT_TEST_PATTERNS,
+        global_files: tuple[str, ...] = DEFAULT_GLOBAL_FILES,
+    ) -> None:
+        self._rejig = rejig
+        self._global_files = global_files
+        self._package_dirs: dict[str, bool] = {}
+        self._test_re = re.compile("|".join(fnmatch.translate(p) for p in test_patterns))
+        self._modules: list[str] = []
+        self._module_index: dict[str, int] = {}
+        self._module_paths: list[Path | None] = []
+        self._path_index: dict[Path, int] = {}
+        self._dependents: list[list[int]] = []
+        self._built = False
+
+    # ===== Module graph =====
+
+    def build(self) -> None:
+        """Build the module-level import graph from the working set."""
+        cache = self._rejig.cache
+        per_file: list[tuple[str, bool, list[list[Any]]]] = []
+        self._modules = []
+        self._module_index = {}
+        self._module_paths = []
+        self._path_index = {}
+
+        for file_path in self._rejig.files:
+            module = self.module_name(file_path)
+            if module in self._module_index:
+                module = _relative_module(self._rejig.root, file_path)
+            if not module:
+                continue
+            data = cache.get(CACHE_NAMESPACE, file_path)
+            if data is None:
+                data = self._collect_imports(file_path)
+                cache.put(CACHE_NAMESPACE, file_path, data)
+            self._path_index[file_path] = self._add_module(module, file_path)
+            per_file.append((module, file_path.name == "__init__.py", data))
+
+        cache.prune(CACHE_NAMESPACE, set(self._rejig.files))
+        cache.save()
+
+        edges: list[tuple[str, str]] = []
+        for module, is_package, imports in per_file:
+            # Importing a module runs its parent packages' __init__ first
+            parent = module.rpartition(".")[0]
+            while parent:
+                edges.append((module, parent))
+                parent = parent.rpartition(".")[0]
+            for target, names, level in imports:
+                base = self._absolute_module(module, is_package, target, level)
+                if base is None:
+                    continue
+                edges.extend((module, dep) for dep in self._candidates(base, names))
+
+        self._dependents = [[] for _ in self._modules]
+        seen: set[tuple[int, int]] = set()
+        for importer, imported in edges:
+            dep = self._module_index.get(imported)
+            if dep is None:
+                continue
+            pair = (dep, self._module_index[importer])
+            if pair not in seen and pair[0] != pair[1]:
+                seen.add(pair)
+                self._dependents[dep].append(pair[1])
+
+        self._built = True
+
+    def _add_module(self, module: str, file_path: Path | None) -> int:
+        idx = self._module_index.get(module)
+        if idx is None:
+            idx = len(self._modules)
+            self._module_index[module] = idx
+            self._modules.append(module)
+            self._module_paths.append(file_path)
+        return idx
+
+    def _collect_imports(self, file_path: Path) -> list[list[Any]]:
+        """Collect ``[module, names, level]`` for every import in a file."""
+        try:
+            tree = cst.parse_module(file_path.read_text())
+        except Exception:
+            return []
+        collector = ImportCollector()
+        tree.visit(collector)
+        imports = []
+        for imp in collector.imports:
+            if imp.is_future:
+                continue
+            if imp.is_from_import:
+                imports.append([imp.module or "", imp.names, imp.relative_level])
+            else:
+                imports.extend([name, [], 0] for name in imp.names)
+        return imports
+
+    def _absolute_module(self, module: str, is_package: bool, target: str, level: int) -> str | None:
+        """Resolve a (possibly relative) import to an absolute module name."""
+        if not level:
+            return target or None
+        parts = module.split(".")
+        if not is_package:
+            parts = parts[:-1]
+        if level - 1 > len(parts):
+            return None
+        parts = parts[: len(parts) - (level - 1)]
+        if target:
+            parts.append(target)
+        return ".".join(parts) or None
+
+    def _candidates(self, base: str, names: list[str]) -> list[str]:
+        """Project modules executed by importing ``names`` from ``base``."""
+        found = []
+        prefix = base
+        while prefix:
+            if prefix in self._module_index:
+                found.append(prefix)
+            prefix = prefix.rpartition(".")[0]
+        for name in names:
+            submodule = f"{base}.{name}"
+            if submodule in self._module_index:
+                found.append(submodule)
+        return found
+
+    def module_name(self, path: Path) -> str | None:
+        """Get the importable module name of a file.
+
+        Walks up through directories containing ``__init__.py``, so files in
+        a ``src/`` layout map to their real package names.
+
+        Parameters
+        ----------
+        path : Path
+            Path to a Python file.
+
+        Returns
+        -------
+        str | None
+            Dotted module name, or None if ``path`` is not a Python file.
+        """
+        return _path_to_module(path, self._package_dirs)
+
+    def is_test_file(self, path: Path) -> bool:
+        """Check whether a file is a test module."""
+        return self._test_re.match(path.name) is not None
+
+    # ===== Changes =====
+
+    def changed_since(self, since: str) -> tuple[list[Path], dict[Path, set[int]]] | None:
+        """Get files changed relative to a git revision.
+
+        Includes uncommitted changes in the working tree.
+
+        Parameters
+        ----------
+        since : str
+            Git revision to compare against (e.g., "origin/main").
+
+        Returns
+        -------
+        tuple[list[Path], dict[Path, set[int]]] | None
+            Changed files and, per file, the changed line numbers in the new
+            version. None if git could not be run.
+        """
+        root = self._rejig.root
+        try:
+            toplevel = subprocess.run(
+                ["git", "rev-parse", "--show-toplevel"],
+                cwd=root, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+            diff = subprocess.run(
+                ["git", "diff", "-U0", "--no-color", "--no-ext-diff", since, "--"],
+                cwd=root, capture_output=True, text=True, check=True,
+            ).stdout
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+        top = Path(toplevel)
+        files: list[Path] = []
+        lines: dict[Path, set[int]] = {}
+        current: Path | None = None
+        in_header = False
+        for line in diff.splitlines():
+            if line.startswith("diff --git "):
+                current, in_header = None, True
+            elif in_header and line.startswith("--- ") and line[4:] != "/dev/null":
+                current = (top / line[6:]).resolve()
+                files.append(current)
+            elif in_header and line.startswith("+++ ") and line[4:] != "/dev/null":
+                current = (top / line[6:]).resolve()
+                if current not in files:
+                    files.append(current)
+            elif line.startswith("@@"):
+                # Lines inside hunks (such as a removed "-- " line) aren't headers
+                in_header = False
+                match = _HUNK_RE.match(line)
+                if match and current is not None:
+                    start = int(match.group(1))
+                    count = int(match.group(2) or 1)
+                    # Pure deletions (count 0) touch the line they sit after
+                    changed = range(start, start + count) if count else range(start, start + 1)
+                    lines.setdefault(current, set()).update(changed)
+
+        # Untracked files count as changed too
+        try:
+            untracked = subprocess.run(
+                ["git", "ls-files", "--others", "--exclude-standard"],
+                cwd=root, capture_output=True, text=True, check=True,
+            ).stdout
+        except (OSError, subprocess.CalledProcessError):
+            untracked = ""
+        for name in untracked.splitlines():
+            path = (root / name).resolve()
+            if path not in files:
+                files.append(path)
+
+        return files, lines
+
+    # ===== Selection =====
+
+    def select(
+        self,
+        changed: list[str | Path] | None = None,
+        since: str | None = None,
+        use_call_graph: bool = False,
+    ) -> ImpactSelection:
+        """Select the tests affected by a change.
+
+        Parameters
+        ----------
+        changed : list[str | Path] | None
+            Changed files (relative to the project root or absolute).
+        since : str | None
+            Git revision to diff against instead of passing ``changed``.
+        use_call_graph : bool
+            Narrow test files to the test functions that statically call a
+            changed function (needs ``since`` for line information). This
+            trades safety for precision: tests reaching the change only
+            through dynamic calls are not selected.
+
+        Returns
+        -------
+        ImpactSelection
+            The selected tests.
+        """
+        if not self._built:
+            self.build()
+
+        changed_lines: dict[Path, set[int]] = {}
+        if since is not None:
+            diff = self.changed_since(since)
+            if diff is None:
+                return self._select_all([], f"could not diff against {since!r}")
+            changed_files, changed_lines = diff
+        else:
+            changed_files = [self._rejig._resolve_path(p).resolve() for p in changed or []]
+
+        selection = ImpactSelection(changed_files=changed_files)
+        root = self._rejig.root
+        test_files: set[Path] = set()
+        sources: list[int] = []
+
+        for path in changed_files:
+            if path.suffix != ".py":
+                if any(fnmatch.fnmatch(path.name, pattern) for pattern in self._global_files):
+                    return self._select_all(changed_files, f"{path.name} changed")
+                continue
+            if path.name == "conftest.py":
+                test_files.update(
+                    f for f in self._rejig.files if self.is_test_file(f) and f.is_relative_to(path.parent)
+                )
+                continue
+            if path in self._path_index:
+                sources.append(self._path_index[path])
+                continue
+            module = self.module_name(path)
+            if module is not None and not path.exists():
+                # Deleted module: anything still importing it is affected
+                sources.extend(self._importers_of_missing(module))
+
+        affected = reachable(self._dependents, sources)
+        selection.affected_modules = sorted(self._modules[i] for i in affected)
+        for idx in affected:
+            path = self._module_paths[idx]
+            if path is not None and self.is_test_file(path):
+                test_files.add(path)
+        for path in changed_files:
+            if path.exists() and self.is_test_file(path):
+                test_files.add(path)
+
+        narrowed: dict[Path, list[str]] = {}
+        if use_call_graph and changed_lines:
+            narrowed = self._narrow_with_call_graph(sorted(test_files), changed_files, changed_lines)
+        # Files where no test reaches a changed function are dropped
+        selection.test_files = sorted(f for f in test_files if narrowed.get(f, True))
+
+        node_ids = []
+        for path in selection.test_files:
+            rel = _relative(path, root)
+            if path in narrowed:
+                node_ids.extend(f"{rel}::{test}" for test in narrowed[path])
+            else:
+                node_ids.append(rel)
+        selection.node_ids = node_ids
+        return selection
+
+    def _select_all(self, changed_files: list[Path], reason: str) -> ImpactSelection:
+        tests = sorted(f for f in self._rejig.files if self.is_test_file(f))
+        return ImpactSelection(
+            changed_files=changed_files,
+            affected_modules=list(self._modules),
+            test_files=tests,
+            node_ids=[_relative(f, self._rejig.root) for f in tests],
+            run_all=True,
+            reason=reason,
+        )
+
+    def _importers_of_missing(self, module: str) -> list[int]:
+        """Modules that import a module which no longer exists."""
+        importers = []
+        for file_path, idx in self._path_index.items():
+            data = self._rejig.cache.get(CACHE_NAMESPACE, file_path) or []
+            importer = self._modules[idx]
+            is_package = file_path.name == "__init__.py"
+            for target, names, level in data:
+                base = self._absolute_module(importer, is_package, target, level)
+                if not base:
+                    continue
+                full = [base] + [f"{base}.{n}" for n in names]
+                if any(m == module or m.startswith(module + ".") for m in full):
+                    importers.append(idx)
+                    break
+        return importers
+
+    def _narrow_with_call_graph(
+        self,
+        test_files: list[Path],
+        changed_files: list[Path],
+        changed_lines: dict[Path, set[int]],
+    ) -> dict[Path, list[str]]:
+        """Map test files to the tests that statically reach changed functions.
+
+        Returns an empty mapping when the change can't be pinned to functions.
+        Test files whose fixtures or module-level code are affected are left
+        out of the mapping, so they run in full.
+        """
+        graph = self._rejig.get_call_graph()
+        nodes_by_file: dict[Path, list] = {}
+        for node in graph.get_nodes():
+            nodes_by_file.setdefault(node.file_path, []).append(node)
+
+        changed_functions: set[str] = set()
+        for path in changed_files:
+            if path.name == "conftest.py":
+                # Fixtures are wired up by pytest, not by calls
+                return {}
+            if self.is_test_file(path):
+                continue
+            lines = changed_lines.get(path)
+            nodes = nodes_by_file.get(path)
+            if not lines or not nodes:
+                # Whole-file or non-source change: can't narrow anything
+                return {}
+            for line in lines:
+                enclosing = [
+                    n for n in nodes
+                    if n.kind != "module" and n.line_number <= line <= n.end_line
+                ]
+                if not enclosing:
+                    # Module-level change affects every importer
+                    return {}
+                changed_functions.add(max(enclosing, key=lambda n: n.line_number).name)
+
+        if not changed_functions:
+            return {}
+        impacted = graph.callers_of(*changed_functions) | changed_functions
+
+        narrowed: dict[Path, list[str]] = {}
+        changed_set = set(changed_files)
+        for path in test_files:
+            if path in changed_set:
+                continue
+            module_nodes = [n.name for n in nodes_by_file.get(path, []) if n.kind == "module"]
+            if not module_nodes:
+                continue
+            module = module_nodes[0][: -len(MODULE_NODE) - 1]
+            tests = []
+            keep_whole = False
+            for node in nodes_by_file.get(path, []):
+                if node.name not in impacted:
+                    continue
+                local = node.name[len(module) + 1:]
+                if _is_test_function(local):
+                    tests.append(local.replace(".", "::"))
+                elif node.kind == "module" or not graph.get_callers(node.name):
+                    # Module-level code, fixtures and hooks run without a
+                    # visible caller, so any test could depend on them
+                    keep_whole = True
+            if not keep_whole:
+                narrowed[path] = sorted(tests)
+        return narrowed
+
+
+def _is_test_function(local_name: str) -> bool:
+    """Check whether a module-local name is a test pytest would collect."""
+    parts = local_name.split(".")
+    if not parts[-1].startswith("test"):
+        return False
+    return len(parts) == 1 or (len(parts) == 2 and parts[0].startswith("Test"))
+
+
+def _relative(path: Path, root: Path) -> str:
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return str(path)
@@ -8,7 +8,6 @@ Generates various reports:
 """
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -22,6 +21,7 @@ from rejig.analysis.metrics import CodeMetrics
 from rejig.analysis.patterns import PatternFinder
 from rejig.analysis.targets import AnalysisTargetList, AnalysisType
 from rejig.core.results import Result
+from rejig.core.writers import JsonWriter, open_report
 
 if TYPE_CHECKING:
     from rejig.core.rejig import Rejig
@@ -564,7 +564,7 @@ class AnalysisReporter:
         """
         results = self._complexity_analyzer.analyze_all()
 
-        data = {
+        header = {
             "generated_at": datetime.now().isoformat(),
             "project_root": str(self._rejig.root),
             "summary": {
@@ -581,25 +581,30 @@ class AnalysisReporter:
                     1 for r in results if r.cyclomatic_complexity > 10
                 ),
             },
-            "functions": [
-                {
-                    "name": r.full_name,
-                    "file": str(r.file_path),
-                    "line": r.line_number,
-                    "cyclomatic_complexity": r.cyclomatic_complexity,
-                    "line_count": r.line_count,
-                    "parameter_count": r.parameter_count,
-                    "branch_count": r.branch_count,
-                    "return_count": r.return_count,
-                }
-                for r in results
-            ],
         }
+        functions = (
+            {
+                "name": r.full_name,
+                "file": str(r.file_path),
+                "line": r.line_number,
+                "cyclomatic_complexity": r.cyclomatic_complexity,
+                "line_count": r.line_count,
+                "parameter_count": r.parameter_count,
+                "branch_count": r.branch_count,
+                "return_count": r.return_count,
+            }
+            for r in results
+        )
 
         if output_path:
+            # Stream the functions rather than building the document
             output_path = Path(output_path)
             try:
-                output_path.write_text(json.dumps(data, indent=2))
+                with open_report(output_path) as stream:
+                    writer = JsonWriter(stream, header, key="functions")
+                    for function in functions:
+                        writer.write(function)
+                    writer.close()
                 return Result(
                     success=True,
                     message=f"Complexity report written to {output_path}",
@@ -611,6 +616,8 @@ class AnalysisReporter:
                     message=f"Failed to write complexity report: {e}",
                 )
 
+        data = {**header, "functions": list(functions)}
+
         return Result(
             success=True,
             message="Complexity report generated",
@@ -299,23 +299,14 @@ class AnalysisTargetList(FindingTargetList[AnalysisTarget, AnalysisType]):
 
     # ===== Output methods (override to include value) =====
 
-    def to_list_of_dicts(self) -> list[dict]:
-        """Convert to list of dictionaries for serialization.
-
-        Returns
-        -------
-        list[dict]
-            List of finding dictionaries.
-        """
-        return [
-            {
-                "type": t.type.name,
-                "file": str(t.file_path),
-                "line": t.line_number,
-                "name": t.name,
-                "message": t.message,
-                "severity": t.severity,
-                "value": t.value,
-            }
-            for t in self._targets
-        ]
+    def _to_dict(self, target: AnalysisTarget) -> dict:
+        """Convert one finding to a dictionary for serialization."""
+        return {
+            "type": target.type.name,
+            "file": str(target.file_path),
+            "line": target.line_number,
+            "name": target.name,
+            "message": target.message,
+            "severity": target.severity,
+            "value": target.value,
+        }
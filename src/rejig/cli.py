@@ -0,0 +1,59 @@
+"""Command-line entry point (``rejig`` / ``python -m rejig``)."""
+from __future__ import annotations
+
+import argparse
+import sys
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="rejig", description="Programmatic Python refactoring.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser(
+        "serve",
+        help="Run a JSON-RPC server keeping the project warm between requests",
+        description=(
+            "Serve line-delimited JSON-RPC 2.0 over stdio (default) or a Unix socket. "
+            "The server executes any refactoring its clients request: only expose it locally."
+        ),
+    )
+    serve.add_argument("path", nargs="?", default=".", help="Project directory, file or glob (default: .)")
+    serve.add_argument("--socket", metavar="PATH", help="Listen on this Unix socket instead of stdio")
+    serve.add_argument("--dry-run", action="store_true", help="Report diffs without writing files")
+    serve.add_argument("--cache-dir", metavar="DIR", help="Persist analysis caches in this directory")
+    serve.add_argument(
+        "--no-warm", action="store_true", help="Don't index the project before the first request"
+    )
+    return parser
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from rejig.server import RejigServer
+
+    server = RejigServer(args.path, dry_run=args.dry_run, cache_dir=args.cache_dir)
+    if not args.no_warm:
+        server.warm()
+    if args.socket:
+        server.serve_unix(args.socket)
+    else:
+        server.serve_stdio()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line.
+
+    Parameters
+    ----------
+    argv : list[str] | None
+        Arguments (default ``sys.argv[1:]``).
+
+    Returns
+    -------
+    int
+        Process exit code.
+    """
+    args = _build_parser().parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "serve":
+        return _serve(args)
+    return 2
@@ -16,9 +16,11 @@ Example
 """
 from __future__ import annotations
 
+from .baseline import Baseline
 from .rejig import Rejig
 from .results import BatchResult, ErrorResult, Result
 from .transaction import Transaction
+from .watch import FindingDelta, WatchSession
 
 __all__ = [
     "Rejig",
@@ -26,4 +28,7 @@ __all__ = [
     "ErrorResult",
     "BatchResult",
     "Transaction",
+    "Baseline",
+    "WatchSession",
+    "FindingDelta",
 ]
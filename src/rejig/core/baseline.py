@@ -0,0 +1,301 @@
+"""Finding baselines for incremental runs.
+
+A baseline records the findings accepted at some point (typically on the
+main branch) so later runs can report only what is new::
+
+    findings = rj.find_security_issues()
+    findings.to_baseline().save("security-baseline.json")
+
+    # later, in CI
+    new = rj.find_security_issues().new_since("security-baseline.json")
+
+Findings are identified by a fingerprint built from the rule (finding type
+and name), the file, the enclosing class/function and the whitespace-
+normalised source line, but not the line number, so findings survive
+unrelated edits above them. Identical fingerprints within a file are
+numbered in order of appearance.
+
+Entries may carry a ``reason``; such entries act as suppressions and keep
+their reason when the baseline is updated.
+
+For pull requests, scan only the changed files and carry the rest of the
+baseline forward::
+
+    pr = rj.restrict_to(changed_files)
+    findings = pr.find_security_issues()
+    new = findings.new_since(baseline)
+    baseline = baseline.update(findings.to_baseline(), pr.working_set, pr.root)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+from rejig.core.results import ErrorResult, Result
+
+if TYPE_CHECKING:
+    from rejig.targets.base import BaseFinding
+
+# Bump when the fingerprint recipe or file layout changes.
+BASELINE_VERSION = 1
+
+_DEF_RE = re.compile(r"^([ \t]*)(?:async[ \t]+)?(?:def|class)[ \t]+(\w+)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _enclosing_symbols(lines: list[str]) -> list[str]:
+    """Map each line (0-based) to its enclosing ``Class.method`` path."""
+    symbols: list[str] = []
+    stack: list[tuple[int, str]] = []
+    for line in lines:
+        stripped = line.lstrip()
+        if stripped and not stripped.startswith("#"):
+            indent = len(line) - len(stripped)
+            while stack and stack[-1][0] >= indent:
+                stack.pop()
+            match = _DEF_RE.match(line)
+            if match:
+                stack.append((indent, match.group(2)))
+        symbols.append(".".join(name for _, name in stack))
+    return symbols
+
+
+def _relative_path(path: Path, root: Path | None) -> str:
+    if root is not None:
+        try:
+            return path.resolve().relative_to(root).as_posix()
+        except ValueError:
+            pass
+    return path.as_posix()
+
+
+def fingerprint_findings(findings: Iterable[BaseFinding], root: Path | None = None) -> list[str]:
+    """Compute stable fingerprints for findings.
+
+    Each file is read once, however many findings it has.
+
+    Parameters
+    ----------
+    findings : Iterable[BaseFinding]
+        Findings to fingerprint.
+    root : Path | None
+        Directory file paths are made relative to, so fingerprints don't
+        depend on where the repository is checked out.
+
+    Returns
+    -------
+    list[str]
+        One fingerprint per finding, in the same order.
+    """
+    findings = list(findings)
+    root = root.resolve() if root is not None else None
+    files: dict[Path, tuple[str, list[str], list[str]]] = {}
+    counts: Counter[str] = Counter()
+
+    # Number duplicates in location order so the numbering doesn't depend
+    # on the order scanners emitted findings in
+    order = sorted(range(len(findings)), key=lambda i: (str(findings[i].file_path), findings[i].line_number))
+    fingerprints = [""] * len(findings)
+
+    for i in order:
+        finding = findings[i]
+        path = finding.file_path
+        if path not in files:
+            try:
+                lines = path.read_text(errors="replace").splitlines()
+            except OSError:
+                lines = []
+            files[path] = (_relative_path(path, root), lines, _enclosing_symbols(lines))
+        relative, lines, symbols = files[path]
+
+        line_no = finding.line_number
+        if 0 < line_no <= len(lines):
+            snippet, symbol = lines[line_no - 1], symbols[line_no - 1]
+        else:
+            snippet = getattr(finding, "code_snippet", None) or finding.message
+            symbol = ""
+
+        rule = f"{finding.type.name}:{finding.name or ''}"
+        key = "\0".join((
+            rule,
+            relative,
+            symbol,
+            _WHITESPACE_RE.sub(" ", snippet.strip()),
+        ))
+        digest = hashlib.sha256(key.encode()).hexdigest()[:20]
+        fingerprints[i] = f"{digest}:{counts[digest]}"
+        counts[digest] += 1
+
+    return fingerprints
+
+
+class Baseline:
+    """A set of accepted findings, identified by fingerprint.
+
+    Parameters
+    ----------
+    entries : list[dict] | None
+        Baseline entries; each has at least a ``fingerprint`` and a ``file``.
+
+    Examples
+    --------
+    >>> baseline = Baseline.load("security-baseline.json")
+    >>> new = rj.find_security_issues().new_since(baseline)
+    """
+
+    def __init__(self, entries: list[dict[str, Any]] | None = None) -> None:
+        self.entries = list(entries or [])
+        self._fingerprints = {entry["fingerprint"] for entry in self.entries}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self._fingerprints
+
+    def __repr__(self) -> str:
+        return f"Baseline({len(self.entries)} findings)"
+
+    @property
+    def files(self) -> set[str]:
+        """Relative paths of the files with baseline entries."""
+        return {entry["file"] for entry in self.entries}
+
+    @classmethod
+    def from_findings(cls, findings: Iterable[BaseFinding], root: Path | None = None) -> Baseline:
+        """Create a baseline accepting the given findings.
+
+        Parameters
+        ----------
+        findings : Iterable[BaseFinding]
+            Findings to accept.
+        root : Path | None
+            Directory file paths are stored relative to.
+
+        Returns
+        -------
+        Baseline
+            The new baseline.
+        """
+        findings = list(findings)
+        root = root.resolve() if root is not None else None
+        entries = [
+            {
+                "fingerprint": fingerprint,
+                "type": finding.type.name,
+                "name": finding.name,
+                "file": _relative_path(finding.file_path, root),
+                "line": finding.line_number,
+                "severity": finding.severity,
+                "message": finding.message,
+            }
+            for finding, fingerprint in zip(findings, fingerprint_findings(findings, root))
+        ]
+        entries.sort(key=lambda e: (e["file"], e["line"], e["fingerprint"]))
+        return cls(entries)
+
+    @classmethod
+    def load(cls, path: str | Path) -> Baseline:
+        """Load a baseline file.
+
+        A missing file loads as an empty baseline, so a first CI run simply
+        reports everything.
+
+        Parameters
+        ----------
+        path : str | Path
+            Path to the baseline JSON file.
+
+        Returns
+        -------
+        Baseline
+            The loaded baseline.
+
+        Raises
+        ------
+        ValueError
+            If the file isn't a baseline or was written by an incompatible
+            version.
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text())
+        if not isinstance(data, dict) or data.get("version") != BASELINE_VERSION:
+            raise ValueError(f"{path} is not a version {BASELINE_VERSION} rejig baseline")
+        return cls(data.get("findings", []))
+
+    def save(self, path: str | Path) -> Result:
+        """Write the baseline as JSON.
+
+        Parameters
+        ----------
+        path : str | Path
+            Destination file.
+
+        Returns
+        -------
+        Result
+            Result with the written file in ``files_changed``.
+        """
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                json.dumps({"version": BASELINE_VERSION, "findings": self.entries}, indent=2) + "\n"
+            )
+        except OSError as e:
+            return ErrorResult(
+                message=f"Failed to write baseline: {e}", exception=e, operation="save"
+            )
+        return Result(
+            success=True,
+            message=f"Saved baseline with {len(self.entries)} findings to {path}",
+            files_changed=[path],
+        )
+
+    def update(
+        self,
+        current: Baseline,
+        scanned_files: Iterable[str | Path] | None = None,
+        root: Path | None = None,
+    ) -> Baseline:
+        """Merge the results of a (possibly partial) rescan into this baseline.
+
+        Parameters
+        ----------
+        current : Baseline
+            Baseline built from the findings of the rescan.
+        scanned_files : Iterable[str | Path] | None
+            Files that were rescanned. Entries for other files are carried
+            forward unchanged. If None, ``current`` replaces everything.
+        root : Path | None
+            Directory that ``Path`` entries in ``scanned_files`` are made
+            relative to (the root the baselines were built with).
+
+        Returns
+        -------
+        Baseline
+            The merged baseline. Suppression reasons are kept for findings
+            that are still present.
+        """
+        reasons = {e["fingerprint"]: e["reason"] for e in self.entries if e.get("reason")}
+        if scanned_files is None:
+            kept: list[dict[str, Any]] = []
+        else:
+            root = root.resolve() if root is not None else None
+            scanned = {
+                _relative_path(f, root) if isinstance(f, Path) else f for f in scanned_files
+            }
+            kept = [e for e in self.entries if e["file"] not in scanned]
+
+        merged = kept + [dict(e) for e in current.entries]
+        for entry in merged:
+            if entry["fingerprint"] in reasons and "reason" not in entry:
+                entry["reason"] = reasons[entry["fingerprint"]]
+        merged.sort(key=lambda e: (e["file"], e["line"], e["fingerprint"]))
+        return Baseline(merged)
@@ -0,0 +1,201 @@
+"""Per-file analysis cache.
+
+Analyses that are expensive to recompute (call graphs, import graphs, ...)
+store one entry per source file, keyed by the file's path and validated
+against its size and modification time. On later runs unchanged files are
+served from the cache, so only edited files need to be parsed again.
+
+Entries are grouped into namespaces (one per analysis). When the cache has
+a directory, each namespace is persisted as a JSON file in it; otherwise
+the cache lives in memory for the lifetime of the owning Rejig instance.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+# Bump when the on-disk layout changes so stale caches are discarded.
+CACHE_VERSION = 1
+
+
+def file_fingerprint(path: Path) -> list[int] | None:
+    """Return a cheap change-detection fingerprint for a file.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the file.
+
+    Returns
+    -------
+    list[int] | None
+        ``[mtime_ns, size]``, or None if the file cannot be stat'ed.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class AnalysisCache:
+    """Cache of per-file analysis results.
+
+    Parameters
+    ----------
+    directory : Path | None
+        Directory to persist namespaces in. If None, the cache is
+        memory-only.
+
+    Examples
+    --------
+    >>> cache = AnalysisCache(Path(".rejig_cache"))
+    >>> data = cache.get("call_graph", path)
+    >>> if data is None:
+    ...     data = expensive_analysis(path)
+    ...     cache.put("call_graph", path, data)
+    >>> cache.save()
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self._directory = directory
+        self._namespaces: dict[str, dict[str, dict[str, Any]]] = {}
+        self._dirty: set[str] = set()
+
+    @property
+    def directory(self) -> Path | None:
+        """Directory the cache is persisted in (None if memory-only)."""
+        return self._directory
+
+    @property
+    def persistent(self) -> bool:
+        """Whether the cache is written to disk."""
+        return self._directory is not None
+
+    def _namespace_path(self, namespace: str) -> Path | None:
+        if self._directory is None:
+            return None
+        return self._directory / f"{namespace}.json"
+
+    def _load(self, namespace: str) -> dict[str, dict[str, Any]]:
+        """Load a namespace from disk (once) and return its entries."""
+        entries = self._namespaces.get(namespace)
+        if entries is not None:
+            return entries
+
+        entries = {}
+        ns_path = self._namespace_path(namespace)
+        if ns_path is not None and ns_path.exists():
+            try:
+                raw = json.loads(ns_path.read_text())
+                if raw.get("version") == CACHE_VERSION:
+                    entries = raw.get("entries", {})
+            except (OSError, ValueError):
+                entries = {}
+
+        self._namespaces[namespace] = entries
+        return entries
+
+    def get(self, namespace: str, path: Path) -> Any | None:
+        """Get the cached data for a file if it is still up to date.
+
+        Parameters
+        ----------
+        namespace : str
+            Name of the analysis the data belongs to.
+        path : Path
+            Path to the source file.
+
+        Returns
+        -------
+        Any | None
+            The cached data, or None if missing or stale.
+        """
+        entry = self._load(namespace).get(str(path))
+        if entry is None:
+            return None
+        if entry.get("fingerprint") != file_fingerprint(path):
+            return None
+        return entry.get("data")
+
+    def put(self, namespace: str, path: Path, data: Any) -> None:
+        """Store data for a file, stamped with its current fingerprint.
+
+        Parameters
+        ----------
+        namespace : str
+            Name of the analysis the data belongs to.
+        path : Path
+            Path to the source file.
+        data : Any
+            JSON-serializable data to cache.
+        """
+        self._load(namespace)[str(path)] = {
+            "fingerprint": file_fingerprint(path),
+            "data": data,
+        }
+        self._dirty.add(namespace)
+
+    def invalidate(self, path: Path | None = None, namespace: str | None = None) -> None:
+        """Drop cached entries.
+
+        Parameters
+        ----------
+        path : Path | None
+            Only drop entries for this file. If None, drop all entries.
+        namespace : str | None
+            Only drop entries in this namespace. If None, all namespaces.
+        """
+        if namespace is not None:
+            namespaces = [namespace]
+        else:
+            namespaces = list(self._namespaces)
+            if self._directory is not None and self._directory.exists():
+                namespaces.extend(p.stem for p in self._directory.glob("*.json"))
+
+        for ns in set(namespaces):
+            entries = self._load(ns)
+            if path is None:
+                if entries:
+                    entries.clear()
+                    self._dirty.add(ns)
+            elif entries.pop(str(path), None) is not None:
+                self._dirty.add(ns)
+
+    def prune(self, namespace: str, keep: set[Path]) -> None:
+        """Drop entries for files no longer in the working set.
+
+        Parameters
+        ----------
+        namespace : str
+            Namespace to prune.
+        keep : set[Path]
+            Files whose entries should be kept.
+        """
+        entries = self._load(namespace)
+        keep_keys = {str(p) for p in keep}
+        stale = [key for key in entries if key not in keep_keys]
+        for key in stale:
+            del entries[key]
+        if stale:
+            self._dirty.add(namespace)
+
+    def save(self) -> None:
+        """Write modified namespaces to disk (no-op for memory-only caches)."""
+        if self._directory is None or not self._dirty:
+            return
+
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            for namespace in sorted(self._dirty):
+                ns_path = self._namespace_path(namespace)
+                payload = {"version": CACHE_VERSION, "entries": self._namespaces.get(namespace, {})}
+                tmp_path = ns_path.with_suffix(".json.tmp")
+                tmp_path.write_text(json.dumps(payload, separators=(",", ":")))
+                os.replace(tmp_path, ns_path)
+        except OSError:
+            # A cache that can't be written is just a slower cache.
+            return
+        self._dirty.clear()
@@ -0,0 +1,115 @@
+"""Graph algorithms shared by the call graph and import graph.
+
+Graphs are given as adjacency lists over integer node ids (``0..n-1``),
+which keeps traversal cheap on graphs with hundreds of thousands of nodes.
+All algorithms are iterative, so deep graphs never hit the recursion limit.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Sequence
+
+
+def reachable(successors: Sequence[Sequence[int]], sources: Iterable[int]) -> list[int]:
+    """Return all nodes reachable from the given sources (sources included).
+
+    Parameters
+    ----------
+    successors : Sequence[Sequence[int]]
+        Adjacency list: ``successors[i]`` holds the direct successors of ``i``.
+    sources : Iterable[int]
+        Node ids to start from.
+
+    Returns
+    -------
+    list[int]
+        Reachable node ids in breadth-first order.
+    """
+    seen = bytearray(len(successors))
+    order: list[int] = []
+    queue: deque[int] = deque()
+
+    for source in sources:
+        if not seen[source]:
+            seen[source] = 1
+            queue.append(source)
+
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for succ in successors[node]:
+            if not seen[succ]:
+                seen[succ] = 1
+                queue.append(succ)
+
+    return order
+
+
+def strongly_connected_components(successors: Sequence[Sequence[int]]) -> list[list[int]]:
+    """Compute strongly connected components with Tarjan's algorithm.
+
+    Parameters
+    ----------
+    successors : Sequence[Sequence[int]]
+        Adjacency list: ``successors[i]`` holds the direct successors of ``i``.
+
+    Returns
+    -------
+    list[list[int]]
+        Every component (including single nodes), in reverse topological
+        order: a component only depends on components listed before it.
+    """
+    n = len(successors)
+    index = [-1] * n
+    lowlink = [0] * n
+    on_stack = bytearray(n)
+    stack: list[int] = []
+    components: list[list[int]] = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+
+        # Each work item is (node, position of the next successor to visit).
+        work: list[tuple[int, int]] = [(root, 0)]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+
+        while work:
+            node, pos = work[-1]
+            succs = successors[node]
+
+            if pos < len(succs):
+                work[-1] = (node, pos + 1)
+                succ = succs[pos]
+                if index[succ] == -1:
+                    index[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack[succ] = 1
+                    work.append((succ, 0))
+                elif on_stack[succ] and index[succ] < lowlink[node]:
+                    lowlink[node] = index[succ]
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+
+            if lowlink[node] == index[node]:
+                component: list[int] = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
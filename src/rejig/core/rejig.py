@@ -5,7 +5,7 @@ import re
 import shutil
 from contextlib import contextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING, Generator
+from typing import TYPE_CHECKING, Callable, Generator, Iterable
 
 import libcst as cst
 
@@ -14,7 +14,10 @@ from rejig.core.results import BatchResult, Result
 if TYPE_CHECKING:
     from rope.base.project import Project as RopeProject
 
+    from rejig.analysis.call_graph import CallGraph
+    from rejig.core.cache import AnalysisCache
     from rejig.core.transaction import Transaction
+    from rejig.core.watch import WatchSession
     from rejig.packaging.models import PackageConfig
     from rejig.patching.targets import PatchTarget
     from rejig.project.targets import PyprojectTarget
@@ -53,6 +56,10 @@ class Rejig:
     dry_run : bool, optional
         If True, all operations will report what they would do without making
         actual changes. Defaults to False.
+    cache_dir : str | Path | None, optional
+        Directory (relative to root, or absolute) to persist per-file analysis
+        results in, so later runs only re-analyze changed files. If None,
+        results are only cached in memory for the lifetime of this instance.
 
     Attributes
     ----------
@@ -75,7 +82,12 @@ class Rejig:
     >>> print(result.message)  # [DRY RUN] Would add attribute...
     """
 
-    def __init__(self, path: str | Path, dry_run: bool = False) -> None:
+    def __init__(
+        self,
+        path: str | Path,
+        dry_run: bool = False,
+        cache_dir: str | Path | None = None,
+    ) -> None:
         """Initialize a Rejig instance for code refactoring.
 
         Parameters
@@ -84,13 +96,18 @@ class Rejig:
             Path to the file, directory, or glob pattern to work with.
         dry_run : bool
             If True, operations don't modify files, only preview changes.
+        cache_dir : str | Path | None
+            Directory to persist analysis caches in. If None, memory only.
         """
         self.path = Path(path) if isinstance(path, str) else path
         self.dry_run = dry_run
+        self.cache_dir = cache_dir
         self._files: list[Path] | None = None
         self._rope_project: RopeProject | None = None
         self._root_path: Path | None = None
         self._transaction: Transaction | None = None
+        self._cache: AnalysisCache | None = None
+        self._working_set: list[Path] | None = None
 
     @property
     def root(self) -> Path:
@@ -116,6 +133,20 @@ class Rejig:
         """Alias for root (for backwards compatibility)."""
         return self.root
 
+    @property
+    def cache(self) -> AnalysisCache:
+        """
+        Per-file analysis cache shared by all analyzers of this instance.
+
+        Persisted under ``cache_dir`` when one was given, memory-only otherwise.
+        """
+        if self._cache is None:
+            from rejig.core.cache import AnalysisCache
+
+            directory = self._resolve_path(self.cache_dir) if self.cache_dir is not None else None
+            self._cache = AnalysisCache(directory)
+        return self._cache
+
     def _resolve_path(self, path: str | Path) -> Path:
         """Resolve a path relative to root, or return absolute paths unchanged."""
         p = Path(path)
@@ -180,6 +211,65 @@ class Rejig:
             self._files = self._discover_files()
         return self._files
 
+    def reset_files(self) -> None:
+        """
+        Forget the discovered files so the next access to ``files`` rediscovers them.
+
+        Long-lived instances call this when files are created or deleted.
+        Instances made by ``restrict_to`` keep their fixed file list.
+        """
+        if self._working_set is None:
+            self._files = None
+
+    @property
+    def working_set(self) -> list[Path] | None:
+        """
+        Files this instance is restricted to (any type), or None.
+
+        Set by ``restrict_to``; None means every file under ``path``.
+        """
+        return self._working_set
+
+    def restrict_to(self, paths: Iterable[str | Path]) -> Rejig:
+        """
+        Create a Rejig instance limited to the given files.
+
+        The new instance shares this instance's root and cache, so relative
+        paths, module names and baseline fingerprints match a full run.
+        Missing files (e.g. deleted in a change) are dropped.
+
+        Parameters
+        ----------
+        paths : Iterable[str | Path]
+            Files to keep, absolute or relative to ``root``. Non-Python
+            files are kept in ``working_set`` for scanners that read them.
+
+        Returns
+        -------
+        Rejig
+            A Rejig whose ``files`` are the Python files among ``paths``.
+
+        Examples
+        --------
+        >>> changed = rj.select_tests(since="origin/main").changed_files
+        >>> pr = rj.restrict_to(changed)
+        >>> new = pr.find_security_issues().new_since("security-baseline.json")
+        """
+        restricted = Rejig(self.path, dry_run=self.dry_run, cache_dir=self.cache_dir)
+        restricted._root_path = self.root
+        restricted._cache = self._cache
+
+        files = set()
+        for path in paths:
+            path = Path(path)
+            if not path.is_absolute():
+                path = self.root / path
+            if path.is_file():
+                files.add(path.resolve())
+        restricted._working_set = sorted(files)
+        restricted._files = [p for p in restricted._working_set if p.suffix == ".py"]
+        return restricted
+
     def _discover_files(self) -> list[Path]:
         """Discover all Python files matching the path pattern."""
         if self.path.is_file():
@@ -1039,7 +1129,7 @@ class Rejig:
         )
 
     # -------------------------------------------------------------------------
-    # Rope-based Move Operations
+    # Move Operations
     # -------------------------------------------------------------------------
 
     def _get_class_offset(self, file_path: Path, class_name: str) -> int | None:
@@ -1059,11 +1149,19 @@ class Rejig:
         source_file: Path,
         class_name: str,
         dest_module: str,
+        use_rope: bool = False,
+        allow_cycle: bool = False,
     ) -> Result:
         """
-        Move a class from source file to destination module using rope.
+        Move a class from source file to destination module.
 
-        Rope automatically updates all imports throughout the project.
+        The class is cut from its module together with the imports only it
+        used, added to the destination (created if its package exists) with
+        the imports it needs, and every importer is updated: absolute,
+        relative and aliased imports, and references through the module.
+        All files are changed together. A move that would make the source
+        and destination modules import each other is refused unless
+        ``allow_cycle`` is set.
 
         Parameters
         ----------
@@ -1073,6 +1171,12 @@ class Rejig:
             Name of the class to move.
         dest_module : str
             Destination module path (e.g., 'myapp.views').
+        use_rope : bool
+            Use rope instead. It indexes the whole project first and needs
+            ``rejig[rope]``; call ``close()`` afterwards.
+        allow_cycle : bool
+            Move the class even if the source and destination modules end up
+            importing each other.
 
         Returns
         -------
@@ -1083,59 +1187,26 @@ class Rejig:
         --------
         >>> rj = Rejig("src/")
         >>> result = rj.move_class(Path("src/old.py"), "MyClass", "new_module")
-        >>> rj.close()  # Always close after move operations
         """
-        from rope.refactor.move import create_move
-
-        offset = self._get_class_offset(source_file, class_name)
-        if offset is None:
-            return Result(
-                success=False,
-                message=f"Could not find class {class_name} in {source_file}",
-            )
+        if use_rope:
+            return self._rope_move(source_file, class_name, dest_module, self._get_class_offset)
 
-        try:
-            relative_path = source_file.relative_to(self.root_path)
-            resource = self.rope_project.get_resource(str(relative_path))
+        from rejig.modules.move import DefinitionMover
 
-            mover = create_move(self.rope_project, resource, offset)
-            changes = mover.get_changes(dest_module)
-
-            changed_files = [
-                Path(self.root_path / change.path)
-                for change in changes.get_changed_resources()
-            ]
-
-            if self.dry_run:
-                return Result(
-                    success=True,
-                    message=f"[DRY RUN] Would move {class_name} to {dest_module}",
-                    files_changed=changed_files,
-                )
-
-            self.rope_project.do(changes)
-            return Result(
-                success=True,
-                message=f"Moved {class_name} to {dest_module}",
-                files_changed=changed_files,
-            )
-
-        except Exception as e:
-            return Result(
-                success=False,
-                message=f"Error moving {class_name}: {e}",
-            )
+        return DefinitionMover(self).move(source_file, class_name, dest_module, "class", allow_cycle)
 
     def move_function(
         self,
         source_file: Path,
         function_name: str,
         dest_module: str,
+        use_rope: bool = False,
+        allow_cycle: bool = False,
     ) -> Result:
         """
-        Move a function from source file to destination module using rope.
+        Move a function from source file to destination module.
 
-        Rope automatically updates all imports throughout the project.
+        Works like ``move_class``.
 
         Parameters
         ----------
@@ -1145,6 +1216,12 @@ class Rejig:
             Name of the function to move.
         dest_module : str
             Destination module path.
+        use_rope : bool
+            Use rope instead. It indexes the whole project first and needs
+            ``rejig[rope]``; call ``close()`` afterwards.
+        allow_cycle : bool
+            Move the function even if the source and destination modules end
+            up importing each other.
 
         Returns
         -------
@@ -1155,15 +1232,29 @@ class Rejig:
         --------
         >>> rj = Rejig("src/")
         >>> result = rj.move_function(Path("src/utils.py"), "helper", "new_utils")
-        >>> rj.close()
         """
+        if use_rope:
+            return self._rope_move(source_file, function_name, dest_module, self._get_function_offset)
+
+        from rejig.modules.move import DefinitionMover
+
+        return DefinitionMover(self).move(source_file, function_name, dest_module, "function", allow_cycle)
+
+    def _rope_move(
+        self,
+        source_file: Path,
+        name: str,
+        dest_module: str,
+        get_offset: Callable[[Path, str], int | None],
+    ) -> Result:
+        """Move a class or function with rope, which updates imports."""
         from rope.refactor.move import create_move
 
-        offset = self._get_function_offset(source_file, function_name)
+        offset = get_offset(source_file, name)
         if offset is None:
             return Result(
                 success=False,
-                message=f"Could not find function {function_name} in {source_file}",
+                message=f"Could not find {name} in {source_file}",
             )
 
         try:
@@ -1181,21 +1272,21 @@ class Rejig:
             if self.dry_run:
                 return Result(
                     success=True,
-                    message=f"[DRY RUN] Would move {function_name} to {dest_module}",
+                    message=f"[DRY RUN] Would move {name} to {dest_module}",
                     files_changed=changed_files,
                 )
 
             self.rope_project.do(changes)
             return Result(
                 success=True,
-                message=f"Moved {function_name} to {dest_module}",
+                message=f"Moved {name} to {dest_module}",
                 files_changed=changed_files,
             )
 
         except Exception as e:
             return Result(
                 success=False,
-                message=f"Error moving {function_name}: {e}",
+                message=f"Error moving {name}: {e}",
             )
 
     # -------------------------------------------------------------------------
@@ -1576,10 +1667,16 @@ class Rejig:
     # Import Management Operations
     # -------------------------------------------------------------------------
 
-    def find_unused_imports(self) -> TargetList:
+    def find_unused_imports(self, workers: int = 1) -> TargetList:
         """
         Find all unused imports across all files in the project.
 
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes. With 1 (default), files are
+            analysed in this process.
+
         Returns
         -------
         TargetList
@@ -1596,15 +1693,11 @@ class Rejig:
         from rejig.imports.analyzer import ImportAnalyzer
         from rejig.imports.targets import ImportTarget, ImportTargetList
 
-        analyzer = ImportAnalyzer(self)
-        all_targets: list[ImportTarget] = []
-
-        for file_path in self.files:
-            unused = analyzer.find_unused_imports(file_path)
-            for info in unused:
-                all_targets.append(ImportTarget(self, file_path, info))
-
-        return ImportTargetList(self, all_targets)
+        unused = ImportAnalyzer(self).find_all_unused_imports(workers)
+        return ImportTargetList(
+            self,
+            [ImportTarget(self, path, info) for path, infos in unused.items() for info in infos],
+        )
 
     def find_circular_imports(self) -> list:
         """
@@ -1657,6 +1750,110 @@ class Rejig:
         graph.build()
         return graph
 
+    def profile_imports(
+        self,
+        entry: str,
+        python: str | None = None,
+        run_main: bool = False,
+        timeout: float = 120,
+    ) -> Result:
+        """
+        Measure the import time of an entry module and map it onto the import graph.
+
+        Imports ``entry`` in a subprocess with ``python -X importtime`` (the
+        project root first on ``PYTHONPATH``) and attaches the self and
+        cumulative times to the ``ImportGraph``'s modules and edges.
+
+        Parameters
+        ----------
+        entry : str
+            Dotted name of the entry module (e.g. "myapp.main").
+        python : str | None
+            Interpreter to run. Defaults to the current one.
+        run_main : bool
+            Run the module with ``-m`` instead of only importing it.
+        timeout : float
+            Seconds before the subprocess is killed.
+
+        Returns
+        -------
+        Result
+            Result with ``data["profile"]``, an ``ImportProfile`` reporting
+            the heaviest subtrees, first-party imports of heavy third-party
+            packages and top-level imports only used inside functions.
+
+        Examples
+        --------
+        >>> rj = Rejig("src/")
+        >>> result = rj.profile_imports(entry="myapp.main")
+        >>> profile = result.data["profile"]
+        >>> for item in profile.deferrable_imports():
+        ...     print(item)
+        """
+        from rejig.imports.profiler import ImportProfiler
+
+        return ImportProfiler(self).profile(
+            entry, python=python, run_main=run_main, timeout=timeout
+        )
+
+    def defer_imports(
+        self,
+        modules: set[str] | list[str] | None = None,
+        min_us: int | None = None,
+        entry: str | None = None,
+        python: str | None = None,
+    ) -> Result:
+        """
+        Convert top-level imports of heavy modules into lazy imports.
+
+        Names used in functions are imported inside those functions, names
+        only used in annotations move under ``if TYPE_CHECKING:`` and names
+        the module re-exports are loaded by a generated ``__getattr__``.
+        Imports whose names are used at import time are left in place and
+        reported.
+
+        Parameters
+        ----------
+        modules : set[str] | list[str] | None
+            Dotted names of the modules to defer.
+        min_us : int | None
+            Instead of naming modules, defer every non-project module whose
+            cumulative import time is at least this many microseconds.
+            Requires ``entry``.
+        entry : str | None
+            Entry module to profile when ``min_us`` is given.
+        python : str | None
+            Interpreter used for profiling. Defaults to the current one.
+
+        Returns
+        -------
+        Result
+            Result with the combined diff. ``data["converted"]`` maps files
+            to the moved names and ``data["skipped"]`` lists the imports
+            left in place with the reason.
+
+        Examples
+        --------
+        >>> rj = Rejig("src/")
+        >>> rj.defer_imports(modules={"pandas", "matplotlib"})
+        >>> rj.defer_imports(min_us=50_000, entry="myapp.main")
+        """
+        from rejig.imports.lazy import LazyImportConverter
+
+        converter = LazyImportConverter(self)
+        selected = set(modules or ())
+        if min_us is not None:
+            if entry is None:
+                return Result(
+                    success=False,
+                    message="defer_imports(min_us=...) needs an entry module to profile",
+                )
+            profiled = self.profile_imports(entry, python=python)
+            if not profiled.success:
+                return profiled
+            selected |= converter.select_modules(profiled.data["profile"], min_us)
+        return converter.apply(selected)
+
     def rename_import(self, old_path: str, new_path: str) -> Result:
         """
         Rename an import across all files in the project.
@@ -1664,6 +1861,12 @@ class Rejig:
         Updates all import statements that reference the old path to use
         the new path. This is useful after moving or renaming modules.
 
+        Only files that import the old path (or a package containing it)
+        are opened, found through an import-site index. Imports are
+        rewritten with libcst, so strings and comments are left alone, and
+        references through the import (``old_module.func()``, or a renamed
+        class) are updated too. All files are changed together.
+
         Parameters
         ----------
         old_path : str
@@ -1680,85 +1883,29 @@ class Rejig:
         --------
         >>> rj = Rejig("src/")
         >>> rj.rename_import("myapp.old_module.OldClass", "myapp.new_module.NewClass")
+        >>> rj.rename_import("myapp.old_module", "myapp.core.module")
         """
-        import re as regex_module
-
-        old_module = ".".join(old_path.rsplit(".", 1)[:-1]) if "." in old_path else old_path
-        old_name = old_path.rsplit(".", 1)[-1] if "." in old_path else None
-        new_module = ".".join(new_path.rsplit(".", 1)[:-1]) if "." in new_path else new_path
-        new_name = new_path.rsplit(".", 1)[-1] if "." in new_path else None
-
-        files_changed = []
-        total_changes = 0
-
-        for file_path in self.files:
-            try:
-                content = file_path.read_text()
-                original = content
-
-                # Handle 'from module import name' -> 'from new_module import new_name'
-                if old_name and new_name:
-                    # Pattern: from old_module import ..., old_name, ...
-                    pattern = rf"(from\s+{regex_module.escape(old_module)}\s+import\s+)(\w+(?:\s*,\s*\w+)*)"
-
-                    def replace_import(m):
-                        prefix = m.group(1)
-                        names = m.group(2)
-                        new_names = regex_module.sub(rf"\b{regex_module.escape(old_name)}\b", new_name, names)
-                        if old_module != new_module:
-                            prefix = f"from {new_module} import "
-                        return prefix + new_names
-
-                    content = regex_module.sub(pattern, replace_import, content)
-
-                # Handle 'import module' -> 'import new_module'
-                if old_module and not old_name:
-                    content = regex_module.sub(
-                        rf"(import\s+){regex_module.escape(old_module)}\b",
-                        rf"\1{new_module}",
-                        content,
-                    )
-                    content = regex_module.sub(
-                        rf"(from\s+){regex_module.escape(old_module)}(\s+import)",
-                        rf"\1{new_module}\2",
-                        content,
-                    )
-
-                if content != original:
-                    if self.dry_run:
-                        files_changed.append(file_path)
-                        total_changes += 1
-                    else:
-                        file_path.write_text(content)
-                        files_changed.append(file_path)
-                        total_changes += 1
-
-            except Exception:
-                continue
-
-        if self.dry_run:
-            return Result(
-                success=True,
-                message=f"[DRY RUN] Would update {total_changes} files",
-                files_changed=files_changed,
-            )
+        from rejig.modules.rename import ModuleRenamer
 
-        return Result(
-            success=True,
-            message=f"Updated imports in {total_changes} files",
-            files_changed=files_changed,
-        )
+        return ModuleRenamer(self).rename_imports(old_path, new_path)
 
     def organize_all_imports(
-        self, first_party_packages: set[str] | None = None
+        self, first_party_packages: set[str] | None = None, workers: int = 1
     ) -> Result:
         """
         Organize imports in all Python files in the project.
 
+        Import classification (first-party, stdlib and installed packages)
+        is worked out once and shared by all files, and all files are
+        changed together.
+
         Parameters
         ----------
         first_party_packages : set[str] | None
             Set of package names to treat as first-party.
+        workers : int
+            Number of worker processes. With 1 (default), files are
+            organized in this process. The output is the same either way.
 
         Returns
         -------
@@ -1769,58 +1916,39 @@ class Rejig:
         --------
         >>> rj = Rejig("src/")
         >>> rj.organize_all_imports()
+        >>> rj.organize_all_imports(workers=8)
         """
         from rejig.imports.organizer import ImportOrganizer
 
-        organizer = ImportOrganizer(self, first_party_packages)
-        files_changed = []
-
-        for file_path in self.files:
-            result = organizer.organize(file_path)
-            if result.success and result.files_changed:
-                files_changed.extend(result.files_changed)
+        return ImportOrganizer(self, first_party_packages).organize_all(workers)
 
-        return Result(
-            success=True,
-            message=f"Organized imports in {len(files_changed)} files",
-            files_changed=files_changed,
-        )
-
-    def remove_all_unused_imports(self) -> Result:
+    def remove_all_unused_imports(self, workers: int = 1) -> Result:
         """
         Remove all unused imports from all files in the project.
 
+        Each file is parsed, analysed and rewritten once, and all files
+        are changed together.
+
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes. With 1 (default), files are
+            analysed in this process.
+
         Returns
         -------
         Result
-            Result of the operation.
+            Result of the operation. ``data["removed"]`` maps each changed
+            file to the imports removed.
 
         Examples
         --------
         >>> rj = Rejig("src/")
         >>> rj.remove_all_unused_imports()
         """
-        files_changed = []
-        total_removed = 0
-
-        for file_path in self.files:
-            file_target = self.file(file_path)
-            unused = file_target.find_unused_imports()
-
-            if unused:
-                # Delete in reverse order to avoid line number shifts
-                for imp in sorted(unused.to_list(), key=lambda t: t.line_number, reverse=True):
-                    result = imp.delete()
-                    if result.success:
-                        total_removed += 1
-
-                files_changed.append(file_path)
+        from rejig.imports.analyzer import ImportAnalyzer
 
-        return Result(
-            success=True,
-            message=f"Removed {total_removed} unused imports from {len(files_changed)} files",
-            files_changed=files_changed,
-        )
+        return ImportAnalyzer(self).remove_all_unused_imports(workers)
 
     # -------------------------------------------------------------------------
     # Type Hint Operations
@@ -3291,6 +3419,75 @@ class Rejig:
         graph.build()
         return graph
 
+    def get_call_graph(self) -> CallGraph:
+        """
+        Get the call graph for the project.
+
+        Built from one scope-resolved pass per file. Per-file results are kept
+        in the analysis cache, so repeated calls only re-parse changed files.
+
+        Returns
+        -------
+        CallGraph
+            The call graph, with caller/callee, reachability and recursion
+            queries.
+
+        Examples
+        --------
+        >>> rj = Rejig("src/")
+        >>> graph = rj.get_call_graph()
+        >>> graph.get_callers("save")
+        >>> live = graph.reachable_from("main")
+        """
+        from rejig.analysis.call_graph import CallGraph
+
+        graph = CallGraph(self)
+        graph.build()
+        return graph
+
+    def select_tests(
+        self,
+        changed: list[str | Path] | None = None,
+        since: str | None = None,
+        use_call_graph: bool = False,
+    ):
+        """
+        Select the tests affected by a set of changed files.
+
+        Follows imports backwards from the changed modules to the test files
+        that (transitively) import them. Changes to ``conftest.py`` select the
+        tests below it; changes to project config files select every test.
+
+        Parameters
+        ----------
+        changed : list[str | Path] | None
+            Changed files, relative to the project root or absolute.
+        since : str | None
+            Git revision to diff the working tree against (e.g.,
+            "origin/main"), used instead of ``changed``.
+        use_call_graph : bool
+            Narrow test files down to the individual tests that statically
+            call a changed function. Only applies with ``since``, which
+            provides changed line numbers; tests that reach the change only
+            through dynamic calls are missed.
+
+        Returns
+        -------
+        ImpactSelection
+            Selected test files and pytest node IDs.
+
+        Examples
+        --------
+        >>> rj = Rejig(".", cache_dir=".rejig_cache")
+        >>> selection = rj.select_tests(since="origin/main")
+        >>> pytest.main(selection.to_pytest_args())
+        >>> rj.select_tests(changed=["src/myapp/models.py"]).test_files
+        """
+        from rejig.analysis.impact import ImpactAnalyzer
+
+        analyzer = ImpactAnalyzer(self)
+        return analyzer.select(changed=changed, since=since, use_call_graph=use_call_graph)
+
     def find_circular_imports(self):
         """
         Find circular import chains in the project.
@@ -3529,6 +3726,50 @@ class Rejig:
             include_coverage=include_coverage,
         )
 
+    def watch(
+        self,
+        analyzers: Iterable[str] | dict[str, str | Callable] | None = None,
+        polling: bool = False,
+        interval: float = 0.5,
+    ) -> WatchSession:
+        """
+        Create a session re-running analyzers on files as they change.
+
+        Parameters
+        ----------
+        analyzers : Iterable[str] | dict[str, str | Callable] | None
+            Rejig method names returning findings (registered under their
+            own name with file scope), or a mapping of names to method
+            names or callables. Use ``WatchSession.register`` for other
+            scopes.
+        polling : bool
+            Poll file stats instead of using inotify.
+        interval : float
+            Polling interval in seconds.
+
+        Returns
+        -------
+        WatchSession
+            The session; call ``start()`` and then ``run()`` or ``poll()``.
+
+        Examples
+        --------
+        >>> session = rj.watch(["find_security_issues", "find_bare_excepts"])
+        >>> session.subscribe(lambda delta: print(delta))
+        >>> session.start()
+        >>> session.run()
+        """
+        from rejig.core.watch import WatchSession
+
+        session = WatchSession(self, polling=polling, interval=interval)
+        if isinstance(analyzers, dict):
+            for name, analyzer in analyzers.items():
+                session.register(name, analyzer)
+        else:
+            for name in analyzers or ():
+                session.register(name, name)
+        return session
+
     def get_code_metrics(self):
         """
         Get code metrics for the project.
@@ -0,0 +1,594 @@
+"""Filesystem watching with incremental re-analysis.
+
+A watcher reports which source files changed; a ``WatchSession`` keeps the
+findings of registered analyzers up to date by re-running them on just
+those files (plus their importers, for analyzers that need it) and tells
+subscribers which findings were added or removed::
+
+    session = rj.watch(["find_security_issues"])
+    session.subscribe(lambda delta: print(delta))
+    session.start()   # full run
+    session.run()     # then react to every save
+
+Two watchers are provided, both local-only: ``InotifyWatcher`` uses Linux
+inotify through libc, and ``PollingWatcher`` compares ``stat`` snapshots.
+``create_watcher`` picks inotify where available.
+
+Findings are matched across runs by their baseline fingerprint (see
+``rejig.core.baseline``), so a finding that only moved down a few lines is
+neither added nor removed.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import operator
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from rejig.core.baseline import fingerprint_findings
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+    from rejig.targets.base import FindingTarget
+
+# Scopes an analyzer can be re-run with
+SCOPES = ("file", "dependents", "project")
+
+
+def _ignored_dir(name: str) -> bool:
+    """Directories never worth watching (VCS metadata, caches)."""
+    return name.startswith(".") or name == "__pycache__"
+
+
+class FileWatcher(ABC):
+    """Reports changed files under a directory.
+
+    Parameters
+    ----------
+    root : Path
+        Directory to watch (recursively).
+    suffixes : tuple[str, ...]
+        File suffixes to report.
+    """
+
+    def __init__(self, root: Path, suffixes: tuple[str, ...] = (".py",)) -> None:
+        self.root = Path(root).resolve()
+        self.suffixes = suffixes
+
+    def _wanted(self, path: Path) -> bool:
+        return path.suffix in self.suffixes
+
+    @abstractmethod
+    def poll(self, timeout: float | None = 0.0) -> set[Path]:
+        """Wait for changes and return the files created, modified or deleted.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Seconds to wait for a first change (0 checks once, None waits
+            forever).
+
+        Returns
+        -------
+        set[Path]
+            Changed files; empty if nothing changed before the timeout. A
+            directory that was removed or moved away may be reported as
+            the directory itself.
+        """
+
+    def close(self) -> None:
+        """Release the watcher's resources."""
+
+    def __enter__(self) -> FileWatcher:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return False
+
+
+class PollingWatcher(FileWatcher):
+    """Watcher comparing ``stat`` snapshots of the watched files.
+
+    Parameters
+    ----------
+    root : Path
+        Directory to watch.
+    suffixes : tuple[str, ...]
+        File suffixes to report.
+    interval : float
+        Seconds between snapshots while waiting.
+    """
+
+    def __init__(self, root: Path, suffixes: tuple[str, ...] = (".py",), interval: float = 0.5) -> None:
+        super().__init__(root, suffixes)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for directory, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not _ignored_dir(d)]
+            for filename in filenames:
+                path = Path(directory, filename)
+                if not self._wanted(path):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: float | None = 0.0) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.interval, remaining))
+            else:
+                time.sleep(self.interval)
+
+
+# inotify(7) event masks
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+
+def _libc() -> Any:
+    name = ctypes.util.find_library("c")
+    libc = ctypes.CDLL(name, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError("inotify is not available")
+    return libc
+
+
+class InotifyWatcher(FileWatcher):
+    """Watcher using Linux inotify, with one watch per directory.
+
+    Raises
+    ------
+    OSError
+        If inotify isn't available or the watch limit is reached.
+    """
+
+    def __init__(self, root: Path, suffixes: tuple[str, ...] = (".py",)) -> None:
+        super().__init__(root, suffixes)
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = _libc()
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        try:
+            self._watch_tree(self.root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, top: Path) -> set[Path]:
+        """Watch a directory tree; return the wanted files already in it."""
+        found: set[Path] = set()
+        for directory, dirnames, filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if not _ignored_dir(d)]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if directory == str(top) and top == self.root:
+                    raise OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+                continue
+            self._dirs[wd] = Path(directory)
+            found.update(p for p in (Path(directory, f) for f in filenames) if self._wanted(p))
+        return found
+
+    def _read_events(self) -> tuple[set[Path], bool]:
+        changed: set[Path] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                directory = self._dirs.get(wd)
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                if directory is None or not name:
+                    continue
+                path = directory / name
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO) and not _ignored_dir(name):
+                        # Files written before the watch existed are reported too
+                        changed.update(self._watch_tree(path))
+                    elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                        self._forget_tree(path)
+                        changed.add(path)
+                elif self._wanted(path):
+                    changed.add(path)
+        return changed, overflow
+
+    def _forget_tree(self, top: Path) -> None:
+        """Stop tracking a directory tree that was removed or moved away."""
+        for wd, directory in list(self._dirs.items()):
+            if directory == top or top in directory.parents:
+                del self._dirs[wd]
+
+    def poll(self, timeout: float | None = 0.0) -> set[Path]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed, overflow = self._read_events()
+        if overflow:
+            # Events were lost: report every file so nothing is missed
+            for directory in list(self._dirs.values()):
+                try:
+                    changed.update(p for p in directory.iterdir() if self._wanted(p))
+                except OSError:
+                    continue
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(
+    root: Path,
+    suffixes: tuple[str, ...] = (".py",),
+    polling: bool = False,
+    interval: float = 0.5,
+) -> FileWatcher:
+    """Create the best available watcher for a directory.
+
+    Parameters
+    ----------
+    root : Path
+        Directory to watch.
+    suffixes : tuple[str, ...]
+        File suffixes to report.
+    polling : bool
+        Force the polling watcher.
+    interval : float
+        Polling interval in seconds (polling watcher only).
+
+    Returns
+    -------
+    FileWatcher
+        An ``InotifyWatcher`` where inotify works, else a ``PollingWatcher``.
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(root, suffixes)
+        except OSError:
+            pass
+    return PollingWatcher(root, suffixes, interval)
+
+
+@dataclass
+class FindingDelta:
+    """Changes to one analyzer's findings after re-analysis.
+
+    Attributes
+    ----------
+    analyzer : str
+        Name the analyzer was registered under.
+    added : list[FindingTarget]
+        Findings that are new.
+    removed : list[FindingTarget]
+        Findings that no longer occur (as last reported).
+    files : list[Path]
+        Files that were re-analyzed.
+    """
+
+    analyzer: str
+    added: list[FindingTarget] = field(default_factory=list)
+    removed: list[FindingTarget] = field(default_factory=list)
+    files: list[Path] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+    def __str__(self) -> str:
+        lines = [f"{self.analyzer}: +{len(self.added)} -{len(self.removed)}"]
+        lines.extend(f"+ {t.location}: {t.message}" for t in self.added)
+        lines.extend(f"- {t.location}: {t.message}" for t in self.removed)
+        return "\n".join(lines)
+
+
+@dataclass
+class _Analyzer:
+    name: str
+    run: Callable[[Rejig], Iterable[FindingTarget]]
+    scope: str
+    # Current findings by file, keyed by fingerprint
+    findings: dict[Path, dict[str, FindingTarget]] = field(default_factory=dict)
+
+
+class WatchSession:
+    """Keep registered analyzers' findings current as files change.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The parent Rejig instance.
+    watcher : FileWatcher | None
+        Watcher to take changes from. If None, one is created by
+        ``create_watcher`` for ``rejig.root`` on ``start``.
+    polling : bool
+        Force the polling watcher when creating one.
+    interval : float
+        Polling interval in seconds when creating a polling watcher.
+
+    Examples
+    --------
+    >>> session = WatchSession(rj)
+    >>> session.register("security", "find_security_issues")
+    >>> session.register("dead_code", lambda r: r.find_unused_functions(), scope="project")
+    >>> session.subscribe(print)
+    >>> session.start()
+    >>> session.run()
+    """
+
+    def __init__(
+        self,
+        rejig: Rejig,
+        watcher: FileWatcher | None = None,
+        polling: bool = False,
+        interval: float = 0.5,
+    ) -> None:
+        self._rejig = rejig
+        self._watcher = watcher
+        self._polling = polling
+        self._interval = interval
+        self._analyzers: dict[str, _Analyzer] = {}
+        self._subscribers: list[Callable[[FindingDelta], Any]] = []
+        self._import_index: Any = None
+        self._started = False
+
+    def register(
+        self,
+        name: str,
+        analyzer: str | Callable[[Rejig], Iterable[FindingTarget]],
+        scope: str = "file",
+    ) -> None:
+        """Register an analyzer to keep up to date.
+
+        Parameters
+        ----------
+        name : str
+            Name reported in deltas.
+        analyzer : str | Callable[[Rejig], Iterable[FindingTarget]]
+            A Rejig method name (e.g. "find_security_issues") or a callable
+            taking a Rejig and returning findings.
+        scope : str
+            Which files to re-analyze when files change:
+
+            - "file": only the changed files (analyzers whose findings in a
+              file depend on that file alone).
+            - "dependents": the changed files and the files importing them.
+            - "project": every file (analyzers that need the whole project,
+              such as dead-code detection); deltas are still reported.
+
+        Raises
+        ------
+        ValueError
+            If the scope is unknown or the name is already registered.
+        """
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope {scope!r}; expected one of {', '.join(SCOPES)}")
+        if name in self._analyzers:
+            raise ValueError(f"Analyzer {name!r} is already registered")
+        run = operator.methodcaller(analyzer) if isinstance(analyzer, str) else analyzer
+        self._analyzers[name] = _Analyzer(name, run, scope)
+        if self._started:
+            self._publish([self._analyze(self._analyzers[name], None, set())])
+
+    def subscribe(self, callback: Callable[[FindingDelta], Any]) -> None:
+        """Call ``callback`` with every non-empty delta."""
+        self._subscribers.append(callback)
+
+    def findings(self, name: str) -> list[FindingTarget]:
+        """Get an analyzer's current findings, ordered by location."""
+        analyzer = self._analyzers[name]
+        found = [t for by_fp in analyzer.findings.values() for t in by_fp.values()]
+        return sorted(found, key=lambda t: (str(t.file_path), t.line_number))
+
+    @property
+    def watcher(self) -> FileWatcher | None:
+        """The watcher changes are taken from (created by ``start``)."""
+        return self._watcher
+
+    def start(self) -> list[FindingDelta]:
+        """Start watching and run every analyzer on the whole project.
+
+        Returns
+        -------
+        list[FindingDelta]
+            One delta per analyzer, listing all its findings as added.
+        """
+        if self._watcher is None:
+            self._watcher = create_watcher(self._rejig.root, polling=self._polling, interval=self._interval)
+        self._started = True
+        return self._publish([self._analyze(a, None, set()) for a in self._analyzers.values()])
+
+    def poll(self, timeout: float | None = 0.0) -> list[FindingDelta]:
+        """Wait for changes and re-analyze them.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Seconds to wait for a change (None waits forever).
+
+        Returns
+        -------
+        list[FindingDelta]
+            Non-empty deltas (also sent to subscribers).
+        """
+        if not self._started:
+            self.start()
+        changed = self._watcher.poll(timeout)
+        return self.update(changed) if changed else []
+
+    def run(self, stop: threading.Event | None = None, interval: float = 0.5) -> None:
+        """Re-analyze changes until ``stop`` is set (or forever).
+
+        Parameters
+        ----------
+        stop : threading.Event | None
+            Event ending the loop.
+        interval : float
+            Longest time between checks of ``stop``.
+        """
+        if not self._started:
+            self.start()
+        while stop is None or not stop.is_set():
+            self.poll(interval)
+
+    def update(self, paths: Iterable[str | Path]) -> list[FindingDelta]:
+        """Re-analyze after the given files changed.
+
+        Use this directly when changes are known by other means (an
+        editor's save hook, a version-control checkout).
+
+        Parameters
+        ----------
+        paths : Iterable[str | Path]
+            Files created, modified or deleted, absolute or relative to root.
+
+        Returns
+        -------
+        list[FindingDelta]
+            Non-empty deltas (also sent to subscribers).
+        """
+        rejig = self._rejig
+        known = set(rejig.files)
+        dirty: set[Path] = set()
+        for path in paths:
+            path = Path(path)
+            if not path.is_absolute():
+                path = rejig.root / path
+            if path.exists():
+                path = path.resolve()
+            if path.suffix == ".py":
+                dirty.add(path)
+            elif not path.exists():
+                # A removed directory: everything known under it is gone
+                tracked = known.union(*(a.findings for a in self._analyzers.values()))
+                dirty.update(p for p in tracked if path in p.parents)
+        if not dirty:
+            return []
+
+        if any(p not in known or not p.exists() for p in dirty):
+            rejig.reset_files()
+        for path in dirty:
+            rejig.cache.invalidate(path)
+
+        importers: set[Path] = set()
+        if any(a.scope == "dependents" for a in self._analyzers.values()):
+            importers = self._importers(dirty)
+
+        deltas = [self._analyze(a, dirty, importers) for a in self._analyzers.values()]
+        return self._publish([d for d in deltas if d])
+
+    def _importers(self, dirty: set[Path]) -> set[Path]:
+        """Files importing the changed modules, before and after the change."""
+        from rejig.imports.index import ImportSiteIndex
+
+        if self._import_index is None:
+            self._import_index = ImportSiteIndex(self._rejig)
+            self._import_index.build()
+        modules = {self._import_index.module_name(p) for p in dirty}
+        # Rebuilding re-parses only the invalidated (dirty) files
+        self._import_index.build()
+        modules |= {self._import_index.module_name(p) for p in dirty}
+        return {f for m in modules if m for f in self._import_index.files_importing(m)}
+
+    def _analyze(self, analyzer: _Analyzer, dirty: set[Path] | None, importers: set[Path]) -> FindingDelta:
+        """Re-run an analyzer on the affected files and diff its findings."""
+        rejig = self._rejig
+        if dirty is None or analyzer.scope == "project":
+            files = set(rejig.files)
+            target = rejig
+        else:
+            files = dirty | importers if analyzer.scope == "dependents" else set(dirty)
+            target = rejig.restrict_to(files)
+        # Deleted files lose their findings too
+        affected = files | set(analyzer.findings) if target is rejig else files
+
+        results = [t for t in analyzer.run(target) if t.file_path in affected]
+        fingerprints = fingerprint_findings((t.finding for t in results), rejig.root)
+        current: dict[Path, dict[str, FindingTarget]] = {}
+        for result, fingerprint in zip(results, fingerprints):
+            current.setdefault(result.file_path, {})[fingerprint] = result
+
+        delta = FindingDelta(analyzer.name, files=sorted(files & set(rejig.files)))
+        for path in affected:
+            before = analyzer.findings.pop(path, {})
+            after = current.get(path, {})
+            delta.added.extend(t for fp, t in after.items() if fp not in before)
+            delta.removed.extend(t for fp, t in before.items() if fp not in after)
+            if after:
+                analyzer.findings[path] = after
+
+        delta.added.sort(key=lambda t: (str(t.file_path), t.line_number))
+        delta.removed.sort(key=lambda t: (str(t.file_path), t.line_number))
+        return delta
+
+    def _publish(self, deltas: list[FindingDelta]) -> list[FindingDelta]:
+        for delta in deltas:
+            if delta:
+                for callback in self._subscribers:
+                    callback(delta)
+        return deltas
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self._watcher is not None:
+            self._watcher.close()
@@ -0,0 +1,444 @@
+"""Streaming report writers.
+
+Reports are written record by record straight to a file handle instead of
+being assembled as nested dicts and serialised in one ``json.dumps`` call,
+so writing a report takes memory proportional to one finding (plus, for
+SARIF, the distinct rules and files), not to the number of findings.
+
+Records are plain dicts such as those produced by
+``FindingTargetList.to_list_of_dicts()``; SARIF needs the ``type``,
+``file``, ``line``, ``message`` and ``severity`` keys.
+
+Formats
+-------
+jsonl
+    One JSON object per line.
+csv
+    A header row followed by one row per record.
+json
+    A single JSON document with the records under ``"findings"``.
+sarif
+    SARIF 2.1.0, with rules and artifacts stored once in per-run tables
+    and referenced from results by index.
+
+Paths ending in ``.gz`` are gzip-compressed.
+
+Examples
+--------
+>>> with open_report("findings.sarif.gz") as stream:
+...     writer = SarifWriter(stream, root=rj.root)
+...     for record in records:
+...         writer.write(record)
+...     writer.close()
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+from collections import Counter
+from pathlib import Path
+from typing import IO, Any, Iterable, Sequence
+
+from rejig.core.results import ErrorResult, Result
+
+FORMATS = ("jsonl", "csv", "json", "sarif")
+
+SARIF_SCHEMA = (
+    "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json"
+)
+
+# Finding severity -> SARIF result level
+SARIF_LEVELS = {
+    "critical": "error",
+    "high": "error",
+    "medium": "warning",
+    "low": "note",
+}
+
+_SUFFIX_FORMATS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".json": "json",
+    ".sarif": "sarif",
+}
+
+
+def open_report(path: str | Path, compress: bool | None = None) -> IO[str]:
+    """Open a report file for writing text.
+
+    Parameters
+    ----------
+    path : str | Path
+        Destination file. Parent directories are created.
+    compress : bool | None
+        Gzip the output. If None, compress when the path ends in ``.gz``.
+
+    Returns
+    -------
+    IO[str]
+        A text stream; close it (or use it as a context manager) when done.
+    """
+    path = Path(path)
+    if compress is None:
+        compress = path.suffix == ".gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if compress:
+        # Level 6 is several times faster than the default 9 for a few
+        # percent larger output
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6)
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def format_for_path(path: str | Path) -> str | None:
+    """Guess a report format from a file name (ignoring a ``.gz`` suffix)."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        path = path.with_suffix("")
+    return _SUFFIX_FORMATS.get(path.suffix.lower())
+
+
+class JsonLinesWriter:
+    """Write records as JSON Lines.
+
+    Parameters
+    ----------
+    stream : IO[str]
+        Text stream to write to.
+    """
+
+    def __init__(self, stream: IO[str]) -> None:
+        self._stream = stream
+        self.count = 0
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Write one record."""
+        self._stream.write(json.dumps(record, default=str))
+        self._stream.write("\n")
+        self.count += 1
+
+    def close(self) -> None:
+        """Finish the report (nothing to do for JSON Lines)."""
+
+
+class CsvWriter:
+    """Write records as CSV rows.
+
+    Parameters
+    ----------
+    stream : IO[str]
+        Text stream to write to (opened with ``newline=""``).
+    fields : Sequence[str] | None
+        Column names. If None, the keys of the first record are used.
+        Keys missing from a record are written as empty cells and extra
+        keys are ignored.
+    """
+
+    def __init__(self, stream: IO[str], fields: Sequence[str] | None = None) -> None:
+        self._stream = stream
+        self._fields = list(fields) if fields is not None else None
+        self._writer: csv.DictWriter | None = None
+        self.count = 0
+        if self._fields is not None:
+            self._start()
+
+    def _start(self) -> None:
+        self._writer = csv.DictWriter(self._stream, self._fields, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Write one record."""
+        if self._writer is None:
+            self._fields = list(record)
+            self._start()
+        self._writer.writerow({k: "" if v is None else v for k, v in record.items()})
+        self.count += 1
+
+    def close(self) -> None:
+        """Finish the report (nothing to do for CSV)."""
+
+
+class JsonWriter:
+    """Write a JSON document whose records are streamed into one array.
+
+    The document is ``header`` keys, then the array, then ``trailer`` keys
+    passed to ``close()`` (typically a summary computed while writing).
+
+    Parameters
+    ----------
+    stream : IO[str]
+        Text stream to write to.
+    header : dict | None
+        Keys written before the records.
+    key : str
+        Name of the records array. Defaults to ``"findings"``.
+    indent : int
+        Indentation of the document. Defaults to 2.
+    """
+
+    def __init__(
+        self,
+        stream: IO[str],
+        header: dict[str, Any] | None = None,
+        key: str = "findings",
+        indent: int = 2,
+    ) -> None:
+        self._stream = stream
+        self._indent = indent
+        self._pad = " " * indent
+        self.count = 0
+
+        stream.write("{")
+        for name, value in (header or {}).items():
+            stream.write(f"\n{self._pad}{json.dumps(name)}: {self._dump(value, 1)},")
+        stream.write(f"\n{self._pad}{json.dumps(key)}: [")
+
+    def _dump(self, value: Any, depth: int) -> str:
+        text = json.dumps(value, indent=self._indent, default=str)
+        return text.replace("\n", "\n" + self._pad * depth)
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Write one record."""
+        separator = "," if self.count else ""
+        self._stream.write(f"{separator}\n{self._pad * 2}{self._dump(record, 2)}")
+        self.count += 1
+
+    def close(self, trailer: dict[str, Any] | None = None) -> None:
+        """Close the array, write the ``trailer`` keys and end the document."""
+        self._stream.write(f"\n{self._pad}]" if self.count else "]")
+        for name, value in (trailer or {}).items():
+            self._stream.write(f",\n{self._pad}{json.dumps(name)}: {self._dump(value, 1)}")
+        self._stream.write("\n}\n")
+
+
+class SarifWriter:
+    """Write records as a single-run SARIF 2.1.0 log.
+
+    Results are written as they arrive. Rules and artifacts are collected
+    into tables (one entry per distinct rule id and file) that results
+    reference by index; the tables are written after the results, so the
+    whole log never has to be held in memory.
+
+    Parameters
+    ----------
+    stream : IO[str]
+        Text stream to write to.
+    tool_name : str
+        Name of the tool driver. Defaults to ``"rejig"``.
+    tool_version : str | None
+        Version of the tool driver.
+    information_uri : str | None
+        Tool homepage.
+    rules : Iterable[dict] | None
+        Rule descriptors to declare up front (each with at least an
+        ``id``). Rules first seen in records are added with a default
+        descriptor.
+    root : Path | None
+        Project root. Files under it are written relative to the
+        ``SRCROOT`` base URI.
+    """
+
+    def __init__(
+        self,
+        stream: IO[str],
+        tool_name: str = "rejig",
+        tool_version: str | None = None,
+        information_uri: str | None = None,
+        rules: Iterable[dict[str, Any]] | None = None,
+        root: Path | None = None,
+    ) -> None:
+        self._stream = stream
+        self._driver: dict[str, Any] = {"name": tool_name}
+        if tool_version:
+            self._driver["version"] = tool_version
+        if information_uri:
+            self._driver["informationUri"] = information_uri
+        self._rules: list[dict[str, Any]] = []
+        self._rule_index: dict[str, int] = {}
+        for rule in rules or ():
+            self._add_rule(rule)
+        self._artifacts: list[dict[str, Any]] = []
+        self._artifact_index: dict[str, int] = {}
+        self._root = root.resolve() if root is not None else None
+        self.count = 0
+
+        stream.write(f'{{\n  "$schema": {json.dumps(SARIF_SCHEMA)},\n  "version": "2.1.0",\n')
+        stream.write('  "runs": [\n    {\n      "results": [')
+
+    def _add_rule(self, rule: dict[str, Any]) -> int:
+        index = self._rule_index.get(rule["id"])
+        if index is None:
+            index = self._rule_index[rule["id"]] = len(self._rules)
+            self._rules.append(rule)
+        return index
+
+    def _artifact(self, file: str) -> dict[str, Any]:
+        index = self._artifact_index.get(file)
+        if index is None:
+            location: dict[str, Any] = {"uri": Path(file).as_posix()}
+            if self._root is not None:
+                try:
+                    location = {
+                        "uri": Path(file).resolve().relative_to(self._root).as_posix(),
+                        "uriBaseId": "SRCROOT",
+                    }
+                except ValueError:
+                    pass
+            index = self._artifact_index[file] = len(self._artifacts)
+            self._artifacts.append({"location": location})
+        return {**self._artifacts[index]["location"], "index": index}
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Write one record as a SARIF result."""
+        rule_id = record["type"]
+        rule_index = self._rule_index.get(rule_id)
+        if rule_index is None:
+            rule_index = self._add_rule(default_sarif_rule(rule_id))
+        region: dict[str, Any] = {"startLine": max(1, record.get("line") or 1)}
+        if record.get("end_line"):
+            region["endLine"] = record["end_line"]
+        result = {
+            "ruleId": rule_id,
+            "ruleIndex": rule_index,
+            "level": SARIF_LEVELS.get(record.get("severity", ""), "warning"),
+            "message": {"text": record.get("message") or rule_id},
+            "locations": [
+                {
+                    "physicalLocation": {
+                        "artifactLocation": self._artifact(str(record["file"])),
+                        "region": region,
+                    }
+                }
+            ],
+        }
+        separator = "," if self.count else ""
+        self._stream.write(f"{separator}\n        {json.dumps(result, default=str)}")
+        self.count += 1
+
+    def close(self) -> None:
+        """Write the rule and artifact tables and end the log."""
+        self._stream.write("\n      ],\n" if self.count else "],\n")
+        self._stream.write(f'      "artifacts": {json.dumps(self._artifacts)},\n')
+        if self._root is not None:
+            base = {"SRCROOT": {"uri": self._root.as_uri() + "/"}}
+            self._stream.write(f'      "originalUriBaseIds": {json.dumps(base)},\n')
+        driver = {**self._driver, "rules": self._rules}
+        self._stream.write(f'      "tool": {{"driver": {json.dumps(driver)}}}\n    }}\n  ]\n}}\n')
+
+
+def default_sarif_rule(rule_id: str) -> dict[str, Any]:
+    """Build a SARIF rule descriptor for a finding type name."""
+    return {
+        "id": rule_id,
+        "name": rule_id.replace("_", " ").title(),
+        "shortDescription": {"text": rule_id.replace("_", " ").lower()},
+    }
+
+
+def write_report(
+    records: Iterable[dict[str, Any]],
+    path: str | Path,
+    format: str | None = None,
+    compress: bool | None = None,
+    root: Path | None = None,
+    header: dict[str, Any] | None = None,
+    summary: dict[str, Any] | None = None,
+    rules: Iterable[dict[str, Any]] | None = None,
+    fields: Sequence[str] | None = None,
+    tool_name: str = "rejig",
+) -> Result:
+    """Stream records to a report file.
+
+    Parameters
+    ----------
+    records : Iterable[dict]
+        Records to write; consumed lazily, so a generator keeps memory
+        use flat.
+    path : str | Path
+        Destination file.
+    format : str | None
+        One of ``FORMATS``. If None, guessed from the file name.
+    compress : bool | None
+        Gzip the output. If None, compress when the path ends in ``.gz``.
+    root : Path | None
+        Project root, for relative SARIF artifact URIs.
+    header : dict | None
+        Top-level keys written before the findings of JSON reports.
+    summary : dict | None
+        Extra keys for the ``summary`` appended to JSON reports, which
+        always has the total and counts by severity and type.
+    rules : Iterable[dict] | None
+        SARIF rule descriptors to declare up front.
+    fields : Sequence[str] | None
+        CSV columns.
+    tool_name : str
+        SARIF tool driver name.
+
+    Returns
+    -------
+    Result
+        Result with the written file in ``files_changed`` and the number
+        of records in ``data["count"]``.
+    """
+    format = format or format_for_path(path)
+    if format not in FORMATS:
+        return ErrorResult(
+            message=f"Unknown format: {format}. Use one of: {', '.join(FORMATS)}.",
+            operation="write_report",
+        )
+
+    path = Path(path)
+    try:
+        with open_report(path, compress) as stream:
+            if format == "jsonl":
+                writer: Any = JsonLinesWriter(stream)
+            elif format == "csv":
+                writer = CsvWriter(stream, fields)
+            elif format == "sarif":
+                from rejig import __version__
+
+                writer = SarifWriter(
+                    stream,
+                    tool_name=tool_name,
+                    tool_version=__version__,
+                    information_uri="https://github.com/SpliFF/rejig",
+                    rules=rules,
+                    root=root,
+                )
+            else:
+                writer = JsonWriter(stream, header)
+
+            by_severity: Counter[str] = Counter()
+            by_type: Counter[str] = Counter()
+            for record in records:
+                writer.write(record)
+                by_severity[record.get("severity")] += 1
+                by_type[record.get("type")] += 1
+
+            if format == "json":
+                writer.close({
+                    "summary": {
+                        "total_findings": writer.count,
+                        "critical": by_severity["critical"],
+                        "high": by_severity["high"],
+                        **(summary or {}),
+                        "by_severity": dict(by_severity),
+                        "by_type": dict(by_type),
+                    }
+                })
+            else:
+                writer.close()
+    except OSError as e:
+        return ErrorResult(
+            message=f"Failed to write report: {e}",
+            exception=e,
+            operation="write_report",
+        )
+
+    return Result(
+        success=True,
+        message=f"Wrote {writer.count} findings to {path}",
+        files_changed=[path],
+        data={"count": writer.count},
+    )
@@ -9,6 +9,7 @@ from __future__ import annotations
 import re
 import shutil
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from ..core import Rejig
 from ..core.results import Result
@@ -16,6 +17,9 @@ from .dependencies import DependencyManager
 from .settings import SettingsManager
 from .urls import UrlManager
 
+if TYPE_CHECKING:
+    from ..optimize.targets import OptimizeTargetList
+
 
 class DjangoProject:
     """
@@ -63,7 +67,7 @@ class DjangoProject:
 
     Notes
     -----
-    When using rope-based operations (move_class, move_function), always call
+    When using rope for move operations (``use_rope=True``), always call
     close() when finished to ensure all changes are written and cleanup is done.
     """
 
@@ -261,6 +265,20 @@ class DjangoProject:
                 return filepath
         return None
 
+    def find_n_plus_one_queries(self) -> OptimizeTargetList:
+        """
+        Find lazy relations accessed in loops over querysets.
+
+        Returns
+        -------
+        OptimizeTargetList
+            N+1 query findings. Use ``NPlusOneAnalyzer.apply`` to add the
+            suggested ``select_related``/``prefetch_related`` calls.
+        """
+        from ..optimize.orm import NPlusOneAnalyzer
+
+        return NPlusOneAnalyzer(self._rejig).find_n_plus_one_queries()
+
     # -------------------------------------------------------------------------
     # App Creation Methods
     # -------------------------------------------------------------------------
@@ -317,7 +335,7 @@ class DjangoProject:
         )
 
     # -------------------------------------------------------------------------
-    # Rope-based Refactoring Methods (delegated to Rejig)
+    # Move Operations (delegated to Rejig)
     # -------------------------------------------------------------------------
 
     def move_class(
@@ -325,11 +343,12 @@ class DjangoProject:
         source_file: Path,
         class_name: str,
         dest_module: str,
+        use_rope: bool = False,
     ) -> Result:
         """
-        Move a class from source file to destination module using rope.
+        Move a class from source file to destination module.
 
-        Rope automatically updates all imports throughout the project.
+        All imports throughout the project are updated.
 
         Parameters
         ----------
@@ -339,22 +358,25 @@ class DjangoProject:
             Name of the class to move.
         dest_module : str
             Destination module path (e.g., 'myapp.views').
+        use_rope : bool
+            Use rope instead of the built-in mover.
 
         Returns
         -------
         Result
             Result with success status.
         """
-        return self._rejig.move_class(source_file, class_name, dest_module)
+        return self._rejig.move_class(source_file, class_name, dest_module, use_rope)
 
     def move_function(
         self,
         source_file: Path,
         function_name: str,
         dest_module: str,
+        use_rope: bool = False,
     ) -> Result:
         """
-        Move a function from source file to destination module using rope.
+        Move a function from source file to destination module.
 
         Parameters
         ----------
@@ -364,13 +386,15 @@ class DjangoProject:
             Name of the function to move.
         dest_module : str
             Destination module path.
+        use_rope : bool
+            Use rope instead of the built-in mover.
 
         Returns
         -------
         Result
             Result with success status.
         """
-        return self._rejig.move_function(source_file, function_name, dest_module)
+        return self._rejig.move_function(source_file, function_name, dest_module, use_rope)
 
     # -------------------------------------------------------------------------
     # Settings Management (delegated to SettingsManager)
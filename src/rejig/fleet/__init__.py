@@ -0,0 +1,35 @@
+"""Apply one refactoring script across many repositories.
+
+Each repository gets its own worker process, Rejig instance and
+transaction; results are gathered into one ``FleetResult``.
+
+Classes
+-------
+Fleet
+    Runs a script over a list of repository roots.
+
+RepoResult
+    Outcome of the script in one repository.
+
+FleetResult
+    Per-repository outcomes with a combined summary.
+
+Examples
+--------
+>>> from rejig.fleet import Fleet
+>>>
+>>> def add_header(rj):
+...     return rj.find_files().add_copyright_header("Acme Corp")
+>>>
+>>> summary = Fleet(["../svc-a", "../svc-b"], workers=8, timeout=300).run(add_header)
+>>> print(summary.summary())
+"""
+from __future__ import annotations
+
+from rejig.fleet.runner import Fleet, FleetResult, RepoResult
+
+__all__ = [
+    "Fleet",
+    "FleetResult",
+    "RepoResult",
+]
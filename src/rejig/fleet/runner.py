@@ -0,0 +1,406 @@
+"""Run a refactoring script over many repositories concurrently.
+
+Every repository is handled by its own worker process: a fresh ``Rejig``
+is created for the repository root, the script runs inside a transaction,
+and the transaction is committed only if none of the script's operations
+failed. Workers exceeding the per-repository timeout are killed, so one
+stuck repository can't hold up the fleet.
+
+A script is one of:
+
+- a callable taking the repository's ``Rejig`` and returning a ``Result``,
+  ``BatchResult``, an iterable of them, or None. With the "spawn" and
+  "forkserver" start methods it must be picklable (a module-level
+  function);
+- rejig code using the variable ``rj``, as produced by
+  ``PatchConverter.to_rejig_code`` / ``Patch.to_rejig_code``; the result of
+  every top-level expression counts as an operation;
+- a ``Patch``, applied to each repository with ``PatchConverter.apply``.
+
+Operations that don't record their changes in transactions write
+immediately, so they can't be rolled back.
+"""
+from __future__ import annotations
+
+import ast
+import multiprocessing
+import pickle
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Union
+
+from rejig.core.results import BatchResult, ErrorResult, Result
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+    from rejig.patching.models import Patch
+
+Script = Union[Callable[["Rejig"], Any], str, "Patch"]
+
+
+@dataclass
+class RepoResult:
+    """Outcome of running the script in one repository.
+
+    Attributes
+    ----------
+    root : Path
+        Repository root.
+    success : bool
+        Whether every operation succeeded and the changes were committed.
+    message : str
+        Human-readable description of what happened.
+    results : list[Result]
+        Results of the script's operations.
+    commit : BatchResult | None
+        Result of committing the transaction (None if it wasn't committed).
+    error : str | None
+        Traceback if the script raised or the worker died.
+    timed_out : bool
+        Whether the worker was killed for exceeding the timeout.
+    duration : float
+        Seconds the repository took.
+    """
+
+    root: Path
+    success: bool
+    message: str
+    results: list[Result] = field(default_factory=list)
+    commit: BatchResult | None = None
+    error: str | None = None
+    timed_out: bool = False
+    duration: float = 0.0
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    @property
+    def files_changed(self) -> list[Path]:
+        """Files written (or, in dry-run mode, that would be)."""
+        files: list[Path] = []
+        for result in [*self.results, *(self.commit or [])]:
+            files.extend(f for f in result.files_changed if f not in files)
+        return files
+
+    @property
+    def diffs(self) -> dict[Path, str]:
+        """Per-file diffs of the committed changes."""
+        return self.commit.diffs if self.commit is not None else {}
+
+    @property
+    def diff(self) -> str | None:
+        """Combined diff of the committed changes."""
+        return self.commit.diff if self.commit is not None else None
+
+
+@dataclass
+class FleetResult:
+    """Outcomes of a fleet run, one per repository in input order.
+
+    Attributes
+    ----------
+    repos : list[RepoResult]
+        Per-repository results.
+    duration : float
+        Seconds the whole run took.
+    """
+
+    repos: list[RepoResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """True if every repository succeeded."""
+        return all(r.success for r in self.repos)
+
+    @property
+    def succeeded(self) -> list[RepoResult]:
+        """Repositories where the script succeeded."""
+        return [r for r in self.repos if r.success]
+
+    @property
+    def failed(self) -> list[RepoResult]:
+        """Repositories where the script failed, raised or timed out."""
+        return [r for r in self.repos if not r.success]
+
+    @property
+    def timed_out(self) -> list[RepoResult]:
+        """Repositories whose worker was killed for exceeding the timeout."""
+        return [r for r in self.repos if r.timed_out]
+
+    @property
+    def diffs(self) -> dict[Path, str]:
+        """Combined diff per repository root (repositories with changes only)."""
+        return {r.root: r.diff for r in self.repos if r.diff}
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    def __len__(self) -> int:
+        return len(self.repos)
+
+    def __iter__(self):
+        return iter(self.repos)
+
+    def summary(self) -> str:
+        """Format a per-repository summary."""
+        lines = [
+            f"Fleet: {len(self.succeeded)}/{len(self.repos)} repositories succeeded "
+            f"in {self.duration:.1f}s"
+        ]
+        for repo in self.repos:
+            status = "ok" if repo.success else ("timeout" if repo.timed_out else "FAILED")
+            lines.append(
+                f"  [{status}] {repo.root}: {repo.message} "
+                f"({len(repo.files_changed)} files, {repo.duration:.1f}s)"
+            )
+        return "\n".join(lines)
+
+
+def _portable(result: Result) -> Result:
+    """Copy a result into one that can be sent between processes."""
+    if isinstance(result, ErrorResult):
+        return ErrorResult(
+            message=result.message,
+            files_changed=list(result.files_changed),
+            diff=result.diff,
+            diffs=dict(result.diffs),
+            operation=result.operation,
+            target_repr=result.target_repr,
+        )
+    try:
+        data = result.data
+        pickle.dumps(data)
+    except Exception:
+        data = None
+    return Result(
+        success=result.success,
+        message=result.message,
+        files_changed=list(result.files_changed),
+        data=data,
+        diff=result.diff,
+        diffs=dict(result.diffs),
+    )
+
+
+def _flatten(value: Any) -> list[Result]:
+    """Collect the Results in a script's return value."""
+    if value is None:
+        return []
+    if isinstance(value, Result):
+        return [value]
+    if isinstance(value, BatchResult):
+        return list(value.results)
+    if isinstance(value, (list, tuple)):
+        return [r for item in value for r in _flatten(item)]
+    return []
+
+
+def _run_code(code: str, rj: Rejig) -> list[Result]:
+    """Execute rejig code, collecting the value of each top-level expression."""
+    from rejig.core.rejig import Rejig
+
+    namespace: dict[str, Any] = {"rj": rj, "Rejig": Rejig, "Path": Path}
+    results: list[Result] = []
+    for statement in ast.parse(code).body:
+        if isinstance(statement, ast.Expr):
+            expression = compile(ast.Expression(statement.value), "<script>", "eval")
+            results.extend(_flatten(eval(expression, namespace)))
+        else:
+            module = ast.Module(body=[statement], type_ignores=[])
+            exec(compile(module, "<script>", "exec"), namespace)
+    return results
+
+
+def _run_script(script: Script, rj: Rejig) -> list[Result]:
+    from rejig.patching.models import Patch
+
+    if isinstance(script, Patch):
+        from rejig.patching.converter import PatchConverter
+
+        return _flatten(PatchConverter(rj).apply(script))
+    if isinstance(script, str):
+        return _run_code(script, rj)
+    return _flatten(script(rj))
+
+
+def run_in_repo(root: Path, script: Script, dry_run: bool = False) -> RepoResult:
+    """Run a script in one repository, inside a transaction.
+
+    This is what each fleet worker runs; it can also be called directly.
+
+    Parameters
+    ----------
+    root : Path
+        Repository root.
+    script : Script
+        Callable, rejig code or Patch (see module docstring).
+    dry_run : bool
+        Report diffs without writing files.
+
+    Returns
+    -------
+    RepoResult
+        The outcome. Exceptions raised by the script are reported, not
+        raised.
+    """
+    from rejig.core.rejig import Rejig
+
+    started = time.monotonic()
+    rj = Rejig(root, dry_run=dry_run)
+    try:
+        with rj.transaction() as tx:
+            results = [_portable(r) for r in _run_script(script, rj)]
+            failed = [r for r in results if not r.success]
+            if failed:
+                tx.rollback()
+                message = (
+                    f"{len(failed)} of {len(results)} operations failed, "
+                    f"rolled back: {failed[0].message}"
+                )
+                return RepoResult(root, False, message, results, duration=time.monotonic() - started)
+            commit = BatchResult([_portable(r) for r in tx.commit()])
+    except Exception as e:
+        return RepoResult(
+            root,
+            False,
+            f"Script raised {type(e).__name__}: {e}",
+            error=traceback.format_exc(),
+            duration=time.monotonic() - started,
+        )
+    finally:
+        rj.close()
+
+    if not commit.success:
+        message = commit.failed[0].message
+    else:
+        count = len(commit.files_changed)
+        message = f"[DRY RUN] Would change {count} files" if dry_run else f"Changed {count} files"
+    return RepoResult(root, commit.success, message, results, commit, duration=time.monotonic() - started)
+
+
+def _worker(conn: Any, root: Path, script: Script, dry_run: bool) -> None:
+    try:
+        conn.send(run_in_repo(root, script, dry_run))
+    except Exception:
+        # The result couldn't be sent; the parent reports the worker's exit
+        pass
+    finally:
+        conn.close()
+
+
+class Fleet:
+    """Apply one script to many repositories, each in its own process.
+
+    Parameters
+    ----------
+    roots : Iterable[str | Path]
+        Repository roots.
+    workers : int
+        Maximum number of repositories processed at once.
+    timeout : float | None
+        Seconds a repository may take before its worker is killed (None
+        for no limit).
+    dry_run : bool
+        Report diffs without writing files.
+    start_method : str | None
+        multiprocessing start method ("fork", "spawn", "forkserver");
+        None uses the platform default.
+
+    Examples
+    --------
+    >>> fleet = Fleet(Path("~/src").expanduser().glob("svc-*"), workers=8, timeout=300)
+    >>> summary = fleet.run(parse_patch_file("template-sync.patch"))
+    >>> for repo in summary.failed:
+    ...     print(repo.root, repo.message)
+    """
+
+    def __init__(
+        self,
+        roots: Iterable[str | Path],
+        workers: int = 4,
+        timeout: float | None = None,
+        dry_run: bool = False,
+        start_method: str | None = None,
+    ) -> None:
+        self.roots = [Path(r).resolve() for r in roots]
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.dry_run = dry_run
+        self._context = multiprocessing.get_context(start_method)
+
+    def run(self, script: Script) -> FleetResult:
+        """Run the script in every repository.
+
+        Parameters
+        ----------
+        script : Script
+            Callable, rejig code or Patch (see module docstring).
+
+        Returns
+        -------
+        FleetResult
+            Per-repository results in the order of ``roots``.
+        """
+        started = time.monotonic()
+        results: dict[Path, RepoResult] = {}
+        pending = deque(self.roots)
+        running: dict[Any, tuple[Path, Any, float]] = {}
+
+        while pending or running:
+            while pending and len(running) < self.workers:
+                root = pending.popleft()
+                if not root.is_dir():
+                    results[root] = RepoResult(root, False, f"Not a directory: {root}")
+                    continue
+                receiver, sender = self._context.Pipe(duplex=False)
+                process = self._context.Process(
+                    target=_worker, args=(sender, root, script, self.dry_run), daemon=True
+                )
+                process.start()
+                sender.close()
+                running[receiver] = (root, process, time.monotonic())
+
+            if not running:
+                continue
+
+            wait_for = None
+            if self.timeout is not None:
+                now = time.monotonic()
+                wait_for = max(0.0, min(s + self.timeout - now for _, _, s in running.values()))
+            for receiver in wait(list(running), timeout=wait_for):
+                root, process, begun = running.pop(receiver)
+                try:
+                    results[root] = receiver.recv()
+                except EOFError:
+                    process.join()
+                    results[root] = RepoResult(
+                        root,
+                        False,
+                        f"Worker exited with code {process.exitcode}",
+                        duration=time.monotonic() - begun,
+                    )
+                receiver.close()
+                process.join()
+
+            if self.timeout is not None:
+                now = time.monotonic()
+                for receiver, (root, process, begun) in list(running.items()):
+                    if now - begun >= self.timeout:
+                        process.kill()
+                        process.join()
+                        receiver.close()
+                        del running[receiver]
+                        results[root] = RepoResult(
+                            root,
+                            False,
+                            f"Timed out after {self.timeout}s",
+                            timed_out=True,
+                            duration=now - begun,
+                        )
+
+        return FleetResult([results[r] for r in self.roots], duration=time.monotonic() - started)
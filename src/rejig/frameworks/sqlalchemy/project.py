@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from rejig.core import Rejig
 from rejig.core.results import Result
@@ -14,6 +15,9 @@ from rejig.core.results import Result
 from .models import ModelManager
 from .relationships import RelationshipManager
 
+if TYPE_CHECKING:
+    from rejig.optimize.targets import OptimizeTargetList
+
 
 class SQLAlchemyProject:
     """
@@ -176,6 +180,20 @@ class SQLAlchemyProject:
         """
         return self._relationships.get_model_relationships(model_name)
 
+    def find_n_plus_one_queries(self) -> OptimizeTargetList:
+        """
+        Find lazy relationships accessed in loops over query results.
+
+        Returns
+        -------
+        OptimizeTargetList
+            N+1 query findings. Use ``NPlusOneAnalyzer.apply`` to add the
+            suggested ``joinedload``/``selectinload`` options.
+        """
+        from rejig.optimize.orm import NPlusOneAnalyzer
+
+        return NPlusOneAnalyzer(self._rejig).find_n_plus_one_queries()
+
     # -------------------------------------------------------------------------
     # Column Management (delegated to ModelManager)
     # -------------------------------------------------------------------------
@@ -6,20 +6,43 @@ Provides comprehensive import manipulation including:
 - Adding missing imports
 - Converting between relative and absolute imports
 - Import graph analysis and circular import detection
+- Indexing where each module or name is imported
+- Import-time profiling (``-X importtime``) mapped onto the import graph
+- Converting imports of heavy modules into lazy imports
 """
 from __future__ import annotations
 
 from rejig.imports.analyzer import ImportAnalyzer, ImportInfo
-from rejig.imports.graph import CircularImport, ImportGraph
-from rejig.imports.organizer import ImportOrganizer
+from rejig.imports.graph import CircularImport, ImportCycleGroup, ImportGraph
+from rejig.imports.index import ImportSite, ImportSiteIndex
+from rejig.imports.lazy import LazyImportConverter, SkippedImport
+from rejig.imports.organizer import ImportClassifier, ImportOrganizer
+from rejig.imports.profiler import (
+    DeferrableImport,
+    HeavyImport,
+    ImportProfile,
+    ImportProfiler,
+    ImportTiming,
+)
 from rejig.imports.targets import ImportTarget, ImportTargetList
 
 __all__ = [
     "ImportAnalyzer",
     "ImportInfo",
     "ImportGraph",
+    "ImportSiteIndex",
+    "ImportSite",
     "ImportOrganizer",
+    "ImportClassifier",
     "ImportTarget",
     "ImportTargetList",
     "CircularImport",
+    "ImportCycleGroup",
+    "ImportProfiler",
+    "ImportProfile",
+    "ImportTiming",
+    "HeavyImport",
+    "DeferrableImport",
+    "LazyImportConverter",
+    "SkippedImport",
 ]
@@ -3,20 +3,27 @@
 Provides functionality to:
 - Parse and extract import statements
 - Track which names are used in a file
-- Detect unused imports
+- Detect and remove unused imports with one scope-analysis pass per file
 - Detect missing imports (undefined names that could be imports)
 """
 from __future__ import annotations
 
 import builtins
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Iterator, Sequence
 
 import libcst as cst
+from libcst.helpers import get_full_name_for_node
+from libcst.metadata import GlobalScope, ScopeProvider
+
+from rejig.core.diff import combine_diffs
+from rejig.core.results import ErrorResult, Result
 
 if TYPE_CHECKING:
     from rejig.core.rejig import Rejig
+    from rejig.core.transaction import Transaction
 
 
 @dataclass
@@ -83,13 +90,27 @@ class ImportInfo:
 
 
 class ImportCollector(cst.CSTVisitor):
-    """Collect all imports from a module."""
+    """Collect all imports from a module.
+
+    Line numbers are filled in when visited through a ``MetadataWrapper``
+    and left at 0 otherwise.
+    """
+
+    METADATA_DEPENDENCIES = (cst.metadata.PositionProvider,)
 
     def __init__(self) -> None:
         self.imports: list[ImportInfo] = []
+        # The statement each ImportInfo was built from
+        self.nodes: list[cst.Import | cst.ImportFrom] = []
         self._in_type_checking = False
         self._type_checking_depth = 0
 
+    def _line(self, node: cst.CSTNode) -> int:
+        # Not available when the collector is visited without a MetadataWrapper
+        positions = getattr(self, "metadata", {}).get(cst.metadata.PositionProvider, {})
+        pos = positions.get(node)
+        return pos.start.line if pos else 0
+
     def visit_If(self, node: cst.If) -> bool:
         """Track if we're inside an if TYPE_CHECKING block."""
         # Check if this is 'if TYPE_CHECKING:'
@@ -123,15 +144,6 @@ class ImportCollector(cst.CSTVisitor):
                     if name.asname and isinstance(name.asname.name, cst.Name):
                         aliases[name.asname.name.value] = name.name.value
 
-        line_number = node.body[0].start_pos.line if hasattr(node, "body") else 0
-        if hasattr(node, "_metadata"):
-            pos_data = node._metadata.get(cst.metadata.PositionProvider, None)
-            if pos_data:
-                line_number = pos_data.start.line
-
-        # For simple imports, get line number from the CST structure
-        # We'll get accurate line numbers when we use the position provider wrapper
-
         self.imports.append(
             ImportInfo(
                 module=None,
@@ -140,11 +152,13 @@ class ImportCollector(cst.CSTVisitor):
                 is_from_import=False,
                 is_relative=False,
                 relative_level=0,
+                line_number=self._line(node),
                 import_statement=_node_to_code(node),
                 is_future=False,
                 is_type_checking=self._in_type_checking,
             )
         )
+        self.nodes.append(node)
         return False
 
     def visit_ImportFrom(self, node: cst.ImportFrom) -> bool:
@@ -185,11 +199,13 @@ class ImportCollector(cst.CSTVisitor):
                 is_from_import=True,
                 is_relative=is_relative,
                 relative_level=relative_level,
+                line_number=self._line(node),
                 import_statement=_node_to_code(node),
                 is_future=is_future,
                 is_type_checking=self._in_type_checking,
             )
         )
+        self.nodes.append(node)
         return False
 
 
@@ -282,14 +298,6 @@ class ImportAnalyzer:
             wrapper = cst.MetadataWrapper(tree)
             collector = ImportCollector()
             wrapper.visit(collector)
-
-            # Update line numbers using position data
-            for i, node in enumerate(_get_import_nodes(tree)):
-                if hasattr(node, "__class__"):
-                    pos = wrapper.resolve(cst.metadata.PositionProvider).get(node)
-                    if pos and i < len(collector.imports):
-                        collector.imports[i].line_number = pos.start.line
-
             return collector.imports
         except Exception:
             return []
@@ -323,6 +331,12 @@ class ImportAnalyzer:
     def find_unused_imports(self, path: Path) -> list[ImportInfo]:
         """Find imports that are not used in the file.
 
+        The file is parsed once and checked with scope analysis, so a name
+        shadowed in a function doesn't count as a use. Names in
+        ``__all__``, string annotations and explicit re-exports
+        (``import x as x``) count as uses. A statement with some unused
+        names is reported with only those names.
+
         Parameters
         ----------
         path : Path
@@ -333,32 +347,112 @@ class ImportAnalyzer:
         list[ImportInfo]
             List of unused imports.
         """
-        imports = self.get_imports(path)
-        used_names = self.get_used_names(path)
+        try:
+            return find_unused_imports_in_code(path.read_text())
+        except Exception:
+            return []
 
-        unused = []
-        for imp in imports:
-            # Skip __future__ imports (always needed if present)
-            if imp.is_future:
-                continue
+    def find_all_unused_imports(self, workers: int = 1) -> dict[Path, list[ImportInfo]]:
+        """Find unused imports in every project file.
 
-            # Skip star imports (can't determine if unused)
-            if "*" in imp.names:
-                continue
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes. With 1 (default), files are
+            analysed in this process.
+
+        Returns
+        -------
+        dict[Path, list[ImportInfo]]
+            Unused imports of each file that has any.
+        """
+        files = list(self._rejig.files)
+        return {
+            path: unused
+            for path, unused in _map_files(_find_unused_in_files, files, workers)
+            if unused
+        }
+
+    def remove_all_unused_imports(self, workers: int = 1) -> Result:
+        """Remove unused imports from every project file.
+
+        Each file is parsed, analysed and rewritten once; all files are
+        changed together in a transaction (or added to the current one,
+        if any).
 
-            # Check if any of the imported names are used
-            imported_names = imp.get_imported_names()
-            is_used = False
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes. With 1 (default), files are
+            analysed in this process.
 
-            for name in imported_names:
-                if name in used_names:
-                    is_used = True
-                    break
+        Returns
+        -------
+        Result
+            Result with the combined diff. ``data["removed"]`` maps each
+            changed file to the removed imports.
+        """
+        tx = self._rejig.current_transaction
+        if tx is not None:
+            return self._remove_unused(tx, workers)
 
-            if not is_used:
-                unused.append(imp)
+        try:
+            with self._rejig.transaction() as tx:
+                result = self._remove_unused(tx, workers)
+                if not result.files_changed:
+                    return result
+                batch = tx.commit()
+        except Exception as e:
+            return ErrorResult(
+                message=f"Failed to remove unused imports: {e}",
+                exception=e,
+                operation="remove_all_unused_imports",
+            )
 
-        return unused
+        if not batch.success:
+            return ErrorResult(
+                message="; ".join(r.message for r in batch.failed),
+                operation="remove_all_unused_imports",
+            )
+        return Result(
+            success=True,
+            message=result.message,
+            files_changed=batch.files_changed,
+            diff=batch.diff,
+            diffs=batch.diffs,
+            data=result.data,
+        )
+
+    def _remove_unused(self, tx: Transaction, workers: int) -> Result:
+        """Rewrite every file with unused imports, recording changes in tx."""
+        contents = []
+        for path in self._rejig.files:
+            content = tx.get_current_content(path)
+            if content is not None:
+                contents.append((path, content))
+
+        originals = dict(contents)
+        removed: dict[Path, list[ImportInfo]] = {}
+        diffs: dict[Path, str] = {}
+        for path, new_content, unused in _map_files(_remove_unused_in_files, contents, workers):
+            if not unused:
+                continue
+            change = tx.add_change(
+                path, originals[path], new_content, f"remove {_count_names(unused)} unused import(s)"
+            )
+            removed[path] = unused
+            if change.diff:
+                diffs[path] = change.diff
+
+        count = sum(_count_names(unused) for unused in removed.values())
+        return Result(
+            success=True,
+            message=f"Removed {count} unused imports from {len(removed)} files",
+            files_changed=list(removed),
+            diff=combine_diffs(diffs) if diffs else None,
+            diffs=diffs,
+            data={"removed": removed},
+        )
 
     def find_potentially_missing_imports(self, path: Path) -> set[str]:
         """Find names that are used but not defined or imported.
@@ -433,17 +527,6 @@ def _node_to_code(node: cst.CSTNode) -> str:
     return cst.Module(body=[cst.SimpleStatementLine(body=[node])]).code.strip()
 
 
-def _get_import_nodes(tree: cst.Module) -> list[cst.CSTNode]:
-    """Get all import nodes from a module."""
-    nodes = []
-    for node in tree.body:
-        if isinstance(node, cst.SimpleStatementLine):
-            for stmt in node.body:
-                if isinstance(stmt, (cst.Import, cst.ImportFrom)):
-                    nodes.append(stmt)
-    return nodes
-
-
 class DefinitionCollector(cst.CSTVisitor):
     """Collect all defined names in a module."""
 
@@ -510,3 +593,294 @@ def _get_defined_names(tree: cst.Module) -> set[str]:
     wrapper = cst.MetadataWrapper(tree)
     wrapper.visit(collector)
     return collector.defined_names
+
+
+# =============================================================================
+# Unused Import Detection and Removal
+# =============================================================================
+
+
+def dotted_name(node: cst.BaseExpression) -> str:
+    """Get ``a.b.c`` for a Name/Attribute chain (an import's module or name)."""
+    return get_full_name_for_node(node) or ""
+
+
+def walk_nodes(node: cst.CSTNode) -> Iterator[cst.CSTNode]:
+    """Yield a node and all its descendants, depth first."""
+    yield node
+    for child in node.children:
+        yield from walk_nodes(child)
+
+
+def is_import_line(node: cst.CSTNode) -> bool:
+    """Check for a statement line holding only imports."""
+    return isinstance(node, cst.SimpleStatementLine) and all(
+        isinstance(s, (cst.Import, cst.ImportFrom)) for s in node.body
+    )
+
+
+def is_docstring(node: cst.CSTNode) -> bool:
+    """Check for a statement line holding only a string literal."""
+    return (
+        isinstance(node, cst.SimpleStatementLine)
+        and len(node.body) == 1
+        and isinstance(node.body[0], cst.Expr)
+        and isinstance(node.body[0].value, (cst.SimpleString, cst.ConcatenatedString))
+    )
+
+
+def dunder_all_names(body: Sequence[cst.BaseStatement]) -> set[str]:
+    """Get the string names listed in a module's ``__all__``."""
+    names: set[str] = set()
+    for line in body:
+        if not isinstance(line, cst.SimpleStatementLine):
+            continue
+        for stmt in line.body:
+            targets = []
+            if isinstance(stmt, cst.Assign):
+                targets = [t.target for t in stmt.targets]
+            elif isinstance(stmt, (cst.AugAssign, cst.AnnAssign)):
+                targets = [stmt.target]
+            if not any(isinstance(t, cst.Name) and t.value == "__all__" for t in targets):
+                continue
+            for element in getattr(stmt.value, "elements", ()):
+                if isinstance(element.value, cst.SimpleString):
+                    names.add(element.value.evaluated_value)
+    return names
+
+
+def _alias_used(alias: cst.ImportAlias, assignments: list, exported: set[str]) -> bool:
+    """Whether the name an import alias binds is referenced or exported."""
+    if alias.asname is not None:
+        if not isinstance(alias.asname.name, cst.Name):
+            return True
+        names = [alias.asname.name.value]
+        # import x as x marks an explicit re-export
+        if names[0] == _get_full_name(alias.name):
+            return True
+    else:
+        # import a.b binds a; uses resolve to the longest matching prefix
+        parts = _get_full_name(alias.name).split(".")
+        names = [".".join(parts[:i]) for i in range(len(parts), 0, -1)]
+    if names[-1] in exported:
+        return True
+    return any(a.references for a in assignments if a.name in names)
+
+
+def _find_unused_aliases(
+    wrapper: cst.MetadataWrapper,
+) -> list[tuple[ImportInfo, cst.Import | cst.ImportFrom, list[cst.ImportAlias]]]:
+    """Find unused import names with one scope analysis of the module.
+
+    Returns the narrowed ``ImportInfo``, the statement and its unused
+    aliases for each import statement with unused names.
+    """
+    collector = ImportCollector()
+    wrapper.visit(collector)
+    scopes = wrapper.resolve(ScopeProvider)
+    exported = dunder_all_names(wrapper.module.body)
+
+    # Assignments of each import statement, indexed once per scope
+    by_node: dict[int, list] = {}
+    indexed: set[int] = set()
+    unused_imports = []
+    for info, node in zip(collector.imports, collector.nodes):
+        if info.is_future or isinstance(node.names, cst.ImportStar):
+            continue
+        scope = scopes.get(node)
+        if scope is None:
+            continue
+        if id(scope) not in indexed:
+            indexed.add(id(scope))
+            for assignment in scope.assignments:
+                by_node.setdefault(id(assignment.node), []).append(assignment)
+        assignments = by_node.get(id(node), [])
+        unused = [
+            alias
+            for alias in node.names
+            if not _alias_used(alias, assignments, exported if isinstance(scope, GlobalScope) else set())
+        ]
+        if not unused:
+            continue
+        if len(unused) < len(node.names):
+            names = [_get_full_name(alias.name) for alias in unused]
+            bound = {alias.asname.name.value for alias in unused if alias.asname is not None}
+            info = replace(
+                info,
+                names=names,
+                aliases={k: v for k, v in info.aliases.items() if k in bound},
+            )
+        unused_imports.append((info, node, unused))
+    return unused_imports
+
+
+def find_unused_imports_in_code(code: str) -> list[ImportInfo]:
+    """Find unused imports in module source.
+
+    Parameters
+    ----------
+    code : str
+        Module source.
+
+    Returns
+    -------
+    list[ImportInfo]
+        Unused imports; statements with some used names list only the
+        unused ones.
+
+    Raises
+    ------
+    libcst.ParserSyntaxError
+        If the code doesn't parse.
+    """
+    wrapper = cst.MetadataWrapper(cst.parse_module(code), unsafe_skip_copy=True)
+    return [info for info, _, _ in _find_unused_aliases(wrapper)]
+
+
+def remove_unused_imports_from_code(code: str) -> tuple[str, list[ImportInfo]]:
+    """Remove unused imports from module source in one parse.
+
+    Parameters
+    ----------
+    code : str
+        Module source.
+
+    Returns
+    -------
+    tuple[str, list[ImportInfo]]
+        The new source and the imports removed.
+
+    Raises
+    ------
+    libcst.ParserSyntaxError
+        If the code doesn't parse.
+    """
+    wrapper = cst.MetadataWrapper(cst.parse_module(code), unsafe_skip_copy=True)
+    unused = _find_unused_aliases(wrapper)
+    if not unused:
+        return code, []
+    transformer = RemoveImportAliasesTransformer({node: set(aliases) for _, node, aliases in unused})
+    return wrapper.module.visit(transformer).code, [info for info, _, _ in unused]
+
+
+def _count_names(infos: list[ImportInfo]) -> int:
+    return sum(len(info.names) for info in infos)
+
+
+def _find_unused_in_files(paths: list[Path]) -> list[tuple[Path, list[ImportInfo]]]:
+    """Find unused imports in a batch of files (run in worker processes)."""
+    results = []
+    for path in paths:
+        try:
+            results.append((path, find_unused_imports_in_code(path.read_text())))
+        except Exception:
+            continue
+    return results
+
+
+def _remove_unused_in_files(
+    items: list[tuple[Path, str]],
+) -> list[tuple[Path, str, list[ImportInfo]]]:
+    """Remove unused imports from a batch of sources (run in worker processes)."""
+    results = []
+    for path, content in items:
+        try:
+            results.append((path, *remove_unused_imports_from_code(content)))
+        except cst.ParserSyntaxError:
+            continue
+    return results
+
+
+def _map_files(func: Callable[[list], list], items: list, workers: int) -> list:
+    """Run a batch function over items, in worker processes if worthwhile."""
+    workers = min(workers, max(1, len(items) // 64))
+    if workers <= 1:
+        return func(items)
+
+    batch_size = max(1, len(items) // (workers * 4))
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    results: list = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch in executor.map(func, batches):
+            results.extend(batch)
+    return results
+
+
+class RemoveImportAliasesTransformer(cst.CSTTransformer):
+    """Remove the given aliases from import statements.
+
+    Statements left without names are removed. Comments and spacing above
+    a removed top-level import line move to the following statement.
+
+    Parameters
+    ----------
+    removed : dict[cst.Import | cst.ImportFrom, set[cst.ImportAlias]]
+        Aliases to remove, keyed by statement. Nodes must come from the
+        module being transformed.
+    """
+
+    def __init__(self, removed: dict[cst.Import | cst.ImportFrom, set[cst.ImportAlias]]) -> None:
+        super().__init__()
+        self._removed = removed
+        self._top_level: set[int] = set()
+        self._orphaned_lines: list[cst.EmptyLine] = []
+
+    def visit_Module(self, node: cst.Module) -> bool:
+        self._top_level = {id(s) for s in node.body}
+        return True
+
+    def _leave_import(
+        self,
+        original_node: cst.Import | cst.ImportFrom,
+        updated_node: cst.Import | cst.ImportFrom,
+    ) -> cst.BaseSmallStatement | cst.RemovalSentinel:
+        removed = self._removed.get(original_node)
+        if not removed:
+            return updated_node
+        names = [u for o, u in zip(original_node.names, updated_node.names) if o not in removed]
+        if not names:
+            return cst.RemoveFromParent()
+        names[-1] = names[-1].with_changes(comma=cst.MaybeSentinel.DEFAULT)
+        if isinstance(updated_node, cst.ImportFrom):
+            return updated_node.with_changes(names=names, lpar=None, rpar=None)
+        return updated_node.with_changes(names=names)
+
+    def leave_Import(
+        self,
+        original_node: cst.Import,
+        updated_node: cst.Import,
+    ) -> cst.BaseSmallStatement | cst.RemovalSentinel:
+        return self._leave_import(original_node, updated_node)
+
+    def leave_ImportFrom(
+        self,
+        original_node: cst.ImportFrom,
+        updated_node: cst.ImportFrom,
+    ) -> cst.BaseSmallStatement | cst.RemovalSentinel:
+        return self._leave_import(original_node, updated_node)
+
+    def on_leave(
+        self,
+        original_node: cst.CSTNode,
+        updated_node: cst.CSTNode,
+    ) -> cst.CSTNode | cst.RemovalSentinel | cst.FlattenSentinel:
+        updated_node = super().on_leave(original_node, updated_node)
+        if id(original_node) not in self._top_level:
+            return updated_node
+        if isinstance(original_node, cst.SimpleStatementLine) and (
+            isinstance(updated_node, cst.RemovalSentinel)
+            or (isinstance(updated_node, cst.SimpleStatementLine) and not updated_node.body)
+        ):
+            self._orphaned_lines.extend(original_node.leading_lines)
+            return cst.RemoveFromParent()
+        if self._orphaned_lines and isinstance(updated_node, cst.BaseStatement):
+            # Keep the spacing of the removed line unless the next statement
+            # has its own; comments are always kept
+            orphaned = self._orphaned_lines
+            if any(not line.comment for line in updated_node.leading_lines):
+                orphaned = [line for line in orphaned if line.comment]
+            updated_node = updated_node.with_changes(
+                leading_lines=[*orphaned, *updated_node.leading_lines]
+            )
+            self._orphaned_lines = []
+        return updated_node
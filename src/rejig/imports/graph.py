@@ -1,7 +1,7 @@
 """Import graph analysis and circular import detection."""
 from __future__ import annotations
 
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -10,6 +10,7 @@ from rejig.imports.analyzer import ImportAnalyzer
 
 if TYPE_CHECKING:
     from rejig.core.rejig import Rejig
+    from rejig.imports.profiler import ImportTiming
 
 
 @dataclass
@@ -30,6 +31,10 @@ class ImportEdge:
         Line number of the import in the source file.
     file_path : Path
         Path to the file containing the import.
+    import_time_us : int | None
+        Microseconds spent importing to_module through this edge, from
+        ``-X importtime`` (see ``ImportGraph.attach_timings``). 0 if another
+        module imported it first; None if not profiled.
     """
 
     from_module: str
@@ -38,6 +43,7 @@ class ImportEdge:
     names: list[str] = field(default_factory=list)
     line_number: int = 0
     file_path: Path | None = None
+    import_time_us: int | None = None
 
 
 @dataclass
@@ -59,12 +65,37 @@ class CircularImport:
         return " -> ".join(self.cycle + [self.cycle[0]])
 
 
+@dataclass
+class ImportCycleGroup:
+    """A strongly connected component of the import graph.
+
+    Every module in the group imports every other one, directly or
+    indirectly. Breaking all of its cycles means removing imports until
+    the group falls apart.
+
+    Attributes
+    ----------
+    modules : list[str]
+        Sorted module names in the component.
+    cycles : list[CircularImport]
+        Minimal cycles in the component: the shortest cycle through each
+        import edge inside it, without duplicates, shortest first.
+    """
+
+    modules: list[str]
+    cycles: list[CircularImport] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return f"{len(self.modules)} modules, {len(self.cycles)} cycles: {', '.join(self.modules)}"
+
+
 class ImportGraph:
     """Build and analyze the import graph for a project.
 
     Provides functionality to:
     - Build a dependency graph of imports
-    - Detect circular imports
+    - Detect circular imports (strongly connected components and the
+      minimal cycles inside them)
     - Find all dependencies of a module
     - Find all modules that depend on a given module
     """
@@ -75,7 +106,9 @@ class ImportGraph:
         self._graph: dict[str, set[str]] = defaultdict(set)
         self._reverse_graph: dict[str, set[str]] = defaultdict(set)
         self._edges: list[ImportEdge] = []
+        self._edge_index: dict[tuple[str, str], list[ImportEdge]] = defaultdict(list)
         self._module_to_path: dict[str, Path] = {}
+        self._timings: dict[str, ImportTiming] = {}
         self._built = False
 
     def build(self) -> None:
@@ -83,14 +116,17 @@ class ImportGraph:
         self._graph.clear()
         self._reverse_graph.clear()
         self._edges.clear()
+        self._edge_index.clear()
         self._module_to_path.clear()
 
+        # Known modules first, so imports of submodules can be told apart
+        # from imports of names defined in a package
         for file_path in self._rejig.files:
             module_name = self._path_to_module(file_path)
-            if not module_name:
-                continue
+            if module_name:
+                self._module_to_path[module_name] = file_path
 
-            self._module_to_path[module_name] = file_path
+        for module_name, file_path in self._module_to_path.items():
             imports = self._analyzer.get_imports(file_path)
 
             for imp in imports:
@@ -98,18 +134,13 @@ class ImportGraph:
                 if imp.is_future:
                     continue
 
-                # Resolve the target module
-                target_module = self._resolve_import_target(file_path, imp)
-                if not target_module:
-                    continue
+                for target_module in self._import_targets(file_path, imp):
+                    # Add to graph
+                    self._graph[module_name].add(target_module)
+                    self._reverse_graph[target_module].add(module_name)
 
-                # Add to graph
-                self._graph[module_name].add(target_module)
-                self._reverse_graph[target_module].add(module_name)
-
-                # Track edge details
-                self._edges.append(
-                    ImportEdge(
+                    # Track edge details
+                    edge = ImportEdge(
                         from_module=module_name,
                         to_module=target_module,
                         is_from_import=imp.is_from_import,
@@ -117,7 +148,8 @@ class ImportGraph:
                         line_number=imp.line_number,
                         file_path=file_path,
                     )
-                )
+                    self._edges.append(edge)
+                    self._edge_index[(module_name, target_module)].append(edge)
 
         self._built = True
 
@@ -143,7 +175,11 @@ class ImportGraph:
             return None
 
     def _resolve_import_target(self, file_path: Path, imp) -> str | None:
-        """Resolve an import to its target module name."""
+        """Resolve an import to its full dotted target module name.
+
+        For ``from x import y`` this is ``x``; for ``import x.y`` (and
+        ``import x.y, z``) it is the first imported module, ``x.y``.
+        """
         if imp.is_relative:
             # Resolve relative import
             try:
@@ -169,11 +205,33 @@ class ImportGraph:
         else:
             # Absolute import
             if imp.is_from_import and imp.module:
-                return imp.module.split(".")[0]
+                return imp.module
             elif imp.names:
-                return imp.names[0].split(".")[0]
+                return imp.names[0]
             return None
 
+    def _import_targets(self, file_path: Path, imp) -> list[str]:
+        """All modules an import statement depends on.
+
+        ``import a, b`` depends on both; ``from pkg import mod`` depends on
+        ``pkg.mod`` when that is a module of the project, and on ``pkg``
+        for any names that aren't submodules.
+        """
+        if not imp.is_from_import:
+            return list(dict.fromkeys(imp.names))
+
+        base = self._resolve_import_target(file_path, imp)
+        if not base:
+            return []
+        targets = [
+            f"{base}.{name}"
+            for name in imp.names
+            if f"{base}.{name}" in self._module_to_path
+        ]
+        if len(targets) < len(imp.names) or not targets:
+            targets.append(base)
+        return targets
+
     def get_dependencies(self, module: str) -> set[str]:
         """Get all modules that a given module imports.
 
@@ -240,68 +298,197 @@ class ImportGraph:
         visited.discard(module)  # Don't include the module itself
         return visited
 
+    def find_strongly_connected_components(self) -> list[list[str]]:
+        """Find groups of modules that import each other.
+
+        Uses an iterative version of Tarjan's algorithm, so deep import
+        chains don't hit the recursion limit.
+
+        Returns
+        -------
+        list[list[str]]
+            Components with more than one module, or a single module that
+            imports itself, each sorted, in sorted order.
+        """
+        if not self._built:
+            self.build()
+
+        index: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        components: list[list[str]] = []
+
+        for root in sorted(self._graph):
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            # Each frame is a node and an iterator over its successors
+            work = [(root, iter(sorted(self._graph.get(root, ()))))]
+
+            while work:
+                node, successors = work[-1]
+                for successor in successors:
+                    if successor not in index:
+                        index[successor] = lowlink[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append(
+                            (successor, iter(sorted(self._graph.get(successor, ()))))
+                        )
+                        break
+                    if successor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self._graph.get(node, ()):
+                            components.append(sorted(component))
+
+        return sorted(components)
+
+    def _shortest_path(
+        self,
+        start: str,
+        goal: str,
+        allowed: set[str],
+        adjacency: dict[str, list[str]] | None = None,
+    ) -> list[str] | None:
+        """Shortest import path from start to goal through allowed modules.
+
+        Ties are broken by module name, so results are deterministic;
+        pass pre-sorted adjacency lists when searching repeatedly.
+        """
+        previous: dict[str, str | None] = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if node == goal:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = previous[node]
+                return path[::-1]
+            successors = (
+                adjacency[node] if adjacency is not None
+                else sorted(self._graph.get(node, ()))
+            )
+            for successor in successors:
+                if successor in allowed and successor not in previous:
+                    previous[successor] = node
+                    queue.append(successor)
+        return None
+
+    def _make_cycle(self, cycle: list[str]) -> CircularImport:
+        """CircularImport starting from its smallest module, with its edges."""
+        start = cycle.index(min(cycle))
+        normalized = cycle[start:] + cycle[:start]
+        edges = [
+            self._edge_index[(module, normalized[(i + 1) % len(normalized)])][0]
+            for i, module in enumerate(normalized)
+        ]
+        return CircularImport(cycle=normalized, edges=edges)
+
+    def shortest_cycle(self, module: str) -> CircularImport | None:
+        """Find the shortest import cycle through a module.
+
+        Parameters
+        ----------
+        module : str
+            The module name to check.
+
+        Returns
+        -------
+        CircularImport | None
+            The shortest cycle, or None if the module isn't in one.
+        """
+        if not self._built:
+            self.build()
+
+        best: list[str] | None = None
+        for successor in sorted(self._graph.get(module, ())):
+            path = self._shortest_path(successor, module, set(self._graph) | {module})
+            if path is not None and (best is None or len(path) < len(best)):
+                best = path
+        if best is None:
+            return None
+        # The path ends back at module
+        return self._make_cycle(best[-1:] + best[:-1])
+
+    def find_cycle_groups(self) -> list[ImportCycleGroup]:
+        """Find each group of mutually importing modules and its cycles.
+
+        For every import edge inside a strongly connected component, the
+        shortest cycle using that edge is reported, so every import that
+        takes part in a cycle shows up in at least one short cycle.
+
+        Returns
+        -------
+        list[ImportCycleGroup]
+            One group per strongly connected component.
+        """
+        groups = []
+        for component in self.find_strongly_connected_components():
+            members = set(component)
+            adjacency = {
+                module: sorted(m for m in self._graph.get(module, ()) if m in members)
+                for module in component
+            }
+            cycles: dict[tuple[str, ...], CircularImport] = {}
+            for module in component:
+                for successor in adjacency[module]:
+                    path = self._shortest_path(successor, module, members, adjacency)
+                    if path is None:
+                        continue
+                    cycle = self._make_cycle(path)
+                    cycles.setdefault(tuple(cycle.cycle), cycle)
+            groups.append(ImportCycleGroup(
+                modules=component,
+                cycles=sorted(cycles.values(), key=lambda c: (len(c.cycle), c.cycle)),
+            ))
+        return groups
+
     def find_circular_imports(self) -> list[CircularImport]:
         """Find all circular import chains in the project.
 
         Returns
         -------
         list[CircularImport]
-            List of circular import chains found.
+            The minimal cycles of every group of mutually importing
+            modules (see ``find_cycle_groups``).
+        """
+        return [cycle for group in self.find_cycle_groups() for cycle in group.cycles]
+
+    def get_edges_between(self, from_module: str, to_module: str) -> list[ImportEdge]:
+        """Get the imports of one module by another.
+
+        Parameters
+        ----------
+        from_module : str
+            The importing module.
+        to_module : str
+            The imported module.
+
+        Returns
+        -------
+        list[ImportEdge]
+            Edges from from_module to to_module, in file order.
         """
         if not self._built:
             self.build()
-
-        cycles: list[list[str]] = []
-        visited: set[str] = set()
-        rec_stack: set[str] = set()
-        path: list[str] = []
-
-        def dfs(node: str) -> None:
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-
-            for neighbor in self._graph.get(node, set()):
-                if neighbor not in visited:
-                    dfs(neighbor)
-                elif neighbor in rec_stack:
-                    # Found a cycle
-                    cycle_start = path.index(neighbor)
-                    cycle = path[cycle_start:]
-                    cycles.append(cycle)
-
-            path.pop()
-            rec_stack.discard(node)
-
-        for node in self._graph:
-            if node not in visited:
-                dfs(node)
-
-        # Convert to CircularImport objects and deduplicate
-        seen_cycles: set[frozenset[str]] = set()
-        result: list[CircularImport] = []
-
-        for cycle in cycles:
-            # Normalize cycle (start from smallest element)
-            min_idx = cycle.index(min(cycle))
-            normalized = cycle[min_idx:] + cycle[:min_idx]
-            cycle_set = frozenset(normalized)
-
-            if cycle_set not in seen_cycles:
-                seen_cycles.add(cycle_set)
-
-                # Find the edges that form this cycle
-                edges = []
-                for i, mod in enumerate(normalized):
-                    next_mod = normalized[(i + 1) % len(normalized)]
-                    for edge in self._edges:
-                        if edge.from_module == mod and edge.to_module == next_mod:
-                            edges.append(edge)
-                            break
-
-                result.append(CircularImport(cycle=normalized, edges=edges))
-
-        return result
+        return list(self._edge_index.get((from_module, to_module), []))
 
     def get_edges(self) -> list[ImportEdge]:
         """Get all import edges in the graph.
@@ -315,6 +502,45 @@ class ImportGraph:
             self.build()
         return list(self._edges)
 
+    def attach_timings(self, timings: dict[str, ImportTiming]) -> None:
+        """Attach ``-X importtime`` measurements to modules and edges.
+
+        An edge is charged the target's cumulative import time when its
+        module is the one that imported the target first at runtime.
+
+        Parameters
+        ----------
+        timings : dict[str, ImportTiming]
+            Timings by module name, from ``rejig.imports.profiler``.
+        """
+        if not self._built:
+            self.build()
+        self._timings = dict(timings)
+        for edge in self._edges:
+            timing = self._timings.get(edge.to_module)
+            if timing is None:
+                edge.import_time_us = None
+            elif timing.parent == edge.from_module:
+                edge.import_time_us = timing.cumulative_us
+            else:
+                edge.import_time_us = 0
+
+    def get_import_time(self, module: str) -> ImportTiming | None:
+        """Get the attached import timing of a module.
+
+        Parameters
+        ----------
+        module : str
+            The module name to check.
+
+        Returns
+        -------
+        ImportTiming | None
+            The timing, or None if the module wasn't imported in the
+            profiled run (or no timings are attached).
+        """
+        return self._timings.get(module)
+
     def get_modules(self) -> set[str]:
         """Get all modules in the graph.
 
@@ -0,0 +1,233 @@
+"""Import-site index: where each module (or name) is imported.
+
+One scan of the project records, per file, the absolute dotted target of
+every import statement and the lines it spans. Lookups for a dotted name
+then return only the files that import it, a submodule or name inside it,
+or a package containing it, so refactorings such as renames never open
+the other files.
+
+Per-file entries are kept in the Rejig analysis cache, so rebuilding the
+index only re-parses files that changed.
+"""
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import libcst as cst
+from libcst.metadata import MetadataWrapper, PositionProvider
+
+from rejig.imports.analyzer import dotted_name
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+
+# Cache namespace for per-file import sites
+CACHE_NAMESPACE = "import_sites"
+
+
+@dataclass
+class ImportSite:
+    """One import of a dotted name.
+
+    Attributes
+    ----------
+    file_path : Path
+        File containing the import statement.
+    target : str
+        Absolute dotted name imported. For ``from pkg import name`` this is
+        ``pkg.name``; relative imports are resolved against the file.
+    line_number : int
+        1-based line where the statement starts.
+    end_line : int
+        1-based line where the statement ends.
+    """
+
+    file_path: Path
+    target: str
+    line_number: int
+    end_line: int
+
+    def __str__(self) -> str:
+        return f"{self.file_path}:{self.line_number}: {self.target}"
+
+
+def resolve_relative(module_name: str | None, is_package: bool, target: str, level: int) -> str | None:
+    """Resolve a (possibly relative) import target to an absolute name.
+
+    Parameters
+    ----------
+    module_name : str | None
+        Dotted name of the importing module.
+    is_package : bool
+        Whether the importing module is a package ``__init__``.
+    target : str
+        Module named in the import (empty for ``from . import x``).
+    level : int
+        Number of leading dots.
+
+    Returns
+    -------
+    str | None
+        The absolute name, or None if it can't be resolved.
+    """
+    if not level:
+        return target or None
+    if module_name is None:
+        return None
+    parts = module_name.split(".")
+    if not is_package:
+        parts = parts[:-1]
+    if level - 1 > len(parts):
+        return None
+    parts = parts[: len(parts) - (level - 1)]
+    if target:
+        parts.append(target)
+    return ".".join(parts) or None
+
+
+def collect_import_sites(code: str, module_name: str | None, is_package: bool) -> list[list[Any]]:
+    """Collect ``[target, line, end_line]`` for every import in module source.
+
+    Imports anywhere in the module are included (function bodies, ``if``
+    blocks, ``try`` fallbacks).
+
+    Raises
+    ------
+    libcst.ParserSyntaxError
+        If the code doesn't parse.
+    """
+    wrapper = MetadataWrapper(cst.parse_module(code), unsafe_skip_copy=True)
+    positions = wrapper.resolve(PositionProvider)
+    sites: list[list[Any]] = []
+    for node, position in positions.items():
+        if isinstance(node, cst.Import):
+            targets = [dotted_name(alias.name) for alias in node.names]
+        elif isinstance(node, cst.ImportFrom):
+            module = dotted_name(node.module) if node.module else ""
+            base = resolve_relative(module_name, is_package, module, len(node.relative))
+            if base is None or base == "__future__":
+                continue
+            if isinstance(node.names, cst.ImportStar):
+                targets = [base]
+            else:
+                targets = [f"{base}.{alias.name.value}" for alias in node.names]
+        else:
+            continue
+        sites.extend([t, position.start.line, position.end.line] for t in targets)
+    sites.sort(key=lambda s: (s[1], s[0]))
+    return sites
+
+
+class ImportSiteIndex:
+    """Index of import sites, keyed by absolute dotted target.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The parent Rejig instance.
+
+    Examples
+    --------
+    >>> index = ImportSiteIndex(rj)
+    >>> index.build()
+    >>> index.files_importing("myapp.utils")
+    """
+
+    def __init__(self, rejig: Rejig) -> None:
+        self._rejig = rejig
+        self._sites: dict[str, list[ImportSite]] = {}
+        self._targets: list[str] = []
+        self._modules: dict[Path, str | None] = {}
+        self._built = False
+
+    def build(self) -> None:
+        """Scan the working set once, reusing cached entries of unchanged files."""
+        from rejig.analysis.call_graph import _path_to_module
+
+        cache = self._rejig.cache
+        package_dirs: dict[str, bool] = {}
+        self._sites = {}
+        self._modules = {}
+
+        for file_path in self._rejig.files:
+            module_name = _path_to_module(file_path, package_dirs)
+            self._modules[file_path] = module_name
+            data = cache.get(CACHE_NAMESPACE, file_path)
+            if data is None:
+                try:
+                    data = collect_import_sites(
+                        file_path.read_text(), module_name, file_path.name == "__init__.py"
+                    )
+                except Exception:
+                    data = []
+                cache.put(CACHE_NAMESPACE, file_path, data)
+            for target, line, end_line in data:
+                self._sites.setdefault(target, []).append(
+                    ImportSite(file_path, target, line, end_line)
+                )
+
+        cache.prune(CACHE_NAMESPACE, set(self._rejig.files))
+        cache.save()
+        self._targets = sorted(self._sites)
+        self._built = True
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            self.build()
+
+    def module_name(self, path: Path) -> str | None:
+        """Get the importable module name of an indexed file."""
+        self._ensure_built()
+        return self._modules.get(path)
+
+    def sites(self, name: str) -> list[ImportSite]:
+        """Get the import sites that can reach a dotted name.
+
+        Parameters
+        ----------
+        name : str
+            Dotted module or object name (e.g. "myapp.utils.helper").
+
+        Returns
+        -------
+        list[ImportSite]
+            Imports of ``name`` itself, of anything inside it, and of the
+            packages containing it (whose attributes can reach it), sorted
+            by file and line.
+        """
+        self._ensure_built()
+        found: list[ImportSite] = list(self._sites.get(name, []))
+
+        # Packages and modules containing name
+        prefix = name.rpartition(".")[0]
+        while prefix:
+            found.extend(self._sites.get(prefix, []))
+            prefix = prefix.rpartition(".")[0]
+
+        # Submodules and names inside name (sorted keys share the prefix)
+        start = name + "."
+        i = bisect.bisect_left(self._targets, start)
+        while i < len(self._targets) and self._targets[i].startswith(start):
+            found.extend(self._sites[self._targets[i]])
+            i += 1
+
+        return sorted(found, key=lambda s: (str(s.file_path), s.line_number, s.target))
+
+    def files_importing(self, name: str) -> list[Path]:
+        """Get the files with an import site that can reach a dotted name.
+
+        Parameters
+        ----------
+        name : str
+            Dotted module or object name.
+
+        Returns
+        -------
+        list[Path]
+            Files in working-set order.
+        """
+        files = {site.file_path for site in self.sites(name)}
+        return [f for f in self._rejig.files if f in files]
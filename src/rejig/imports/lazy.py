@@ -0,0 +1,612 @@
+"""Lazy-import conversion for heavy dependencies.
+
+Rewrites top-level imports of chosen modules so they are paid for on
+first use instead of at import time:
+
+- names used inside functions are imported at the top of each function
+  that uses them
+- names only used in annotations move into an ``if TYPE_CHECKING:`` block
+- names re-exported by the module (``__all__``, package ``__init__``
+  re-exports) are served by a generated module-level ``__getattr__``
+  (PEP 562)
+
+A module's own functions look names up in its globals, which never
+reaches ``__getattr__``, so the loader only covers access from outside
+the module; uses inside the module always get function-local imports.
+
+Imports are only moved when every use of the bound name is known to run
+after import time. Names used at module level (class bodies, decorators,
+default values, evaluated annotations), rebound or declared ``global``,
+or not used at all (possibly imported for their side effects) are left
+in place and reported as skipped.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Union
+
+import libcst as cst
+from libcst.metadata import (
+    ClassScope,
+    FunctionScope,
+    GlobalScope,
+    MetadataWrapper,
+    ParentNodeProvider,
+    PositionProvider,
+    ScopeProvider,
+)
+
+from rejig.core.diff import combine_diffs
+from rejig.core.results import ErrorResult, Result
+from rejig.imports.analyzer import (
+    RemoveImportAliasesTransformer,
+    dotted_name,
+    dunder_all_names,
+    is_docstring,
+    is_import_line,
+    walk_nodes,
+)
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+    from rejig.core.transaction import Transaction
+    from rejig.imports.profiler import ImportProfile
+
+_ImportStatement = Union[cst.Import, cst.ImportFrom]
+
+_LAZY_LOADER = '''\
+_LAZY_IMPORTS = {{
+{entries}
+}}
+
+
+def __getattr__(name):
+    # Imports re-exported names on first access (PEP 562)
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+    import importlib
+
+    module_name, attr = _LAZY_IMPORTS[name]
+    value = importlib.import_module(module_name, __package__)
+    if attr is not None:
+        try:
+            value = getattr(value, attr)
+        except AttributeError:
+            # from package import submodule
+            if not module_name.endswith("."):
+                module_name += "."
+            value = importlib.import_module(module_name + attr, __package__)
+    globals()[name] = value
+    return value
+'''
+
+
+@dataclass
+class SkippedImport:
+    """An import of a selected module that was left in place.
+
+    Attributes
+    ----------
+    name : str
+        The name bound by the import.
+    line_number : int
+        Line of the import statement.
+    reason : str
+        Why moving it could change behaviour.
+    file_path : Path | None
+        Path to the file, when known.
+    """
+
+    name: str
+    line_number: int
+    reason: str
+    file_path: Path | None = None
+
+    def __str__(self) -> str:
+        location = f"{self.file_path}:{self.line_number}" if self.file_path else f"line {self.line_number}"
+        return f"{location}: {self.name}: {self.reason}"
+
+
+@dataclass
+class _Binding:
+    """A top-level imported name that can be loaded lazily."""
+
+    name: str
+    statement: _ImportStatement
+    alias: cst.ImportAlias
+    functions: list[cst.FunctionDef] = field(default_factory=list)
+    type_only: bool = False
+    export: bool = False
+
+
+def _selected(module: str, modules: set[str]) -> bool:
+    """Whether loading module loads one of modules (or a submodule of one)."""
+    return any(module == m or module.startswith(m + ".") for m in modules)
+
+
+def _is_type_checking_if(node: cst.CSTNode) -> bool:
+    if not isinstance(node, cst.If):
+        return False
+    test = node.test.attr if isinstance(node.test, cst.Attribute) else node.test
+    return isinstance(test, cst.Name) and test.value == "TYPE_CHECKING"
+
+
+def _import_lines(pairs: list[tuple[_ImportStatement, cst.ImportAlias]]) -> list[cst.SimpleStatementLine]:
+    """One import statement per original statement, with only the given names."""
+    grouped: dict[int, tuple[_ImportStatement, list[cst.ImportAlias]]] = {}
+    for statement, alias in pairs:
+        grouped.setdefault(id(statement), (statement, []))[1].append(
+            alias.with_changes(comma=cst.MaybeSentinel.DEFAULT)
+        )
+    lines = []
+    for statement, aliases in grouped.values():
+        if isinstance(statement, cst.Import):
+            node: _ImportStatement = cst.Import(names=aliases)
+        else:
+            node = cst.ImportFrom(module=statement.module, relative=statement.relative, names=aliases)
+        lines.append(cst.SimpleStatementLine(body=[node]))
+    return lines
+
+
+class _UsagePlanner:
+    """Decides which top-level imports of the selected modules can move.
+
+    Uses the scope analysis of one ``MetadataWrapper``; every use of a
+    bound name is classified as running at import time, inside a function
+    body, or only in annotations that are never evaluated.
+    """
+
+    def __init__(
+        self,
+        wrapper: MetadataWrapper,
+        modules: set[str],
+        module_name: str | None,
+        is_package: bool,
+    ) -> None:
+        self._wrapper = wrapper
+        self._modules = modules
+        self._module_name = module_name
+        self._is_package = is_package
+        self._scopes = wrapper.resolve(ScopeProvider)
+        self._parents = wrapper.resolve(ParentNodeProvider)
+        self._positions = wrapper.resolve(PositionProvider)
+        self._global = self._scopes[wrapper.module]
+        self.bindings: list[_Binding] = []
+        self.skipped: list[SkippedImport] = []
+
+        body = wrapper.module.body
+        self._postponed = any(
+            isinstance(s, cst.ImportFrom)
+            and s.module is not None
+            and dotted_name(s.module) == "__future__"
+            and not isinstance(s.names, cst.ImportStar)
+            and any(getattr(a.name, "value", None) == "annotations" for a in s.names)
+            for line in body
+            if isinstance(line, cst.SimpleStatementLine)
+            for s in line.body
+        )
+        self._exports = dunder_all_names(body)
+        self._global_names = {
+            name.name.value
+            for node in walk_nodes(wrapper.module)
+            if isinstance(node, cst.Global)
+            for name in node.names
+        }
+        self.has_getattr = "__getattr__" in self._global or "_LAZY_IMPORTS" in self._global
+
+    def plan(self) -> None:
+        for line in self._wrapper.module.body:
+            if not isinstance(line, cst.SimpleStatementLine):
+                continue
+            for statement in line.body:
+                if isinstance(statement, cst.Import):
+                    for alias in statement.names:
+                        if _selected(dotted_name(alias.name), self._modules):
+                            self._consider(statement, alias)
+                elif isinstance(statement, cst.ImportFrom):
+                    if isinstance(statement.names, cst.ImportStar):
+                        continue
+                    module = self._absolute(statement)
+                    if module is None or module == "__future__":
+                        continue
+                    for alias in statement.names:
+                        # The name may be a submodule of the imported package
+                        loaded = f"{module}.{alias.name.value}" if module else alias.name.value
+                        if _selected(module, self._modules) or _selected(loaded, self._modules):
+                            self._consider(statement, alias)
+
+    def _absolute(self, statement: cst.ImportFrom) -> str | None:
+        module = dotted_name(statement.module) if statement.module else ""
+        if not statement.relative:
+            return module
+        if self._module_name is None:
+            return None
+        parts = self._module_name.split(".")
+        if not self._is_package:
+            parts = parts[:-1]
+        level = len(statement.relative)
+        if level - 1 > len(parts):
+            return None
+        parts = parts[: len(parts) - level + 1]
+        return ".".join(parts + ([module] if module else []))
+
+    def _skip(self, name: str, statement: _ImportStatement, reason: str) -> None:
+        line = self._positions[statement].start.line
+        self.skipped.append(SkippedImport(name, line, reason))
+
+    def _consider(self, statement: _ImportStatement, alias: cst.ImportAlias) -> None:
+        if alias.asname is not None:
+            if not isinstance(alias.asname.name, cst.Name):
+                return
+            name = alias.asname.name.value
+        else:
+            name = dotted_name(alias.name).split(".")[0]
+
+        if len(self._global[name]) > 1 or name in self._global_names:
+            self._skip(name, statement, "name is rebound or declared global")
+            return
+
+        (assignment,) = self._global[name]
+        binding = _Binding(name, statement, alias)
+        for access in sorted(
+            assignment.references,
+            key=lambda a: (self._positions[a.node].start.line, self._positions[a.node].start.column),
+        ):
+            reason = self._classify(access, binding)
+            if reason is not None:
+                line = self._positions[access.node].start.line
+                self._skip(name, statement, f"{reason} (line {line})")
+                return
+
+        binding.export = name in self._exports or (
+            not binding.functions
+            and not binding.type_only
+            and (self._is_package or (alias.asname is not None and dotted_name(alias.name) == name))
+        )
+        if binding.export:
+            if self.has_getattr:
+                self._skip(name, statement, "module already defines __getattr__")
+                return
+            if isinstance(statement, cst.Import) and alias.asname is None and "." in dotted_name(alias.name):
+                self._skip(name, statement, "re-exported dotted import binds its top-level package")
+                return
+        elif not binding.functions and not binding.type_only:
+            self._skip(name, statement, "not used here; it may be imported for its side effects")
+            return
+        self.bindings.append(binding)
+
+    def _classify(self, access, binding: _Binding) -> str | None:
+        """Record one use of binding; return why it blocks the move, if it does."""
+        node = access.node
+        if isinstance(node, (cst.SimpleString, cst.ConcatenatedString)) or (
+            access.is_annotation and self._postponed
+        ):
+            # Never evaluated, unless the annotation is on a class attribute,
+            # which dataclasses, attrs and pydantic resolve at runtime
+            if isinstance(access.scope, ClassScope) and self._in_ann_assign(node):
+                return "used in a class attribute annotation"
+            binding.type_only = True
+            return None
+
+        scope = access.scope
+        in_lambda = False
+        while not isinstance(scope, GlobalScope):
+            if isinstance(scope, FunctionScope):
+                if isinstance(scope.node, cst.FunctionDef):
+                    if scope.node not in binding.functions:
+                        binding.functions.append(scope.node)
+                    return None
+                in_lambda = True
+            scope = scope.parent
+        # A lambda body runs later, but there is nowhere to put an import
+        return "used in a lambda outside any function" if in_lambda else "used at import time"
+
+    def _in_ann_assign(self, node: cst.CSTNode) -> bool:
+        while node in self._parents:
+            node = self._parents[node]
+            if isinstance(node, cst.Annotation):
+                return isinstance(self._parents.get(node), cst.AnnAssign)
+        return False
+
+
+class _LazyImportTransformer(RemoveImportAliasesTransformer):
+    """Applies a plan from ``_UsagePlanner`` in one pass over the module."""
+
+    def __init__(self, bindings: list[_Binding], type_checking_bound: bool) -> None:
+        removed: dict[_ImportStatement, set[cst.ImportAlias]] = {}
+        for binding in bindings:
+            removed.setdefault(binding.statement, set()).add(binding.alias)
+        super().__init__(removed)
+        self._function_imports: dict[cst.FunctionDef, list[tuple[_ImportStatement, cst.ImportAlias]]] = {}
+        self._type_checking: list[tuple[_ImportStatement, cst.ImportAlias]] = []
+        self._exports: list[_Binding] = []
+        self._type_checking_bound = type_checking_bound
+
+        for binding in bindings:
+            for function in binding.functions:
+                self._function_imports.setdefault(function, []).append((binding.statement, binding.alias))
+            if binding.type_only or binding.export:
+                self._type_checking.append((binding.statement, binding.alias))
+            if binding.export:
+                self._exports.append(binding)
+
+    # ===== Function-local imports =====
+
+    def leave_FunctionDef(
+        self,
+        original_node: cst.FunctionDef,
+        updated_node: cst.FunctionDef,
+    ) -> cst.FunctionDef:
+        pairs = self._function_imports.get(original_node)
+        if not pairs:
+            return updated_node
+        imports = _import_lines(pairs)
+        body = updated_node.body
+        if isinstance(body, cst.SimpleStatementSuite):
+            statements = [
+                cst.SimpleStatementLine(body=body.body, trailing_whitespace=body.trailing_whitespace)
+            ]
+            return updated_node.with_changes(body=cst.IndentedBlock(body=[*imports, *statements]))
+        statements = list(body.body)
+        index = 1 if statements and is_docstring(statements[0]) else 0
+        return updated_node.with_changes(
+            body=body.with_changes(body=[*statements[:index], *imports, *statements[index:]])
+        )
+
+    # ===== TYPE_CHECKING block and __getattr__ loader =====
+
+    def leave_Module(self, original_node: cst.Module, updated_node: cst.Module) -> cst.Module:
+        if not self._type_checking and not self._exports:
+            return updated_node
+        body = list(updated_node.body)
+
+        index = 1 if body and is_docstring(body[0]) else 0
+        for i, statement in enumerate(body):
+            if is_import_line(statement) or _is_type_checking_if(statement):
+                index = i + 1
+
+        if self._type_checking:
+            imports = _import_lines(self._type_checking)
+            existing = next(
+                (i for i, s in enumerate(body[:index]) if _is_type_checking_if(s)), None
+            )
+            if existing is not None and isinstance(body[existing].body, cst.IndentedBlock):
+                block = body[existing].body
+                body[existing] = body[existing].with_changes(
+                    body=block.with_changes(body=[*block.body, *imports])
+                )
+            else:
+                new: list[cst.BaseStatement] = []
+                if not self._type_checking_bound:
+                    new.append(cst.parse_statement("from typing import TYPE_CHECKING\n"))
+                new.append(
+                    cst.If(
+                        test=cst.Name("TYPE_CHECKING"),
+                        body=cst.IndentedBlock(body=imports),
+                        leading_lines=[cst.EmptyLine()],
+                    )
+                )
+                body[index:index] = new
+                index += len(new)
+
+        if self._exports:
+            entries = "\n".join(f"    {self._loader_entry(b)}," for b in self._exports)
+            loader = list(cst.parse_module(_LAZY_LOADER.format(entries=entries)).body)
+            loader[0] = loader[0].with_changes(leading_lines=[cst.EmptyLine(), cst.EmptyLine()])
+            if index < len(body):
+                following = body[index]
+                blank = 0
+                for line in following.leading_lines:
+                    if line.comment:
+                        break
+                    blank += 1
+                if blank < 2:
+                    body[index] = following.with_changes(
+                        leading_lines=[*[cst.EmptyLine()] * (2 - blank), *following.leading_lines]
+                    )
+            body[index:index] = loader
+
+        return updated_node.with_changes(body=body)
+
+    @staticmethod
+    def _loader_entry(binding: _Binding) -> str:
+        statement, alias = binding.statement, binding.alias
+        if isinstance(statement, cst.Import):
+            return f'"{binding.name}": ("{dotted_name(alias.name)}", None)'
+        relative = "." * len(statement.relative)
+        module = dotted_name(statement.module) if statement.module else ""
+        return f'"{binding.name}": ("{relative}{module}", "{alias.name.value}")'
+
+
+def lazify_imports(
+    code: str,
+    modules: set[str],
+    module_name: str | None = None,
+    is_package: bool = False,
+) -> tuple[str, list[str], list[SkippedImport]]:
+    """Rewrite the top-level imports of modules in code to load lazily.
+
+    The code is parsed once; planning and rewriting share the parse.
+
+    Parameters
+    ----------
+    code : str
+        Module source.
+    modules : set[str]
+        Dotted names of the modules to defer. Imports of their submodules
+        are included.
+    module_name : str | None
+        Dotted name of the module, used to resolve relative imports.
+    is_package : bool
+        Whether the code is a package ``__init__``.
+
+    Returns
+    -------
+    tuple[str, list[str], list[SkippedImport]]
+        The new code, the names whose imports were moved, and the imports
+        of selected modules that were left in place.
+
+    Raises
+    ------
+    libcst.ParserSyntaxError
+        If the code doesn't parse.
+    """
+    wrapper = MetadataWrapper(cst.parse_module(code), unsafe_skip_copy=True)
+    planner = _UsagePlanner(wrapper, modules, module_name, is_package)
+    planner.plan()
+    if not planner.bindings:
+        return code, [], planner.skipped
+
+    transformer = _LazyImportTransformer(
+        planner.bindings, type_checking_bound="TYPE_CHECKING" in planner._global
+    )
+    new_code = wrapper.module.visit(transformer).code
+    return new_code, [b.name for b in planner.bindings], planner.skipped
+
+
+class LazyImportConverter:
+    """Move imports of heavy modules out of module import time.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The parent Rejig instance.
+
+    Examples
+    --------
+    >>> converter = LazyImportConverter(rj)
+    >>> result = converter.apply({"pandas", "matplotlib"})
+    >>> for skipped in result.data["skipped"]:
+    ...     print(skipped)
+    """
+
+    def __init__(self, rejig: Rejig) -> None:
+        self._rejig = rejig
+
+    @staticmethod
+    def select_modules(profile: ImportProfile, min_us: int) -> set[str]:
+        """Choose modules to defer from an import profile.
+
+        Parameters
+        ----------
+        profile : ImportProfile
+            Import timings of the application's entry module.
+        min_us : int
+            Minimum cumulative import time, in microseconds.
+
+        Returns
+        -------
+        set[str]
+            Modules outside the project that take at least ``min_us`` to
+            import, including everything they import.
+        """
+        return {
+            timing.module
+            for timing in profile.timings.values()
+            if timing.cumulative_us >= min_us and not profile.is_first_party(timing.module)
+        }
+
+    def _module_name(self, path: Path) -> str | None:
+        try:
+            parts = list(path.relative_to(self._rejig.root).with_suffix("").parts)
+        except ValueError:
+            return None
+        if parts and parts[-1] == "__init__":
+            parts = parts[:-1]
+        return ".".join(parts) or None
+
+    def apply(self, modules: set[str] | list[str]) -> Result:
+        """Convert imports of modules to lazy imports in every project file.
+
+        All files are changed together in a transaction (or added to the
+        current one, if any).
+
+        Parameters
+        ----------
+        modules : set[str] | list[str]
+            Dotted names of the modules to defer.
+
+        Returns
+        -------
+        Result
+            Result with the combined diff. ``data`` holds the moved names
+            per file (``converted``) and a ``SkippedImport`` for each import
+            left in place (``skipped``).
+        """
+        modules = set(modules)
+        if not modules:
+            return Result(success=True, message="No modules to defer", data={"converted": {}, "skipped": []})
+
+        tx = self._rejig.current_transaction
+        if tx is not None:
+            return self._convert_files(tx, modules)
+
+        try:
+            with self._rejig.transaction() as tx:
+                result = self._convert_files(tx, modules)
+                if not result.files_changed:
+                    return result
+                batch = tx.commit()
+        except Exception as e:
+            return ErrorResult(
+                message=f"Failed to convert imports: {e}",
+                exception=e,
+                operation="apply",
+            )
+
+        if not batch.success:
+            return ErrorResult(
+                message="; ".join(r.message for r in batch.failed),
+                operation="apply",
+            )
+        return Result(
+            success=True,
+            message=result.message,
+            files_changed=batch.files_changed,
+            diff=batch.diff,
+            diffs=batch.diffs,
+            data=result.data,
+        )
+
+    def _convert_files(self, tx: Transaction, modules: set[str]) -> Result:
+        """Convert file by file, recording changes in a transaction."""
+        # Cheap text prefilter: a file importing a selected module mentions
+        # its top-level package, or its last component for relative imports
+        needles = {part for m in modules for part in (m.split(".")[0], m.rsplit(".", 1)[-1])}
+        converted: dict[Path, list[str]] = {}
+        skipped: list[SkippedImport] = []
+        diffs: dict[Path, str] = {}
+
+        for path in self._rejig.files:
+            content = tx.get_current_content(path)
+            if content is None or not any(needle in content for needle in needles):
+                continue
+            try:
+                new_content, names, left = lazify_imports(
+                    content, modules, self._module_name(path), path.name == "__init__.py"
+                )
+            except cst.ParserSyntaxError:
+                continue
+            for item in left:
+                item.file_path = path
+            skipped.extend(left)
+            if not names or new_content == content:
+                continue
+            change = tx.add_change(path, content, new_content, f"defer {len(names)} import(s)")
+            converted[path] = names
+            if change.diff:
+                diffs[path] = change.diff
+
+        count = sum(len(names) for names in converted.values())
+        message = f"Deferred {count} import(s) in {len(converted)} file(s)"
+        if skipped:
+            message += f", left {len(skipped)} in place"
+        return Result(
+            success=True,
+            message=message,
+            files_changed=list(converted),
+            diff=combine_diffs(diffs) if diffs else None,
+            diffs=diffs,
+            data={"converted": converted, "skipped": skipped},
+        )
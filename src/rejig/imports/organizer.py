@@ -9,16 +9,20 @@ Organizes imports into groups:
 from __future__ import annotations
 
 import sys
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import libcst as cst
 
-from rejig.core.results import Result
-from rejig.imports.analyzer import ImportAnalyzer, ImportInfo
+from rejig.core.diff import combine_diffs
+from rejig.core.results import ErrorResult, Result
+from rejig.imports.analyzer import ImportAnalyzer, ImportCollector, ImportInfo, _map_files
 
 if TYPE_CHECKING:
     from rejig.core.rejig import Rejig
+    from rejig.core.transaction import Transaction
 
 
 # Standard library modules (Python 3.10+)
@@ -244,73 +248,134 @@ def _get_stdlib_modules() -> set[str]:
         return STDLIB_MODULES
 
 
-class ImportOrganizer:
-    """Organize imports in Python files following isort conventions.
+def _detect_first_party(root: Path) -> set[str]:
+    """Auto-detect first-party package names from the project root."""
+    first_party: set[str] = set()
 
-    Import groups (separated by blank lines):
-    1. __future__ imports
-    2. Standard library imports
-    3. Third-party imports
-    4. Local/first-party imports (relative imports and project imports)
-    5. TYPE_CHECKING imports (inside if TYPE_CHECKING block)
+    # Check for src/ layout
+    src_dir = root / "src"
+    if src_dir.is_dir():
+        for p in src_dir.iterdir():
+            if p.is_dir() and (p / "__init__.py").exists():
+                first_party.add(p.name)
+
+    # Check for packages at root
+    for p in root.iterdir():
+        if p.is_dir() and (p / "__init__.py").exists():
+            first_party.add(p.name)
+
+    # Check pyproject.toml for package name
+    pyproject = root / "pyproject.toml"
+    if pyproject.exists():
+        try:
+            import tomllib
+
+            with open(pyproject, "rb") as f:
+                data = tomllib.load(f)
+
+            names = []
+            # PEP 621
+            if "project" in data and "name" in data["project"]:
+                names.append(data["project"]["name"])
+
+            # Poetry
+            if "tool" in data and "poetry" in data["tool"]:
+                if "name" in data["tool"]["poetry"]:
+                    names.append(data["tool"]["poetry"]["name"])
+
+            for name in names:
+                first_party.add(name.replace("-", "_"))
+            first_party |= _installed_packages_of(names)
+        except Exception:
+            pass
+
+    return first_party
+
+
+def _normalize_distribution(name: str) -> str:
+    return name.replace("-", "_").replace(".", "_").lower()
+
+
+def _installed_packages_of(distributions: list[str]) -> set[str]:
+    """Top-level packages the given distributions install, from local metadata.
+
+    Finds the real package names when they differ from the distribution
+    name (e.g. ``my-lib`` installing ``mylib``), if the project is installed.
     """
+    from importlib.metadata import packages_distributions
+
+    wanted = {_normalize_distribution(d) for d in distributions}
+    return {
+        package
+        for package, dists in packages_distributions().items()
+        if any(_normalize_distribution(d) in wanted for d in dists)
+    }
+
+
+def _sort_import_infos(imports: list[ImportInfo]) -> list[ImportInfo]:
+    """Sort imports within a group."""
+    # Sort by:
+    # 1. from imports after regular imports
+    # 2. Module name alphabetically
+    # 3. Imported names alphabetically
+    def sort_key(imp: ImportInfo) -> tuple:
+        module = imp.module or ""
+        if not imp.is_from_import and imp.names:
+            module = imp.names[0]
+
+        return (
+            imp.is_from_import,  # Regular imports first
+            module.lower(),
+            tuple(sorted(n.lower() for n in imp.names)),
+        )
 
-    def __init__(self, rejig: Rejig, first_party_packages: set[str] | None = None) -> None:
-        """Initialize the organizer.
+    return sorted(imports, key=sort_key)
 
-        Parameters
-        ----------
-        rejig : Rejig
-            The parent Rejig instance.
-        first_party_packages : set[str] | None
-            Set of package names to treat as first-party. If None, will try
-            to auto-detect from the project root.
-        """
-        self._rejig = rejig
-        self._analyzer = ImportAnalyzer(rejig)
-        self._stdlib = _get_stdlib_modules()
-        self._first_party = first_party_packages or self._detect_first_party()
-
-    def _detect_first_party(self) -> set[str]:
-        """Auto-detect first-party package names from the project root."""
-        first_party: set[str] = set()
-        root = self._rejig.root
-
-        # Check for src/ layout
-        src_dir = root / "src"
-        if src_dir.is_dir():
-            for p in src_dir.iterdir():
-                if p.is_dir() and (p / "__init__.py").exists():
-                    first_party.add(p.name)
-
-        # Check for packages at root
-        for p in root.iterdir():
-            if p.is_dir() and (p / "__init__.py").exists():
-                first_party.add(p.name)
 
-        # Check pyproject.toml for package name
-        pyproject = root / "pyproject.toml"
-        if pyproject.exists():
-            try:
-                import tomllib
+@dataclass(frozen=True)
+class ImportClassifier:
+    """Import group classification for one project.
 
-                with open(pyproject, "rb") as f:
-                    data = tomllib.load(f)
+    Built once per project and shared by every file; it is immutable and
+    picklable, so worker processes receive it instead of re-detecting the
+    first-party packages.
 
-                # PEP 621
-                if "project" in data and "name" in data["project"]:
-                    first_party.add(data["project"]["name"].replace("-", "_"))
+    Attributes
+    ----------
+    first_party : frozenset[str]
+        Top-level names of the project's packages.
+    stdlib : frozenset[str]
+        Top-level names of standard library modules.
+    """
 
-                # Poetry
-                if "tool" in data and "poetry" in data["tool"]:
-                    if "name" in data["tool"]["poetry"]:
-                        first_party.add(data["tool"]["poetry"]["name"].replace("-", "_"))
-            except Exception:
-                pass
+    first_party: frozenset[str]
+    stdlib: frozenset[str] = field(default_factory=lambda: frozenset(_get_stdlib_modules()))
 
-        return first_party
+    @classmethod
+    def for_project(
+        cls, root: Path, first_party_packages: set[str] | None = None
+    ) -> ImportClassifier:
+        """Build the classifier for a project.
 
-    def _classify_import(self, imp: ImportInfo) -> str:
+        Parameters
+        ----------
+        root : Path
+            Project root.
+        first_party_packages : set[str] | None
+            Package names to treat as first-party. If None, they are
+            detected from ``src/``, packages at the root, and the project
+            name in ``pyproject.toml`` (with the packages its installed
+            distribution provides).
+
+        Returns
+        -------
+        ImportClassifier
+            The classifier.
+        """
+        first_party = first_party_packages or _detect_first_party(root)
+        return cls(first_party=frozenset(first_party))
+
+    def classify(self, imp: ImportInfo) -> str:
         """Classify an import into a group.
 
         Returns one of: 'future', 'stdlib', 'thirdparty', 'firstparty', 'type_checking'
@@ -332,32 +397,145 @@ class ImportOrganizer:
         else:
             return "thirdparty"
 
-        if top_level in self._stdlib:
+        if top_level in self.stdlib:
             return "stdlib"
 
-        if top_level in self._first_party:
+        if top_level in self.first_party:
             return "firstparty"
 
         return "thirdparty"
 
+
+def organize_code(code: str, classifier: ImportClassifier) -> str:
+    """Organize the imports in module source.
+
+    The source is parsed once; imports are collected from and rewritten
+    in the same tree.
+
+    Parameters
+    ----------
+    code : str
+        Module source.
+    classifier : ImportClassifier
+        Classification for the project the module belongs to.
+
+    Returns
+    -------
+    str
+        The new source (the same string if nothing changed).
+
+    Raises
+    ------
+    libcst.ParserSyntaxError
+        If the code doesn't parse.
+    """
+    new_tree = _organize_tree(cst.parse_module(code), classifier)
+    return code if new_tree is None else new_tree.code
+
+
+def _organize_tree(tree: cst.Module, classifier: ImportClassifier) -> cst.Module | None:
+    """Organize the imports in a parsed module; None if it has no imports."""
+    collector = ImportCollector()
+    tree.visit(collector)
+    imports = collector.imports
+    if not imports:
+        return None
+
+    # Classify imports into groups
+    groups: dict[str, list[ImportInfo]] = {
+        "future": [],
+        "stdlib": [],
+        "thirdparty": [],
+        "firstparty": [],
+        "type_checking": [],
+    }
+
+    for imp in imports:
+        groups[classifier.classify(imp)].append(imp)
+
+    # Sort each group
+    for group in groups:
+        groups[group] = _sort_import_infos(groups[group])
+
+    # Build the organized import block
+    organized_lines: list[str] = []
+    group_order = ["future", "stdlib", "thirdparty", "firstparty"]
+
+    for group in group_order:
+        if groups[group]:
+            if organized_lines:
+                organized_lines.append("")  # Blank line between groups
+            for imp in groups[group]:
+                organized_lines.append(imp.import_statement)
+
+    # Transform the module
+    transformer = ReorganizeImportsTransformer(imports, organized_lines, groups["type_checking"])
+    return tree.visit(transformer)
+
+
+def _organize_sources(
+    items: list[tuple[Path, str]], classifier: ImportClassifier
+) -> list[tuple[Path, str]]:
+    """Organize a batch of sources (run in worker processes).
+
+    Returns the new source of each file that changed.
+    """
+    results = []
+    for path, content in items:
+        try:
+            new_content = organize_code(content, classifier)
+        except cst.ParserSyntaxError:
+            continue
+        if new_content != content:
+            results.append((path, new_content))
+    return results
+
+
+class ImportOrganizer:
+    """Organize imports in Python files following isort conventions.
+
+    Import groups (separated by blank lines):
+    1. __future__ imports
+    2. Standard library imports
+    3. Third-party imports
+    4. Local/first-party imports (relative imports and project imports)
+    5. TYPE_CHECKING imports (inside if TYPE_CHECKING block)
+    """
+
+    def __init__(
+        self,
+        rejig: Rejig,
+        first_party_packages: set[str] | None = None,
+        classifier: ImportClassifier | None = None,
+    ) -> None:
+        """Initialize the organizer.
+
+        Parameters
+        ----------
+        rejig : Rejig
+            The parent Rejig instance.
+        first_party_packages : set[str] | None
+            Set of package names to treat as first-party. If None, will try
+            to auto-detect from the project root.
+        classifier : ImportClassifier | None
+            Classification to reuse. If None, one is built for the project.
+        """
+        self._rejig = rejig
+        self._analyzer = ImportAnalyzer(rejig)
+        self._classifier = classifier or ImportClassifier.for_project(rejig.root, first_party_packages)
+        self._stdlib = self._classifier.stdlib
+        self._first_party = self._classifier.first_party
+
+    def _classify_import(self, imp: ImportInfo) -> str:
+        """Classify an import into a group.
+
+        Returns one of: 'future', 'stdlib', 'thirdparty', 'firstparty', 'type_checking'
+        """
+        return self._classifier.classify(imp)
+
     def _sort_imports(self, imports: list[ImportInfo]) -> list[ImportInfo]:
         """Sort imports within a group."""
-        # Sort by:
-        # 1. from imports after regular imports
-        # 2. Module name alphabetically
-        # 3. Imported names alphabetically
-        def sort_key(imp: ImportInfo) -> tuple:
-            module = imp.module or ""
-            if not imp.is_from_import and imp.names:
-                module = imp.names[0]
-
-            return (
-                imp.is_from_import,  # Regular imports first
-                module.lower(),
-                tuple(sorted(n.lower() for n in imp.names)),
-            )
-
-        return sorted(imports, key=sort_key)
+        return _sort_import_infos(imports)
 
     def organize(self, path: Path) -> Result:
         """Organize imports in a file.
@@ -381,44 +559,11 @@ class ImportOrganizer:
         except Exception as e:
             return Result(success=False, message=f"Failed to parse file: {e}")
 
-        # Collect imports
-        imports = self._analyzer.get_imports(path)
-        if not imports:
+        new_tree = _organize_tree(tree, self._classifier)
+        if new_tree is None:
             return Result(success=True, message="No imports to organize")
 
-        # Classify imports into groups
-        groups: dict[str, list[ImportInfo]] = {
-            "future": [],
-            "stdlib": [],
-            "thirdparty": [],
-            "firstparty": [],
-            "type_checking": [],
-        }
-
-        for imp in imports:
-            group = self._classify_import(imp)
-            groups[group].append(imp)
-
-        # Sort each group
-        for group in groups:
-            groups[group] = self._sort_imports(groups[group])
-
-        # Build the organized import block
-        organized_lines: list[str] = []
-        group_order = ["future", "stdlib", "thirdparty", "firstparty"]
-
-        for group in group_order:
-            if groups[group]:
-                if organized_lines:
-                    organized_lines.append("")  # Blank line between groups
-                for imp in groups[group]:
-                    organized_lines.append(imp.import_statement)
-
-        # Transform the module
-        transformer = ReorganizeImportsTransformer(imports, organized_lines, groups["type_checking"])
-        new_tree = tree.visit(transformer)
         new_content = new_tree.code
-
         if new_content == content:
             return Result(success=True, message="Imports already organized")
 
@@ -450,6 +595,81 @@ class ImportOrganizer:
             diffs={path: diff},
         )
 
+    def organize_all(self, workers: int = 1) -> Result:
+        """Organize imports in every project file.
+
+        Files are organized in batches across worker processes, which all
+        use this organizer's classification. The output is the same as
+        organizing the files one by one. All files are changed together in
+        a transaction (or added to the current one, if any).
+
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes. With 1 (default), files are
+            organized in this process.
+
+        Returns
+        -------
+        Result
+            Result with the combined diff.
+        """
+        tx = self._rejig.current_transaction
+        if tx is not None:
+            return self._organize_files(tx, workers)
+
+        try:
+            with self._rejig.transaction() as tx:
+                result = self._organize_files(tx, workers)
+                if not result.files_changed:
+                    return result
+                batch = tx.commit()
+        except Exception as e:
+            return ErrorResult(
+                message=f"Failed to organize imports: {e}",
+                exception=e,
+                operation="organize_all",
+            )
+
+        if not batch.success:
+            return ErrorResult(
+                message="; ".join(r.message for r in batch.failed),
+                operation="organize_all",
+            )
+        return Result(
+            success=True,
+            message=result.message,
+            files_changed=batch.files_changed,
+            diff=batch.diff,
+            diffs=batch.diffs,
+        )
+
+    def _organize_files(self, tx: Transaction, workers: int) -> Result:
+        """Organize every file, recording changes in a transaction."""
+        contents = []
+        for path in self._rejig.files:
+            content = tx.get_current_content(path)
+            if content is not None:
+                contents.append((path, content))
+        originals = dict(contents)
+
+        organize = partial(_organize_sources, classifier=self._classifier)
+        diffs: dict[Path, str] = {}
+        files_changed = []
+        for path, new_content in _map_files(organize, contents, workers):
+            change = tx.add_change(path, originals[path], new_content, "organize imports")
+            files_changed.append(path)
+            if change.diff:
+                diffs[path] = change.diff
+
+        return Result(
+            success=True,
+            message=f"Organized imports in {len(files_changed)} files",
+            files_changed=files_changed,
+            diff=combine_diffs(diffs) if diffs else None,
+            diffs=diffs,
+        )
+
 
 class ReorganizeImportsTransformer(cst.CSTTransformer):
     """Transform a module to reorganize its imports."""
@@ -0,0 +1,623 @@
+"""Import-time profiling mapped onto the import graph.
+
+Runs an entry module in a subprocess with ``python -X importtime``, parses
+the per-module self and cumulative times, and attaches them to the
+``ImportGraph``. The resulting ``ImportProfile`` answers where deferring
+imports buys the most startup time:
+
+- the heaviest import subtrees
+- first-party imports that pull in heavy third-party packages
+- top-level imports whose names are only used inside functions, so the
+  import could move into those functions
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import libcst as cst
+from libcst.metadata import MetadataWrapper, PositionProvider
+
+from rejig.core.results import ErrorResult, Result
+from rejig.imports.graph import ImportEdge, ImportGraph
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+
+# Prefix of every line written by -X importtime
+IMPORTTIME_PREFIX = "import time:"
+
+# Imports the entry module without running its __main__ block
+_IMPORT_ENTRY = "import importlib, sys; importlib.import_module(sys.argv[1])"
+
+
+@dataclass
+class ImportTiming:
+    """Import time of one module, from ``-X importtime``.
+
+    Attributes
+    ----------
+    module : str
+        Full dotted module name.
+    self_us : int
+        Microseconds spent in the module itself.
+    cumulative_us : int
+        Microseconds including the modules it imported first.
+    depth : int
+        Nesting level in the runtime import tree (0 for top-level imports).
+    parent : str | None
+        The module being imported when this one was first imported.
+    children : list[str]
+        Modules first imported while importing this one, in import order.
+    """
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int = 0
+    parent: str | None = None
+    children: list[str] = field(default_factory=list)
+
+    @property
+    def cumulative_ms(self) -> float:
+        return self.cumulative_us / 1000
+
+
+@dataclass
+class HeavyImport:
+    """A first-party import that pulls in a heavy third-party package.
+
+    Attributes
+    ----------
+    importer : str
+        The first-party module that imports it first at runtime.
+    module : str
+        The third-party module imported.
+    cumulative_us : int
+        Import time of the third-party module and everything it imports.
+    edges : list[ImportEdge]
+        The import statements responsible, from the static import graph.
+    """
+
+    importer: str
+    module: str
+    cumulative_us: int
+    edges: list[ImportEdge] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return f"{self.importer} -> {self.module} ({self.cumulative_us / 1000:.1f} ms)"
+
+
+@dataclass
+class DeferrableImport:
+    """A top-level import only used inside functions.
+
+    Moving the import into the functions that use it saves its import
+    time at startup, paid instead on the first call.
+
+    Attributes
+    ----------
+    importer : str
+        The module containing the import.
+    module : str
+        The module the import loads.
+    names : list[str]
+        Names bound by the import.
+    file_path : Path
+        Path to the importing file.
+    line_number : int
+        Line of the import statement.
+    cumulative_us : int
+        Startup time saved by deferring it.
+    functions : list[str]
+        Functions (qualified names) that use the imported names.
+    """
+
+    importer: str
+    module: str
+    names: list[str]
+    file_path: Path
+    line_number: int
+    cumulative_us: int
+    functions: list[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.file_path}:{self.line_number}: {self.module} "
+            f"({self.cumulative_us / 1000:.1f} ms) only used in {', '.join(self.functions)}"
+        )
+
+
+def parse_importtime(output: str) -> dict[str, ImportTiming]:
+    """Parse ``-X importtime`` output into a runtime import tree.
+
+    A module is printed after the modules it imported, one indentation
+    level deeper, so children are collected until their parent's line.
+
+    Parameters
+    ----------
+    output : str
+        stderr of a ``python -X importtime`` run. Other lines are ignored.
+
+    Returns
+    -------
+    dict[str, ImportTiming]
+        Timings by module name, in the order imports finished.
+    """
+    timings: dict[str, ImportTiming] = {}
+    # Timings whose parent hasn't been printed yet
+    pending: list[ImportTiming] = []
+
+    for line in output.splitlines():
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+        parts = line[len(IMPORTTIME_PREFIX):].split("|", 2)
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            # The "self [us] | cumulative | imported package" header
+            continue
+        name = parts[2][1:] if parts[2].startswith(" ") else parts[2]
+        module = name.lstrip(" ")
+        timing = ImportTiming(module, self_us, cumulative_us, (len(name) - len(module)) // 2)
+
+        while pending and pending[-1].depth > timing.depth:
+            child = pending.pop()
+            child.parent = module
+            timing.children.insert(0, child.module)
+        pending.append(timing)
+        timings[module] = timing
+
+    return timings
+
+
+def _top_level(module: str) -> str:
+    return module.split(".", 1)[0]
+
+
+class _ImportUsageVisitor(cst.CSTVisitor):
+    """Finds module-level imports whose names are only used in functions.
+
+    Code in function and lambda bodies runs when called; everything else
+    (class bodies, decorators, defaults and annotations unless annotations
+    are postponed) runs at import time.
+    """
+
+    METADATA_DEPENDENCIES = (PositionProvider,)
+
+    def __init__(self, module: str, is_package: bool) -> None:
+        super().__init__()
+        self._module = module
+        self._is_package = is_package
+        self._functions: list[str] = []
+        self._classes: list[str] = []
+        self._postponed_annotations = False
+        # name -> (imported module, line)
+        self.bindings: dict[str, tuple[str, int]] = {}
+        self.module_level_uses: set[str] = set()
+        self.function_uses: dict[str, set[str]] = {}
+
+    # ===== Imports =====
+
+    def _at_module_level(self) -> bool:
+        return not self._functions and not self._classes
+
+    def _line(self, node: cst.CSTNode) -> int:
+        return self.get_metadata(PositionProvider, node).start.line
+
+    def visit_If(self, node: cst.If) -> bool | None:
+        # TYPE_CHECKING imports never run
+        test = node.test
+        if isinstance(test, cst.Attribute):
+            test = test.attr
+        if isinstance(test, cst.Name) and test.value == "TYPE_CHECKING":
+            if node.orelse is not None:
+                node.orelse.visit(self)
+            return False
+        return None
+
+    def visit_Import(self, node: cst.Import) -> bool:
+        if self._at_module_level():
+            for alias in node.names:
+                full_name = cst.Module(body=[]).code_for_node(alias.name)
+                if alias.asname is not None and isinstance(alias.asname.name, cst.Name):
+                    self.bindings[alias.asname.name.value] = (full_name, self._line(node))
+                else:
+                    # import a.b binds a, but loads a.b
+                    self.bindings[_top_level(full_name)] = (full_name, self._line(node))
+        return False
+
+    def visit_ImportFrom(self, node: cst.ImportFrom) -> bool:
+        module = cst.Module(body=[]).code_for_node(node.module) if node.module else ""
+        if module == "__future__":
+            names = node.names if isinstance(node.names, tuple) else ()
+            if any(getattr(a.name, "value", None) == "annotations" for a in names):
+                self._postponed_annotations = True
+            return False
+        if not self._at_module_level() or isinstance(node.names, cst.ImportStar):
+            return False
+        if node.relative:
+            parts = self._module.split(".")
+            if not self._is_package:
+                parts = parts[:-1]
+            level = len(node.relative)
+            if level - 1 > len(parts):
+                return False
+            parts = parts[: len(parts) - level + 1]
+            module = ".".join(parts + ([module] if module else []))
+        for alias in node.names:
+            if not isinstance(alias.name, cst.Name):
+                continue
+            bound = alias.name.value
+            if alias.asname is not None and isinstance(alias.asname.name, cst.Name):
+                bound = alias.asname.name.value
+            # The imported name may be a submodule; resolved against timings later
+            self.bindings[bound] = (f"{module}:{alias.name.value}", self._line(node))
+        return False
+
+    # ===== Uses =====
+
+    def visit_Name(self, node: cst.Name) -> None:
+        if self._functions:
+            self.function_uses.setdefault(node.value, set()).add(self._functions[-1])
+        else:
+            self.module_level_uses.add(node.value)
+
+    def visit_Assign(self, node: cst.Assign) -> None:
+        # Names exported through __all__ must stay importable from here
+        if self._at_module_level() and any(
+            isinstance(t.target, cst.Name) and t.target.value == "__all__" for t in node.targets
+        ):
+            for element in getattr(node.value, "elements", ()):
+                if isinstance(element.value, cst.SimpleString):
+                    self.module_level_uses.add(element.value.evaluated_value)
+
+    def visit_Attribute(self, node: cst.Attribute) -> bool:
+        # Only the root of a.b.c refers to a binding
+        node.value.visit(self)
+        return False
+
+    def visit_Arg(self, node: cst.Arg) -> bool:
+        node.value.visit(self)
+        return False
+
+    def visit_Annotation(self, node: cst.Annotation) -> bool:
+        return not self._postponed_annotations
+
+    def visit_Param(self, node: cst.Param) -> bool:
+        if node.annotation is not None:
+            node.annotation.visit(self)
+        if node.default is not None:
+            node.default.visit(self)
+        return False
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> bool:
+        for part in (*node.decorators, *node.bases, *node.keywords):
+            part.visit(self)
+        self._classes.append(node.name.value)
+        node.body.visit(self)
+        self._classes.pop()
+        return False
+
+    def _qualify(self, name: str) -> str:
+        if self._functions:
+            return f"{self._functions[-1]}.{name}"
+        return ".".join([*self._classes, name])
+
+    def visit_FunctionDef(self, node: cst.FunctionDef) -> bool:
+        for decorator in node.decorators:
+            decorator.visit(self)
+        node.params.visit(self)
+        if node.returns is not None:
+            node.returns.visit(self)
+        self._functions.append(self._qualify(node.name.value))
+        node.body.visit(self)
+        self._functions.pop()
+        return False
+
+    def visit_Lambda(self, node: cst.Lambda) -> bool:
+        node.params.visit(self)
+        self._functions.append(self._qualify("<lambda>"))
+        node.body.visit(self)
+        self._functions.pop()
+        return False
+
+
+class ImportProfile:
+    """Import timings of one entry module, mapped onto the import graph.
+
+    Parameters
+    ----------
+    entry : str
+        The profiled entry module.
+    timings : dict[str, ImportTiming]
+        Parsed ``-X importtime`` output.
+    graph : ImportGraph
+        The project's import graph; timings are attached to it.
+
+    Attributes
+    ----------
+    entry : str
+        The profiled entry module.
+    timings : dict[str, ImportTiming]
+        Timings by module name.
+    graph : ImportGraph
+        The import graph, with timings attached to modules and edges.
+    first_party : set[str]
+        Top-level package names of the project.
+    """
+
+    def __init__(self, entry: str, timings: dict[str, ImportTiming], graph: ImportGraph) -> None:
+        self.entry = entry
+        self.timings = timings
+        self.graph = graph
+        graph.attach_timings(timings)
+        self.first_party = {_top_level(m) for m in graph._module_to_path}
+
+    @property
+    def total_us(self) -> int:
+        """Cumulative import time of the entry module.
+
+        When the entry was run with ``-m`` it isn't imported under its own
+        name, so this is the time of all top-level imports instead.
+        """
+        timing = self.timings.get(self.entry)
+        if timing is not None:
+            return timing.cumulative_us
+        return sum(t.cumulative_us for t in self.timings.values() if t.depth == 0)
+
+    def is_first_party(self, module: str) -> bool:
+        return _top_level(module) in self.first_party
+
+    def is_third_party(self, module: str) -> bool:
+        top = _top_level(module)
+        return (
+            top not in self.first_party
+            and top not in sys.stdlib_module_names
+            and not top.startswith("_")
+        )
+
+    def heaviest_subtrees(self, limit: int = 10, first_party_only: bool = False) -> list[ImportTiming]:
+        """Get the modules with the largest cumulative import time.
+
+        Parameters
+        ----------
+        limit : int
+            Maximum number of modules to return.
+        first_party_only : bool
+            Only include modules of the project.
+
+        Returns
+        -------
+        list[ImportTiming]
+            Timings, heaviest first.
+        """
+        timings = [
+            t for t in self.timings.values()
+            if not first_party_only or self.is_first_party(t.module)
+        ]
+        timings.sort(key=lambda t: (-t.cumulative_us, t.module))
+        return timings[:limit]
+
+    def heavy_third_party_imports(self, min_us: int = 5000) -> list[HeavyImport]:
+        """Find first-party imports that pull in heavy third-party packages.
+
+        Parameters
+        ----------
+        min_us : int
+            Minimum cumulative import time, in microseconds.
+
+        Returns
+        -------
+        list[HeavyImport]
+            Imports, heaviest first.
+        """
+        heavy = []
+        for timing in self.timings.values():
+            if (
+                timing.parent is None
+                or timing.cumulative_us < min_us
+                or not self.is_first_party(timing.parent)
+                or not self.is_third_party(timing.module)
+            ):
+                continue
+            heavy.append(HeavyImport(
+                importer=timing.parent,
+                module=timing.module,
+                cumulative_us=timing.cumulative_us,
+                edges=self._static_edges(timing.parent, timing.module),
+            ))
+        heavy.sort(key=lambda h: (-h.cumulative_us, h.importer, h.module))
+        return heavy
+
+    def _static_edges(self, importer: str, module: str) -> list[ImportEdge]:
+        """Import statements in importer that load module or a submodule."""
+        return [
+            edge
+            for target in sorted(self.graph.get_dependencies(importer))
+            if target == module or target.startswith(module + ".")
+            for edge in self.graph.get_edges_between(importer, target)
+        ]
+
+    def deferrable_imports(self, min_us: int = 1000) -> list[DeferrableImport]:
+        """Find top-level imports that are only used inside functions.
+
+        Only imports that load their module first at runtime count, since
+        deferring an import that something else already paid for saves
+        nothing. How often the functions run isn't measured; they are
+        listed so rarely-called ones can be picked out.
+
+        Parameters
+        ----------
+        min_us : int
+            Minimum startup time saved, in microseconds.
+
+        Returns
+        -------
+        list[DeferrableImport]
+            Imports, largest saving first.
+        """
+        deferrable = []
+        for importer, path in sorted(self.graph._module_to_path.items()):
+            if importer not in self.timings:
+                continue
+            try:
+                visitor = _ImportUsageVisitor(importer, path.name == "__init__.py")
+                MetadataWrapper(cst.parse_module(path.read_text())).visit(visitor)
+            except Exception:
+                continue
+
+            by_module: dict[tuple[str, int], list[str]] = {}
+            for name, (target, line) in visitor.bindings.items():
+                if name in visitor.module_level_uses or name not in visitor.function_uses:
+                    continue
+                by_module.setdefault((self._loaded_module(target), line), []).append(name)
+
+            for (module, line), names in by_module.items():
+                timing = self.timings.get(module)
+                if timing is None or timing.parent != importer or timing.cumulative_us < min_us:
+                    continue
+                functions = sorted(set().union(*(visitor.function_uses[n] for n in names)))
+                deferrable.append(DeferrableImport(
+                    importer=importer,
+                    module=module,
+                    names=sorted(names),
+                    file_path=path,
+                    line_number=line,
+                    cumulative_us=timing.cumulative_us,
+                    functions=functions,
+                ))
+        deferrable.sort(key=lambda d: (-d.cumulative_us, str(d.file_path), d.line_number))
+        return deferrable
+
+    def _loaded_module(self, target: str) -> str:
+        """Module loaded by a binding: ``pkg:name`` is pkg.name if that's a module."""
+        if ":" not in target:
+            return target
+        module, name = target.split(":", 1)
+        submodule = f"{module}.{name}" if module else name
+        return submodule if submodule in self.timings else module
+
+    def summary(self, limit: int = 10) -> str:
+        """Get a human-readable report.
+
+        Parameters
+        ----------
+        limit : int
+            Maximum entries per section.
+
+        Returns
+        -------
+        str
+            Heaviest subtrees, heavy third-party imports and deferrable
+            imports, with times in milliseconds.
+        """
+        lines = [f"Import time of {self.entry}: {self.total_us / 1000:.1f} ms", ""]
+        lines.append("Heaviest subtrees:")
+        for timing in self.heaviest_subtrees(limit):
+            lines.append(f"  {timing.cumulative_ms:8.1f} ms  {timing.module}")
+        lines.append("")
+        lines.append("Heavy third-party imports:")
+        for heavy in self.heavy_third_party_imports()[:limit]:
+            where = f"  ({heavy.edges[0].file_path}:{heavy.edges[0].line_number})" if heavy.edges else ""
+            lines.append(f"  {heavy.cumulative_us / 1000:8.1f} ms  {heavy.importer} -> {heavy.module}{where}")
+        lines.append("")
+        lines.append("Deferrable imports:")
+        for item in self.deferrable_imports()[:limit]:
+            lines.append(
+                f"  {item.cumulative_us / 1000:8.1f} ms  {item.module} in {item.importer} "
+                f"(used in {', '.join(item.functions)})"
+            )
+        return "\n".join(lines)
+
+
+class ImportProfiler:
+    """Profiles import time of a project entry point.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The Rejig instance; its root is put first on ``PYTHONPATH``.
+
+    Example
+    -------
+    >>> result = ImportProfiler(rj).profile("myapp.main")
+    >>> print(result.data["profile"].summary())
+    """
+
+    def __init__(self, rejig: Rejig) -> None:
+        self._rejig = rejig
+
+    def profile(
+        self,
+        entry: str,
+        python: str | None = None,
+        run_main: bool = False,
+        timeout: float = 120,
+    ) -> Result:
+        """Import an entry module under ``-X importtime`` and map the timings.
+
+        Parameters
+        ----------
+        entry : str
+            Dotted name of the entry module, importable from the project root.
+        python : str | None
+            Interpreter to run. Defaults to the current one.
+        run_main : bool
+            Run the module with ``-m`` (executing its ``__main__`` block)
+            instead of only importing it.
+        timeout : float
+            Seconds before the subprocess is killed.
+
+        Returns
+        -------
+        Result
+            Result with ``data["profile"]`` (an ``ImportProfile``) and
+            ``data["total_us"]``.
+        """
+        root = self._rejig.root
+        command = [python or sys.executable, "-X", "importtime"]
+        command += ["-m", entry] if run_main else ["-c", _IMPORT_ENTRY, entry]
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (str(root), env.get("PYTHONPATH", "")) if p
+        )
+
+        try:
+            process = subprocess.run(
+                command, cwd=root, env=env, capture_output=True, text=True, timeout=timeout,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            return ErrorResult(
+                message=f"Failed to run {entry}: {e}",
+                exception=e,
+                operation="profile_imports",
+            )
+
+        timings = parse_importtime(process.stderr)
+        if process.returncode != 0 or not timings:
+            errors = [
+                line for line in process.stderr.splitlines()
+                if not line.startswith(IMPORTTIME_PREFIX)
+            ]
+            detail = errors[-1] if errors else f"exit code {process.returncode}"
+            return ErrorResult(
+                message=f"Failed to import {entry}: {detail}",
+                operation="profile_imports",
+            )
+
+        profile = ImportProfile(entry, timings, ImportGraph(self._rejig))
+        return Result(
+            success=True,
+            message=(
+                f"Imported {entry} in {profile.total_us / 1000:.1f} ms "
+                f"({len(timings)} modules)"
+            ),
+            data={"profile": profile, "total_us": profile.total_us},
+        )
@@ -3,6 +3,7 @@
 This package provides utilities for:
 - Splitting files by class or function
 - Merging multiple modules
+- Renaming modules and moving classes/functions between them
 - Managing __all__ exports
 - Adding/updating file headers (copyright, license)
 """
@@ -22,6 +23,7 @@ from rejig.modules.headers import (
     update_copyright_year,
 )
 from rejig.modules.merge import ModuleMerger, merge_modules
+from rejig.modules.move import DefinitionMover, move_definition
 from rejig.modules.rename import ModuleRenamer, move_module, rename_module
 from rejig.modules.split import ModuleSplitter, split_by_class, split_by_function
 
@@ -37,6 +39,9 @@ __all__ = [
     "ModuleRenamer",
     "rename_module",
     "move_module",
+    # Move utilities
+    "DefinitionMover",
+    "move_definition",
     # Exports management
     "ExportsManager",
     "get_all_exports",
@@ -0,0 +1,472 @@
+"""Moving classes and functions between modules.
+
+The definition is cut from its module together with the imports only it
+needs, inserted into the destination with the imports it requires there,
+and every importer found through the import-site index is rewritten. All
+edits go into one transaction, so no project-wide index (such as rope's)
+has to be built or thrown away.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Union
+
+import libcst as cst
+from libcst.metadata import GlobalScope, MetadataWrapper, PositionProvider, ScopeProvider
+
+from rejig.core.diff import combine_diffs, generate_diff
+from rejig.core.results import ErrorResult, Result
+from rejig.imports.analyzer import (
+    RemoveImportAliasesTransformer,
+    dotted_name,
+    dunder_all_names,
+    is_docstring,
+    is_import_line,
+    walk_nodes,
+)
+from rejig.imports.index import ImportSiteIndex, resolve_relative
+from rejig.modules.rename import rename_in_code
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+    from rejig.core.transaction import Transaction
+
+_Definition = Union[cst.ClassDef, cst.FunctionDef]
+_ImportStatement = Union[cst.Import, cst.ImportFrom]
+
+
+def _insert_imports(module: cst.Module, lines: list[str]) -> cst.Module:
+    """Add import lines after the module's leading imports (or docstring)."""
+    if not lines:
+        return module
+    body = list(module.body)
+    index = 0
+    for i, statement in enumerate(body):
+        if is_import_line(statement) or (i == 0 and is_docstring(statement)):
+            index = i + 1
+        else:
+            break
+    new = [cst.parse_statement(line) for line in lines]
+    if index == 0 and body:
+        # Separate new imports from code that starts the file
+        body[0] = body[0].with_changes(leading_lines=[cst.EmptyLine(), cst.EmptyLine()])
+    return module.with_changes(body=[*body[:index], *new, *body[index:]])
+
+
+class _SourcePlan:
+    """What moving a definition out of its module takes.
+
+    Uses the scope analysis of the source module: names the definition uses
+    from the module's global scope become imports at the destination, and
+    imports only the definition used are removed from the source.
+    """
+
+    def __init__(
+        self,
+        wrapper: MetadataWrapper,
+        definition: _Definition,
+        module_name: str,
+        is_package: bool,
+        dest_module: str,
+        dest_is_package: bool,
+    ) -> None:
+        self._module_name = module_name
+        self._is_package = is_package
+        self._dest_module = dest_module
+        self._dest_is_package = dest_is_package
+        self._definition = definition
+        scopes = wrapper.resolve(ScopeProvider)
+        self._positions = wrapper.resolve(PositionProvider)
+        self._global = scopes[wrapper.module]
+        self._inside = set(walk_nodes(definition))
+        self._exports = dunder_all_names(wrapper.module.body)
+        # Import lines the destination needs, in source order
+        self.imports: list[str] = []
+        self.removed: dict[_ImportStatement, set[cst.ImportAlias]] = {}
+        # Whether the source still uses the moved name
+        self.still_used = False
+
+    def plan(self) -> None:
+        name = self._definition.name.value
+        needed: list[tuple[cst.CSTNode, str]] = []
+        for assignment in self._global.assignments:
+            uses = [a for a in assignment.references if a.node in self._inside]
+            if assignment.name == name:
+                outside = [a for a in assignment.references if a.node not in self._inside]
+                self.still_used = bool(outside) or name in self._exports
+                continue
+            if not uses or not isinstance(assignment.scope, GlobalScope):
+                continue
+            node = assignment.node
+            if isinstance(node, (cst.Import, cst.ImportFrom)):
+                line = self._import_line(node, assignment.name)
+                if line is None:
+                    continue
+                needed.append((node, line))
+                if assignment.name not in self._exports and all(
+                    a.node in self._inside for a in assignment.references
+                ):
+                    self._remove(node, assignment.name)
+            else:
+                needed.append((node, f"from {self._module_name} import {assignment.name}"))
+
+        def position(item: tuple[cst.CSTNode, str]) -> tuple[int, int]:
+            start = self._positions[item[0]].start
+            return (start.line, start.column)
+
+        for _, line in sorted(needed, key=position):
+            if line not in self.imports:
+                self.imports.append(line)
+
+    def _alias_for(self, node: _ImportStatement, name: str) -> cst.ImportAlias | None:
+        if isinstance(node.names, cst.ImportStar):
+            return None
+        for alias in node.names:
+            if alias.asname is not None:
+                if isinstance(alias.asname.name, cst.Name) and alias.asname.name.value == name:
+                    return alias
+            elif isinstance(node, cst.Import):
+                dotted = dotted_name(alias.name)
+                if dotted == name or dotted.startswith(name + "."):
+                    return alias
+            elif alias.name.value == name:
+                return alias
+        return None
+
+    def _import_line(self, node: _ImportStatement, name: str) -> str | None:
+        """The import binding name, made absolute for the destination."""
+        alias = self._alias_for(node, name)
+        if alias is None:
+            return None
+        asname = f" as {alias.asname.name.value}" if alias.asname is not None else ""
+        if isinstance(node, cst.Import):
+            return f"import {dotted_name(alias.name)}{asname}"
+        module = dotted_name(node.module) if node.module else ""
+        base = resolve_relative(self._module_name, self._is_package, module, len(node.relative))
+        if base is None or base == "__future__":
+            return None
+        if node.relative:
+            # Stay relative if the destination reaches the module with the same dots
+            level = len(node.relative)
+            anchor = resolve_relative(self._dest_module, self._dest_is_package, "", level)
+            if anchor is not None and (base == anchor or base.startswith(anchor + ".")):
+                return f"from {'.' * level}{base[len(anchor) + 1:]} import {alias.name.value}{asname}"
+        return f"from {base} import {alias.name.value}{asname}"
+
+    def _remove(self, node: _ImportStatement, name: str) -> None:
+        alias = self._alias_for(node, name)
+        if alias is not None:
+            self.removed.setdefault(node, set()).add(alias)
+
+
+def _find_definition(module: cst.Module, name: str, kind: str) -> _Definition | None:
+    node_type = cst.ClassDef if kind == "class" else cst.FunctionDef
+    for statement in module.body:
+        if isinstance(statement, node_type) and statement.name.value == name:
+            return statement
+    return None
+
+
+class DefinitionMover:
+    """Move top-level classes and functions to another module.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The parent Rejig instance.
+
+    Examples
+    --------
+    >>> mover = DefinitionMover(rj)
+    >>> mover.move(Path("src/myapp/models.py"), "User", "myapp.accounts")
+    """
+
+    def __init__(self, rejig: Rejig) -> None:
+        self._rejig = rejig
+
+    def move(
+        self,
+        source_file: Path,
+        name: str,
+        dest_module: str,
+        kind: str = "class",
+        allow_cycle: bool = False,
+    ) -> Result:
+        """Move a definition and update every import of it.
+
+        The destination module is created if its package exists. The
+        definition's own imports go with it (relative imports made
+        absolute), and names it uses from the source module are imported
+        from there. Importers are rewritten whether they import the name
+        absolutely, relatively, under an alias or through its module. All
+        files are changed together in a transaction (or added to the
+        current one, if any).
+
+        If the source module still uses the definition while the definition
+        uses names from the source module, the two modules would import
+        each other. Such a move is refused unless ``allow_cycle`` is set.
+
+        Parameters
+        ----------
+        source_file : Path
+            File containing the definition.
+        name : str
+            Name of the class or function.
+        dest_module : str
+            Dotted name of the destination module.
+        kind : str
+            "class" or "function".
+        allow_cycle : bool
+            Move the definition even if the source and destination modules
+            end up importing each other.
+
+        Returns
+        -------
+        Result
+            Result with the combined diff. A refused move is an ErrorResult
+            whose diff previews the edits.
+        """
+        tx = self._rejig.current_transaction
+        if tx is not None:
+            return self._move(tx, source_file, name, dest_module, kind, allow_cycle)
+
+        try:
+            with self._rejig.transaction() as tx:
+                result = self._move(tx, source_file, name, dest_module, kind, allow_cycle)
+                if not result.success:
+                    return result
+                batch = tx.commit()
+        except Exception as e:
+            return ErrorResult(
+                message=f"Error moving {name}: {e}",
+                exception=e,
+                operation="move",
+            )
+
+        if not batch.success:
+            return ErrorResult(
+                message="; ".join(r.message for r in batch.failed),
+                operation="move",
+            )
+        return Result(
+            success=True,
+            message=result.message,
+            files_changed=batch.files_changed,
+            diff=batch.diff,
+            diffs=batch.diffs,
+        )
+
+    def _dest_file(self, source_file: Path, source_module: str, dest_module: str) -> Path:
+        """File of the destination module, found relative to the source's package root."""
+        depth = source_module.count(".") + (1 if source_file.name == "__init__.py" else 0)
+        base = source_file.parents[depth]
+        parts = dest_module.split(".")
+        package = base.joinpath(*parts) / "__init__.py"
+        if package.exists():
+            return package
+        return base.joinpath(*parts[:-1]) / f"{parts[-1]}.py"
+
+    def _move(
+        self,
+        tx: Transaction,
+        source_file: Path,
+        name: str,
+        dest_module: str,
+        kind: str,
+        allow_cycle: bool,
+    ) -> Result:
+        """Plan and record every edit of the move in a transaction."""
+        source_file = Path(source_file)
+        index = ImportSiteIndex(self._rejig)
+        source_module = index.module_name(source_file)
+        if source_module is None:
+            from rejig.analysis.call_graph import _path_to_module
+
+            source_module = _path_to_module(source_file)
+        content = tx.get_current_content(source_file)
+        if content is None or source_module is None:
+            return Result(success=False, message=f"File not found: {source_file}")
+        if dest_module == source_module:
+            return Result(success=False, message=f"{name} is already in {dest_module}")
+
+        try:
+            wrapper = MetadataWrapper(cst.parse_module(content), unsafe_skip_copy=True)
+        except cst.ParserSyntaxError as e:
+            return Result(success=False, message=f"Failed to parse {source_file}: {e}")
+        definition = _find_definition(wrapper.module, name, kind)
+        if definition is None:
+            return Result(success=False, message=f"Could not find {kind} {name} in {source_file}")
+
+        dest_file = self._dest_file(source_file, source_module, dest_module)
+        if not dest_file.parent.is_dir():
+            return Result(success=False, message=f"Destination package not found for {dest_module}")
+
+        is_package = source_file.name == "__init__.py"
+        dest_is_package = dest_file.name == "__init__.py"
+        plan = _SourcePlan(wrapper, definition, source_module, is_package, dest_module, dest_is_package)
+        plan.plan()
+        old_name = f"{source_module}.{name}"
+        new_name = f"{dest_module}.{name}"
+
+        # Destination: existing importers of the name now import it locally
+        dest_content = tx.get_current_content(dest_file) or ""
+        dest_content = rename_in_code(dest_content, old_name, new_name, dest_module, dest_is_package)
+        try:
+            dest_tree = self._add_definition(
+                cst.parse_module(dest_content), definition, plan.imports, dest_module, name
+            )
+        except ValueError as e:
+            return Result(success=False, message=str(e))
+
+        # Source: cut the definition and the imports only it used
+        source_tree = wrapper.module.with_changes(
+            body=[s for s in wrapper.module.body if s is not definition]
+        )
+        if plan.removed:
+            source_tree = source_tree.visit(RemoveImportAliasesTransformer(plan.removed))
+        if plan.still_used:
+            source_tree = _insert_imports(source_tree, [f"from {dest_module} import {name}"])
+
+        changes = {source_file: (content, source_tree.code)}
+        original_dest = tx.get_current_content(dest_file) or ""
+        changes[dest_file] = (original_dest, dest_tree.code)
+
+        # Importers elsewhere
+        for path in index.files_importing(old_name):
+            if path in changes:
+                continue
+            original = tx.get_current_content(path)
+            if original is None:
+                continue
+            try:
+                updated = rename_in_code(
+                    original, old_name, new_name, index.module_name(path), path.name == "__init__.py"
+                )
+            except cst.ParserSyntaxError:
+                continue
+            if updated != original:
+                changes[path] = (original, updated)
+
+        diffs: dict[Path, str] = {}
+        cycle = plan.still_used and any(
+            line.startswith(f"from {source_module} import ") for line in plan.imports
+        )
+        if cycle and not allow_cycle:
+            for path, (original, updated) in changes.items():
+                diff = generate_diff(original, updated, path)
+                if diff:
+                    diffs[path] = diff
+            return ErrorResult(
+                message=(
+                    f"Moving {name} to {dest_module} would make {source_module} and {dest_module} "
+                    "import each other; pass allow_cycle=True to move it anyway"
+                ),
+                operation="move",
+                diff=combine_diffs(diffs) if diffs else None,
+                diffs=diffs,
+            )
+
+        for path, (original, updated) in changes.items():
+            change = tx.add_change(path, original, updated, f"move {name} to {dest_module}")
+            if change.diff:
+                diffs[path] = change.diff
+
+        prefix = "[DRY RUN] Would move" if self._rejig.dry_run else "Moved"
+        message = f"{prefix} {name} to {dest_module}"
+        if cycle:
+            message += f" ({source_module} and {dest_module} now import each other)"
+        return Result(
+            success=True,
+            message=message,
+            files_changed=list(changes),
+            diff=combine_diffs(diffs) if diffs else None,
+            diffs=diffs,
+        )
+
+    def _add_definition(
+        self,
+        module: cst.Module,
+        definition: _Definition,
+        imports: list[str],
+        dest_module: str,
+        name: str,
+    ) -> cst.Module:
+        """Append the definition and the imports it needs to a module.
+
+        Raises
+        ------
+        ValueError
+            If the module already defines the name.
+        """
+        wrapper = MetadataWrapper(module, unsafe_skip_copy=True)
+        scope = wrapper.resolve(ScopeProvider)[wrapper.module]
+        module = wrapper.module
+
+        # Drop imports of the name itself (e.g. from its old module)
+        removed: dict[_ImportStatement, set[cst.ImportAlias]] = {}
+        for assignment in scope[name] if name in scope else ():
+            node = assignment.node
+            if isinstance(node, cst.ImportFrom) and not isinstance(node.names, cst.ImportStar):
+                removed.setdefault(node, set()).update(
+                    a for a in node.names if (a.asname is None and a.name.value == name)
+                )
+            else:
+                raise ValueError(f"{dest_module} already defines {name}")
+        if removed:
+            module = module.visit(RemoveImportAliasesTransformer(removed))
+
+        new_imports = []
+        for line in imports:
+            (alias,) = cst.parse_statement(line).body[0].names
+            if alias.asname is not None:
+                bound = alias.asname.name.value
+            else:
+                bound = dotted_name(alias.name).split(".")[0]
+            # Names already bound at the destination, and its own names, are kept
+            if bound in scope or line.startswith(f"from {dest_module} import "):
+                continue
+            new_imports.append(line)
+        module = _insert_imports(module, new_imports)
+
+        comments = [line for line in definition.leading_lines if line.comment is not None]
+        spacing = [cst.EmptyLine(), cst.EmptyLine()] if module.body else []
+        moved = definition.with_changes(leading_lines=[*spacing, *comments])
+        return module.with_changes(body=[*module.body, moved], has_trailing_newline=True)
+
+
+# Convenience functions
+
+
+def move_definition(
+    rejig: Rejig,
+    source_file: Path,
+    name: str,
+    dest_module: str,
+    kind: str = "class",
+    allow_cycle: bool = False,
+) -> Result:
+    """Move a class or function to another module and update its imports.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The parent Rejig instance.
+    source_file : Path
+        File containing the definition.
+    name : str
+        Name of the class or function.
+    dest_module : str
+        Dotted name of the destination module.
+    kind : str
+        "class" or "function".
+    allow_cycle : bool
+        Move the definition even if the source and destination modules end
+        up importing each other.
+
+    Returns
+    -------
+    Result
+        Result of the operation.
+    """
+    mover = DefinitionMover(rejig)
+    return mover.move(source_file, name, dest_module, kind, allow_cycle)
@@ -5,16 +5,29 @@ with automatic import updates across the project.
 """
 from __future__ import annotations
 
-import re
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Union
 
 import libcst as cst
+from libcst.metadata import (
+    Assignment,
+    BaseAssignment,
+    MetadataWrapper,
+    ParentNodeProvider,
+    Scope,
+    ScopeProvider,
+)
+
+from rejig.core.diff import combine_diffs
+from rejig.core.results import ErrorResult, Result
+from rejig.imports.analyzer import dotted_name
+from rejig.imports.index import ImportSiteIndex, resolve_relative
 
 if TYPE_CHECKING:
     from rejig.core.rejig import Rejig
+    from rejig.core.transaction import Transaction
 
-from rejig.core.results import Result
+_ImportStatement = Union[cst.Import, cst.ImportFrom]
 
 
 class ModuleRenamer:
@@ -62,15 +75,23 @@ class ModuleRenamer:
         # Calculate new file path
         new_file = self._calculate_new_path(old_module, new_module, old_file)
 
+        # Update imports first, so the moved file carries its own updates
+        files_changed = [old_file, new_file]
+        diffs: dict[Path, str] = {}
+        if update_imports:
+            update_result = self.rename_imports(old_module, new_module)
+            if not update_result.success:
+                return update_result
+            files_changed.extend(f for f in update_result.files_changed if f not in files_changed)
+            diffs = update_result.diffs
+
         if self._rejig.dry_run:
-            files_changed = [old_file, new_file]
-            if update_imports:
-                import_files = self._find_files_with_import(old_module)
-                files_changed.extend(import_files)
             return Result(
                 success=True,
                 message=f"[DRY RUN] Would rename {old_module} to {new_module}",
                 files_changed=files_changed,
+                diff=combine_diffs(diffs) if diffs else None,
+                diffs=diffs,
             )
 
         # Create new directory if needed
@@ -87,17 +108,12 @@ class ModuleRenamer:
                 message=f"Failed to rename file: {e}",
             )
 
-        files_changed = [old_file, new_file]
-
-        # Update imports if requested
-        if update_imports:
-            update_result = self._update_imports(old_module, new_module)
-            files_changed.extend(update_result.get("files", []))
-
         return Result(
             success=True,
             message=f"Renamed {old_module} to {new_module}",
             files_changed=files_changed,
+            diff=combine_diffs(diffs) if diffs else None,
+            diffs=diffs,
         )
 
     def move_to(
@@ -172,131 +188,424 @@ class ModuleRenamer:
 
         return new_path
 
-    def _find_files_with_import(self, module_path: str) -> list[Path]:
-        """Find all files that import the given module."""
-        files: list[Path] = []
+    def rename_imports(self, old_name: str, new_name: str) -> Result:
+        """Point every import of a module or name at its new location.
 
-        # Patterns to match
-        patterns = [
-            rf"import\s+{re.escape(module_path)}\b",
-            rf"from\s+{re.escape(module_path)}\s+import",
-            rf"from\s+{re.escape(module_path.rsplit('.', 1)[0])}\s+import\s+.*\b{re.escape(module_path.rsplit('.', 1)[-1])}\b"
-            if "." in module_path
-            else None,
-        ]
-        patterns = [p for p in patterns if p is not None]
+        Only files whose imports can reach ``old_name`` (found through the
+        import-site index) are opened. Each is rewritten with libcst, so
+        strings and comments mentioning the old path are left alone, and
+        attribute references such as ``old.mod.func()`` are updated along
+        with the imports. All files are changed together in a transaction
+        (or added to the current one, if any).
 
-        for file_path in self._rejig.files:
+        Parameters
+        ----------
+        old_name : str
+            Current dotted path (e.g., "myapp.old_utils" or
+            "myapp.old_utils.OldClass").
+        new_name : str
+            New dotted path.
+
+        Returns
+        -------
+        Result
+            Result with the combined diff.
+        """
+        tx = self._rejig.current_transaction
+        if tx is not None:
+            return self._update_imports(tx, old_name, new_name)
+
+        try:
+            with self._rejig.transaction() as tx:
+                result = self._update_imports(tx, old_name, new_name)
+                if not result.files_changed:
+                    return result
+                batch = tx.commit()
+        except Exception as e:
+            return ErrorResult(
+                message=f"Failed to update imports: {e}",
+                exception=e,
+                operation="rename_imports",
+            )
+
+        if not batch.success:
+            return ErrorResult(
+                message="; ".join(r.message for r in batch.failed),
+                operation="rename_imports",
+            )
+        return Result(
+            success=True,
+            message=result.message,
+            files_changed=batch.files_changed,
+            diff=batch.diff,
+            diffs=batch.diffs,
+        )
+
+    def _update_imports(self, tx: Transaction, old_name: str, new_name: str) -> Result:
+        """Rewrite the files that import old_name, recording changes in a transaction."""
+        index = ImportSiteIndex(self._rejig)
+        diffs: dict[Path, str] = {}
+        files_changed = []
+
+        for path in index.files_importing(old_name):
+            content = tx.get_current_content(path)
+            if content is None:
+                continue
             try:
-                content = file_path.read_text()
-                for pattern in patterns:
-                    if re.search(pattern, content):
-                        files.append(file_path)
-                        break
-            except Exception:
+                new_content = rename_in_code(
+                    content, old_name, new_name, index.module_name(path), path.name == "__init__.py"
+                )
+            except cst.ParserSyntaxError:
+                continue
+            if new_content == content:
                 continue
+            change = tx.add_change(path, content, new_content, f"rename {old_name} to {new_name}")
+            files_changed.append(path)
+            if change.diff:
+                diffs[path] = change.diff
 
-        return files
+        return Result(
+            success=True,
+            message=f"Updated imports in {len(files_changed)} files",
+            files_changed=files_changed,
+            diff=combine_diffs(diffs) if diffs else None,
+            diffs=diffs,
+        )
 
-    def _update_imports(self, old_module: str, new_module: str) -> dict:
-        """Update imports across the project."""
-        files_changed: list[Path] = []
 
-        for file_path in self._rejig.files:
-            try:
-                content = file_path.read_text()
-                original_content = content
+def _under(name: str, prefix: str) -> bool:
+    """Whether name is prefix or something inside it."""
+    return name == prefix or name.startswith(prefix + ".")
 
-                # Update various import forms
-                content = self._update_import_statements(content, old_module, new_module)
 
-                if content != original_content:
-                    file_path.write_text(content)
-                    files_changed.append(file_path)
-            except Exception:
-                continue
+def _build_dotted(name: str) -> cst.Name | cst.Attribute:
+    """Build a Name/Attribute expression from a dotted name."""
+    parts = name.split(".")
+    result: cst.Name | cst.Attribute = cst.Name(parts[0])
+    for part in parts[1:]:
+        result = cst.Attribute(value=result, attr=cst.Name(part))
+    return result
 
-        return {"files": files_changed}
 
-    def _update_import_statements(
+class _RenamePlanner:
+    """Works out the import and reference edits for one rename in a module.
+
+    Every import statement (at any depth) that can reach the old name is
+    rewritten; scope analysis finds the uses of the names those imports
+    bind, so only references through them are changed.
+    """
+
+    def __init__(
         self,
-        content: str,
-        old_module: str,
-        new_module: str,
-    ) -> str:
-        """Update import statements in content."""
-        # Direct module import: import myapp.old_utils
-        content = re.sub(
-            rf"\bimport\s+{re.escape(old_module)}\b",
-            f"import {new_module}",
-            content,
-        )
+        wrapper: MetadataWrapper,
+        old_name: str,
+        new_name: str,
+        module_name: str | None,
+        is_package: bool,
+    ) -> None:
+        self._old = old_name
+        self._new = new_name
+        self._module_name = module_name
+        self._is_package = is_package
+        self._module = wrapper.module
+        self._scopes = wrapper.resolve(ScopeProvider)
+        self._parents = wrapper.resolve(ParentNodeProvider)
+        # Replacement statements for each changed import (the first one
+        # takes its place, the rest are added after its line)
+        self.statements: dict[_ImportStatement, list[_ImportStatement]] = {}
+        self.references: dict[cst.CSTNode, cst.BaseExpression] = {}
+
+    def _moved(self, name: str) -> str | None:
+        """New dotted name for name, if it is (inside) the renamed path."""
+        if not _under(name, self._old):
+            return None
+        return self._new + name[len(self._old):]
+
+    def plan(self) -> None:
+        for node, scope in self._scopes.items():
+            if scope is None:
+                continue
+            if isinstance(node, cst.Import):
+                self._plan_import(node, scope)
+            elif isinstance(node, cst.ImportFrom):
+                self._plan_import_from(node, scope)
+
+    def _plan_import(self, node: cst.Import, scope: Scope) -> None:
+        aliases = []
+        for alias in node.names:
+            moved = self._moved(dotted_name(alias.name))
+            aliases.append(alias if moved is None else alias.with_changes(name=_build_dotted(moved)))
+        if aliases != list(node.names):
+            self.statements[node] = [node.with_changes(names=aliases)]
+
+        for assignment in scope.assignments:
+            if assignment.node is not node:
+                continue
+            local = assignment.name
+            for alias in node.names:
+                dotted = dotted_name(alias.name)
+                if alias.asname is not None:
+                    if isinstance(alias.asname.name, cst.Name) and alias.asname.name.value == local:
+                        self._plan_references(assignment, dotted, self._moved(dotted) or dotted, local)
+                        break
+                elif _under(dotted, local):
+                    # "import a.b" binds "a" and "a.b"; their new names come
+                    # from the rewritten statement
+                    new_dotted = self._moved(dotted) or dotted
+                    new_local = self._moved(local) or ".".join(
+                        new_dotted.split(".")[: local.count(".") + 1]
+                    )
+                    self._plan_references(assignment, local, new_local, new_local)
+                    break
+
+    def _plan_import_from(self, node: cst.ImportFrom, scope: Scope) -> None:
+        module = dotted_name(node.module) if node.module else ""
+        base = resolve_relative(self._module_name, self._is_package, module, len(node.relative))
+        if base is None or base == "__future__":
+            return
+
+        moved_base = self._moved(base)
+        if moved_base is not None:
+            # The names keep their local names, so only the statement changes
+            self.statements[node] = [node.with_changes(**self._from_module(node, moved_base))]
+            return
+        if isinstance(node.names, cst.ImportStar):
+            return
+
+        kept: list[cst.ImportAlias] = []
+        moved: dict[str, list[cst.ImportAlias]] = {}
+        for alias in node.names:
+            target = self._moved(f"{base}.{alias.name.value}")
+            if target is None:
+                kept.append(alias)
+                continue
+            dest, _, name = target.rpartition(".")
+            new_alias = alias.with_changes(name=cst.Name(name))
+            if dest == base:
+                kept.append(new_alias)
+            else:
+                moved.setdefault(dest, []).append(new_alias)
+        if kept != list(node.names):
+            statements: list[_ImportStatement] = []
+            if kept:
+                statements.append(node.with_changes(names=self._fix_commas(node, kept)))
+            for dest, aliases in moved.items():
+                if not dest:
+                    statements.append(cst.Import(names=self._fix_commas(None, aliases)))
+                else:
+                    statements.append(
+                        cst.ImportFrom(names=self._fix_commas(None, aliases), **self._from_module(node, dest))
+                    )
+            self.statements[node] = statements
+
+        for assignment in scope.assignments:
+            if assignment.node is not node:
+                continue
+            local = assignment.name
+            for alias in node.names:
+                asname = alias.asname.name if alias.asname is not None else None
+                if (asname.value if isinstance(asname, cst.Name) else alias.name.value) != local:
+                    continue
+                full = f"{base}.{alias.name.value}"
+                target = self._moved(full)
+                new_local = local
+                if target is not None and asname is None:
+                    new_local = target.rpartition(".")[2]
+                self._plan_references(assignment, full, target or full, new_local)
+                break
+
+    def _import_new_name(self, assignment: Assignment) -> str | None:
+        """Add ``from <new parent> import <new name>`` after an import.
+
+        Returns the name to use, or None if the new path is top-level or its
+        name is already bound where the import is.
+        """
+        dest, _, name = self._new.rpartition(".")
+        if name in assignment.scope:
+            # Fine if the name already is (or is being renamed to) the new path
+            targets = {self._import_target(a) for a in assignment.scope[name]}
+            return name if targets <= {self._old, self._new} else None
+        if not dest:
+            return None
+        statement = assignment.node
+        added = cst.ImportFrom(module=_build_dotted(dest), names=[cst.ImportAlias(name=cst.Name(name))])
+        statements = self.statements.get(statement, [statement])
+        if not any(added.deep_equals(s) for s in statements[1:]):
+            self.statements[statement] = [*statements, added]
+        return name
+
+    def _import_target(self, assignment: BaseAssignment) -> str | None:
+        """Absolute path a from-imported name stands for, if it is one."""
+        node = getattr(assignment, "node", None)
+        if not isinstance(node, cst.ImportFrom) or isinstance(node.names, cst.ImportStar):
+            return None
+        module = dotted_name(node.module) if node.module else ""
+        base = resolve_relative(self._module_name, self._is_package, module, len(node.relative))
+        for alias in node.names:
+            asname = alias.asname.name if alias.asname is not None else alias.name
+            if isinstance(asname, cst.Name) and asname.value == assignment.name:
+                return f"{base}.{alias.name.value}"
+        return None
 
-        # From import: from myapp.old_utils import X
-        content = re.sub(
-            rf"\bfrom\s+{re.escape(old_module)}\s+import\b",
-            f"from {new_module} import",
-            content,
-        )
+    def _from_module(self, node: cst.ImportFrom, dest: str) -> dict:
+        """Module and dots importing from dest, relative if node was and can be."""
+        if node.relative:
+            anchor = resolve_relative(self._module_name, self._is_package, "", len(node.relative))
+            if anchor is not None and _under(dest, anchor):
+                rest = dest[len(anchor) + 1:]
+                return {"module": _build_dotted(rest) if rest else None, "relative": node.relative}
+        return {"module": _build_dotted(dest), "relative": []}
+
+    @staticmethod
+    def _fix_commas(node: cst.ImportFrom | None, aliases: list[cst.ImportAlias]) -> list[cst.ImportAlias]:
+        """End the names like the original statement did.
+
+        Without parentheses a trailing comma is a syntax error; with them,
+        the original last comma keeps the closing parenthesis in place.
+        """
+        if node is None:
+            return [a.with_changes(comma=cst.MaybeSentinel.DEFAULT) for a in aliases]
+        comma = node.names[-1].comma if node.rpar is not None else cst.MaybeSentinel.DEFAULT
+        return [*aliases[:-1], aliases[-1].with_changes(comma=comma)]
 
-        # Also handle if the module is part of a from import
-        # from myapp import old_utils
-        if "." in old_module:
-            parent, name = old_module.rsplit(".", 1)
-            new_parent, new_name = new_module.rsplit(".", 1)
-
-            if parent == new_parent:
-                # Same parent, just rename the imported name
-                # from myapp import old_utils -> from myapp import new_utils
-                content = re.sub(
-                    rf"(\bfrom\s+{re.escape(parent)}\s+import\s+(?:.*,\s*)?)(\b{re.escape(name)}\b)",
-                    rf"\1{new_name}",
-                    content,
-                )
+    def _plan_references(self, assignment: Assignment, full: str, new_full: str, new_local: str) -> None:
+        """Rewrite uses of one imported name.
 
-        return content
+        ``full`` is the dotted path the local name stands for before the
+        rename and ``new_full`` after it, reached through ``new_local``.
+        """
+        local = assignment.name
+        if _under(full, self._old):
+            # The name itself was renamed; uses change only if its local name does
+            if new_local != local:
+                for access in assignment.references:
+                    if isinstance(access.node, (cst.Name, cst.Attribute)):
+                        self.references[access.node] = _build_dotted(new_local)
+            return
+        if not _under(self._old, full):
+            return
+
+        expected = local + self._old[len(full):]
+        if _under(self._new, new_full):
+            replacement = new_local + self._new[len(new_full):]
+        else:
+            # Not reachable through this import: import the new name directly
+            replacement = self._import_new_name(assignment)
+            if replacement is None:
+                return
+        depth = self._old.count(".") - full.count(".")
+        for access in assignment.references:
+            node = access.node
+            if not isinstance(node, (cst.Name, cst.Attribute)):
+                continue
+            for _ in range(depth):
+                parent = self._parents.get(node)
+                if not isinstance(parent, cst.Attribute) or parent.value is not node:
+                    break
+                node = parent
+            if dotted_name(node) == expected:
+                self.references[node] = _build_dotted(replacement)
 
 
 class ImportUpdater(cst.CSTTransformer):
-    """CST transformer for updating import statements."""
+    """CST transformer applying the edits planned for a rename."""
+
+    def __init__(
+        self,
+        statements: dict[_ImportStatement, list[_ImportStatement]],
+        references: dict[cst.CSTNode, cst.BaseExpression],
+    ) -> None:
+        self.statements = statements
+        self.references = references
 
-    def __init__(self, old_module: str, new_module: str) -> None:
-        self.old_module = old_module
-        self.new_module = new_module
-        self.changed = False
+    def _extra(self, original_node: cst.SimpleStatementLine | cst.SimpleStatementSuite) -> list:
+        return [s for small in original_node.body for s in self.statements.get(small, [])[1:]]
+
+    def leave_SimpleStatementLine(
+        self,
+        original_node: cst.SimpleStatementLine,
+        updated_node: cst.SimpleStatementLine,
+    ) -> cst.SimpleStatementLine | cst.FlattenSentinel:
+        extra = self._extra(original_node)
+        if not extra:
+            return updated_node
+        return cst.FlattenSentinel([updated_node, *(cst.SimpleStatementLine(body=[s]) for s in extra)])
+
+    def leave_SimpleStatementSuite(
+        self,
+        original_node: cst.SimpleStatementSuite,
+        updated_node: cst.SimpleStatementSuite,
+    ) -> cst.SimpleStatementSuite:
+        extra = self._extra(original_node)
+        if not extra:
+            return updated_node
+        return updated_node.with_changes(body=[*updated_node.body, *extra])
+
+    def leave_Import(self, original_node: cst.Import, updated_node: cst.Import) -> cst.Import:
+        return self.statements.get(original_node, [updated_node])[0]
 
     def leave_ImportFrom(
         self,
         original_node: cst.ImportFrom,
         updated_node: cst.ImportFrom,
-    ) -> cst.ImportFrom:
-        if updated_node.module is None:
-            return updated_node
+    ) -> _ImportStatement:
+        return self.statements.get(original_node, [updated_node])[0]
 
-        module_name = self._get_full_name(updated_node.module)
-
-        if module_name == self.old_module:
-            self.changed = True
-            new_module_node = self._build_module(self.new_module)
-            return updated_node.with_changes(module=new_module_node)
-
-        return updated_node
-
-    def _get_full_name(self, node: cst.BaseExpression) -> str:
-        """Get the full dotted name from an expression."""
-        if isinstance(node, cst.Name):
-            return node.value
-        elif isinstance(node, cst.Attribute):
-            return f"{self._get_full_name(node.value)}.{node.attr.value}"
-        return ""
-
-    def _build_module(self, name: str) -> cst.BaseExpression:
-        """Build a module expression from a dotted name."""
-        parts = name.split(".")
-        result: cst.BaseExpression = cst.Name(parts[0])
-        for part in parts[1:]:
-            result = cst.Attribute(value=result, attr=cst.Name(part))
-        return result
+    def leave_Name(self, original_node: cst.Name, updated_node: cst.Name) -> cst.BaseExpression:
+        return self.references.get(original_node, updated_node)
+
+    def leave_Attribute(
+        self,
+        original_node: cst.Attribute,
+        updated_node: cst.Attribute,
+    ) -> cst.BaseExpression:
+        return self.references.get(original_node, updated_node)
+
+
+def rename_in_code(
+    code: str,
+    old_name: str,
+    new_name: str,
+    module_name: str | None = None,
+    is_package: bool = False,
+) -> str:
+    """Point the imports in module source at a renamed module or name.
+
+    Parameters
+    ----------
+    code : str
+        Module source.
+    old_name : str
+        Current dotted path of the module or name.
+    new_name : str
+        New dotted path.
+    module_name : str | None
+        Dotted name of the module, to resolve relative imports. If None,
+        relative imports are left alone.
+    is_package : bool
+        Whether the module is a package ``__init__``.
+
+    Returns
+    -------
+    str
+        The new source (the same string if nothing changed).
+
+    Raises
+    ------
+    libcst.ParserSyntaxError
+        If the code doesn't parse.
+
+    Examples
+    --------
+    >>> rename_in_code("import a.old\na.old.run()\n", "a.old", "a.new")
+    'import a.new\na.new.run()\n'
+    """
+    wrapper = MetadataWrapper(cst.parse_module(code), unsafe_skip_copy=True)
+    planner = _RenamePlanner(wrapper, old_name, new_name, module_name, is_package)
+    planner.plan()
+    if not planner.statements and not planner.references:
+        return code
+    return wrapper.module.visit(ImportUpdater(planner.statements, planner.references)).code
 
 
 # Convenience functions
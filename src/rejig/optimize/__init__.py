@@ -2,7 +2,12 @@
 
 This module provides tools for optimizing Python code:
 - DRY (Don't Repeat Yourself) analysis for finding duplicate code
+- Clone detection for finding copy-pasted and edited code
+- MinHash/LSH similarity search for near-duplicate functions
 - Loop optimization for replacing slow loops with comprehensions and builtins
+- Safe automatic rewriting of those loops
+- Runtime performance anti-patterns (repeated work inside loops)
+- N+1 queries in Django and SQLAlchemy code, with eager-loading fixes
 
 Example
 -------
@@ -20,16 +25,25 @@ Example
 >>> loops = LoopOptimizer(rj)
 >>> optimizations = loops.find_all_issues()
 >>> print(optimizations.summary())
+>>> optimizations.fix_all()
 """
+from rejig.optimize.clones import (
+    Clone,
+    CloneDetector,
+)
 from rejig.optimize.dry import (
     CodeFragment,
     DRYAnalyzer,
     DuplicateGroup,
 )
+from rejig.optimize.loop_fixes import LoopRewriter
 from rejig.optimize.loops import (
     LoopOptimizer,
     LoopPattern,
 )
+from rejig.optimize.orm import ModelRelationship, NPlusOneAnalyzer
+from rejig.optimize.performance import PerformanceAnalyzer
+from rejig.optimize.similarity import MinHashIndex
 from rejig.optimize.targets import (
     OptimizeFinding,
     OptimizeTarget,
@@ -40,7 +54,10 @@ from rejig.optimize.targets import (
 __all__ = [
     # Analyzers
     "DRYAnalyzer",
+    "CloneDetector",
     "LoopOptimizer",
+    "PerformanceAnalyzer",
+    "NPlusOneAnalyzer",
     # Targets
     "OptimizeTarget",
     "OptimizeTargetList",
@@ -49,5 +66,9 @@ __all__ = [
     # Supporting classes
     "CodeFragment",
     "DuplicateGroup",
+    "Clone",
+    "MinHashIndex",
     "LoopPattern",
+    "LoopRewriter",
+    "ModelRelationship",
 ]
@@ -0,0 +1,593 @@
+"""Near-duplicate (clone) detection using winnowed token fingerprints.
+
+``DRYAnalyzer.find_duplicate_code_blocks`` only finds compound-statement
+bodies that are identical after normalisation. This module finds copy-paste
+clones of any shape, including ones with edited, inserted or reordered
+statements:
+
+1. Each file is split into tokens with a single regex pass (no parsing).
+   Identifiers, numbers and strings are abstracted so renamed copies still
+   match; comments, layout and import statements are dropped.
+2. Every k-token window is hashed, and winnowing keeps the minimum hash
+   of each run of ``window`` consecutive hashes. Any match
+   of at least ``k + window - 1`` tokens is guaranteed to share a
+   fingerprint.
+3. An inverted index maps fingerprints to their locations. Shared
+   fingerprints are chained into regions per pair of files, allowing gaps
+   (Type-3 clones) and local reordering.
+4. Regions are scored with a token-level similarity and classified as
+   Type-1 (identical tokens), Type-2 (identical up to names and literals)
+   or Type-3 (similar).
+
+All steps are linear in the size of the corpus except scoring, which only
+runs on candidate regions. Fingerprints shared by more than
+``max_occurrences`` locations (boilerplate) are ignored.
+"""
+from __future__ import annotations
+
+import keyword
+import re
+import zlib
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from itertools import accumulate, groupby
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from rejig.optimize.targets import (
+    OptimizeFinding,
+    OptimizeTarget,
+    OptimizeTargetList,
+    OptimizeType,
+)
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+
+
+_TOKEN_RE = re.compile(
+    r"""
+    [ \t\f]*
+    (?:(?P<skip>\\\r?\n|\#[^\r\n]*)
+    |(?P<newline>\r?\n)
+    |(?P<string>
+        (?i:[rbuf]{0,2})
+        (?:'''(?:[^'\\]|\\.|'(?!''))*'''
+          |\"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"
+          |'(?:[^'\\\n]|\\.)*'
+          |"(?:[^"\\\n]|\\.)*")
+    )
+    |(?P<number>\d[\w.]*(?:[eE][-+]\d+)?|\.\d\w*)
+    |(?P<name>\w+)
+    |(?P<op>\*\*=?|//=?|>>=?|<<=?|->|:=|\.\.\.|[-+*/%&|^@=<>!]=|[-+*/%&|^~@<>=.,:;()\[\]{}])
+    |(?P<other>.))
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_KEYWORDS = frozenset(keyword.kwlist)
+_OPEN = frozenset("([{")
+_CLOSE = frozenset(")]}")
+
+# Normalised tokens for abstracted identifiers, numbers and strings, and for
+# the end of a logical line
+_NAME, _NUMBER, _STRING, _NEWLINE = "$", "0", '"', ";"
+
+# Token ids must agree between worker processes, so they come from crc32
+# rather than the (per-process salted) str hash
+_TOKEN_IDS: dict[str, int] = {}
+
+# Spans longer than this (in tokens) are compared line by line
+_MAX_TOKEN_DIFF = 500
+
+_POSITION_MASK = 0xFFFFFFFF
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def tokenize_source(content: str) -> tuple[list[str], list[str], list[int]]:
+    """Split Python source into normalised tokens.
+
+    Import statements, comments and layout are dropped. Keywords and
+    operators are kept, other names become ``$``, numbers ``0`` and strings
+    ``"``; the end of each logical line is a ``;`` token.
+
+    Parameters
+    ----------
+    content : str
+        Python source code. It doesn't have to parse.
+
+    Returns
+    -------
+    tuple[list[str], list[str], list[int]]
+        Normalised tokens, the original token texts and the 1-based line
+        number of each token.
+    """
+    normalized: list[str] = []
+    raw: list[str] = []
+    lines: list[int] = []
+    line = 1
+    depth = 0
+    line_start = True
+    skipping = False
+
+    for match in _TOKEN_RE.finditer(content):
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "skip":
+            if text[0] == "\\":
+                line += 1
+            continue
+        if kind == "newline":
+            line += 1
+            if depth == 0:
+                if not line_start and not skipping:
+                    normalized.append(_NEWLINE)
+                    raw.append(_NEWLINE)
+                    lines.append(line - 1)
+                line_start = True
+                skipping = False
+            continue
+
+        if line_start:
+            line_start = False
+            skipping = text in ("import", "from")
+        if kind == "op":
+            if text in _OPEN:
+                depth += 1
+            elif text in _CLOSE and depth:
+                depth -= 1
+        if skipping:
+            if kind == "string":
+                line += text.count("\n")
+            continue
+
+        if kind == "name":
+            token = text if text in _KEYWORDS else _NAME
+        elif kind == "string":
+            token = _STRING
+        elif kind == "number":
+            token = _NUMBER
+        else:
+            token = text
+        normalized.append(token)
+        raw.append(text)
+        lines.append(line)
+        if kind == "string":
+            line += text.count("\n")
+
+    return normalized, raw, lines
+
+
+def winnow(hashes: list[int], window: int) -> list[tuple[int, int]]:
+    """Select winnowing fingerprints from a sequence of k-gram hashes.
+
+    The minimum hash of every ``window`` consecutive hashes is selected
+    (the rightmost one on ties), each position at most once.
+
+    Parameters
+    ----------
+    hashes : list[int]
+        k-gram hashes in order.
+    window : int
+        Winnowing window size.
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        ``(hash, position)`` pairs in order of position.
+    """
+    n = len(hashes)
+    if not n:
+        return []
+    window = min(window, n)
+
+    # Pack hash and inverted position into one key so min() prefers the
+    # smallest hash, then the rightmost position
+    keys = [(h & _HASH_MASK) << 32 | (_POSITION_MASK - i) for i, h in enumerate(hashes)]
+
+    # Sliding window minimum from per-block prefix and suffix minima
+    prefix: list[int] = []
+    suffix: list[int] = []
+    for start in range(0, n, window):
+        block = keys[start:start + window]
+        prefix.extend(accumulate(block, min))
+        suffix.extend(reversed(list(accumulate(reversed(block), min))))
+    minima = map(min, suffix[:n - window + 1], prefix[window - 1:])
+
+    return [(key >> 32, _POSITION_MASK - (key & _POSITION_MASK)) for key, _ in groupby(minima)]
+
+
+@dataclass
+class FileFingerprints:
+    """Tokens and winnowing fingerprints of one file.
+
+    Attributes
+    ----------
+    path : Path
+        The file.
+    ids : array
+        Normalised token ids.
+    raw : array
+        Checksums of the original token texts (to tell Type-1 clones from
+        Type-2).
+    lines : array
+        1-based line number of each token.
+    fingerprints : list[tuple[int, int]]
+        Selected ``(hash, token position)`` pairs.
+    """
+
+    path: Path
+    ids: array
+    raw: array
+    lines: array
+    fingerprints: list[tuple[int, int]]
+
+
+def _token_id(token: str) -> int:
+    token_id = _TOKEN_IDS.get(token)
+    if token_id is None:
+        token_id = _TOKEN_IDS[token] = zlib.crc32(token.encode())
+    return token_id
+
+
+def fingerprint_file(path: Path, k: int = 12, window: int = 8) -> FileFingerprints | None:
+    """Tokenize a file and select its winnowing fingerprints.
+
+    Parameters
+    ----------
+    path : Path
+        Python file to fingerprint.
+    k : int
+        Tokens per hashed k-gram.
+    window : int
+        Winnowing window.
+
+    Returns
+    -------
+    FileFingerprints | None
+        The file's tokens and fingerprints, or None if it can't be read.
+    """
+    try:
+        content = path.read_text(errors="replace")
+    except OSError:
+        return None
+    normalized, raw, lines = tokenize_source(content)
+    ids = array("q", map(_token_id, normalized))
+    hashes = [hash(gram) for gram in zip(*(ids[i:] for i in range(k)))]
+    return FileFingerprints(
+        path=path,
+        ids=ids,
+        raw=array("q", map(zlib.crc32, map(str.encode, raw))),
+        lines=array("q", lines),
+        fingerprints=winnow(hashes, window),
+    )
+
+
+def _fingerprint_files(paths: list[Path], k: int, window: int) -> list[FileFingerprints]:
+    """Fingerprint a batch of files (used as the worker function)."""
+    results = []
+    for path in paths:
+        result = fingerprint_file(path, k, window)
+        if result is not None:
+            results.append(result)
+    return results
+
+
+@dataclass
+class Clone:
+    """A pair of similar code regions.
+
+    Attributes
+    ----------
+    file_path : Path
+        File of the first region.
+    line_number : int
+        First line of the first region.
+    end_line : int
+        Last line of the first region.
+    other_file : Path
+        File of the second region.
+    other_line : int
+        First line of the second region.
+    other_end_line : int
+        Last line of the second region.
+    tokens : int
+        Number of tokens in the first region.
+    other_tokens : int
+        Number of tokens in the second region.
+    similarity : float
+        Token similarity of the regions, from 0.0 to 1.0.
+    clone_type : int
+        1 for identical tokens, 2 for identical up to names and literals,
+        3 for similar regions with edits.
+    """
+
+    file_path: Path
+    line_number: int
+    end_line: int
+    other_file: Path
+    other_line: int
+    other_end_line: int
+    tokens: int
+    other_tokens: int
+    similarity: float
+    clone_type: int
+
+    @property
+    def other_location(self) -> str:
+        """Location of the second region."""
+        return f"{self.other_file}:{self.other_line}-{self.other_end_line}"
+
+
+@dataclass
+class _Region:
+    """Fingerprint matches between two files, chained into one region."""
+
+    start_a: int
+    last_a: int
+    min_b: int
+    max_b: int
+    matches: int = 1
+
+
+class CloneDetector:
+    """Detect Type-1/2/3 code clones across a project.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The Rejig instance for accessing project files.
+    k : int
+        Tokens per hashed k-gram. Defaults to 12.
+    window : int
+        Winnowing window. Matches of at least ``k + window - 1`` tokens are
+        always found. Defaults to 8.
+    max_occurrences : int
+        Fingerprints found in more places than this are treated as
+        boilerplate and ignored. Defaults to 20.
+    workers : int
+        Number of worker processes for tokenizing. With 1 (default), files
+        are tokenized in this process.
+
+    Example
+    -------
+    >>> from rejig.optimize import CloneDetector
+    >>> clones = CloneDetector(rj).find_code_clones(min_similarity=0.8)
+    >>> for clone in clones:
+    ...     print(clone.location, clone.finding.context["other_location"])
+    """
+
+    def __init__(
+        self,
+        rejig: Rejig,
+        k: int = 12,
+        window: int = 8,
+        max_occurrences: int = 20,
+        workers: int = 1,
+    ) -> None:
+        self._rejig = rejig
+        self._k = k
+        self._window = window
+        self._max_occurrences = max_occurrences
+        self._workers = workers
+
+    def _fingerprint_all(self) -> list[FileFingerprints]:
+        files = list(self._rejig.files)
+        workers = min(self._workers, max(1, len(files) // 64))
+        if workers <= 1:
+            return _fingerprint_files(files, self._k, self._window)
+
+        batch_size = max(1, len(files) // (workers * 4))
+        batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+        results: list[FileFingerprints] = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch in executor.map(
+                _fingerprint_files, batches, [self._k] * len(batches), [self._window] * len(batches)
+            ):
+                results.extend(batch)
+        return results
+
+    def detect(
+        self,
+        min_tokens: int = 50,
+        min_similarity: float = 0.8,
+        max_gap: int | None = None,
+    ) -> list[Clone]:
+        """Find pairs of similar code regions.
+
+        Parameters
+        ----------
+        min_tokens : int
+            Minimum size of both regions, in tokens. Defaults to 50.
+        min_similarity : float
+            Minimum similarity (0.0 to 1.0). Defaults to 0.8.
+        max_gap : int | None
+            Largest gap, in tokens, bridged between matching fingerprints
+            (edits inside a Type-3 clone). Defaults to ``2 * (k + window)``.
+
+        Returns
+        -------
+        list[Clone]
+            Clones ordered by location.
+        """
+        k = self._k
+        gap = 2 * (k + self._window) if max_gap is None else max_gap
+        files = self._fingerprint_all()
+        index: dict[int, list[int]] = defaultdict(list)
+        for file_index, fingerprints in enumerate(files):
+            for h, pos in fingerprints.fingerprints:
+                index[h].append(file_index << 32 | pos)
+            fingerprints.fingerprints = []
+
+        # Pair up locations sharing a fingerprint, per pair of files
+        matches: dict[tuple[int, int], list[tuple[int, int]]] = defaultdict(list)
+        for locations in index.values():
+            if len(locations) < 2 or len(locations) > self._max_occurrences:
+                continue
+            for i, a in enumerate(locations):
+                file_a, pos_a = a >> 32, a & _POSITION_MASK
+                for b in locations[i + 1:]:
+                    file_b, pos_b = b >> 32, b & _POSITION_MASK
+                    if file_a == file_b and pos_b - pos_a < min_tokens:
+                        continue
+                    matches[file_a, file_b].append((pos_a, pos_b))
+        del index
+
+        clones: list[Clone] = []
+        for (file_a, file_b), pairs in matches.items():
+            a, b = files[file_a], files[file_b]
+            for region in _chain(sorted(pairs), gap):
+                end_a, end_b = region.last_a + k, region.max_b + k
+                if end_a - region.start_a < min_tokens or end_b - region.min_b < min_tokens:
+                    continue
+                if file_a == file_b and region.min_b < end_a and region.start_a < end_b:
+                    # Overlapping repetition within one file
+                    continue
+                span_a = a.ids[region.start_a:end_a]
+                span_b = b.ids[region.min_b:end_b]
+                lines_a = a.lines[region.start_a:end_a]
+                lines_b = b.lines[region.min_b:end_b]
+                similarity = _similarity(span_a, span_b, lines_a, lines_b, min_similarity)
+                if similarity < min_similarity:
+                    continue
+
+                if span_a == span_b:
+                    same_text = a.raw[region.start_a:end_a] == b.raw[region.min_b:end_b]
+                    clone_type = 1 if same_text else 2
+                else:
+                    clone_type = 3
+                clones.append(Clone(
+                    file_path=a.path,
+                    line_number=lines_a[0],
+                    end_line=lines_a[-1],
+                    other_file=b.path,
+                    other_line=lines_b[0],
+                    other_end_line=lines_b[-1],
+                    tokens=len(span_a),
+                    other_tokens=len(span_b),
+                    similarity=round(similarity, 3),
+                    clone_type=clone_type,
+                ))
+
+        clones.sort(key=lambda c: (str(c.file_path), c.line_number, str(c.other_file), c.other_line))
+        return clones
+
+    def find_code_clones(
+        self,
+        min_tokens: int = 50,
+        min_similarity: float = 0.8,
+    ) -> OptimizeTargetList:
+        """Find copy-paste clones, including edited and reordered copies.
+
+        Each pair of similar regions is reported once, at the first region.
+
+        Parameters
+        ----------
+        min_tokens : int
+            Minimum size of both regions, in tokens. Defaults to 50.
+        min_similarity : float
+            Minimum similarity (0.0 to 1.0). Defaults to 0.8.
+
+        Returns
+        -------
+        OptimizeTargetList
+            CODE_CLONE findings. ``context`` holds ``clone_type`` (1, 2 or
+            3), ``similarity``, ``tokens`` and the other region
+            (``other_file``, ``other_line``, ``other_end_line`` and
+            ``other_location``).
+        """
+        findings: list[OptimizeTarget] = []
+        for clone in self.detect(min_tokens=min_tokens, min_similarity=min_similarity):
+            finding = OptimizeFinding(
+                type=OptimizeType.CODE_CLONE,
+                file_path=clone.file_path,
+                line_number=clone.line_number,
+                end_line=clone.end_line,
+                message=(
+                    f"Type-{clone.clone_type} clone of {clone.other_location} "
+                    f"({clone.similarity:.0%} similar)"
+                ),
+                severity="warning",
+                suggested_code="Consider extracting the shared code into a function",
+                estimated_improvement="Maintainability, reduced code size",
+                context={
+                    "clone_type": clone.clone_type,
+                    "similarity": clone.similarity,
+                    "tokens": clone.tokens,
+                    "other_file": clone.other_file,
+                    "other_line": clone.other_line,
+                    "other_end_line": clone.other_end_line,
+                    "other_location": clone.other_location,
+                },
+            )
+            findings.append(OptimizeTarget(self._rejig, finding))
+        return OptimizeTargetList(self._rejig, findings)
+
+
+def _chain(pairs: list[tuple[int, int]], gap: int) -> list[_Region]:
+    """Chain sorted ``(pos_a, pos_b)`` matches into regions.
+
+    A match joins a region if it follows the region in the first file and
+    lies within ``gap`` tokens of the region's extent in the second file,
+    which bridges edits and tolerates locally reordered statements.
+    """
+    done: list[_Region] = []
+    active: list[_Region] = []
+    for pos_a, pos_b in pairs:
+        still_active = []
+        for region in active:
+            if pos_a - region.last_a > gap:
+                done.append(region)
+            else:
+                still_active.append(region)
+        active = still_active
+
+        for region in active:
+            if region.min_b - gap <= pos_b <= region.max_b + gap:
+                region.last_a = pos_a
+                region.min_b = min(region.min_b, pos_b)
+                region.max_b = max(region.max_b, pos_b)
+                region.matches += 1
+                break
+        else:
+            active.append(_Region(pos_a, pos_a, pos_b, pos_b))
+    return done + active
+
+
+def _similarity(
+    span_a: array, span_b: array, lines_a: array, lines_b: array, threshold: float
+) -> float:
+    """Similarity of two token spans, by tokens or (for long spans) by lines.
+
+    Returns early with an upper bound when that is already below
+    ``threshold``.
+    """
+    if span_a == span_b:
+        return 1.0
+    if max(len(span_a), len(span_b)) <= _MAX_TOKEN_DIFF:
+        matcher = SequenceMatcher(None, span_a.tolist(), span_b.tolist(), autojunk=False)
+    else:
+        matcher = SequenceMatcher(
+            None, _line_keys(span_a, lines_a), _line_keys(span_b, lines_b), autojunk=False
+        )
+    upper = matcher.quick_ratio()
+    return upper if upper < threshold else matcher.ratio()
+
+
+def _line_keys(span: array, lines: array) -> list[tuple[int, ...]]:
+    """Group a token span into per-line token tuples."""
+    keys: list[tuple[int, ...]] = []
+    current: list[int] = []
+    previous = lines[0] if lines else 0
+    for token, line in zip(span, lines):
+        if line != previous and current:
+            keys.append(tuple(current))
+            current = []
+        current.append(token)
+        previous = line
+    if current:
+        keys.append(tuple(current))
+    return keys
@@ -12,18 +12,30 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 import libcst as cst
-from libcst.metadata import MetadataWrapper, PositionProvider
+from libcst.metadata import PositionProvider
 
+from rejig.optimize.similarity import BUILTIN_NAMES, MinHashIndex, node_label, shingle_labels
 from rejig.optimize.targets import (
     OptimizeFinding,
     OptimizeTarget,
     OptimizeTargetList,
     OptimizeType,
 )
+from rejig.optimize.visitors import visit_combined
 
 if TYPE_CHECKING:
     from rejig.core.rejig import Rejig
 
+# Analysis cache namespace for per-file function records
+CACHE_NAMESPACE = "dry_functions"
+
+# Bodies with fewer shingles (e.g. stubs and one-line getters) are too small
+# to be worth consolidating
+MIN_SHINGLES = 8
+
+# Maximum number of other cluster members listed in a finding's context
+MAX_LISTED_FUNCTIONS = 20
+
 
 @dataclass
 class CodeFragment:
@@ -109,15 +121,7 @@ class CodeNormalizer(cst.CSTTransformer):
     ) -> cst.Name:
         """Normalize variable names to generic placeholders."""
         # Keep built-in names as-is
-        builtins = {
-            "True", "False", "None", "print", "len", "range", "str", "int",
-            "float", "list", "dict", "set", "tuple", "bool", "type", "isinstance",
-            "hasattr", "getattr", "setattr", "delattr", "enumerate", "zip", "map",
-            "filter", "sum", "min", "max", "abs", "sorted", "reversed", "any", "all",
-            "open", "file", "input", "super", "self", "cls", "Exception", "ValueError",
-            "TypeError", "KeyError", "IndexError", "AttributeError", "RuntimeError",
-        }
-        if original_node.value in builtins:
+        if original_node.value in BUILTIN_NAMES:
             return updated_node
         return updated_node.with_changes(
             value=self._get_normalized_name(original_node.value)
@@ -368,6 +372,10 @@ class FunctionSignatureCollector(cst.CSTVisitor):
         self.file_path = file_path
         self.functions: list[dict] = []
         self._current_class: str | None = None
+        # Functions being visited, and label sequences of the bodies being
+        # visited (labels are collected in the same pass, see node_labels)
+        self._function_stack: list[dict] = []
+        self._open_bodies: list[list[str]] = []
 
     def _get_position(self, node: cst.CSTNode) -> tuple[int, int]:
         """Get start and end line numbers for a node."""
@@ -377,6 +385,24 @@ class FunctionSignatureCollector(cst.CSTVisitor):
         except KeyError:
             return 0, 0
 
+    def on_visit(self, node: cst.CSTNode) -> bool:
+        """Label the node for every enclosing function body."""
+        label, descend = node_label(node)
+        if label is not None:
+            for labels in self._open_bodies:
+                labels.append(label)
+        if not descend:
+            # Names, literals and formatting never contain functions
+            return False
+        return super().on_visit(node)
+
+    def on_leave(self, original_node: cst.CSTNode) -> None:
+        """Close the node's label bracket."""
+        if self._open_bodies and node_label(original_node)[0] is not None:
+            for labels in self._open_bodies:
+                labels.append(")")
+        super().on_leave(original_node)
+
     def visit_ClassDef(self, node: cst.ClassDef) -> bool:
         """Track class context."""
         self._current_class = node.name.value
@@ -386,6 +412,21 @@ class FunctionSignatureCollector(cst.CSTVisitor):
         """Clear class context."""
         self._current_class = None
 
+    def visit_FunctionDef_body(self, node: cst.FunctionDef) -> None:
+        """Start collecting labels of the function body."""
+        self._open_bodies.append([])
+
+    def leave_FunctionDef_body(self, node: cst.FunctionDef) -> None:
+        """Hash the body's labels into shingles."""
+        labels = self._open_bodies.pop()
+        func = self._function_stack[-1]
+        func["body_hash"] = hashlib.md5("\0".join(labels).encode()).hexdigest()
+        func["shingles"] = shingle_labels(labels)
+
+    def leave_FunctionDef(self, node: cst.FunctionDef) -> None:
+        """Finish the current function."""
+        self._function_stack.pop()
+
     def visit_FunctionDef(self, node: cst.FunctionDef) -> bool:
         """Collect function information."""
         start_line, end_line = self._get_position(node)
@@ -402,32 +443,48 @@ class FunctionSignatureCollector(cst.CSTVisitor):
         if isinstance(node.body, cst.IndentedBlock):
             statement_count = len(node.body.body)
 
-        # Get normalized body for comparison
-        try:
-            normalizer = CodeNormalizer()
-            normalized_body = node.body.visit(normalizer) if node.body else ""
-            body_hash = hashlib.md5(str(normalized_body).encode()).hexdigest()
-        except Exception:
-            body_hash = ""
-
         name = node.name.value
         if self._current_class:
             name = f"{self._current_class}.{name}"
 
-        self.functions.append({
+        # body_hash and shingles are filled in once the body is visited
+        func = {
             "name": name,
             "file_path": self.file_path,
             "line_number": start_line,
             "end_line": end_line,
             "param_count": param_count,
             "statement_count": statement_count,
-            "body_hash": body_hash,
-            "original_code": str(node),
-        })
+            "body_hash": "",
+            "shingles": [],
+            "original_code": cst.Module(body=[]).code_for_node(node).strip(),
+        }
+        self.functions.append(func)
+        self._function_stack.append(func)
 
         return True
 
 
+@dataclass
+class _DRYScan:
+    """Everything the DRY detectors need, collected in one pass per file."""
+
+    fragments: list[CodeFragment] = field(default_factory=list)
+    expressions: list[CodeFragment] = field(default_factory=list)
+    literals: list[CodeFragment] = field(default_factory=list)
+    functions: list[dict] = field(default_factory=list)
+
+
+def _truncate(code: str, limit: int = 200) -> str:
+    """Shorten code shown in a finding."""
+    return code[:limit] + "..." if len(code) > limit else code
+
+
+def _others(items: list, index: int, limit: int) -> list:
+    """Up to ``limit`` items of a list, skipping the one at ``index``."""
+    return [item for i, item in enumerate(items[:limit + 1]) if i != index][:limit]
+
+
 class DRYAnalyzer:
     """Analyzer for detecting DRY (Don't Repeat Yourself) violations.
 
@@ -435,9 +492,13 @@ class DRYAnalyzer:
     - Duplicate code blocks (if, for, while, try, with bodies)
     - Duplicate expressions (complex operations, function calls)
     - Duplicate literals (magic numbers and strings)
-    - Similar functions (functions with identical structure)
+    - Similar functions (functions with identical or similar structure)
     - Repeated patterns
 
+    Each file is parsed once per call: ``find_all_issues`` runs the
+    duplicate and function collectors in a single traversal and feeds all
+    four detectors from it.
+
     Parameters
     ----------
     rejig : Rejig
@@ -460,43 +521,82 @@ class DRYAnalyzer:
         """Get all Python files in the project."""
         return list(self._rejig.root.rglob("*.py"))
 
-    def _analyze_file(
-        self, file_path: Path, min_lines: int = 3, min_statements: int = 2
-    ) -> tuple[list[CodeFragment], list[CodeFragment], list[CodeFragment]]:
-        """Analyze a single file for duplicate code.
+    def _visit_file(self, file_path: Path, visitors: list[cst.CSTVisitor]) -> bool:
+        """Parse a file once and run all visitors over it in one traversal.
 
         Returns
         -------
-        tuple
-            (code_fragments, expressions, literals)
+        bool
+            False if the file could not be read, parsed or visited.
         """
         try:
-            content = file_path.read_text()
-            tree = cst.parse_module(content)
-            wrapper = MetadataWrapper(tree)
-
-            collector = DuplicateCollector(
-                file_path, min_lines=min_lines, min_statements=min_statements
-            )
-            wrapper.visit(collector)
-
-            return collector.fragments, collector.expressions, collector.literals
+            visit_combined(file_path.read_text(), visitors)
+            return True
         except Exception:
-            return [], [], []
+            return False
 
-    def _analyze_functions(self, file_path: Path) -> list[dict]:
-        """Analyze functions in a file for similarity."""
-        try:
-            content = file_path.read_text()
-            tree = cst.parse_module(content)
-            wrapper = MetadataWrapper(tree)
+    def _collect(
+        self,
+        min_lines: int = 3,
+        min_statements: int = 2,
+        duplicates: bool = True,
+        functions: bool = True,
+    ) -> _DRYScan:
+        """Collect fragments, expressions, literals and functions.
 
-            collector = FunctionSignatureCollector(file_path)
-            wrapper.visit(collector)
+        Parameters
+        ----------
+        min_lines : int
+            Minimum lines for collected code blocks.
+        min_statements : int
+            Minimum statements for collected compound statement bodies.
+        duplicates : bool
+            Collect code blocks, expressions and literals.
+        functions : bool
+            Collect function records (from the analysis cache when fresh).
 
-            return collector.functions
-        except Exception:
-            return []
+        Returns
+        -------
+        _DRYScan
+            The collected items of all files.
+        """
+        cache = self._rejig.cache
+        scan = _DRYScan()
+        files = self._get_python_files()
+
+        for file_path in files:
+            visitors: list[cst.CSTVisitor] = []
+            collector = signatures = None
+            if duplicates:
+                collector = DuplicateCollector(
+                    file_path, min_lines=min_lines, min_statements=min_statements
+                )
+                visitors.append(collector)
+            records = cache.get(CACHE_NAMESPACE, file_path) if functions else None
+            if functions and records is None:
+                signatures = FunctionSignatureCollector(file_path)
+                visitors.append(signatures)
+
+            ok = not visitors or self._visit_file(file_path, visitors)
+
+            if collector is not None and ok:
+                scan.fragments.extend(collector.fragments)
+                scan.expressions.extend(collector.expressions)
+                scan.literals.extend(collector.literals)
+            if signatures is not None:
+                records = []
+                for func in signatures.functions if ok else []:
+                    record = {k: v for k, v in func.items() if k != "file_path"}
+                    record["original_code"] = _truncate(func["original_code"])
+                    records.append(record)
+                cache.put(CACHE_NAMESPACE, file_path, records)
+            if records:
+                scan.functions.extend(dict(record, file_path=file_path) for record in records)
+
+        if functions:
+            cache.prune(CACHE_NAMESPACE, set(files))
+            cache.save()
+        return scan
 
     def find_duplicate_code_blocks(
         self, min_lines: int = 3, min_occurrences: int = 2
@@ -515,49 +615,10 @@ class DRYAnalyzer:
         OptimizeTargetList
             List of duplicate code block findings.
         """
-        all_fragments: list[CodeFragment] = []
-
-        for file_path in self._get_python_files():
-            fragments, _, _ = self._analyze_file(file_path, min_lines=min_lines)
-            all_fragments.extend(fragments)
-
-        # Group by hash
-        groups: dict[str, list[CodeFragment]] = defaultdict(list)
-        for fragment in all_fragments:
-            groups[fragment.hash].append(fragment)
-
-        # Create findings for duplicates
-        findings: list[OptimizeTarget] = []
-        for hash_val, fragments in groups.items():
-            if len(fragments) >= min_occurrences:
-                for fragment in fragments:
-                    other_locations = [
-                        f"{f.file_path}:{f.line_number}"
-                        for f in fragments
-                        if f != fragment
-                    ]
-                    finding = OptimizeFinding(
-                        type=OptimizeType.DUPLICATE_CODE_BLOCK,
-                        file_path=fragment.file_path,
-                        line_number=fragment.line_number,
-                        end_line=fragment.end_line,
-                        name=fragment.name,
-                        message=f"Duplicate code block found in {len(fragments)} locations",
-                        severity="warning",
-                        original_code=fragment.original_code[:200] + "..."
-                        if len(fragment.original_code) > 200
-                        else fragment.original_code,
-                        suggested_code="Consider extracting to a shared function",
-                        estimated_improvement="Maintainability, reduced code size",
-                        context={
-                            "occurrences": len(fragments),
-                            "other_locations": other_locations[:5],
-                            "line_count": fragment.line_count,
-                        },
-                    )
-                    findings.append(OptimizeTarget(self._rejig, finding))
-
-        return OptimizeTargetList(self._rejig, findings)
+        scan = self._collect(min_lines=min_lines, functions=False)
+        return OptimizeTargetList(
+            self._rejig, self._duplicate_block_findings(scan.fragments, min_occurrences)
+        )
 
     def find_duplicate_expressions(
         self, min_occurrences: int = 3
@@ -574,40 +635,10 @@ class DRYAnalyzer:
         OptimizeTargetList
             List of duplicate expression findings.
         """
-        all_expressions: list[CodeFragment] = []
-
-        for file_path in self._get_python_files():
-            _, expressions, _ = self._analyze_file(file_path)
-            all_expressions.extend(expressions)
-
-        # Group by normalized code
-        groups: dict[str, list[CodeFragment]] = defaultdict(list)
-        for expr in all_expressions:
-            groups[expr.code].append(expr)
-
-        findings: list[OptimizeTarget] = []
-        for code, expressions in groups.items():
-            if len(expressions) >= min_occurrences:
-                for expr in expressions:
-                    finding = OptimizeFinding(
-                        type=OptimizeType.DUPLICATE_EXPRESSION,
-                        file_path=expr.file_path,
-                        line_number=expr.line_number,
-                        end_line=expr.end_line,
-                        name=expr.name,
-                        message=f"Expression repeated {len(expressions)} times",
-                        severity="suggestion",
-                        original_code=expr.original_code,
-                        suggested_code="Consider extracting to a variable or function",
-                        estimated_improvement="Readability, maintainability",
-                        context={
-                            "occurrences": len(expressions),
-                            "expression_type": expr.node_type,
-                        },
-                    )
-                    findings.append(OptimizeTarget(self._rejig, finding))
-
-        return OptimizeTargetList(self._rejig, findings)
+        scan = self._collect(functions=False)
+        return OptimizeTargetList(
+            self._rejig, self._duplicate_expression_findings(scan.expressions, min_occurrences)
+        )
 
     def find_duplicate_literals(
         self, min_occurrences: int = 3
@@ -624,104 +655,292 @@ class DRYAnalyzer:
         OptimizeTargetList
             List of duplicate literal findings.
         """
-        all_literals: list[CodeFragment] = []
-
-        for file_path in self._get_python_files():
-            _, _, literals = self._analyze_file(file_path)
-            all_literals.extend(literals)
-
-        # Group by value
-        groups: dict[str, list[CodeFragment]] = defaultdict(list)
-        for literal in all_literals:
-            groups[literal.code].append(literal)
-
-        findings: list[OptimizeTarget] = []
-        for value, literals in groups.items():
-            if len(literals) >= min_occurrences:
-                literal_type = literals[0].node_type
-                suggested = (
-                    f"Define a constant: MY_CONSTANT = {value}"
-                    if literal_type == "integer"
-                    else f"Define a constant: MY_STRING = {value}"
-                )
-
-                for literal in literals:
-                    finding = OptimizeFinding(
-                        type=OptimizeType.DUPLICATE_LITERAL,
-                        file_path=literal.file_path,
-                        line_number=literal.line_number,
-                        end_line=literal.end_line,
-                        name=literal.name,
-                        message=f"{'Magic number' if literal_type == 'integer' else 'String literal'} {value} used {len(literals)} times",
-                        severity="suggestion",
-                        original_code=value,
-                        suggested_code=suggested,
-                        estimated_improvement="Maintainability, single point of change",
-                        context={
-                            "occurrences": len(literals),
-                            "literal_type": literal_type,
-                        },
-                    )
-                    findings.append(OptimizeTarget(self._rejig, finding))
-
-        return OptimizeTargetList(self._rejig, findings)
+        scan = self._collect(functions=False)
+        return OptimizeTargetList(
+            self._rejig, self._duplicate_literal_findings(scan.literals, min_occurrences)
+        )
 
     def find_similar_functions(
         self, similarity_threshold: float = 0.9
     ) -> OptimizeTargetList:
         """Find functions with similar structure that could be consolidated.
 
+        Function bodies are compared as sets of normalised AST shingles (see
+        ``rejig.optimize.similarity``): names, literals and formatting are
+        ignored, so renamed copies are identical and edited copies are
+        similar. Candidate pairs come from a MinHash LSH index and are
+        checked with the exact Jaccard similarity, so the search is not
+        quadratic in the number of functions. Per-file shingles are kept in
+        the analysis cache.
+
+        Similar functions are grouped into clusters around a representative
+        (the function most others are similar to). Every cluster member
+        gets a finding whose context holds the ``cluster_id``, the
+        ``representative``, its ``similarity`` to the representative and the
+        other ``similar_functions``.
+
         Parameters
         ----------
         similarity_threshold : float
-            Threshold for body similarity (0.0 to 1.0).
+            Minimum Jaccard similarity of function bodies (0.0 to 1.0).
 
         Returns
         -------
         OptimizeTargetList
             List of similar function findings.
         """
-        all_functions: list[dict] = []
+        scan = self._collect(duplicates=False)
+        return OptimizeTargetList(
+            self._rejig, self._similar_function_findings(scan.functions, similarity_threshold)
+        )
 
-        for file_path in self._get_python_files():
-            functions = self._analyze_functions(file_path)
-            all_functions.extend(functions)
+    # ===== Detectors =====
+
+    @staticmethod
+    def _groups(
+        items: list[CodeFragment], key: str, min_occurrences: int
+    ) -> list[list[CodeFragment]]:
+        """Bucket items by an attribute, keeping buckets large enough to report."""
+        buckets: dict[str, list[CodeFragment]] = defaultdict(list)
+        for item in items:
+            buckets[getattr(item, key)].append(item)
+        return [group for group in buckets.values() if len(group) >= min_occurrences]
+
+    def _duplicate_block_findings(
+        self, fragments: list[CodeFragment], min_occurrences: int
+    ) -> list[OptimizeTarget]:
+        """Report code blocks with identical normalized code."""
+        findings: list[OptimizeTarget] = []
+        for group in self._groups(fragments, "hash", min_occurrences):
+            # Only the first few locations are listed, so only those are built
+            locations = [f"{f.file_path}:{f.line_number}" for f in group[:6]]
+            for i, fragment in enumerate(group):
+                finding = OptimizeFinding(
+                    type=OptimizeType.DUPLICATE_CODE_BLOCK,
+                    file_path=fragment.file_path,
+                    line_number=fragment.line_number,
+                    end_line=fragment.end_line,
+                    name=fragment.name,
+                    message=f"Duplicate code block found in {len(group)} locations",
+                    severity="warning",
+                    original_code=_truncate(fragment.original_code),
+                    suggested_code="Consider extracting to a shared function",
+                    estimated_improvement="Maintainability, reduced code size",
+                    context={
+                        "occurrences": len(group),
+                        "other_locations": _others(locations, i, 5),
+                        "line_count": fragment.line_count,
+                    },
+                )
+                findings.append(OptimizeTarget(self._rejig, finding))
+        return findings
 
-        # Group by body hash (exact matches)
-        groups: dict[str, list[dict]] = defaultdict(list)
-        for func in all_functions:
-            if func["body_hash"]:
-                groups[func["body_hash"]].append(func)
+    def _duplicate_expression_findings(
+        self, expressions: list[CodeFragment], min_occurrences: int
+    ) -> list[OptimizeTarget]:
+        """Report expressions with identical normalized code."""
+        findings: list[OptimizeTarget] = []
+        for group in self._groups(expressions, "code", min_occurrences):
+            message = f"Expression repeated {len(group)} times"
+            for expr in group:
+                finding = OptimizeFinding(
+                    type=OptimizeType.DUPLICATE_EXPRESSION,
+                    file_path=expr.file_path,
+                    line_number=expr.line_number,
+                    end_line=expr.end_line,
+                    name=expr.name,
+                    message=message,
+                    severity="suggestion",
+                    original_code=expr.original_code,
+                    suggested_code="Consider extracting to a variable or function",
+                    estimated_improvement="Readability, maintainability",
+                    context={
+                        "occurrences": len(group),
+                        "expression_type": expr.node_type,
+                    },
+                )
+                findings.append(OptimizeTarget(self._rejig, finding))
+        return findings
 
+    def _duplicate_literal_findings(
+        self, literals: list[CodeFragment], min_occurrences: int
+    ) -> list[OptimizeTarget]:
+        """Report literal values used repeatedly."""
         findings: list[OptimizeTarget] = []
-        for hash_val, functions in groups.items():
-            if len(functions) >= 2:
-                for func in functions:
-                    other_names = [
-                        f["name"] for f in functions if f != func
-                    ]
-                    finding = OptimizeFinding(
-                        type=OptimizeType.SIMILAR_FUNCTION,
-                        file_path=func["file_path"],
-                        line_number=func["line_number"],
-                        end_line=func["end_line"],
-                        name=func["name"],
-                        message=f"Function has identical structure to: {', '.join(other_names[:3])}",
-                        severity="warning",
-                        original_code=func["original_code"][:200] + "..."
-                        if len(func["original_code"]) > 200
-                        else func["original_code"],
-                        suggested_code="Consider consolidating into a single parameterized function",
-                        estimated_improvement="Reduced code duplication",
-                        context={
-                            "similar_functions": other_names,
-                            "param_count": func["param_count"],
-                            "statement_count": func["statement_count"],
-                        },
+        for group in self._groups(literals, "code", min_occurrences):
+            value = group[0].code
+            literal_type = group[0].node_type
+            suggested = (
+                f"Define a constant: MY_CONSTANT = {value}"
+                if literal_type == "integer"
+                else f"Define a constant: MY_STRING = {value}"
+            )
+            message = (
+                f"{'Magic number' if literal_type == 'integer' else 'String literal'} "
+                f"{value} used {len(group)} times"
+            )
+            context = {"occurrences": len(group), "literal_type": literal_type}
+
+            for literal in group:
+                finding = OptimizeFinding(
+                    type=OptimizeType.DUPLICATE_LITERAL,
+                    file_path=literal.file_path,
+                    line_number=literal.line_number,
+                    end_line=literal.end_line,
+                    name=literal.name,
+                    message=message,
+                    severity="suggestion",
+                    original_code=value,
+                    suggested_code=suggested,
+                    estimated_improvement="Maintainability, single point of change",
+                    context=dict(context),
+                )
+                findings.append(OptimizeTarget(self._rejig, finding))
+        return findings
+
+    def _similar_function_findings(
+        self, functions: list[dict], similarity_threshold: float
+    ) -> list[OptimizeTarget]:
+        """Cluster functions with similar shingle sets and report them."""
+        # Functions with identical shingles share a node of the index
+        members: dict[tuple[int, ...], list[dict]] = defaultdict(list)
+        for func in functions:
+            if len(func["shingles"]) >= MIN_SHINGLES:
+                members[tuple(func["shingles"])].append(func)
+        nodes = list(members.values())
+
+        index = MinHashIndex(threshold=similarity_threshold)
+        for node_id, node in enumerate(nodes):
+            index.add(node_id, node[0]["shingles"])
+        neighbours: dict[int, list[tuple[int, float]]] = defaultdict(list)
+        for a, b, similarity in index.similar_pairs():
+            neighbours[a].append((b, similarity))
+            neighbours[b].append((a, similarity))
+
+        findings: list[OptimizeTarget] = []
+        for cluster_id, (center, cluster) in enumerate(self._cluster_functions(nodes, neighbours)):
+            representative = nodes[center][0]
+            cluster_funcs = sorted(
+                (
+                    (func, 1.0 if node_id == center else index.similarity(node_id, center))
+                    for node_id in cluster
+                    for func in nodes[node_id]
+                ),
+                key=lambda item: (str(item[0]["file_path"]), item[0]["line_number"]),
+            )
+            names = [func["name"] for func, _ in cluster_funcs[:MAX_LISTED_FUNCTIONS + 1]]
+            closest = max(
+                similarity for func, similarity in cluster_funcs if func is not representative
+            )
+            for i, (func, similarity) in enumerate(cluster_funcs):
+                other_names = _others(names, i, MAX_LISTED_FUNCTIONS)
+                shown = closest if func is representative else similarity
+                if shown >= 1.0:
+                    message = f"Function has identical structure to: {', '.join(other_names[:3])}"
+                else:
+                    message = (
+                        f"Function has similar structure ({shown:.0%}) to: "
+                        f"{', '.join(other_names[:3])}"
                     )
-                    findings.append(OptimizeTarget(self._rejig, finding))
+                finding = OptimizeFinding(
+                    type=OptimizeType.SIMILAR_FUNCTION,
+                    file_path=func["file_path"],
+                    line_number=func["line_number"],
+                    end_line=func["end_line"],
+                    name=func["name"],
+                    message=message,
+                    severity="warning",
+                    original_code=func["original_code"],
+                    suggested_code="Consider consolidating into a single parameterized function",
+                    estimated_improvement="Reduced code duplication",
+                    context={
+                        "cluster_id": cluster_id,
+                        "cluster_size": len(cluster_funcs),
+                        "representative": representative["name"],
+                        "representative_location": (
+                            f"{representative['file_path']}:{representative['line_number']}"
+                        ),
+                        "similarity": round(similarity, 3),
+                        "similar_functions": other_names,
+                        "param_count": func["param_count"],
+                        "statement_count": func["statement_count"],
+                    },
+                )
+                findings.append(OptimizeTarget(self._rejig, finding))
+        return findings
 
-        return OptimizeTargetList(self._rejig, findings)
+    @staticmethod
+    def _cluster_functions(
+        nodes: list[list[dict]], neighbours: dict[int, list[tuple[int, float]]]
+    ) -> list[tuple[int, list[int]]]:
+        """Greedily group similar nodes into clusters.
+
+        Nodes are taken in order of how many functions they (and their
+        neighbours) cover; each unassigned node becomes a center and takes
+        its unassigned neighbours, so members are similar to the center.
+        A node whose neighbours were all taken joins the cluster of its
+        most similar neighbour.
+
+        Returns
+        -------
+        list[tuple[int, list[int]]]
+            ``(center, node_ids)`` per cluster of two or more functions.
+        """
+        def coverage(node_id: int) -> int:
+            return len(nodes[node_id]) + sum(len(nodes[n]) for n, _ in neighbours[node_id])
+
+        candidates = [i for i in range(len(nodes)) if len(nodes[i]) > 1 or neighbours.get(i)]
+        candidates.sort(key=lambda i: (-coverage(i), i))
+
+        center_of: dict[int, int] = {}
+        clusters: dict[int, list[int]] = {}
+        for node_id in candidates:
+            if node_id in center_of:
+                continue
+            center_of[node_id] = node_id
+            cluster = [node_id]
+            for other, _ in neighbours[node_id]:
+                if other not in center_of:
+                    center_of[other] = node_id
+                    cluster.append(other)
+            clusters[node_id] = cluster
+
+        for center, cluster in list(clusters.items()):
+            if len(cluster) == 1 and len(nodes[center]) == 1:
+                best, _ = max(neighbours[center], key=lambda item: (item[1], -item[0]))
+                target = center_of[best]
+                clusters[target].append(center)
+                center_of[center] = target
+                del clusters[center]
+
+        return sorted(clusters.items())
+
+    def find_code_clones(
+        self, min_tokens: int = 50, min_similarity: float = 0.8
+    ) -> OptimizeTargetList:
+        """Find copy-paste clones, including edited and reordered copies.
+
+        Unlike ``find_duplicate_code_blocks``, which needs whole statement
+        bodies to match exactly, this compares token fingerprints (see
+        ``CloneDetector``) and also reports near-duplicates.
+
+        Parameters
+        ----------
+        min_tokens : int
+            Minimum size of both regions, in tokens.
+        min_similarity : float
+            Minimum similarity (0.0 to 1.0).
+
+        Returns
+        -------
+        OptimizeTargetList
+            List of code clone findings.
+        """
+        from rejig.optimize.clones import CloneDetector
+
+        return CloneDetector(self._rejig).find_code_clones(
+            min_tokens=min_tokens, min_similarity=min_similarity
+        )
 
     def find_all_issues(
         self,
@@ -729,9 +948,12 @@ class DRYAnalyzer:
         min_block_occurrences: int = 2,
         min_expression_occurrences: int = 3,
         min_literal_occurrences: int = 3,
+        similarity_threshold: float = 0.9,
     ) -> OptimizeTargetList:
         """Find all DRY violations in the codebase.
 
+        Every file is parsed and traversed once for all detectors.
+
         Parameters
         ----------
         min_block_lines : int
@@ -742,31 +964,29 @@ class DRYAnalyzer:
             Minimum occurrences for duplicate expressions.
         min_literal_occurrences : int
             Minimum occurrences for duplicate literals.
+        similarity_threshold : float
+            Minimum similarity for similar functions (0.0 to 1.0).
 
         Returns
         -------
         OptimizeTargetList
             Combined list of all DRY findings.
         """
-        all_findings: list[OptimizeTarget] = []
+        # One parse and traversal per file feeds all four detectors
+        scan = self._collect(min_lines=min_block_lines)
 
-        # Collect all types of findings
-        blocks = self.find_duplicate_code_blocks(
-            min_lines=min_block_lines, min_occurrences=min_block_occurrences
+        all_findings: list[OptimizeTarget] = []
+        all_findings.extend(
+            self._duplicate_block_findings(scan.fragments, min_block_occurrences)
         )
-        all_findings.extend(blocks._targets)
-
-        expressions = self.find_duplicate_expressions(
-            min_occurrences=min_expression_occurrences
+        all_findings.extend(
+            self._duplicate_expression_findings(scan.expressions, min_expression_occurrences)
         )
-        all_findings.extend(expressions._targets)
-
-        literals = self.find_duplicate_literals(
-            min_occurrences=min_literal_occurrences
+        all_findings.extend(
+            self._duplicate_literal_findings(scan.literals, min_literal_occurrences)
+        )
+        all_findings.extend(
+            self._similar_function_findings(scan.functions, similarity_threshold)
         )
-        all_findings.extend(literals._targets)
-
-        similar = self.find_similar_functions()
-        all_findings.extend(similar._targets)
 
         return OptimizeTargetList(self._rejig, all_findings)
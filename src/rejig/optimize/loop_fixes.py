@@ -0,0 +1,669 @@
+"""Safe rewrites for the loop patterns found by ``LoopOptimizer``.
+
+``LoopRewriter`` turns a detected loop into the comprehension or builtin it
+was reported as, but only where that can't change behaviour:
+
+- Accumulator loops (``append``/``add``/``d[k] = v``) become a
+  comprehension assigned to the accumulator when it was initialised empty
+  right before the loop, and ``extend``/``update`` with a comprehension
+  otherwise.
+- ``+=`` loops become ``sum()`` or ``"".join()`` only when the accumulator
+  was initialised with a number or an empty string right before the loop.
+- ``if cond: return True`` loops become ``return any(...)`` only when the
+  loop is followed by ``return False`` (and the reverse for ``all``).
+- Manual index counters become ``enumerate()`` when the counter is set
+  right before the loop, incremented last, never continued past and not
+  used after the loop.
+
+A comprehension has its own scope, so a loop is left alone if its loop
+variables are used anywhere else in the enclosing function or module, if it
+is directly in a class body, if any rewritten expression contains ``:=``,
+``yield`` or ``await`` or refers to the accumulator, or if a comment would
+be lost. Index-based loops (``zip`` candidates) are never rewritten.
+
+Note that ``sum()`` of floats may round differently from repeated ``+=``
+(it is more accurate from Python 3.12), and that if the loop raises part way
+through, the accumulator is left unchanged rather than partly filled.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Sequence
+
+import libcst as cst
+from libcst.metadata import PositionProvider
+
+# LoopPatternVisitor pattern types LoopRewriter can fix
+FIXABLE_PATTERNS = frozenset({
+    "list_comprehension",
+    "list_conversion",
+    "dict_comprehension",
+    "set_comprehension",
+    "map_builtin",
+    "filter_comprehension",
+    "any_builtin",
+    "all_builtin",
+    "sum_builtin",
+    "string_join",
+    "enumerate_builtin",
+})
+
+# Expressions that need parentheses inside a comprehension or call
+_LOOSE_EXPRESSIONS = (cst.IfExp, cst.Lambda, cst.NamedExpr, cst.Yield, cst.Tuple)
+
+_EMPTY_CONSTRUCTORS = {"list": cst.List, "set": None, "dict": cst.Dict}
+
+
+def _code(node: cst.CSTNode) -> str:
+    """Source of a node, parenthesised if it could bind wrongly when inlined."""
+    code = cst.Module(body=[]).code_for_node(node).strip()
+    if isinstance(node, _LOOSE_EXPRESSIONS) and not getattr(node, "lpar", None):
+        return f"({code})"
+    return code
+
+
+class _NameCounter(cst.CSTVisitor):
+    """Count Name nodes by value and note constructs that block rewrites."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.names: Counter[str] = Counter()
+        self.unsafe = False
+        self.comments = False
+        self.continues = False
+
+    def visit_Name(self, node: cst.Name) -> None:
+        self.names[node.value] += 1
+
+    def visit_NamedExpr(self, node: cst.NamedExpr) -> None:
+        self.unsafe = True
+
+    def visit_Yield(self, node: cst.Yield) -> None:
+        self.unsafe = True
+
+    def visit_Await(self, node: cst.Await) -> None:
+        self.unsafe = True
+
+    def visit_Comment(self, node: cst.Comment) -> None:
+        self.comments = True
+
+    def visit_Continue(self, node: cst.Continue) -> None:
+        self.continues = True
+
+
+def _scan(*nodes: cst.CSTNode | None) -> _NameCounter:
+    """Run a _NameCounter over several nodes."""
+    counter = _NameCounter()
+    for node in nodes:
+        if node is not None:
+            node.visit(counter)
+    return counter
+
+
+def _without_leading_lines(stmt: cst.BaseStatement) -> cst.BaseStatement:
+    """A statement minus its leading lines (which are carried over)."""
+    return stmt.with_changes(leading_lines=())
+
+
+def _small(stmt: cst.CSTNode) -> cst.BaseSmallStatement | None:
+    """The statement of a one-statement line, if it is one."""
+    if isinstance(stmt, cst.SimpleStatementLine) and len(stmt.body) == 1:
+        return stmt.body[0]
+    return None
+
+
+def _single(block: cst.BaseSuite) -> cst.BaseStatement | None:
+    """The only statement of an indented block, if it has exactly one."""
+    if isinstance(block, cst.IndentedBlock) and len(block.body) == 1:
+        return block.body[0]
+    return None
+
+
+def _target_names(target: cst.BaseExpression) -> list[str] | None:
+    """Names bound by a loop target, or None if it binds anything else."""
+    if isinstance(target, cst.Name):
+        return [target.value]
+    if isinstance(target, (cst.Tuple, cst.List)):
+        names: list[str] = []
+        for element in target.elements:
+            sub = _target_names(element.value)
+            if sub is None:
+                return None
+            names.extend(sub)
+        return names
+    return None
+
+
+def _root_name(node: cst.BaseExpression) -> str | None:
+    """Root name of ``a`` or ``a.b.c``, or None for anything else."""
+    while isinstance(node, cst.Attribute):
+        node = node.value
+    return node.value if isinstance(node, cst.Name) else None
+
+
+def _bool_return(stmt: cst.CSTNode) -> bool | None:
+    """The constant of ``return True``/``return False``, else None."""
+    small = _small(stmt) if not isinstance(stmt, cst.BaseSmallStatement) else stmt
+    if isinstance(small, cst.Return) and isinstance(small.value, cst.Name):
+        return {"True": True, "False": False}.get(small.value.value)
+    return None
+
+
+def _init_value(stmt: cst.CSTNode | None, name: str) -> cst.BaseExpression | None:
+    """Value of ``name = <value>`` or ``name: T = <value>``, if that's the statement."""
+    small = _small(stmt) if stmt is not None else None
+    if isinstance(small, cst.Assign) and len(small.targets) == 1:
+        target = small.targets[0].target
+    elif isinstance(small, cst.AnnAssign) and small.value is not None:
+        target = small.target
+    else:
+        return None
+    if isinstance(target, cst.Name) and target.value == name:
+        return small.value
+    return None
+
+
+def _declaration(stmt: cst.CSTNode) -> str:
+    """Left-hand side of an initialiser accepted by ``_init_value``."""
+    small = _small(stmt)
+    if isinstance(small, cst.AnnAssign):
+        return f"{_code(small.target)}: {_code(small.annotation.annotation)}"
+    assert isinstance(small, cst.Assign)
+    return _code(small.targets[0].target)
+
+
+def _is_empty(value: cst.BaseExpression | None, kind: str) -> bool:
+    """Check for ``[]``/``{}``/``list()``/``set()``/``dict()``."""
+    if value is None:
+        return False
+    literal = _EMPTY_CONSTRUCTORS[kind]
+    if literal is not None and isinstance(value, literal) and not value.elements:
+        return True
+    return (
+        isinstance(value, cst.Call)
+        and isinstance(value.func, cst.Name)
+        and value.func.value == kind
+        and not value.args
+    )
+
+
+class _Rewrite:
+    """A planned replacement of statements around a loop."""
+
+    def __init__(
+        self,
+        statements: list[cst.BaseStatement],
+        consume_previous: bool = False,
+        consume_next: bool = False,
+    ) -> None:
+        self.statements = statements
+        self.consume_previous = consume_previous
+        self.consume_next = consume_next
+
+
+class LoopRewriter(cst.CSTTransformer):
+    """Rewrite fixable slow loops into comprehensions and builtins.
+
+    Parameters
+    ----------
+    lines : set[int] | None
+        Start lines of the loops to rewrite (as reported in findings). If
+        None, every fixable loop is rewritten.
+
+    Attributes
+    ----------
+    rewritten : list[int]
+        Start lines of the loops that were rewritten.
+
+    Examples
+    --------
+    >>> wrapper = MetadataWrapper(cst.parse_module(code))
+    >>> rewriter = LoopRewriter()
+    >>> new_code = wrapper.visit(rewriter).code
+    """
+
+    METADATA_DEPENDENCIES = (PositionProvider,)
+
+    def __init__(self, lines: set[int] | None = None) -> None:
+        super().__init__()
+        self.lines = lines
+        self.rewritten: list[int] = []
+        # Enclosing scopes (original nodes) and their name counts
+        self._scopes: list[cst.CSTNode] = []
+        self._scope_names: dict[int, Counter[str]] = {}
+
+    # ===== Scope tracking =====
+
+    def visit_Module(self, node: cst.Module) -> bool:
+        self._scopes.append(node)
+        return True
+
+    def visit_FunctionDef(self, node: cst.FunctionDef) -> bool:
+        self._scopes.append(node)
+        return True
+
+    def leave_FunctionDef(
+        self, original_node: cst.FunctionDef, updated_node: cst.FunctionDef
+    ) -> cst.FunctionDef:
+        self._scopes.pop()
+        return updated_node
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> bool:
+        self._scopes.append(node)
+        return True
+
+    def leave_ClassDef(
+        self, original_node: cst.ClassDef, updated_node: cst.ClassDef
+    ) -> cst.ClassDef:
+        self._scopes.pop()
+        return updated_node
+
+    def _names_in_scope(self) -> Counter[str]:
+        scope = self._scopes[-1]
+        key = id(scope)
+        if key not in self._scope_names:
+            self._scope_names[key] = _scan(scope).names
+        return self._scope_names[key]
+
+    # ===== Blocks =====
+
+    def leave_IndentedBlock(
+        self, original_node: cst.IndentedBlock, updated_node: cst.IndentedBlock
+    ) -> cst.IndentedBlock:
+        body = self._rewrite_block(original_node.body, updated_node.body)
+        return updated_node if body is None else updated_node.with_changes(body=body)
+
+    def leave_Module(self, original_node: cst.Module, updated_node: cst.Module) -> cst.Module:
+        body = self._rewrite_block(original_node.body, updated_node.body)
+        self._scopes.pop()
+        return updated_node if body is None else updated_node.with_changes(body=body)
+
+    def _rewrite_block(
+        self,
+        original: Sequence[cst.BaseStatement],
+        updated: Sequence[cst.BaseStatement],
+    ) -> list[cst.BaseStatement] | None:
+        """Rewrite the fixable loops of a statement list (None if unchanged)."""
+        if isinstance(self._scopes[-1], cst.ClassDef) or len(original) != len(updated):
+            return None
+
+        out: list[cst.BaseStatement] = []
+        # Whether out[-1] is updated[i - 1], untouched
+        previous_plain = False
+        changed = False
+        i = 0
+        while i < len(updated):
+            stmt = updated[i]
+            rewrite = None
+            if isinstance(stmt, cst.For) and self._wanted(original[i]):
+                previous = original[i - 1] if previous_plain else None
+                following = original[i + 1] if i + 1 < len(original) else None
+                try:
+                    rewrite = self._plan(original[i], stmt, previous, following)
+                except cst.ParserSyntaxError:
+                    rewrite = None
+            if rewrite is None:
+                out.append(stmt)
+                previous_plain = True
+                i += 1
+                continue
+
+            first = stmt
+            if rewrite.consume_previous:
+                first = out.pop()
+            statements = rewrite.statements
+            statements[0] = statements[0].with_changes(leading_lines=first.leading_lines)
+            out.extend(statements)
+            self.rewritten.append(self._start_line(original[i]))
+            changed = True
+            previous_plain = False
+            i += 2 if rewrite.consume_next else 1
+
+        return out if changed else None
+
+    def _wanted(self, node: cst.CSTNode) -> bool:
+        return self.lines is None or self._start_line(node) in self.lines
+
+    def _start_line(self, node: cst.CSTNode) -> int:
+        try:
+            return self.get_metadata(PositionProvider, node).start.line
+        except KeyError:
+            return 0
+
+    # ===== Planning =====
+
+    def _plan(
+        self,
+        original: cst.For,
+        loop: cst.For,
+        previous: cst.BaseStatement | None,
+        following: cst.BaseStatement | None,
+    ) -> _Rewrite | None:
+        """Work out a safe replacement for one loop, if there is one."""
+        if loop.orelse is not None or loop.asynchronous is not None:
+            return None
+        if not isinstance(loop.body, cst.IndentedBlock):
+            return None
+        if _scan(_without_leading_lines(original)).comments:
+            return None
+
+        if len(loop.body.body) >= 2:
+            return self._plan_enumerate(original, loop, previous)
+
+        stmt = _single(loop.body)
+        if stmt is None:
+            return None
+        condition = None
+        if isinstance(stmt, cst.If):
+            if stmt.orelse is not None:
+                return None
+            condition = stmt.test
+            inner = _single(stmt.body)
+            if inner is None:
+                return None
+            returned = _bool_return(inner)
+            if returned is not None:
+                return self._plan_any_all(original, loop, condition, returned, following)
+            stmt = inner
+
+        small = _small(stmt)
+        if isinstance(small, cst.Expr) and isinstance(small.value, cst.Call):
+            return self._plan_accumulate(original, loop, small.value, condition, previous)
+        if condition is None and isinstance(small, cst.Assign):
+            return self._plan_dict(original, loop, small, previous)
+        if condition is None and isinstance(small, cst.AugAssign):
+            return self._plan_augmented(original, loop, small, previous)
+        return None
+
+    def _comprehension_safe(
+        self,
+        original: cst.For,
+        loop: cst.For,
+        expressions: list[cst.CSTNode | None],
+        accumulator: str | None,
+        previous: cst.BaseStatement | None = None,
+        following: cst.BaseStatement | None = None,
+    ) -> bool:
+        """Check that moving the loop into a comprehension keeps behaviour."""
+        targets = _target_names(loop.target)
+        if targets is None or accumulator in targets:
+            return False
+        used = _scan(*expressions, loop.iter)
+        if used.unsafe or (accumulator is not None and used.names[accumulator]):
+            return False
+        consumed = _scan(original, previous, following).names
+        in_scope = self._names_in_scope()
+        return all(in_scope[name] == consumed[name] for name in targets)
+
+    def _header(self, loop: cst.For) -> str:
+        target = cst.Module(body=[]).code_for_node(loop.target).strip()
+        return f"for {target} in {_code(loop.iter)}"
+
+    def _plan_accumulate(
+        self,
+        original: cst.For,
+        loop: cst.For,
+        call: cst.Call,
+        condition: cst.BaseExpression | None,
+        previous: cst.BaseStatement | None,
+    ) -> _Rewrite | None:
+        """``acc.append(v)``/``acc.add(v)``, optionally under an ``if``."""
+        func = call.func
+        if not isinstance(func, cst.Attribute) or func.attr.value not in ("append", "add"):
+            return None
+        if len(call.args) != 1 or call.args[0].keyword is not None or call.args[0].star:
+            return None
+        if func.attr.value == "add" and condition is not None:
+            return None
+        kind = "list" if func.attr.value == "append" else "set"
+        accumulator = _root_name(func.value)
+        value = call.args[0].value
+        if accumulator is None:
+            return None
+
+        init = _init_value(previous, accumulator) if isinstance(func.value, cst.Name) else None
+        merge = _is_empty(init, kind)
+        if not self._comprehension_safe(
+            original, loop, [value, condition], accumulator, previous if merge else None
+        ):
+            return None
+
+        identity = (
+            condition is None
+            and isinstance(value, cst.Name)
+            and isinstance(loop.target, cst.Name)
+            and value.value == loop.target.value
+        )
+        if identity:
+            items = _code(loop.iter)
+            built = f"{kind}({items})"
+        else:
+            clause = f" if {_code(condition)}" if condition is not None else ""
+            inner = f"{_code(value)} {self._header(loop)}{clause}"
+            built = f"[{inner}]" if kind == "list" else f"{{{inner}}}"
+            items = built
+
+        method = "extend" if kind == "list" else "update"
+        if merge:
+            code = f"{_declaration(previous)} = {built}"
+        else:
+            code = f"{_code(func.value)}.{method}({items})"
+        return _Rewrite([cst.parse_statement(code + "\n")], consume_previous=merge)
+
+    def _plan_dict(
+        self,
+        original: cst.For,
+        loop: cst.For,
+        assign: cst.Assign,
+        previous: cst.BaseStatement | None,
+    ) -> _Rewrite | None:
+        """``acc[k] = v``."""
+        if len(assign.targets) != 1:
+            return None
+        target = assign.targets[0].target
+        if not isinstance(target, cst.Subscript) or len(target.slice) != 1:
+            return None
+        index = target.slice[0].slice
+        if not isinstance(index, cst.Index) or index.star is not None:
+            return None
+        key, value = index.value, assign.value
+        accumulator = _root_name(target.value)
+        if accumulator is None:
+            return None
+        # A comprehension evaluates the key first, the loop the value first
+        if _contains_call(key) and _contains_call(value):
+            return None
+
+        init = _init_value(previous, accumulator) if isinstance(target.value, cst.Name) else None
+        merge = _is_empty(init, "dict")
+        if not self._comprehension_safe(
+            original, loop, [key, value], accumulator, previous if merge else None
+        ):
+            return None
+
+        built = f"{{{_code(key)}: {_code(value)} {self._header(loop)}}}"
+        if merge:
+            code = f"{_declaration(previous)} = {built}"
+        else:
+            code = f"{_code(target.value)}.update({built})"
+        return _Rewrite([cst.parse_statement(code + "\n")], consume_previous=merge)
+
+    def _plan_augmented(
+        self,
+        original: cst.For,
+        loop: cst.For,
+        aug: cst.AugAssign,
+        previous: cst.BaseStatement | None,
+    ) -> _Rewrite | None:
+        """``acc += v`` after ``acc = <number>`` or ``acc = ""``."""
+        if not isinstance(aug.operator, cst.AddAssign) or not isinstance(aug.target, cst.Name):
+            return None
+        accumulator = aug.target.value
+        init = _init_value(previous, accumulator)
+        if init is None:
+            return None
+        if not self._comprehension_safe(original, loop, [aug.value], accumulator, previous):
+            return None
+
+        identity = (
+            isinstance(aug.value, cst.Name)
+            and isinstance(loop.target, cst.Name)
+            and aug.value.value == loop.target.value
+        )
+        items = _code(loop.iter) if identity else f"{_code(aug.value)} {self._header(loop)}"
+
+        declaration = _declaration(previous)
+        if isinstance(init, (cst.Integer, cst.Float)):
+            if init.value == "0":
+                code = f"{declaration} = sum({items})"
+            else:
+                generator = items if identity else f"({items})"
+                code = f"{declaration} = sum({generator}, {init.value})"
+        elif (
+            isinstance(init, cst.SimpleString)
+            and "b" not in init.prefix.lower()
+            and init.evaluated_value == ""
+        ):
+            code = f"{declaration} = {init.value}.join({items})"
+        else:
+            return None
+        return _Rewrite([cst.parse_statement(code + "\n")], consume_previous=True)
+
+    def _plan_any_all(
+        self,
+        original: cst.For,
+        loop: cst.For,
+        condition: cst.BaseExpression,
+        returned: bool,
+        following: cst.BaseStatement | None,
+    ) -> _Rewrite | None:
+        """``if cond: return True`` followed by ``return False`` (or reversed)."""
+        if following is None or _bool_return(following) is not (not returned):
+            return None
+        if _scan(_without_leading_lines(following)).comments:
+            return None
+        if not self._comprehension_safe(original, loop, [condition], None, None, following):
+            return None
+
+        generator = f"{_code(condition)} {self._header(loop)}"
+        code = f"return any({generator})" if returned else f"return not any({generator})"
+        return _Rewrite([cst.parse_statement(code + "\n")], consume_next=True)
+
+    def _plan_enumerate(
+        self,
+        original: cst.For,
+        loop: cst.For,
+        previous: cst.BaseStatement | None,
+    ) -> _Rewrite | None:
+        """``i = n`` before the loop and ``i += 1`` as its last statement."""
+        last = _small(loop.body.body[-1])
+        if not (
+            isinstance(last, cst.AugAssign)
+            and isinstance(last.operator, cst.AddAssign)
+            and isinstance(last.target, cst.Name)
+            and isinstance(last.value, cst.Integer)
+            and last.value.value == "1"
+        ):
+            return None
+        index = last.target.value
+        start = _init_value(previous, index)
+        if not isinstance(start, cst.Integer) or not isinstance(_small(previous), cst.Assign):
+            return None
+        if _target_names(loop.target) is None or index in _target_names(loop.target):
+            return None
+
+        rest = loop.body.body[:-1]
+        body = _scan(*rest)
+        if body.continues or body.unsafe or _scan(loop.iter).names[index]:
+            return None
+        if _assigns(rest, index):
+            return None
+        # The counter ends one higher after the manual loop
+        consumed = _scan(original, previous).names
+        if self._names_in_scope()[index] != consumed[index]:
+            return None
+
+        target = _code(loop.target)
+        offset = "" if start.value == "0" else f", {start.value}"
+        header = cst.parse_statement(
+            f"for {index}, {target} in enumerate({_code(loop.iter)}{offset}):\n    pass\n"
+        )
+        assert isinstance(header, cst.For)
+        rewritten = loop.with_changes(
+            target=header.target,
+            iter=header.iter,
+            body=loop.body.with_changes(body=rest),
+        )
+        return _Rewrite([rewritten], consume_previous=True)
+
+
+def _contains_call(node: cst.CSTNode) -> bool:
+    """Check whether an expression contains a call."""
+    found = False
+
+    class _Finder(cst.CSTVisitor):
+        def visit_Call(self, node: cst.Call) -> bool:
+            nonlocal found
+            found = True
+            return False
+
+    node.visit(_Finder())
+    return found
+
+
+def _assigns(statements: Sequence[cst.CSTNode], name: str) -> bool:
+    """Check whether any statement (re)binds ``name``."""
+    found = False
+
+    class _Finder(cst.CSTVisitor):
+        def _check(self, target: cst.CSTNode) -> None:
+            nonlocal found
+            if name in _scan(target).names:
+                found = True
+
+        def visit_AssignTarget(self, node: cst.AssignTarget) -> None:
+            self._check(node.target)
+
+        def visit_AugAssign(self, node: cst.AugAssign) -> None:
+            self._check(node.target)
+
+        def visit_AnnAssign(self, node: cst.AnnAssign) -> None:
+            self._check(node.target)
+
+        def visit_For(self, node: cst.For) -> None:
+            self._check(node.target)
+
+        def visit_AsName(self, node: cst.AsName) -> None:
+            self._check(node.name)
+
+    finder = _Finder()
+    for statement in statements:
+        statement.visit(finder)
+    return found
+
+
+def rewrite_loops(code: str, lines: set[int] | None = None) -> tuple[str, list[int]]:
+    """Rewrite the fixable loops of a module.
+
+    Parameters
+    ----------
+    code : str
+        Module source.
+    lines : set[int] | None
+        Start lines of the loops to rewrite; None rewrites all fixable loops.
+
+    Returns
+    -------
+    tuple[str, list[int]]
+        The new source and the start lines of the rewritten loops.
+
+    Raises
+    ------
+    libcst.ParserSyntaxError
+        If ``code`` is not valid Python.
+    """
+    from libcst.metadata import MetadataWrapper
+
+    rewriter = LoopRewriter(lines)
+    new_code = MetadataWrapper(cst.parse_module(code)).visit(rewriter).code
+    return new_code, sorted(rewriter.rewritten)
@@ -5,6 +5,7 @@ or other built-in functions for improved performance and readability.
 """
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -12,6 +13,9 @@ from typing import TYPE_CHECKING
 import libcst as cst
 from libcst.metadata import MetadataWrapper, PositionProvider
 
+from rejig.core.diff import combine_diffs
+from rejig.core.results import ErrorResult, Result
+from rejig.optimize.loop_fixes import FIXABLE_PATTERNS, rewrite_loops
 from rejig.optimize.targets import (
     OptimizeFinding,
     OptimizeTarget,
@@ -21,6 +25,7 @@ from rejig.optimize.targets import (
 
 if TYPE_CHECKING:
     from rejig.core.rejig import Rejig
+    from rejig.core.transaction import Transaction
 
 
 @dataclass
@@ -420,7 +425,7 @@ class LoopPatternVisitor(cst.CSTVisitor):
             pattern_type = "any_builtin"
         elif return_value == "False":
             # This could be an all() pattern (negated)
-            suggested = f"return not all(not ({condition}) for {target} in {iter_var})"
+            suggested = f"return not any({condition} for {target} in {iter_var})"
             pattern_type = "all_builtin"
         else:
             return
@@ -883,3 +888,123 @@ class LoopOptimizer:
                     findings.append(OptimizeTarget(self._rejig, finding))
 
         return OptimizeTargetList(self._rejig, findings)
+
+    def apply(
+        self,
+        findings: OptimizeTargetList | None = None,
+        min_confidence: float = 0.7,
+    ) -> Result:
+        """Rewrite the fixable loops among findings.
+
+        Each file is parsed and rewritten once, and all files are changed
+        together in a transaction (or added to the current one, if any).
+        Loops are only rewritten where ``LoopRewriter`` can show the change
+        keeps behaviour; the rest are counted as skipped. Findings must be
+        up to date with the files, since loops are matched by start line.
+
+        Parameters
+        ----------
+        findings : OptimizeTargetList | None
+            Findings to fix. Non-loop findings are ignored. If None, runs
+            ``find_all_issues(min_confidence)``.
+        min_confidence : float
+            Minimum confidence when finding issues here.
+
+        Returns
+        -------
+        Result
+            Result with the combined diff. ``data`` holds ``fixed`` and
+            ``skipped`` counts and the rewritten start ``lines`` per file.
+
+        Examples
+        --------
+        >>> result = LoopOptimizer(rj).apply()
+        >>> print(result.data["fixed"], "loops rewritten")
+        """
+        if findings is None:
+            findings = self.find_all_issues(min_confidence)
+
+        lines_by_file: dict[Path, set[int]] = defaultdict(set)
+        for target in findings:
+            context = target.finding.context or {}
+            if context.get("pattern_type") in FIXABLE_PATTERNS:
+                lines_by_file[target.file_path].add(target.line_number)
+
+        if not lines_by_file:
+            return Result(
+                success=True,
+                message="No fixable loop findings",
+                data={"fixed": 0, "skipped": 0, "lines": {}},
+            )
+
+        tx = self._rejig.current_transaction
+        if tx is not None:
+            return self._rewrite_files(tx, lines_by_file)
+
+        try:
+            with self._rejig.transaction() as tx:
+                result = self._rewrite_files(tx, lines_by_file)
+                if not result.files_changed:
+                    return result
+                batch = tx.commit()
+        except Exception as e:
+            return ErrorResult(
+                message=f"Failed to rewrite loops: {e}",
+                exception=e,
+                operation="apply",
+            )
+
+        if not batch.success:
+            return ErrorResult(
+                message="; ".join(r.message for r in batch.failed),
+                operation="apply",
+            )
+        return Result(
+            success=True,
+            message=result.message,
+            files_changed=batch.files_changed,
+            diff=batch.diff,
+            diffs=batch.diffs,
+            data=result.data,
+        )
+
+    def _rewrite_files(
+        self, tx: Transaction, lines_by_file: dict[Path, set[int]]
+    ) -> Result:
+        """Rewrite loops file by file, recording changes in a transaction."""
+        fixed: dict[Path, list[int]] = {}
+        skipped = 0
+        diffs: dict[Path, str] = {}
+
+        for path, lines in lines_by_file.items():
+            content = tx.get_current_content(path)
+            if content is None:
+                skipped += len(lines)
+                continue
+            try:
+                new_content, rewritten = rewrite_loops(content, lines)
+            except cst.ParserSyntaxError:
+                skipped += len(lines)
+                continue
+            skipped += len(lines) - len(rewritten)
+            if not rewritten or new_content == content:
+                continue
+            change = tx.add_change(
+                path, content, new_content, f"rewrite {len(rewritten)} loop(s)"
+            )
+            fixed[path] = rewritten
+            if change.diff:
+                diffs[path] = change.diff
+
+        count = sum(len(lines) for lines in fixed.values())
+        message = f"Rewrote {count} loop(s) in {len(fixed)} file(s)"
+        if skipped:
+            message += f", skipped {skipped}"
+        return Result(
+            success=True,
+            message=message,
+            files_changed=list(fixed),
+            diff=combine_diffs(diffs) if diffs else None,
+            diffs=diffs,
+            data={"fixed": count, "skipped": skipped, "lines": fixed},
+        )
@@ -0,0 +1,1008 @@
+"""N+1 query detection for Django and SQLAlchemy code.
+
+Accessing a lazy relationship on each object of a query result runs one
+extra query per object. This module finds loops (and comprehensions) over
+querysets or query results whose body dereferences such a relationship
+without it being eager-loaded, and suggests the eager-loading call:
+
+- Django: ``select_related()`` for forward ``ForeignKey``/``OneToOneField``
+  and reverse one-to-one accessors, ``prefetch_related()`` for
+  ``ManyToManyField`` and reverse ``ForeignKey`` managers
+- SQLAlchemy: ``options(joinedload(...))`` for many-to-one relationships
+  and ``options(selectinload(...))`` for collections, on ``session.query()``,
+  ``select()`` statements and Flask-SQLAlchemy ``Model.query``
+
+The model and relationship map comes from the model classes in the same
+project, so each file is parsed once for both. ``NPlusOneAnalyzer.apply``
+inserts the eager-loading calls into the originating queries.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+import libcst as cst
+from libcst.codemod import CodemodContext
+from libcst.codemod.visitors import AddImportsVisitor
+from libcst.metadata import MetadataWrapper, PositionProvider
+
+from rejig.core.diff import combine_diffs
+from rejig.core.results import ErrorResult, Result
+from rejig.optimize.performance import _dotted
+from rejig.optimize.targets import (
+    OptimizeFinding,
+    OptimizeTarget,
+    OptimizeTargetList,
+    OptimizeType,
+)
+from rejig.optimize.visitors import visit_combined
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+    from rejig.core.transaction import Transaction
+
+# Django relationship fields, and whether the forward side is a collection
+DJANGO_RELATION_FIELDS = {
+    "ForeignKey": False,
+    "OneToOneField": False,
+    "ManyToManyField": True,
+}
+
+# SQLAlchemy loader options that eager-load a relationship
+SQLALCHEMY_EAGER_LOADERS = frozenset({
+    "joinedload", "selectinload", "subqueryload", "immediateload", "contains_eager",
+})
+
+# relationship(lazy=...) strategies that load on first attribute access
+SQLALCHEMY_LAZY_STRATEGIES = frozenset({"select", "True"})
+
+# Queryset methods that return dicts or tuples instead of model instances
+DJANGO_VALUE_METHODS = frozenset({"values", "values_list"})
+
+# Related-manager methods that always run a new query, prefetched or not
+DJANGO_QUERY_METHODS = frozenset({
+    "filter", "exclude", "order_by", "annotate", "aggregate", "values", "values_list",
+})
+
+# Calls whose first argument carries the query (session.scalars(stmt))
+_WRAPPER_CALLS = frozenset({"scalars", "execute"})
+
+# Collection annotations inside Mapped[...]
+_COLLECTION_TYPES = frozenset({"list", "List", "set", "Set", "Sequence", "tuple"})
+
+# How far query variables are followed back through assignments
+_MAX_RESOLVE = 5
+
+
+@dataclass
+class ModelRelationship:
+    """A relationship attribute on an ORM model.
+
+    Attributes
+    ----------
+    model : str
+        Name of the model class the attribute is accessed on.
+    name : str
+        Attribute name.
+    target : str
+        Name of the related model class.
+    framework : str
+        "django" or "sqlalchemy".
+    many : bool | None
+        Whether the attribute is a collection (None if unknown).
+    lazy : bool
+        Whether the attribute is loaded with a query on first access.
+    reverse : bool
+        Whether the attribute is created by the other model's field
+        (a Django reverse accessor or a SQLAlchemy ``backref``).
+    """
+
+    model: str
+    name: str
+    target: str
+    framework: str
+    many: bool | None = None
+    lazy: bool = True
+    reverse: bool = False
+
+    @property
+    def loader(self) -> str:
+        """Eager-loading call that avoids a query per object."""
+        if self.framework == "django":
+            return "prefetch_related" if self.many else "select_related"
+        return "joinedload" if self.many is False else "selectinload"
+
+
+@dataclass
+class _Query:
+    """Where a loop's iterable comes from."""
+
+    framework: str
+    model: str
+    model_expr: str
+    origin_line: int
+    origin_column: int
+    origin_code: str
+    loaded: set[str] = field(default_factory=set)
+    select_all: bool = False
+
+    def is_loaded(self, relationship: ModelRelationship) -> bool:
+        if relationship.name in self.loaded:
+            return True
+        # select_related() without arguments follows every non-null forward key
+        return self.select_all and relationship.loader == "select_related"
+
+
+@dataclass
+class _QueryLoop:
+    """A loop or comprehension over a query."""
+
+    variable: str
+    query: _Query
+    line: int
+    scope: str | None
+    # attribute name -> first line it's accessed on the loop variable
+    accesses: dict[str, int] = field(default_factory=dict)
+
+
+def _call_name(node: cst.Call) -> str | None:
+    if isinstance(node.func, cst.Name):
+        return node.func.value
+    if isinstance(node.func, cst.Attribute):
+        return node.func.attr.value
+    return None
+
+
+def _string(node: cst.BaseExpression) -> str | None:
+    if isinstance(node, cst.SimpleString):
+        value = node.evaluated_value
+        return value if isinstance(value, str) else None
+    return None
+
+
+def _positional(node: cst.Call, index: int = 0, keyword: str | None = None) -> cst.BaseExpression | None:
+    """The index-th positional argument, or the keyword argument."""
+    positional = [a for a in node.args if a.keyword is None and not a.star]
+    if index < len(positional):
+        return positional[index].value
+    if keyword is not None:
+        return _keyword(node, keyword)
+    return None
+
+
+def _keyword(node: cst.Call, name: str) -> cst.BaseExpression | None:
+    return next((a.value for a in node.args if a.keyword and a.keyword.value == name), None)
+
+
+def _class_name(node: cst.BaseExpression | None) -> str | None:
+    """Model class named by a string, name or dotted reference."""
+    if node is None:
+        return None
+    value = _string(node)
+    if value is None:
+        value = _dotted(node)
+    return value.rsplit(".", 1)[-1] if value else None
+
+
+def _root_model(node: cst.CSTNode) -> tuple[str, str] | None:
+    """(framework, model expression) if node is where a query starts."""
+    if isinstance(node, cst.Attribute) and isinstance(node.value, (cst.Name, cst.Attribute)):
+        model = _dotted(node.value)
+        if model is None:
+            return None
+        if node.attr.value == "objects":
+            return "django", model
+        if node.attr.value == "query" and isinstance(node.value, cst.Name):
+            return "sqlalchemy", model
+    elif isinstance(node, cst.Call) and _call_name(node) in ("query", "select"):
+        model = _dotted(_positional(node)) if _positional(node) is not None else None
+        if model is not None:
+            return "sqlalchemy", model
+    return None
+
+
+def _spine(node: cst.CSTNode) -> Iterator[cst.CSTNode]:
+    """Nodes along a method chain, from the outermost call inwards.
+
+    ``session.scalars(stmt)`` and ``session.execute(stmt)`` continue into
+    the statement rather than the session.
+    """
+    while True:
+        yield node
+        if isinstance(node, cst.Call):
+            if (
+                _call_name(node) in _WRAPPER_CALLS
+                and isinstance(node.func, cst.Attribute)
+                and _positional(node) is not None
+            ):
+                node = _positional(node)
+            else:
+                node = node.func
+        elif isinstance(node, cst.Attribute):
+            node = node.value
+        else:
+            return
+
+
+def _rewrite_spine(node: cst.BaseExpression, replace) -> cst.BaseExpression:
+    """Replace the first node along the chain for which replace() returns one."""
+    replaced = replace(node)
+    if replaced is not None:
+        return replaced
+    if isinstance(node, cst.Call):
+        first = _positional(node)
+        if (
+            _call_name(node) in _WRAPPER_CALLS
+            and isinstance(node.func, cst.Attribute)
+            and first is not None
+        ):
+            index = next(i for i, a in enumerate(node.args) if a.value is first)
+            value = _rewrite_spine(first, replace)
+            if value is first:
+                return node
+            args = list(node.args)
+            args[index] = args[index].with_changes(value=value)
+            return node.with_changes(args=args)
+        func = _rewrite_spine(node.func, replace)
+        return node if func is node.func else node.with_changes(func=func)
+    if isinstance(node, cst.Attribute):
+        value = _rewrite_spine(node.value, replace)
+        return node if value is node.value else node.with_changes(value=value)
+    return node
+
+
+def _loaded_names(node: cst.BaseExpression) -> Iterator[str]:
+    """Relationship names eager-loaded by a loader option expression."""
+    for part in _spine(node):
+        if isinstance(part, cst.Call) and _call_name(part) in SQLALCHEMY_EAGER_LOADERS:
+            argument = _positional(part)
+            if isinstance(argument, cst.Attribute):
+                yield argument.attr.value
+            elif argument is not None and _string(argument):
+                yield _string(argument)
+
+
+def add_eager_loads(
+    query: cst.BaseExpression,
+    framework: str,
+    model_expr: str,
+    relationships: list[ModelRelationship],
+) -> cst.BaseExpression:
+    """Add eager loading of relationships to a query expression.
+
+    Arguments are added to an existing ``select_related()``,
+    ``prefetch_related()`` or ``options()`` call in the chain; otherwise
+    the call is inserted right after where the query starts
+    (``Model.objects``, ``session.query(Model)``, ``select(Model)`` or
+    ``Model.query``).
+
+    Parameters
+    ----------
+    query : cst.BaseExpression
+        The query expression.
+    framework : str
+        "django" or "sqlalchemy".
+    model_expr : str
+        How the model is referenced in the query (e.g. ``models.Post``).
+    relationships : list[ModelRelationship]
+        Relationships to load.
+
+    Returns
+    -------
+    cst.BaseExpression
+        The new query expression.
+    """
+    calls: dict[str, list[str]] = defaultdict(list)
+    for rel in relationships:
+        if framework == "django":
+            calls[rel.loader].append(f'"{rel.name}"')
+        else:
+            calls["options"].append(f"{rel.loader}({model_expr}.{rel.name})")
+
+    # Each call is inserted at the root, so insert the last one first
+    for method, arguments in reversed(list(calls.items())):
+        args = [cst.Arg(cst.parse_expression(a)) for a in arguments]
+
+        def extend(node: cst.CSTNode) -> cst.BaseExpression | None:
+            if (
+                isinstance(node, cst.Call)
+                and _call_name(node) == method
+                and isinstance(node.func, cst.Attribute)
+                and (node.args or method == "options")
+            ):
+                return node.with_changes(args=[*node.args, *args])
+            return None
+
+        def wrap(node: cst.CSTNode) -> cst.BaseExpression | None:
+            if _root_model(node) is None:
+                return None
+            return cst.Call(func=cst.Attribute(value=node, attr=cst.Name(method)), args=args)
+
+        new_query = _rewrite_spine(query, extend)
+        if new_query is query:
+            new_query = _rewrite_spine(query, wrap)
+        query = new_query
+    return query
+
+
+class QueryLoopVisitor(cst.CSTVisitor):
+    """Collects ORM relationships and loops over queries in one module.
+
+    Relationships are declared in one module and used in others, so the
+    visitor only records what it sees; ``NPlusOneAnalyzer`` matches the
+    loop accesses against the relationships of the whole project.
+
+    Parameters
+    ----------
+    file_path : Path
+        Path of the module being visited.
+    """
+
+    METADATA_DEPENDENCIES = (PositionProvider,)
+
+    def __init__(self, file_path: Path) -> None:
+        super().__init__()
+        self.file_path = file_path
+        self.relationships: list[ModelRelationship] = []
+        self.loops: list[_QueryLoop] = []
+        # ("class" | "function" | "module", name)
+        self._scopes: list[tuple[str, str | None]] = []
+        # Simple name assignments per function (or module) scope
+        self._assignments: list[dict[str, cst.BaseExpression]] = []
+        self._active: list[tuple[cst.CSTNode, _QueryLoop]] = []
+        # Attribute nodes whose access doesn't benefit from eager loading
+        self._ignored: set[int] = set()
+
+    def _line(self, node: cst.CSTNode) -> int:
+        try:
+            return self.get_metadata(PositionProvider, node).start.line
+        except KeyError:
+            return 0
+
+    def _function_name(self) -> str | None:
+        names = [name for kind, name in self._scopes if kind != "module"]
+        return ".".join(names) if names else None
+
+    # ===== Scopes =====
+
+    def visit_Module(self, node: cst.Module) -> bool:
+        self._scopes.append(("module", None))
+        self._assignments.append({})
+        return True
+
+    def leave_Module(self, original_node: cst.Module) -> None:
+        self._scopes.pop()
+        self._assignments.pop()
+        self.loops.sort(key=lambda loop: loop.line)
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> bool:
+        self._scopes.append(("class", node.name.value))
+        return True
+
+    def leave_ClassDef(self, original_node: cst.ClassDef) -> None:
+        self._scopes.pop()
+
+    def visit_FunctionDef(self, node: cst.FunctionDef) -> bool:
+        self._scopes.append(("function", node.name.value))
+        self._assignments.append({})
+        return True
+
+    def leave_FunctionDef(self, original_node: cst.FunctionDef) -> None:
+        self._scopes.pop()
+        self._assignments.pop()
+
+    # ===== Models =====
+
+    def visit_Assign(self, node: cst.Assign) -> None:
+        for target in node.targets:
+            if isinstance(target.target, cst.Attribute):
+                self._ignored.add(id(target.target))
+        if len(node.targets) != 1 or not isinstance(node.targets[0].target, cst.Name):
+            return
+        name = node.targets[0].target.value
+        if self._scopes[-1][0] == "class":
+            self._check_field(name, node.value, None)
+        else:
+            self._assignments[-1][name] = node.value
+
+    def visit_AnnAssign(self, node: cst.AnnAssign) -> None:
+        if not isinstance(node.target, cst.Name) or node.value is None:
+            return
+        if self._scopes[-1][0] == "class":
+            self._check_field(node.target.value, node.value, node.annotation.annotation)
+        else:
+            self._assignments[-1][node.target.value] = node.value
+
+    def _check_field(
+        self, name: str, value: cst.BaseExpression, annotation: cst.BaseExpression | None
+    ) -> None:
+        if not isinstance(value, cst.Call):
+            return
+        model = self._scopes[-1][1]
+        function = _call_name(value)
+        if function in DJANGO_RELATION_FIELDS:
+            self._add_django_field(model, name, value, function)
+        elif function == "relationship":
+            self._add_sqlalchemy_relationship(model, name, value, annotation)
+
+    def _add_django_field(self, model: str, name: str, node: cst.Call, kind: str) -> None:
+        target = _class_name(_positional(node, keyword="to"))
+        if target is None:
+            return
+        if target == "self":
+            target = model
+        many = DJANGO_RELATION_FIELDS[kind]
+        self.relationships.append(ModelRelationship(model, name, target, "django", many))
+
+        related_name = _keyword(node, "related_name")
+        if related_name is not None:
+            reverse = _string(related_name)
+            if reverse is None or reverse.endswith("+"):
+                return
+        elif kind == "OneToOneField":
+            reverse = model.lower()
+        else:
+            reverse = f"{model.lower()}_set"
+        self.relationships.append(ModelRelationship(
+            target, reverse, model, "django", kind != "OneToOneField", reverse=True,
+        ))
+
+    def _add_sqlalchemy_relationship(
+        self,
+        model: str,
+        name: str,
+        node: cst.Call,
+        annotation: cst.BaseExpression | None,
+    ) -> None:
+        target = _class_name(_positional(node, keyword="argument"))
+        many: bool | None = None
+        if annotation is not None:
+            annotated, many = self._mapped_type(annotation)
+            target = target or annotated
+        if target is None:
+            return
+
+        uselist = _keyword(node, "uselist")
+        if isinstance(uselist, cst.Name) and uselist.value in ("True", "False"):
+            many = uselist.value == "True"
+        lazy = _keyword(node, "lazy")
+        is_lazy = lazy is None or (
+            (_string(lazy) or getattr(lazy, "value", None)) in SQLALCHEMY_LAZY_STRATEGIES
+        )
+        self.relationships.append(
+            ModelRelationship(model, name, target, "sqlalchemy", many, is_lazy)
+        )
+
+        backref = _keyword(node, "backref")
+        if isinstance(backref, cst.Call):
+            backref = _positional(backref)
+        reverse = _string(backref) if backref is not None else None
+        if reverse:
+            self.relationships.append(ModelRelationship(
+                target, reverse, model, "sqlalchemy",
+                None if many is None else not many, reverse=True,
+            ))
+
+    def _mapped_type(self, annotation: cst.BaseExpression) -> tuple[str | None, bool | None]:
+        """Target class and collection-ness from ``Mapped[...]``."""
+        if not isinstance(annotation, cst.Subscript) or _class_name(annotation.value) != "Mapped":
+            return None, None
+        many = False
+        inner = annotation.slice[0].slice
+        while isinstance(inner, cst.Index):
+            value = inner.value
+            if not isinstance(value, cst.Subscript):
+                return _class_name(value), many
+            container = _class_name(value.value)
+            if container in _COLLECTION_TYPES:
+                many = True
+            elif container != "Optional":
+                return None, None
+            inner = value.slice[0].slice
+        return None, None
+
+    # ===== Queries =====
+
+    def _describe(self, expr: cst.BaseExpression) -> _Query | None:
+        """Find where an iterable expression's query starts, if it is one."""
+        calls: list[cst.Call] = []
+        node = expr
+        for _ in range(_MAX_RESOLVE):
+            origin = node
+            root = None
+            for part in _spine(node):
+                if isinstance(part, cst.Call):
+                    calls.append(part)
+                root = _root_model(part)
+                if root is not None:
+                    break
+            if root is not None:
+                break
+            if not isinstance(part, cst.Name):
+                return None
+            node = next(
+                (scope[part.value] for scope in reversed(self._assignments) if part.value in scope),
+                None,
+            )
+            if node is None:
+                return None
+        else:
+            return None
+
+        framework, model_expr = root
+        position = self.get_metadata(PositionProvider, origin).start
+        query = _Query(
+            framework,
+            model_expr.rsplit(".", 1)[-1],
+            model_expr,
+            position.line,
+            position.column,
+            cst.Module(body=[]).code_for_node(origin),
+        )
+        names = {_call_name(call) for call in calls}
+        if framework == "django":
+            if names & DJANGO_VALUE_METHODS:
+                return None
+            for call in calls:
+                if _call_name(call) == "select_related":
+                    if not call.args:
+                        query.select_all = True
+                    query.loaded.update(self._lookups(call))
+                elif _call_name(call) == "prefetch_related":
+                    query.loaded.update(self._lookups(call))
+        else:
+            # Rows from session.execute(select(...)) are tuples, not models
+            if isinstance(part, cst.Call) and _call_name(part) == "select" and "scalars" not in names:
+                return None
+            for call in calls:
+                if _call_name(call) == "options":
+                    for arg in call.args:
+                        query.loaded.update(_loaded_names(arg.value))
+        return query
+
+    @staticmethod
+    def _lookups(call: cst.Call) -> Iterator[str]:
+        """First relationship of each Django lookup in a *_related() call."""
+        for arg in call.args:
+            value = arg.value
+            if isinstance(value, cst.Call) and _call_name(value) == "Prefetch":
+                value = _positional(value)
+            lookup = _string(value) if value is not None else None
+            if lookup:
+                yield lookup.split("__", 1)[0]
+
+    def _start_loop(
+        self,
+        node: cst.CSTNode,
+        target: cst.BaseExpression,
+        iterable: cst.BaseExpression,
+    ) -> None:
+        if not isinstance(target, cst.Name):
+            return
+        query = self._describe(iterable)
+        if query is None:
+            return
+        loop = _QueryLoop(target.value, query, self._line(node), self._function_name())
+        self._active.append((node, loop))
+        self.loops.append(loop)
+
+    def _end_loops(self, node: cst.CSTNode) -> None:
+        while self._active and self._active[-1][0] is node:
+            self._active.pop()
+
+    def visit_For(self, node: cst.For) -> None:
+        self._start_loop(node, node.target, node.iter)
+
+    def leave_For(self, original_node: cst.For) -> None:
+        self._end_loops(original_node)
+
+    def _visit_comprehension(self, node: cst.CSTNode) -> None:
+        comp_for = node.for_in
+        while comp_for is not None:
+            self._start_loop(node, comp_for.target, comp_for.iter)
+            comp_for = comp_for.inner_for_in
+
+    def visit_ListComp(self, node: cst.ListComp) -> None:
+        self._visit_comprehension(node)
+
+    def leave_ListComp(self, original_node: cst.ListComp) -> None:
+        self._end_loops(original_node)
+
+    def visit_SetComp(self, node: cst.SetComp) -> None:
+        self._visit_comprehension(node)
+
+    def leave_SetComp(self, original_node: cst.SetComp) -> None:
+        self._end_loops(original_node)
+
+    def visit_GeneratorExp(self, node: cst.GeneratorExp) -> None:
+        self._visit_comprehension(node)
+
+    def leave_GeneratorExp(self, original_node: cst.GeneratorExp) -> None:
+        self._end_loops(original_node)
+
+    def visit_DictComp(self, node: cst.DictComp) -> None:
+        self._visit_comprehension(node)
+
+    def leave_DictComp(self, original_node: cst.DictComp) -> None:
+        self._end_loops(original_node)
+
+    def visit_Call(self, node: cst.Call) -> None:
+        # obj.related.filter() queries again even when obj.related is prefetched
+        if (
+            isinstance(node.func, cst.Attribute)
+            and node.func.attr.value in DJANGO_QUERY_METHODS
+            and isinstance(node.func.value, cst.Attribute)
+        ):
+            self._ignored.add(id(node.func.value))
+
+    def visit_Attribute(self, node: cst.Attribute) -> None:
+        if not self._active or not isinstance(node.value, cst.Name) or id(node) in self._ignored:
+            return
+        for _, loop in reversed(self._active):
+            if loop.variable == node.value.value:
+                loop.accesses.setdefault(node.attr.value, self._line(node))
+                return
+
+
+class _EagerLoadInserter(cst.CSTTransformer):
+    """Adds eager loading to queries identified by position and code."""
+
+    METADATA_DEPENDENCIES = (PositionProvider,)
+
+    def __init__(self, fixes: dict[tuple[int, int], tuple[_Query, list[ModelRelationship]]]) -> None:
+        super().__init__()
+        self._fixes = fixes
+        self.fixed: list[int] = []
+        self.loaders: set[str] = set()
+
+    def on_leave(
+        self,
+        original_node: cst.CSTNode,
+        updated_node: cst.CSTNode,
+    ) -> cst.CSTNode | cst.RemovalSentinel | cst.FlattenSentinel:
+        if not isinstance(original_node, cst.BaseExpression) or not isinstance(updated_node, cst.BaseExpression):
+            return updated_node
+        position = self.get_metadata(PositionProvider, original_node).start
+        fix = self._fixes.get((position.line, position.column))
+        if fix is None:
+            return updated_node
+        query, relationships = fix
+        # Nodes nested at the start of the query share its position
+        if cst.Module(body=[]).code_for_node(original_node) != query.origin_code:
+            return updated_node
+        del self._fixes[(position.line, position.column)]
+        self.fixed.append(position.line)
+        if query.framework == "sqlalchemy":
+            self.loaders.update(rel.loader for rel in relationships)
+        return add_eager_loads(updated_node, query.framework, query.model_expr, relationships)
+
+
+def insert_eager_loads(
+    code: str, fixes: dict[tuple[int, int], tuple[_Query, list[ModelRelationship]]]
+) -> tuple[str, list[int]]:
+    """Add eager loading to queries in a module.
+
+    SQLAlchemy loader options are imported from ``sqlalchemy.orm`` when
+    the module doesn't import them already.
+
+    Returns
+    -------
+    tuple[str, list[int]]
+        The new code and the sorted lines of the queries changed.
+    """
+    inserter = _EagerLoadInserter(dict(fixes))
+    module = MetadataWrapper(cst.parse_module(code)).visit(inserter)
+    if inserter.loaders:
+        context = CodemodContext()
+        for loader in sorted(inserter.loaders):
+            AddImportsVisitor.add_needed_import(context, "sqlalchemy.orm", loader)
+        module = AddImportsVisitor(context).transform_module(module)
+    return module.code, sorted(inserter.fixed)
+
+
+class NPlusOneAnalyzer:
+    """Finds N+1 queries in Django and SQLAlchemy code.
+
+    Builds the model and relationship map from the project's model
+    classes, then looks for loops over querysets or query results that
+    access a lazy relationship which the query doesn't eager-load.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The Rejig instance to analyze.
+
+    Example
+    -------
+    >>> from rejig import Rejig
+    >>> from rejig.optimize import NPlusOneAnalyzer
+    >>> rj = Rejig("src/")
+    >>> analyzer = NPlusOneAnalyzer(rj)
+    >>> issues = analyzer.find_all_issues()
+    >>> print(issues.summary())
+    >>> analyzer.apply(issues)
+    """
+
+    # Finding types reported by this analyzer
+    FINDING_TYPES = frozenset({OptimizeType.N_PLUS_ONE_QUERY})
+
+    def __init__(self, rejig: Rejig) -> None:
+        self._rejig = rejig
+
+    def _get_python_files(self) -> list[Path]:
+        """Get all Python files in the project."""
+        return list(self._rejig.root.rglob("*.py"))
+
+    def _scan(self) -> tuple[list[ModelRelationship], list[tuple[Path, _QueryLoop]]]:
+        """Collect relationships and query loops, parsing each file once."""
+        relationships: list[ModelRelationship] = []
+        loops: list[tuple[Path, _QueryLoop]] = []
+        for file_path in self._get_python_files():
+            visitor = QueryLoopVisitor(file_path)
+            try:
+                visit_combined(file_path.read_text(), [visitor])
+            except Exception:
+                continue
+            relationships.extend(visitor.relationships)
+            loops.extend((file_path, loop) for loop in visitor.loops)
+        return relationships, loops
+
+    @staticmethod
+    def _relationship_map(
+        relationships: list[ModelRelationship],
+    ) -> dict[str, dict[str, ModelRelationship]]:
+        models: dict[str, dict[str, ModelRelationship]] = defaultdict(dict)
+        for rel in relationships:
+            # A field declared on the model wins over a reverse accessor
+            if rel.reverse and rel.name in models[rel.model]:
+                continue
+            models[rel.model][rel.name] = rel
+        return dict(models)
+
+    def find_relationships(self) -> dict[str, dict[str, ModelRelationship]]:
+        """Build the model and relationship map of the project.
+
+        Returns
+        -------
+        dict[str, dict[str, ModelRelationship]]
+            Relationships by model class name and attribute name,
+            including Django reverse accessors and SQLAlchemy backrefs.
+        """
+        return self._relationship_map(self._scan()[0])
+
+    def find_n_plus_one_queries(self, min_confidence: float = 0.7) -> OptimizeTargetList:
+        """Find lazy relationship accesses inside loops over queries.
+
+        Parameters
+        ----------
+        min_confidence : float
+            Minimum confidence level for including a finding (0.0 to 1.0).
+
+        Returns
+        -------
+        OptimizeTargetList
+            One finding per loop and relationship, suggesting the query
+            with the eager-loading call added.
+        """
+        relationships, loops = self._scan()
+        models = self._relationship_map(relationships)
+        findings: list[OptimizeTarget] = []
+
+        for file_path, loop in loops:
+            query = loop.query
+            known = models.get(query.model, {})
+            lazy = [
+                known[name]
+                for name in loop.accesses
+                if name in known
+                and known[name].framework == query.framework
+                and known[name].lazy
+                and not query.is_loaded(known[name])
+            ]
+            if not lazy:
+                continue
+            suggested = cst.Module(body=[]).code_for_node(
+                add_eager_loads(
+                    cst.parse_expression(query.origin_code),
+                    query.framework,
+                    query.model_expr,
+                    lazy,
+                )
+            )
+            # Guessing the collection-ness only matters for the loader chosen
+            confidence = 0.85 if all(rel.many is not None for rel in lazy) else 0.75
+            if confidence < min_confidence:
+                continue
+            for rel in lazy:
+                finding = OptimizeFinding(
+                    type=OptimizeType.N_PLUS_ONE_QUERY,
+                    file_path=file_path,
+                    line_number=loop.accesses[rel.name],
+                    name=loop.scope,
+                    message=(
+                        f"'{loop.variable}.{rel.name}' runs a query for each "
+                        f"{query.model} in the loop at line {loop.line}"
+                    ),
+                    severity="warning",
+                    original_code=query.origin_code,
+                    suggested_code=suggested,
+                    estimated_improvement=(
+                        f"One query (or two with {rel.loader}) instead of one per {query.model}"
+                    ),
+                    context={
+                        "confidence": confidence,
+                        "framework": query.framework,
+                        "model": query.model,
+                        "model_expr": query.model_expr,
+                        "relationship": rel.name,
+                        "target": rel.target,
+                        "loader": rel.loader,
+                        "variable": loop.variable,
+                        "loop_line": loop.line,
+                        "query_line": query.origin_line,
+                        "query_column": query.origin_column,
+                    },
+                )
+                findings.append(OptimizeTarget(self._rejig, finding))
+
+        findings.sort(key=lambda t: (str(t.file_path), t.line_number))
+        return OptimizeTargetList(self._rejig, findings)
+
+    def find_all_issues(self, min_confidence: float = 0.7) -> OptimizeTargetList:
+        """Find all N+1 query issues in the codebase.
+
+        Parameters
+        ----------
+        min_confidence : float
+            Minimum confidence level for including a finding (0.0 to 1.0).
+
+        Returns
+        -------
+        OptimizeTargetList
+            Combined list of all findings.
+        """
+        return self.find_n_plus_one_queries(min_confidence)
+
+    def apply(
+        self,
+        findings: OptimizeTargetList | None = None,
+        min_confidence: float = 0.7,
+    ) -> Result:
+        """Insert the eager-loading calls suggested by findings.
+
+        All relationships found for one query are added in a single call,
+        and all files are changed together in a transaction (or added to
+        the current one, if any). Queries are matched by position and
+        code, so findings must be up to date with the files.
+
+        Parameters
+        ----------
+        findings : OptimizeTargetList | None
+            Findings to fix. Other finding types are ignored. If None,
+            runs ``find_all_issues(min_confidence)``.
+        min_confidence : float
+            Minimum confidence when finding issues here.
+
+        Returns
+        -------
+        Result
+            Result with the combined diff. ``data`` holds ``fixed`` and
+            ``skipped`` query counts and the changed query ``lines`` per file.
+
+        Examples
+        --------
+        >>> result = NPlusOneAnalyzer(rj).apply()
+        >>> print(result.data["fixed"], "queries eager-load their relationships")
+        """
+        if findings is None:
+            findings = self.find_all_issues(min_confidence)
+
+        fixes: dict[Path, dict[tuple[int, int], tuple[_Query, list[ModelRelationship]]]] = (
+            defaultdict(dict)
+        )
+        for target in findings:
+            finding = target.finding
+            if finding.type != OptimizeType.N_PLUS_ONE_QUERY:
+                continue
+            context = finding.context
+            key = (context["query_line"], context["query_column"])
+            query = _Query(
+                context["framework"],
+                context["model"],
+                context["model_expr"],
+                key[0],
+                key[1],
+                finding.original_code,
+            )
+            _, relationships = fixes[target.file_path].setdefault(key, (query, []))
+            if all(rel.name != context["relationship"] for rel in relationships):
+                relationships.append(ModelRelationship(
+                    context["model"],
+                    context["relationship"],
+                    context["target"],
+                    context["framework"],
+                    many=context["loader"] in ("prefetch_related", "selectinload"),
+                ))
+
+        if not fixes:
+            return Result(
+                success=True,
+                message="No N+1 query findings",
+                data={"fixed": 0, "skipped": 0, "lines": {}},
+            )
+
+        tx = self._rejig.current_transaction
+        if tx is not None:
+            return self._insert_loads(tx, fixes)
+
+        try:
+            with self._rejig.transaction() as tx:
+                result = self._insert_loads(tx, fixes)
+                if not result.files_changed:
+                    return result
+                batch = tx.commit()
+        except Exception as e:
+            return ErrorResult(
+                message=f"Failed to add eager loading: {e}",
+                exception=e,
+                operation="apply",
+            )
+
+        if not batch.success:
+            return ErrorResult(
+                message="; ".join(r.message for r in batch.failed),
+                operation="apply",
+            )
+        return Result(
+            success=True,
+            message=result.message,
+            files_changed=batch.files_changed,
+            diff=batch.diff,
+            diffs=batch.diffs,
+            data=result.data,
+        )
+
+    def _insert_loads(
+        self,
+        tx: Transaction,
+        fixes: dict[Path, dict[tuple[int, int], tuple[_Query, list[ModelRelationship]]]],
+    ) -> Result:
+        """Add eager loading file by file, recording changes in a transaction."""
+        fixed: dict[Path, list[int]] = {}
+        skipped = 0
+        diffs: dict[Path, str] = {}
+
+        for path, queries in fixes.items():
+            content = tx.get_current_content(path)
+            if content is None:
+                skipped += len(queries)
+                continue
+            try:
+                new_content, lines = insert_eager_loads(content, queries)
+            except cst.ParserSyntaxError:
+                skipped += len(queries)
+                continue
+            skipped += len(queries) - len(lines)
+            if not lines or new_content == content:
+                continue
+            change = tx.add_change(
+                path, content, new_content, f"eager-load {len(lines)} query(s)"
+            )
+            fixed[path] = lines
+            if change.diff:
+                diffs[path] = change.diff
+
+        count = sum(len(lines) for lines in fixed.values())
+        message = f"Added eager loading to {count} query(s) in {len(fixed)} file(s)"
+        if skipped:
+            message += f", skipped {skipped}"
+        return Result(
+            success=True,
+            message=message,
+            files_changed=list(fixed),
+            diff=combine_diffs(diffs) if diffs else None,
+            diffs=diffs,
+            data={"fixed": count, "skipped": skipped, "lines": fixed},
+        )
@@ -0,0 +1,977 @@
+"""Runtime performance anti-pattern detection for Python code.
+
+Finds code that costs CPU on every iteration of a loop, where the cost is
+usually easy to move out or avoid:
+
+- ``x in items`` where ``items`` is a list (or a constant list/tuple) and
+  doesn't change inside the loop
+- ``re`` calls with a constant pattern inside loops, or inside functions
+  that are called from loops in the same module
+- string ``+=`` accumulation
+- attribute chains (``os.path.join``, ``self.items.append``) looked up on
+  every iteration of an innermost loop
+- ``list.pop(0)`` / ``list.insert(0, x)`` used as a queue
+- ``copy.deepcopy`` inside loops
+- sorting a container that doesn't change inside the loop
+
+Findings are ordinary ``OptimizeFinding`` objects with a suggested fix.
+``PerformanceAnalyzer.find_all_issues(include_loops=True)`` runs the
+``LoopPatternVisitor`` checks in the same traversal.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import libcst as cst
+from libcst.metadata import PositionProvider
+
+from rejig.optimize.loops import LoopOptimizer, LoopPattern, LoopPatternVisitor
+from rejig.optimize.targets import (
+    OptimizeFinding,
+    OptimizeTarget,
+    OptimizeTargetList,
+    OptimizeType,
+)
+from rejig.optimize.visitors import visit_combined
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+
+# re functions whose first argument is the pattern
+REGEX_FUNCTIONS = frozenset({
+    "compile", "match", "search", "fullmatch", "findall", "finditer",
+    "sub", "subn", "split",
+})
+
+# Constant list/tuple literals at least this long are worth a set literal
+MIN_LITERAL_ITEMS = 4
+
+# Innermost loops with at most this many statements count as tight loops
+TIGHT_LOOP_STATEMENTS = 3
+
+# Comprehension parts evaluated once per iteration
+_COMPREHENSION_PARTS = frozenset({
+    (cst.ListComp, "elt"),
+    (cst.SetComp, "elt"),
+    (cst.GeneratorExp, "elt"),
+    (cst.DictComp, "key"),
+    (cst.DictComp, "value"),
+    (cst.CompFor, "ifs"),
+    (cst.CompFor, "inner_for_in"),
+})
+
+_CONSTANTS = (cst.SimpleString, cst.ConcatenatedString, cst.Integer, cst.Float)
+
+
+def _dotted(node: cst.CSTNode) -> str | None:
+    """``a.b.c`` for a Name/Attribute chain, None for anything else."""
+    parts = []
+    while isinstance(node, cst.Attribute):
+        parts.append(node.attr.value)
+        node = node.value
+    if not isinstance(node, cst.Name):
+        return None
+    parts.append(node.value)
+    return ".".join(reversed(parts))
+
+
+def _is_constant_string(node: cst.CSTNode) -> bool:
+    """Check for a plain (non-f) string literal."""
+    if isinstance(node, cst.SimpleString):
+        return True
+    if isinstance(node, cst.ConcatenatedString):
+        return _is_constant_string(node.left) and _is_constant_string(node.right)
+    return False
+
+
+def _is_string_expression(node: cst.CSTNode) -> bool:
+    """Check for an expression that obviously produces a string."""
+    if isinstance(node, (cst.SimpleString, cst.FormattedString, cst.ConcatenatedString)):
+        return "b" not in getattr(node, "prefix", "").lower()
+    if isinstance(node, cst.Call):
+        return isinstance(node.func, cst.Name) and node.func.value == "str"
+    if isinstance(node, cst.BinaryOperation) and isinstance(node.operator, cst.Modulo):
+        return isinstance(node.left, cst.SimpleString)
+    return False
+
+
+def _is_list_expression(node: cst.CSTNode) -> bool:
+    """Check for an expression that obviously produces a list."""
+    if isinstance(node, (cst.List, cst.ListComp)):
+        return True
+    if isinstance(node, cst.Call):
+        return isinstance(node.func, cst.Name) and node.func.value in ("list", "sorted")
+    return False
+
+
+def _is_list_annotation(node: cst.Annotation | None) -> bool:
+    """Check for ``list``/``list[...]``/``List[...]`` annotations."""
+    if node is None:
+        return False
+    annotation = node.annotation
+    if isinstance(annotation, cst.Subscript):
+        annotation = annotation.value
+    name = _dotted(annotation)
+    return name in ("list", "List", "typing.List")
+
+
+def _bound_by(target: cst.CSTNode, names: set[str], attributes: set[str]) -> None:
+    """Add the names and attribute chains an assignment target binds."""
+    if isinstance(target, cst.Name):
+        names.add(target.value)
+    elif isinstance(target, (cst.Tuple, cst.List)):
+        for element in target.elements:
+            _bound_by(element.value, names, attributes)
+    elif isinstance(target, cst.StarredElement):
+        _bound_by(target.value, names, attributes)
+    elif isinstance(target, cst.Attribute):
+        dotted = _dotted(target)
+        if dotted is not None:
+            attributes.add(dotted)
+
+
+def _comprehension_targets(node: cst.CSTNode) -> set[str]:
+    """Names bound by the ``for`` clauses of a comprehension."""
+    names: set[str] = set()
+    comp_for = getattr(node, "for_in", None)
+    while comp_for is not None:
+        _bound_by(comp_for.target, names, set())
+        comp_for = comp_for.inner_for_in
+    return names
+
+
+@dataclass
+class _Loop:
+    """A loop being visited."""
+
+    line: int
+    # Names and attribute chains rebound in the loop (complete when left)
+    bound: set[str] = field(default_factory=set)
+    attributes: set[str] = field(default_factory=set)
+    # False for comprehension parts
+    statement: bool = True
+    # Statements directly in the loop body
+    size: int = 0
+    has_inner: bool = False
+    # Attribute chains called in the loop, with the first line
+    lookups: dict[str, int] = field(default_factory=dict)
+    # Findings that hold if a container doesn't vary: (container,
+    # membership key or None, finding)
+    pending: list[tuple[str, str | None, OptimizeFinding]] = field(default_factory=list)
+
+    def varies(self, dotted: str) -> bool:
+        """Whether a Name/Attribute chain may change between iterations."""
+        if dotted.split(".")[0] in self.bound:
+            return True
+        return any(
+            dotted == attr or dotted.startswith(attr + ".")
+            for attr in self.attributes
+        )
+
+
+@dataclass
+class _Scope:
+    """A module, class or function being visited."""
+
+    kind: str
+    name: str | None
+    # Names bound in the scope (complete when left)
+    bound: set[str] = field(default_factory=set)
+    # Names (or ".attr" for instance attributes) assigned lists / others
+    lists: set[str] = field(default_factory=set)
+    others: set[str] = field(default_factory=set)
+    strings: set[str] = field(default_factory=set)
+    # Membership tests waiting to learn whether the container is a list
+    membership: list[tuple[str, OptimizeFinding]] = field(default_factory=list)
+    # Regex calls outside loops, reported if the function is called in one
+    regex: list[OptimizeFinding] = field(default_factory=list)
+
+    def is_list(self, key: str) -> bool:
+        return key in self.lists and key not in self.others
+
+
+class PerformanceVisitor(cst.CSTVisitor):
+    """Visitor that detects runtime performance anti-patterns.
+
+    Parameters
+    ----------
+    file_path : Path
+        Path of the module being visited (used in findings).
+
+    Attributes
+    ----------
+    findings : list[OptimizeFinding]
+        Findings in line order, complete once the module has been left.
+    """
+
+    METADATA_DEPENDENCIES = (PositionProvider,)
+
+    def __init__(self, file_path: Path) -> None:
+        super().__init__()
+        self.file_path = file_path
+        self.findings: list[OptimizeFinding] = []
+        self._scopes: list[_Scope] = []
+        # One loop stack per function, since a nested def isn't in the loop
+        self._loops: list[list[_Loop]] = [[]]
+        self._comprehensions: list[set[str]] = []
+        # Local name -> module for ``import x``; -> "module.name" for from-imports
+        self._imports: dict[str, str] = {}
+        # Function/method names called inside loops -> first call line
+        self._loop_calls: dict[str, int] = {}
+        self._function_regex: dict[str, list[OptimizeFinding]] = defaultdict(list)
+
+    # ===== Helpers =====
+
+    def _line(self, node: cst.CSTNode) -> int:
+        try:
+            return self.get_metadata(PositionProvider, node).start.line
+        except KeyError:
+            return 0
+
+    def _code(self, node: cst.CSTNode, limit: int = 200) -> str:
+        code = cst.Module(body=[]).code_for_node(node).strip()
+        return code[:limit] + "..." if len(code) > limit else code
+
+    @property
+    def _loop(self) -> _Loop | None:
+        loops = self._loops[-1]
+        return loops[-1] if loops else None
+
+    def _context_name(self) -> str | None:
+        names = [s.name for s in self._scopes if s.kind != "module"]
+        return ".".join(names) if names else None
+
+    def _function_scope(self) -> _Scope | None:
+        scope = self._scopes[-1] if self._scopes else None
+        return scope if scope is not None and scope.kind == "function" else None
+
+    def _class_scope(self) -> _Scope | None:
+        for scope in reversed(self._scopes):
+            if scope.kind == "class":
+                return scope
+        return None
+
+    def _resolve(self, func: cst.BaseExpression) -> str | None:
+        """Qualified name of a called function, following imports."""
+        dotted = _dotted(func)
+        if dotted is None:
+            return None
+        root, _, rest = dotted.partition(".")
+        resolved = self._imports.get(root, root)
+        return f"{resolved}.{rest}" if rest else resolved
+
+    def _finding(
+        self,
+        finding_type: OptimizeType,
+        node: cst.CSTNode,
+        message: str,
+        suggested_code: str,
+        improvement: str,
+        severity: str,
+        confidence: float,
+        line: int | None = None,
+        **context: object,
+    ) -> OptimizeFinding:
+        line = self._line(node) if line is None else line
+        return OptimizeFinding(
+            type=finding_type,
+            file_path=self.file_path,
+            line_number=line,
+            name=self._context_name(),
+            message=message,
+            severity=severity,
+            original_code=self._code(node),
+            suggested_code=suggested_code,
+            estimated_improvement=improvement,
+            context={"confidence": confidence, **context},
+        )
+
+    def _push_loop(self, loop: _Loop) -> None:
+        current = self._loop
+        if current is not None and loop.statement:
+            current.has_inner = True
+        self._loops[-1].append(loop)
+
+    # ===== Scopes =====
+
+    def visit_Module(self, node: cst.Module) -> bool:
+        self._scopes.append(_Scope("module", None))
+        return True
+
+    def leave_Module(self, original_node: cst.Module) -> None:
+        scope = self._scopes.pop()
+        for key, finding in scope.membership:
+            if scope.is_list(key):
+                self.findings.append(finding)
+        for name, call_line in self._loop_calls.items():
+            for finding in self._function_regex.get(name, []):
+                finding.message += f" (called in a loop at line {call_line})"
+                finding.context["called_from_line"] = call_line
+                self.findings.append(finding)
+        self.findings.sort(key=lambda f: (f.line_number, f.type.name))
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> bool:
+        self._bind(node.name)
+        self._scopes.append(_Scope("class", node.name.value))
+        return True
+
+    def leave_ClassDef(self, original_node: cst.ClassDef) -> None:
+        scope = self._scopes.pop()
+        for key, finding in scope.membership:
+            if scope.is_list(key):
+                self.findings.append(finding)
+
+    def visit_FunctionDef(self, node: cst.FunctionDef) -> bool:
+        self._bind(node.name)
+        scope = _Scope("function", node.name.value)
+        for param in (
+            *node.params.posonly_params,
+            *node.params.params,
+            *node.params.kwonly_params,
+        ):
+            scope.bound.add(param.name.value)
+            if _is_list_annotation(param.annotation):
+                scope.lists.add(param.name.value)
+        for star in (node.params.star_arg, node.params.star_kwarg):
+            if isinstance(star, cst.Param):
+                scope.bound.add(star.name.value)
+        self._scopes.append(scope)
+        self._loops.append([])
+        return True
+
+    def leave_FunctionDef(self, original_node: cst.FunctionDef) -> None:
+        self._loops.pop()
+        scope = self._scopes.pop()
+        outer = next((s for s in reversed(self._scopes) if s.kind != "class"), None)
+        owner = self._class_scope() if self._scopes and self._scopes[-1].kind == "class" else None
+        for key, finding in scope.membership:
+            if key.startswith("."):
+                if owner is not None:
+                    owner.membership.append((key, finding))
+            elif key in scope.bound:
+                if scope.is_list(key):
+                    self.findings.append(finding)
+            elif outer is not None:
+                outer.membership.append((key, finding))
+        if scope.regex:
+            self._function_regex[scope.name].extend(scope.regex)
+
+    # ===== Bindings =====
+
+    def _bind(self, target: cst.CSTNode) -> None:
+        """Record what a target binds in the current scope and loops."""
+        names: set[str] = set()
+        attributes: set[str] = set()
+        _bound_by(target, names, attributes)
+        self._scopes[-1].bound |= names
+        for loop in self._loops[-1]:
+            loop.bound |= names
+            loop.attributes |= attributes
+
+    def visit_AssignTarget(self, node: cst.AssignTarget) -> None:
+        self._bind(node.target)
+
+    def visit_NamedExpr(self, node: cst.NamedExpr) -> None:
+        self._bind(node.target)
+
+    def visit_AsName(self, node: cst.AsName) -> None:
+        self._bind(node.name)
+
+    def visit_ImportAlias(self, node: cst.ImportAlias) -> None:
+        if node.asname is None:
+            dotted = _dotted(node.name)
+            if dotted is not None:
+                self._bind(cst.Name(dotted.split(".")[0]))
+
+    def visit_Del(self, node: cst.Del) -> None:
+        self._bind(node.target)
+
+    # ===== Imports and assignments =====
+
+    def visit_Import(self, node: cst.Import) -> None:
+        for alias in node.names:
+            module = _dotted(alias.name)
+            if module is None:
+                continue
+            if alias.asname is not None and isinstance(alias.asname.name, cst.Name):
+                self._imports[alias.asname.name.value] = module
+            else:
+                root = module.split(".")[0]
+                self._imports[root] = root
+
+    def visit_ImportFrom(self, node: cst.ImportFrom) -> None:
+        if node.relative or node.module is None or isinstance(node.names, cst.ImportStar):
+            return
+        module = _dotted(node.module)
+        for alias in node.names:
+            name = _dotted(alias.name)
+            if module is None or name is None:
+                continue
+            local = name
+            if alias.asname is not None and isinstance(alias.asname.name, cst.Name):
+                local = alias.asname.name.value
+            self._imports[local] = f"{module}.{name}"
+
+    def _record_assignment(
+        self,
+        target: cst.BaseExpression,
+        value: cst.BaseExpression | None,
+        annotation: cst.Annotation | None = None,
+    ) -> None:
+        is_list = _is_list_annotation(annotation) or (
+            value is not None and _is_list_expression(value)
+        )
+        if isinstance(target, cst.Name):
+            scope = self._scopes[-1]
+            key = target.value
+            if value is not None and _is_string_expression(value):
+                scope.strings.add(key)
+            elif value is not None and not self._loops[-1]:
+                scope.strings.discard(key)
+        elif (
+            isinstance(target, cst.Attribute)
+            and isinstance(target.value, cst.Name)
+            and target.value.value in ("self", "cls")
+        ):
+            scope = self._class_scope()
+            key = "." + target.attr.value
+        else:
+            return
+        if scope is None:
+            return
+        (scope.lists if is_list else scope.others).add(key)
+
+    def visit_Assign(self, node: cst.Assign) -> None:
+        for target in node.targets:
+            self._record_assignment(target.target, node.value)
+        scope = self._scopes[-1]
+        if scope.kind == "class":
+            # Class attributes are read as self.name too
+            for target in node.targets:
+                if isinstance(target.target, cst.Name):
+                    key = "." + target.target.value
+                    is_list = _is_list_expression(node.value)
+                    (scope.lists if is_list else scope.others).add(key)
+        self._check_concat_assign(node)
+
+    def visit_AnnAssign(self, node: cst.AnnAssign) -> None:
+        self._bind(node.target)
+        self._record_assignment(node.target, node.value, node.annotation)
+
+    # ===== Loops =====
+
+    def visit_For_body(self, node: cst.For) -> None:
+        self._bind(node.target)
+        loop = _Loop(line=self._line(node), size=len(node.body.body))
+        _bound_by(node.target, loop.bound, loop.attributes)
+        self._push_loop(loop)
+
+    def leave_For_body(self, node: cst.For) -> None:
+        self._leave_loop()
+
+    def visit_While(self, node: cst.While) -> bool:
+        self._push_loop(_Loop(line=self._line(node), size=len(node.body.body)))
+        return True
+
+    def leave_While(self, original_node: cst.While) -> None:
+        self._leave_loop()
+
+    def _enter_comprehension(self, node: cst.CSTNode) -> bool:
+        self._comprehensions.append(_comprehension_targets(node))
+        return True
+
+    def _leave_comprehension(self, node: cst.CSTNode) -> None:
+        self._comprehensions.pop()
+
+    visit_ListComp = visit_SetComp = visit_GeneratorExp = visit_DictComp = _enter_comprehension
+    leave_ListComp = leave_SetComp = leave_GeneratorExp = leave_DictComp = _leave_comprehension
+
+    def on_visit_attribute(self, node: cst.CSTNode, attribute: str) -> None:
+        if (type(node), attribute) in _COMPREHENSION_PARTS and self._comprehensions:
+            self._push_loop(_Loop(
+                line=self._line(node),
+                bound=set(self._comprehensions[-1]),
+                statement=False,
+            ))
+        super().on_visit_attribute(node, attribute)
+
+    def on_leave_attribute(self, original_node: cst.CSTNode, attribute: str) -> None:
+        super().on_leave_attribute(original_node, attribute)
+        if (type(original_node), attribute) in _COMPREHENSION_PARTS and self._comprehensions:
+            self._resolve_pending(self._loops[-1].pop())
+
+    def _resolve_pending(self, loop: _Loop) -> None:
+        """Keep the findings whose container turned out not to vary."""
+        for container, key, finding in loop.pending:
+            if loop.varies(container):
+                continue
+            if key is None:
+                self.findings.append(finding)
+            else:
+                self._scopes[-1].membership.append((key, finding))
+
+    def _leave_loop(self) -> None:
+        loop = self._loops[-1].pop()
+        self._resolve_pending(loop)
+        if (
+            loop.has_inner
+            or loop.size > TIGHT_LOOP_STATEMENTS
+            or not loop.lookups
+            or self._function_scope() is None
+        ):
+            return
+        chains = [chain for chain in loop.lookups if not loop.varies(chain)]
+        if not chains:
+            return
+        hoisted = "\n".join(f"{chain.rsplit('.', 1)[1]} = {chain}" for chain in chains)
+        self.findings.append(OptimizeFinding(
+            type=OptimizeType.REPEATED_LOOKUP_IN_LOOP,
+            file_path=self.file_path,
+            line_number=loop.line,
+            name=self._context_name(),
+            message=f"Attribute lookups repeated on every iteration: {', '.join(chains)}",
+            severity="info",
+            original_code=", ".join(chains),
+            suggested_code=f"# Before the loop:\n{hoisted}",
+            estimated_improvement="Fewer attribute lookups per iteration in a hot loop",
+            context={"confidence": 0.7, "lookups": chains},
+        ))
+
+    # ===== Checks =====
+
+    def visit_Comparison(self, node: cst.Comparison) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        for comparison in node.comparisons:
+            if not isinstance(comparison.operator, (cst.In, cst.NotIn)):
+                continue
+            container = comparison.comparator
+            if isinstance(container, (cst.List, cst.Tuple)):
+                self._check_literal_membership(node, container)
+                continue
+            dotted = _dotted(container)
+            if dotted is None:
+                continue
+            if dotted.count(".") == 0:
+                key = dotted
+            elif dotted.count(".") == 1 and dotted.split(".")[0] in ("self", "cls"):
+                key = "." + dotted.split(".")[1]
+            else:
+                continue
+            local = dotted.rsplit(".", 1)[-1]
+            finding = self._finding(
+                OptimizeType.LIST_MEMBERSHIP_IN_LOOP,
+                node,
+                f"Membership test on list '{dotted}' inside a loop is O(n) per test",
+                f"{local}_set = set({dotted})  # before the loop\n"
+                f"... in {local}_set\n"
+                f"# If the loop adds to '{dotted}', keep a set alongside it",
+                "O(1) set lookups instead of scanning the list on every iteration",
+                "warning",
+                0.85,
+                container=dotted,
+                loop_line=loop.line,
+            )
+            loop.pending.append((dotted, key, finding))
+
+    def _check_literal_membership(
+        self, node: cst.Comparison, container: cst.List | cst.Tuple
+    ) -> None:
+        elements = container.elements
+        if len(elements) < MIN_LITERAL_ITEMS:
+            return
+        if not all(
+            isinstance(e, cst.Element) and isinstance(e.value, _CONSTANTS)
+            for e in elements
+        ):
+            return
+        items = ", ".join(self._code(e.value) for e in elements)
+        self.findings.append(self._finding(
+            OptimizeType.LIST_MEMBERSHIP_IN_LOOP,
+            node,
+            "Membership test on a constant sequence inside a loop",
+            f"... in {{{items}}}",
+            "A constant set literal is built once and looked up in O(1)",
+            "suggestion",
+            0.8,
+            container=self._code(container),
+            loop_line=self._loop.line,
+        ))
+
+    def visit_Call(self, node: cst.Call) -> None:
+        loop = self._loop
+        resolved = self._resolve(node.func)
+
+        if loop is not None:
+            if isinstance(node.func, cst.Name):
+                self._loop_calls.setdefault(node.func.value, self._line(node))
+            elif (
+                isinstance(node.func, cst.Attribute)
+                and isinstance(node.func.value, cst.Name)
+                and node.func.value.value in ("self", "cls")
+            ):
+                self._loop_calls.setdefault(node.func.attr.value, self._line(node))
+
+        if resolved is not None and resolved.startswith("re."):
+            self._check_regex(node, resolved[3:], loop)
+        if loop is None:
+            self._check_queue(node, None)
+            return
+
+        if resolved == "copy.deepcopy":
+            self.findings.append(self._finding(
+                OptimizeType.DEEPCOPY_IN_LOOP,
+                node,
+                "copy.deepcopy() inside a loop",
+                "# Copy once before the loop, copy only the parts that change,\n"
+                "# or build the new object directly",
+                "deepcopy walks the whole object graph on every iteration",
+                "warning",
+                0.8,
+                loop_line=loop.line,
+            ))
+        self._check_sort(node, loop)
+        self._check_queue(node, loop)
+        if loop.statement and isinstance(node.func, cst.Attribute):
+            # One hop (module.func, obj.method) is cheap on modern CPython
+            dotted = _dotted(node.func)
+            if dotted is not None and dotted.count(".") >= 2:
+                loop.lookups.setdefault(dotted, self._line(node))
+
+    def _check_regex(self, node: cst.Call, function: str, loop: _Loop | None) -> None:
+        if function not in REGEX_FUNCTIONS:
+            return
+        pattern = None
+        if node.args and node.args[0].keyword is None and not node.args[0].star:
+            pattern = node.args[0].value
+        else:
+            pattern = next(
+                (a.value for a in node.args if a.keyword and a.keyword.value == "pattern"),
+                None,
+            )
+        if pattern is None or not _is_constant_string(pattern):
+            return
+
+        pattern_code = self._code(pattern)
+        if function == "compile":
+            suggested = f"PATTERN = re.compile({pattern_code})  # at module level"
+        else:
+            suggested = (
+                f"PATTERN = re.compile({pattern_code})  # at module level\n"
+                f"PATTERN.{function}(...)"
+            )
+        where = "inside a loop" if loop is not None else "inside a function"
+        finding = self._finding(
+            OptimizeType.REGEX_IN_LOOP,
+            node,
+            f"re.{function}() with a constant pattern {where}",
+            suggested,
+            "Compiles the pattern once instead of a cache lookup (or recompile) per call",
+            "suggestion",
+            0.85,
+            loop_line=loop.line if loop is not None else None,
+        )
+        if loop is not None:
+            self.findings.append(finding)
+        else:
+            scope = self._function_scope()
+            if scope is not None:
+                scope.regex.append(finding)
+
+    def _check_sort(self, node: cst.Call, loop: _Loop) -> None:
+        if isinstance(node.func, cst.Name) and node.func.value == "sorted":
+            if not node.args or node.args[0].keyword is not None:
+                return
+            container = _dotted(node.args[0].value)
+            call = "sorted()"
+        elif isinstance(node.func, cst.Attribute) and node.func.attr.value == "sort":
+            if any(a.keyword is None for a in node.args):
+                return
+            container = _dotted(node.func.value)
+            call = ".sort()"
+        else:
+            return
+        if container is None:
+            return
+        loop.pending.append((container, None, self._finding(
+            OptimizeType.SORT_IN_LOOP,
+            node,
+            f"{call} of '{container}' on every iteration of a loop",
+            f"# Sort '{container}' once before the loop; to keep it sorted while\n"
+            f"# adding items use bisect.insort({container}, item), or heapq for\n"
+            f"# repeated smallest/largest lookups",
+            "Avoids an O(n log n) sort per iteration",
+            "warning",
+            0.8,
+            container=container,
+            loop_line=loop.line,
+        )))
+
+    def _check_queue(self, node: cst.Call, loop: _Loop | None) -> None:
+        func = node.func
+        if not isinstance(func, cst.Attribute):
+            return
+        args = node.args
+        if any(a.keyword is not None or a.star for a in args):
+            return
+        method = func.attr.value
+        if method == "pop" and len(args) == 1:
+            replacement = "popleft()"
+        elif method == "insert" and len(args) == 2:
+            replacement = f"appendleft({self._code(args[1].value)})"
+        else:
+            return
+        first = args[0].value
+        if not (isinstance(first, cst.Integer) and first.value == "0"):
+            return
+        receiver = _dotted(func.value)
+        if receiver is None:
+            return
+        self.findings.append(self._finding(
+            OptimizeType.LIST_AS_QUEUE,
+            node,
+            f"{receiver}.{method}({'0, ...' if method == 'insert' else '0'}) "
+            f"shifts every element of a list",
+            f"{receiver} = collections.deque(...)\n{receiver}.{replacement}",
+            "deque adds and removes at both ends in O(1)",
+            "warning" if loop is not None else "suggestion",
+            0.8 if loop is not None else 0.7,
+            container=receiver,
+            loop_line=loop.line if loop is not None else None,
+        ))
+
+    def visit_AugAssign(self, node: cst.AugAssign) -> None:
+        self._bind(node.target)
+        loop = self._loop
+        if loop is None or not loop.statement:
+            return
+        if not isinstance(node.operator, cst.AddAssign) or not isinstance(node.target, cst.Name):
+            return
+        name = node.target.value
+        if name not in self._scopes[-1].strings and not _is_string_expression(node.value):
+            return
+        self._report_concat(node, name, loop)
+
+    def _check_concat_assign(self, node: cst.Assign) -> None:
+        """``s = s + x`` for a string ``s``."""
+        loop = self._loop
+        if loop is None or not loop.statement or len(node.targets) != 1:
+            return
+        target, value = node.targets[0].target, node.value
+        if not (
+            isinstance(target, cst.Name)
+            and isinstance(value, cst.BinaryOperation)
+            and isinstance(value.operator, cst.Add)
+            and isinstance(value.left, cst.Name)
+            and value.left.value == target.value
+        ):
+            return
+        name = target.value
+        if name not in self._scopes[-1].strings and not _is_string_expression(value.right):
+            return
+        self._report_concat(node, name, loop)
+
+    def _report_concat(self, node: cst.CSTNode, name: str, loop: _Loop) -> None:
+        self.findings.append(self._finding(
+            OptimizeType.INEFFICIENT_STRING_CONCAT,
+            node,
+            f"String '{name}' built with + inside a loop",
+            f"{name}_parts = []  # before the loop\n"
+            f"{name}_parts.append(...)  # in the loop\n"
+            f'{name} = "".join({name}_parts)  # after the loop',
+            "Linear instead of quadratic time; CPython's in-place += is not guaranteed",
+            "suggestion",
+            0.8,
+            loop_line=loop.line,
+        ))
+
+
+class PerformanceAnalyzer:
+    """Finds runtime performance anti-patterns in a codebase.
+
+    Looks for repeated work inside loops (list membership tests, regex
+    calls with constant patterns, string concatenation, attribute lookups,
+    deep copies and sorts) and lists used as queues.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The Rejig instance to analyze.
+
+    Example
+    -------
+    >>> from rejig import Rejig
+    >>> from rejig.optimize import PerformanceAnalyzer
+    >>> rj = Rejig("src/")
+    >>> analyzer = PerformanceAnalyzer(rj)
+    >>> issues = analyzer.find_all_issues()
+    >>> print(issues.warnings().summary())
+    """
+
+    # Finding types reported by this analyzer
+    FINDING_TYPES = frozenset({
+        OptimizeType.LIST_MEMBERSHIP_IN_LOOP,
+        OptimizeType.REGEX_IN_LOOP,
+        OptimizeType.INEFFICIENT_STRING_CONCAT,
+        OptimizeType.REPEATED_LOOKUP_IN_LOOP,
+        OptimizeType.LIST_AS_QUEUE,
+        OptimizeType.DEEPCOPY_IN_LOOP,
+        OptimizeType.SORT_IN_LOOP,
+    })
+
+    def __init__(self, rejig: Rejig) -> None:
+        self._rejig = rejig
+
+    def _get_python_files(self) -> list[Path]:
+        """Get all Python files in the project."""
+        return list(self._rejig.root.rglob("*.py"))
+
+    def _analyze_file(
+        self, file_path: Path, loops: bool = False
+    ) -> tuple[list[OptimizeFinding], list[LoopPattern]]:
+        """Analyze a single file, optionally with the loop pattern checks.
+
+        Both visitors share one parse and one traversal.
+        """
+        visitor = PerformanceVisitor(file_path)
+        visitors: list[cst.CSTVisitor] = [visitor]
+        loop_visitor = LoopPatternVisitor(file_path) if loops else None
+        if loop_visitor is not None:
+            visitors.append(loop_visitor)
+        try:
+            visit_combined(file_path.read_text(), visitors)
+        except Exception:
+            return [], []
+        return visitor.findings, loop_visitor.patterns if loop_visitor else []
+
+    def _find(
+        self, types: set[OptimizeType], min_confidence: float = 0.0
+    ) -> OptimizeTargetList:
+        """Find issues of the given types across the codebase."""
+        findings: list[OptimizeTarget] = []
+        for file_path in self._get_python_files():
+            for finding in self._analyze_file(file_path)[0]:
+                if finding.type in types and finding.context.get("confidence", 1.0) >= min_confidence:
+                    findings.append(OptimizeTarget(self._rejig, finding))
+        return OptimizeTargetList(self._rejig, findings)
+
+    def find_membership_tests(self) -> OptimizeTargetList:
+        """Find ``x in some_list`` tests inside loops.
+
+        Returns
+        -------
+        OptimizeTargetList
+            Membership tests on loop-invariant lists and constant sequences.
+        """
+        return self._find({OptimizeType.LIST_MEMBERSHIP_IN_LOOP})
+
+    def find_regex_in_loops(self) -> OptimizeTargetList:
+        """Find ``re`` calls with constant patterns inside loops.
+
+        Calls in functions that are called from a loop in the same module
+        are included.
+
+        Returns
+        -------
+        OptimizeTargetList
+            Regex calls that should use a pattern compiled once.
+        """
+        return self._find({OptimizeType.REGEX_IN_LOOP})
+
+    def find_string_concatenation(self) -> OptimizeTargetList:
+        """Find strings built with ``+=`` inside loops.
+
+        Returns
+        -------
+        OptimizeTargetList
+            String accumulation that should collect parts and join once.
+        """
+        return self._find({OptimizeType.INEFFICIENT_STRING_CONCAT})
+
+    def find_repeated_lookups(self) -> OptimizeTargetList:
+        """Find attribute chains looked up on every iteration of inner loops.
+
+        Returns
+        -------
+        OptimizeTargetList
+            One finding per loop listing the lookups that could be hoisted.
+        """
+        return self._find({OptimizeType.REPEATED_LOOKUP_IN_LOOP})
+
+    def find_list_queues(self) -> OptimizeTargetList:
+        """Find ``list.pop(0)`` and ``list.insert(0, x)`` calls.
+
+        Returns
+        -------
+        OptimizeTargetList
+            Lists used as queues that should be ``collections.deque``.
+        """
+        return self._find({OptimizeType.LIST_AS_QUEUE})
+
+    def find_deepcopy_in_loops(self) -> OptimizeTargetList:
+        """Find ``copy.deepcopy`` calls inside loops.
+
+        Returns
+        -------
+        OptimizeTargetList
+            Deep copies repeated on every iteration.
+        """
+        return self._find({OptimizeType.DEEPCOPY_IN_LOOP})
+
+    def find_sorts_in_loops(self) -> OptimizeTargetList:
+        """Find sorts of loop-invariant containers inside loops.
+
+        Returns
+        -------
+        OptimizeTargetList
+            ``sorted()``/``.sort()`` calls repeated on every iteration.
+        """
+        return self._find({OptimizeType.SORT_IN_LOOP})
+
+    def find_all_issues(
+        self, include_loops: bool = False, min_confidence: float = 0.7
+    ) -> OptimizeTargetList:
+        """Find all runtime performance issues in the codebase.
+
+        Parameters
+        ----------
+        include_loops : bool
+            Also report ``LoopOptimizer`` findings, computed in the same
+            pass over each file. String concatenation already reported as
+            a ``str.join()`` loop is not reported twice.
+        min_confidence : float
+            Minimum confidence level for including a finding (0.0 to 1.0).
+
+        Returns
+        -------
+        OptimizeTargetList
+            Combined list of all findings.
+        """
+        loop_optimizer = LoopOptimizer(self._rejig) if include_loops else None
+        findings: list[OptimizeTarget] = []
+
+        for file_path in self._get_python_files():
+            issues, patterns = self._analyze_file(file_path, loops=include_loops)
+            join_loops = {
+                p.line_number for p in patterns if p.pattern_type == "string_join"
+            }
+            for finding in issues:
+                if finding.context.get("confidence", 1.0) < min_confidence:
+                    continue
+                if (
+                    finding.type == OptimizeType.INEFFICIENT_STRING_CONCAT
+                    and finding.context.get("loop_line") in join_loops
+                ):
+                    continue
+                findings.append(OptimizeTarget(self._rejig, finding))
+            if loop_optimizer is not None:
+                for pattern in patterns:
+                    if pattern.confidence >= min_confidence:
+                        finding = loop_optimizer._pattern_to_finding(file_path, pattern)
+                        findings.append(OptimizeTarget(self._rejig, finding))
+
+        return OptimizeTargetList(self._rejig, findings)
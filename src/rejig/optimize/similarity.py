@@ -0,0 +1,343 @@
+"""Near-duplicate search over normalised syntax trees.
+
+Functions are compared as sets of *shingles*: overlapping runs of node
+labels from a bracketed pre-order walk of the body, with identifiers,
+literals and formatting abstracted away. Two bodies that differ only in
+names have the same shingles; an edited copy shares most of them, and the
+Jaccard similarity of the two sets measures how much.
+
+Comparing every pair is quadratic, so ``MinHashIndex`` summarises each set
+by a MinHash signature (one-permutation hashing with rotation
+densification, so a signature costs one pass over the set) and buckets
+signature bands with locality-sensitive hashing. Only sets sharing a bucket
+become candidates, and candidates are checked with the exact Jaccard
+similarity before being reported.
+"""
+from __future__ import annotations
+
+import zlib
+from collections import Counter, defaultdict
+from typing import Hashable, Iterable
+
+import libcst as cst
+
+# Length of the label runs hashed into shingles
+SHINGLE_SIZE = 4
+
+# Default MinHash signature length
+NUM_PERM = 128
+
+# Names kept verbatim when abstracting identifiers
+BUILTIN_NAMES = frozenset({
+    "True", "False", "None", "print", "len", "range", "str", "int",
+    "float", "list", "dict", "set", "tuple", "bool", "type", "isinstance",
+    "hasattr", "getattr", "setattr", "delattr", "enumerate", "zip", "map",
+    "filter", "sum", "min", "max", "abs", "sorted", "reversed", "any", "all",
+    "open", "file", "input", "super", "self", "cls", "Exception", "ValueError",
+    "TypeError", "KeyError", "IndexError", "AttributeError", "RuntimeError",
+})
+
+# Formatting and punctuation nodes, which carry no structure
+_SKIPPED_NODES = (
+    cst.BaseParenthesizableWhitespace,
+    cst.TrailingWhitespace,
+    cst.EmptyLine,
+    cst.Newline,
+    cst.Comment,
+    cst.Comma,
+    cst.Dot,
+    cst.Colon,
+    cst.Semicolon,
+    cst.AssignEqual,
+    cst.LeftParen,
+    cst.RightParen,
+    cst.LeftSquareBracket,
+    cst.RightSquareBracket,
+    cst.LeftCurlyBrace,
+    cst.RightCurlyBrace,
+)
+
+_LITERAL_LABELS = {
+    cst.SimpleString: "Str",
+    cst.ConcatenatedString: "Str",
+    cst.FormattedString: "Str",
+    cst.Integer: "Num",
+    cst.Float: "Num",
+    cst.Imaginary: "Num",
+}
+
+_MASK = 0xFFFFFFFF
+
+
+def node_label(node: cst.CSTNode) -> tuple[str | None, bool]:
+    """Structural label of a single node.
+
+    Parameters
+    ----------
+    node : cst.CSTNode
+        Node to label.
+
+    Returns
+    -------
+    tuple[str | None, bool]
+        The label (None for whitespace and punctuation, which are skipped
+        along with their children) and whether the node's children should
+        be labelled too.
+    """
+    if isinstance(node, _SKIPPED_NODES):
+        return None, False
+    literal = _LITERAL_LABELS.get(type(node))
+    if literal is not None:
+        return literal, False
+    if isinstance(node, cst.Name):
+        return (node.value if node.value in BUILTIN_NAMES else "Name"), False
+    return type(node).__name__, True
+
+
+class _LabelCollector(cst.CSTVisitor):
+    """Serialise a subtree as a bracketed pre-order sequence of labels."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.labels: list[str] = []
+
+    def on_visit(self, node: cst.CSTNode) -> bool:
+        label, descend = node_label(node)
+        if label is not None:
+            self.labels.append(label)
+        return descend
+
+    def on_leave(self, original_node: cst.CSTNode) -> None:
+        if not isinstance(original_node, _SKIPPED_NODES):
+            self.labels.append(")")
+
+
+def node_labels(node: cst.CSTNode) -> list[str]:
+    """Serialise a CST subtree as a sequence of structural labels.
+
+    Parameters
+    ----------
+    node : cst.CSTNode
+        Subtree to serialise (typically a function body).
+
+    Returns
+    -------
+    list[str]
+        Node type names in pre-order, each subtree closed by ``")"``.
+        Identifiers other than common builtins become ``"Name"``, literals
+        become ``"Str"``/``"Num"``, and whitespace and punctuation are
+        dropped.
+    """
+    collector = _LabelCollector()
+    node.visit(collector)
+    return collector.labels
+
+
+def shingle_labels(labels: list[str], size: int = SHINGLE_SIZE) -> list[int]:
+    """Hash overlapping runs of labels into a shingle set.
+
+    Repeated runs are numbered by occurrence, so the set also reflects how
+    often a construct appears.
+
+    Parameters
+    ----------
+    labels : list[str]
+        Label sequence from ``node_labels``.
+    size : int
+        Number of labels per shingle.
+
+    Returns
+    -------
+    list[int]
+        Sorted, distinct 32-bit shingle hashes. Stable across runs, so they
+        can be cached.
+    """
+    if not labels:
+        return []
+    if len(labels) < size:
+        size = len(labels)
+    seen: Counter[int] = Counter()
+    shingles: set[int] = set()
+    for i in range(len(labels) - size + 1):
+        h = zlib.crc32("\0".join(labels[i:i + size]).encode())
+        n = seen[h]
+        seen[h] = n + 1
+        shingles.add(zlib.crc32(str(n).encode(), h) if n else h)
+    return sorted(shingles)
+
+
+def node_shingles(node: cst.CSTNode, size: int = SHINGLE_SIZE) -> list[int]:
+    """Shingle set of a CST subtree (``shingle_labels(node_labels(node))``)."""
+    return shingle_labels(node_labels(node), size)
+
+
+def jaccard(a: set[int] | frozenset[int], b: set[int] | frozenset[int]) -> float:
+    """Exact Jaccard similarity of two sets (1.0 for two empty sets)."""
+    if not a and not b:
+        return 1.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+
+def minhash_signature(shingles: Iterable[int], num_perm: int = NUM_PERM) -> list[int]:
+    """Compute a MinHash signature by one-permutation hashing.
+
+    Each hash is assigned to one of ``num_perm`` bins and each bin keeps its
+    minimum; empty bins borrow from the next non-empty bin (rotation
+    densification), offset by the distance so borrowed values stay distinct.
+
+    Parameters
+    ----------
+    shingles : Iterable[int]
+        32-bit shingle hashes.
+    num_perm : int
+        Signature length.
+
+    Returns
+    -------
+    list[int]
+        The signature; empty for an empty set.
+    """
+    span = (_MASK + 1) // num_perm + 1
+    sig: list[int | None] = [None] * num_perm
+    for h in shingles:
+        # Remix so bin and value use independent bits
+        h = (h * 0x9E3779B1) & _MASK
+        h ^= h >> 15
+        bin_, value = h % num_perm, h // num_perm
+        current = sig[bin_]
+        if current is None or value < current:
+            sig[bin_] = value
+    filled = [i for i, v in enumerate(sig) if v is not None]
+    if not filled:
+        return []
+    if len(filled) < num_perm:
+        next_filled = filled[0] + num_perm
+        for i in range(num_perm - 1, -1, -1):
+            if sig[i] is not None:
+                next_filled = i
+            else:
+                sig[i] = sig[next_filled % num_perm] + (next_filled - i) * span
+    return sig  # type: ignore[return-value]
+
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM, recall: float = 0.95) -> tuple[int, int]:
+    """Choose the LSH band layout for a similarity threshold.
+
+    A pair with similarity ``s`` shares a bucket with probability
+    ``1 - (1 - s**rows)**bands``. Candidates are verified exactly, so
+    missed pairs matter more than extra candidates: this picks the most
+    selective layout (most rows per band) that still finds pairs right at
+    ``threshold`` with probability ``recall``.
+
+    Parameters
+    ----------
+    threshold : float
+        Jaccard similarity that should become a candidate.
+    num_perm : int
+        Signature length.
+    recall : float
+        Required probability of finding a pair at ``threshold``.
+
+    Returns
+    -------
+    tuple[int, int]
+        ``(bands, rows)`` with ``bands * rows <= num_perm``.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands < recall:
+            break
+        best = (bands, rows)
+    return best
+
+
+class MinHashIndex:
+    """LSH index of shingle sets for finding similar pairs.
+
+    Parameters
+    ----------
+    threshold : float
+        Minimum Jaccard similarity of reported pairs.
+    num_perm : int
+        MinHash signature length.
+
+    Examples
+    --------
+    >>> index = MinHashIndex(threshold=0.8)
+    >>> index.add("a", node_shingles(body_a))
+    >>> index.add("b", node_shingles(body_b))
+    >>> index.similar_pairs()
+    [('a', 'b', 0.857...)]
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = NUM_PERM) -> None:
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self._sets: dict[Hashable, frozenset[int]] = {}
+        self._buckets: list[dict[tuple[int, ...], list[Hashable]]] = [
+            defaultdict(list) for _ in range(self.bands)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._sets
+
+    def add(self, key: Hashable, shingles: Iterable[int]) -> None:
+        """Index a shingle set under ``key`` (empty sets are ignored)."""
+        shingle_set = frozenset(shingles)
+        if not shingle_set or key in self._sets:
+            return
+        self._sets[key] = shingle_set
+        sig = minhash_signature(shingle_set, self.num_perm)
+        rows = self.rows
+        for band, buckets in enumerate(self._buckets):
+            buckets[tuple(sig[band * rows:(band + 1) * rows])].append(key)
+
+    def similarity(self, a: Hashable, b: Hashable) -> float:
+        """Exact Jaccard similarity of two indexed sets."""
+        return jaccard(self._sets[a], self._sets[b])
+
+    def candidates(self) -> set[tuple[Hashable, Hashable]]:
+        """Pairs of keys sharing at least one LSH bucket.
+
+        Pairs are ordered by insertion order of their keys.
+        """
+        order = {key: i for i, key in enumerate(self._sets)}
+        pairs: set[tuple[Hashable, Hashable]] = set()
+        for buckets in self._buckets:
+            for keys in buckets.values():
+                if len(keys) < 2:
+                    continue
+                for i, a in enumerate(keys):
+                    for b in keys[i + 1:]:
+                        pairs.add((a, b) if order[a] < order[b] else (b, a))
+        return pairs
+
+    def similar_pairs(self) -> list[tuple[Hashable, Hashable, float]]:
+        """Candidate pairs whose exact similarity reaches the threshold.
+
+        Returns
+        -------
+        list[tuple[Hashable, Hashable, float]]
+            ``(a, b, similarity)`` triples, most similar first.
+        """
+        threshold = self.threshold
+        sets = self._sets
+        result = []
+        for a, b in self.candidates():
+            set_a, set_b = sets[a], sets[b]
+            small, large = sorted((len(set_a), len(set_b)))
+            # Jaccard can't exceed the size ratio
+            if small < threshold * large:
+                continue
+            similarity = jaccard(set_a, set_b)
+            if similarity >= threshold:
+                result.append((a, b, similarity))
+        order = {key: i for i, key in enumerate(sets)}
+        result.sort(key=lambda t: (-t[2], order[t[0]], order[t[1]]))
+        return result
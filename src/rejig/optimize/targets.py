@@ -16,6 +16,7 @@ if TYPE_CHECKING:
     from typing import Self
 
     from rejig.core.rejig import Rejig
+    from rejig.core.results import Result
 
 
 class OptimizeType(Enum):
@@ -27,6 +28,7 @@ class OptimizeType(Enum):
     DUPLICATE_LITERAL = auto()
     SIMILAR_FUNCTION = auto()
     REPEATED_PATTERN = auto()
+    CODE_CLONE = auto()
 
     # Loop optimization findings
     SLOW_LOOP_TO_COMPREHENSION = auto()
@@ -45,6 +47,17 @@ class OptimizeType(Enum):
     INEFFICIENT_LIST_EXTEND = auto()
     UNNECESSARY_LIST_CONVERSION = auto()
 
+    # Runtime performance findings
+    LIST_MEMBERSHIP_IN_LOOP = auto()
+    REGEX_IN_LOOP = auto()
+    REPEATED_LOOKUP_IN_LOOP = auto()
+    LIST_AS_QUEUE = auto()
+    DEEPCOPY_IN_LOOP = auto()
+    SORT_IN_LOOP = auto()
+
+    # ORM query findings
+    N_PLUS_ONE_QUERY = auto()
+
 
 @dataclass
 class OptimizeFinding:
@@ -191,6 +204,7 @@ class OptimizeTargetList(FindingTargetList[OptimizeTarget, OptimizeType]):
             OptimizeType.DUPLICATE_LITERAL,
             OptimizeType.SIMILAR_FUNCTION,
             OptimizeType.REPEATED_PATTERN,
+            OptimizeType.CODE_CLONE,
         }
         return self._create_list(
             [t for t in self._targets if t.type in dry_types]
@@ -225,27 +239,51 @@ class OptimizeTargetList(FindingTargetList[OptimizeTarget, OptimizeType]):
             [t for t in self._targets if t.type in efficiency_types]
         )
 
-    # ===== Output methods (override to include optimization-specific fields) =====
+    def performance_issues(self) -> Self:
+        """Filter to runtime performance findings."""
+        performance_types = {
+            OptimizeType.LIST_MEMBERSHIP_IN_LOOP,
+            OptimizeType.REGEX_IN_LOOP,
+            OptimizeType.INEFFICIENT_STRING_CONCAT,
+            OptimizeType.REPEATED_LOOKUP_IN_LOOP,
+            OptimizeType.LIST_AS_QUEUE,
+            OptimizeType.DEEPCOPY_IN_LOOP,
+            OptimizeType.SORT_IN_LOOP,
+            OptimizeType.N_PLUS_ONE_QUERY,
+        }
+        return self._create_list(
+            [t for t in self._targets if t.type in performance_types]
+        )
 
-    def to_list_of_dicts(self) -> list[dict]:
-        """Convert to list of dictionaries for serialization.
+    # ===== Operations =====
+
+    def fix_all(self) -> Result:
+        """Rewrite the loop findings in this list that can be fixed safely.
+
+        Delegates to ``LoopOptimizer.apply``; other findings are ignored.
 
         Returns
         -------
-        list[dict]
-            List of finding dictionaries.
+        Result
+            Result with the combined diff and fixed/skipped counts in
+            ``data``.
         """
-        return [
-            {
-                "type": t.type.name,
-                "file": str(t.file_path),
-                "line": t.line_number,
-                "end_line": t.end_line,
-                "name": t.name,
-                "message": t.message,
-                "severity": t.severity,
-                "original_code": t.original_code,
-                "suggested_code": t.suggested_code,
-            }
-            for t in self._targets
-        ]
+        from rejig.optimize.loops import LoopOptimizer
+
+        return LoopOptimizer(self._rejig).apply(self)
+
+    # ===== Output methods (override to include optimization-specific fields) =====
+
+    def _to_dict(self, target: OptimizeTarget) -> dict:
+        """Convert one finding to a dictionary for serialization."""
+        return {
+            "type": target.type.name,
+            "file": str(target.file_path),
+            "line": target.line_number,
+            "end_line": target.end_line,
+            "name": target.name,
+            "message": target.message,
+            "severity": target.severity,
+            "original_code": target.original_code,
+            "suggested_code": target.suggested_code,
+        }
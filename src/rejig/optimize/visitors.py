@@ -0,0 +1,83 @@
+"""Run several CST visitors over a module in a single traversal.
+
+Parsing and metadata resolution dominate analysis time, so analyzers that
+need more than one visitor per file parse once and drive all of them
+through ``CombinedVisitor``.
+"""
+from __future__ import annotations
+
+from contextlib import ExitStack
+from typing import Sequence
+
+import libcst as cst
+from libcst.metadata import MetadataWrapper
+
+
+class CombinedVisitor(cst.CSTVisitor):
+    """Drive several visitors through one traversal of a tree.
+
+    Each visitor sees exactly the calls it would see on its own: when one
+    declines to visit a node's children, it is not called again until that
+    node is left, while the others carry on.
+    """
+
+    def __init__(self, visitors: Sequence[cst.CSTVisitor]) -> None:
+        super().__init__()
+        self._visitors = list(visitors)
+        # Per visitor, the node whose children it declined (or None)
+        self._skipping: list[cst.CSTNode | None] = [None] * len(self._visitors)
+
+    def on_visit(self, node: cst.CSTNode) -> bool:
+        descend = False
+        for i, visitor in enumerate(self._visitors):
+            if self._skipping[i] is None:
+                if visitor.on_visit(node):
+                    descend = True
+                else:
+                    self._skipping[i] = node
+        return descend
+
+    def on_visit_attribute(self, node: cst.CSTNode, attribute: str) -> None:
+        for i, visitor in enumerate(self._visitors):
+            if self._skipping[i] is None:
+                visitor.on_visit_attribute(node, attribute)
+
+    def on_leave_attribute(self, original_node: cst.CSTNode, attribute: str) -> None:
+        for i, visitor in enumerate(self._visitors):
+            if self._skipping[i] is None:
+                visitor.on_leave_attribute(original_node, attribute)
+
+    def on_leave(self, original_node: cst.CSTNode) -> None:
+        for i, visitor in enumerate(self._visitors):
+            skipping = self._skipping[i]
+            if skipping is original_node:
+                self._skipping[i] = None
+                visitor.on_leave(original_node)
+            elif skipping is None:
+                visitor.on_leave(original_node)
+
+
+def visit_combined(source: str, visitors: Sequence[cst.CSTVisitor]) -> None:
+    """Parse source once and run visitors over it in one traversal.
+
+    Each visitor's metadata dependencies are resolved on the shared
+    wrapper, so visitors using ``get_metadata`` work as usual.
+
+    Parameters
+    ----------
+    source : str
+        Module source code.
+    visitors : Sequence[cst.CSTVisitor]
+        Visitors to run, called in order at each node.
+
+    Raises
+    ------
+    libcst.ParserSyntaxError
+        If the source can't be parsed.
+    """
+    # The module is freshly parsed, so the wrapper needn't copy it
+    wrapper = MetadataWrapper(cst.parse_module(source), unsafe_skip_copy=True)
+    with ExitStack() as stack:
+        for visitor in visitors:
+            stack.enter_context(visitor.resolve(wrapper))
+        wrapper.module.visit(CombinedVisitor(visitors))
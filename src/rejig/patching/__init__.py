@@ -79,6 +79,12 @@ PatchGenerator
 PatchConverter
     Converter for patches to rejig operations.
 
+HunkMatcher
+    Places hunks by context, with offset, fuzz and whitespace tolerance.
+
+HunkPlacement
+    Where a hunk was applied (offset, fuzz).
+
 PatchAnalyzer
     Analyzer for detecting higher-level operations in patches.
 
@@ -107,6 +113,10 @@ from rejig.patching.generator import (
     generate_patch_from_batch,
     generate_patch_from_result,
 )
+from rejig.patching.matcher import (
+    HunkMatcher,
+    HunkPlacement,
+)
 from rejig.patching.models import (
     Change,
     ChangeType,
@@ -148,6 +158,8 @@ __all__ = [
     "apply_patch",
     "generate_script_from_patch",
     "save_script_from_patch",
+    "HunkMatcher",
+    "HunkPlacement",
     # Analyzer
     "PatchAnalyzer",
     "DetectedOperation",
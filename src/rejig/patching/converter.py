@@ -10,6 +10,7 @@ from typing import TYPE_CHECKING
 
 from rejig.core.results import BatchResult, ErrorResult, Result
 from rejig.patching.analyzer import DetectedOperation, OperationType, PatchAnalyzer
+from rejig.patching.matcher import HunkMatcher, HunkPlacement
 from rejig.patching.models import FilePatch, Hunk, Patch
 
 if TYPE_CHECKING:
@@ -29,6 +30,10 @@ class PatchConverter:
       idiomatic rejig code (e.g., rename instead of rewrite)
     - smart_mode=False: Always uses line-based operations (more reliable)
 
+    When applying, hunks are placed by their context rather than trusted
+    line numbers, so patches still apply to files that have since changed
+    (see ``HunkMatcher``).
+
     Examples
     --------
     >>> converter = PatchConverter(rj, smart_mode=True)
@@ -48,6 +53,8 @@ class PatchConverter:
         self,
         rejig: Rejig,
         smart_mode: bool = True,
+        fuzz: int = 2,
+        ignore_whitespace: bool = True,
     ) -> None:
         """Initialize the converter.
 
@@ -58,9 +65,17 @@ class PatchConverter:
         smart_mode : bool
             If True, use analyzer to detect high-level operations.
             If False, use line-based operations only.
+        fuzz : int
+            Maximum context lines ignored at each end of a hunk when
+            applying (as in ``patch --fuzz``).
+        ignore_whitespace : bool
+            Let hunks match lines that differ only in whitespace when
+            applying.
         """
         self._rejig = rejig
         self._smart_mode = smart_mode
+        self._fuzz = fuzz
+        self._ignore_whitespace = ignore_whitespace
         self._analyzer = PatchAnalyzer() if smart_mode else None
 
     def to_rejig_code(
@@ -297,13 +312,17 @@ class PatchConverter:
         Returns
         -------
         Result
-            Result of applying the patch.
+            Result of applying the patch. ``data`` maps each patched file
+            to the ``HunkPlacement`` of its hunks.
         """
         results: list[Result] = []
+        placements: dict[Path, list[HunkPlacement]] = {}
 
         for file_patch in patch.files:
             result = self._apply_file_patch(file_patch)
             results.append(result)
+            if result.success and isinstance(result.data, list):
+                placements[self._rejig._resolve_path(file_patch.path)] = result.data
 
         if not results:
             return Result(success=True, message="No changes to apply")
@@ -318,16 +337,22 @@ class PatchConverter:
             diffs.update(r.diffs)
 
         if all_succeeded:
+            inexact = sum(not p.exact for hunks in placements.values() for p in hunks)
+            message = f"Applied patch to {len(files_changed)} file(s)"
+            if inexact:
+                message += f" ({inexact} hunk(s) with offset or fuzz)"
             return Result(
                 success=True,
-                message=f"Applied patch to {len(files_changed)} file(s)",
+                message=message,
                 files_changed=files_changed,
+                data=placements,
                 diffs=diffs,
             )
         else:
             failed = [r for r in results if not r.success]
             return ErrorResult(
-                message=f"Patch application had {len(failed)} failure(s)",
+                message=f"Patch application had {len(failed)} failure(s): "
+                + "; ".join(r.message for r in failed),
                 operation="apply_patch",
             )
 
@@ -566,16 +591,26 @@ class PatchConverter:
                 exception=e,
             )
 
-        # Apply hunks in reverse order to preserve line numbers
-        hunks_reversed = list(reversed(file_patch.hunks))
-        new_content = content
-
-        for hunk in hunks_reversed:
-            new_content = self._apply_hunk(new_content, hunk)
+        matcher = HunkMatcher(content, self._fuzz, self._ignore_whitespace)
+        new_content, placements, failed = matcher.apply(file_patch.hunks)
+        if failed:
+            numbers = ", ".join(f"#{n}" for n in failed)
+            return ErrorResult(
+                message=(
+                    f"{len(failed)} of {len(file_patch.hunks)} hunks FAILED for {resolved_path}: {numbers}"
+                ),
+                operation="apply_file_patch",
+            )
 
         # Write the modified content
         target = self._rejig.file(resolved_path)
-        return target.rewrite(new_content)
+        result = target.rewrite(new_content)
+        if result.success:
+            result.data = placements
+            notes = [str(p) for p in placements if not p.exact]
+            if notes:
+                result.message += f" ({'; '.join(notes)})"
+        return result
 
     def _apply_new_file(self, file_patch: FilePatch) -> Result:
         """Apply a new file patch."""
@@ -629,27 +664,18 @@ class PatchConverter:
     def _apply_hunk(self, content: str, hunk: Hunk) -> str:
         """Apply a single hunk to content.
 
-        Replaces lines from old_start to old_start+old_count with
-        the new content from additions.
-        """
-        lines = content.splitlines(keepends=True)
-
-        # Convert to 0-based indexing
-        start_idx = hunk.old_start - 1
-        end_idx = start_idx + hunk.old_count
-
-        # Build new lines from the hunk
-        new_lines: list[str] = []
-        for change in hunk.changes:
-            if change.is_addition or change.is_context:
-                line = change.content
-                if not line.endswith("\n"):
-                    line += "\n"
-                new_lines.append(line)
+        The hunk is placed by its context and deleted lines, searching
+        outward from its line numbers.
 
-        # Replace the range
-        result_lines = lines[:start_idx] + new_lines + lines[end_idx:]
-        return "".join(result_lines)
+        Raises
+        ------
+        ValueError
+            If the hunk's lines aren't found in the content.
+        """
+        new_content, _, failed = HunkMatcher(content, self._fuzz, self._ignore_whitespace).apply([hunk])
+        if failed:
+            raise ValueError(f"hunk {hunk.to_header()} does not match the file")
+        return new_content
 
 
 def convert_patch_to_code(
@@ -680,7 +706,12 @@ def convert_patch_to_code(
     return converter.to_rejig_code(patch, variable_name)
 
 
-def apply_patch(patch: Patch, rejig: Rejig) -> Result:
+def apply_patch(
+    patch: Patch,
+    rejig: Rejig,
+    fuzz: int = 2,
+    ignore_whitespace: bool = True,
+) -> Result:
     """Convenience function to apply a patch.
 
     Parameters
@@ -689,13 +720,17 @@ def apply_patch(patch: Patch, rejig: Rejig) -> Result:
         The patch to apply.
     rejig : Rejig
         The Rejig instance.
+    fuzz : int
+        Maximum context lines ignored at each end of a hunk.
+    ignore_whitespace : bool
+        Let hunks match lines that differ only in whitespace.
 
     Returns
     -------
     Result
         Result of applying the patch.
     """
-    converter = PatchConverter(rejig)
+    converter = PatchConverter(rejig, fuzz=fuzz, ignore_whitespace=ignore_whitespace)
     return converter.apply(patch)
 
 
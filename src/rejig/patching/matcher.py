@@ -0,0 +1,246 @@
+"""Context-anchored hunk placement for applying patches to diverged files.
+
+A hunk's line numbers are only a hint: the file may have changed since the
+patch was made. Like GNU patch, the matcher verifies a hunk's context and
+deleted lines against the file and searches outward from the hinted
+position for the closest place they match. If there's no exact match it
+retries ignoring whitespace, then with up to ``fuzz`` context lines dropped
+from each end of the hunk.
+
+Candidate positions come from an index of the file's lines: the rarest line
+of the hunk is looked up and only the positions it implies are verified, so
+large patches against large files apply without scanning.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from rejig.patching.models import Change, Hunk
+
+
+def _loose(line: str) -> str:
+    """Normalize whitespace for whitespace-insensitive matching."""
+    return " ".join(line.split())
+
+
+@dataclass
+class HunkPlacement:
+    """Where a hunk was applied.
+
+    Attributes
+    ----------
+    hunk : Hunk
+        The applied hunk.
+    number : int
+        1-based position of the hunk in its file patch.
+    start : int
+        0-based index of the first replaced line in the original file.
+    end : int
+        0-based index one past the last replaced line.
+    offset : int
+        Lines between where the hunk says it applies and where it did.
+    fuzz : int
+        Context lines ignored at each end of the hunk to make it match.
+    whitespace : bool
+        True if the hunk only matched after ignoring whitespace.
+    lines : list[str]
+        Replacement lines for ``start:end``.
+    """
+
+    hunk: Hunk
+    number: int
+    start: int
+    end: int
+    offset: int = 0
+    fuzz: int = 0
+    whitespace: bool = False
+    lines: list[str] = field(default_factory=list, repr=False)
+
+    @property
+    def exact(self) -> bool:
+        """True if the hunk applied where it said, with no fuzz."""
+        return not (self.offset or self.fuzz or self.whitespace)
+
+    def __str__(self) -> str:
+        text = f"Hunk #{self.number} succeeded at {self.start + 1}"
+        details = []
+        if self.offset:
+            details.append(f"offset {self.offset:+d} lines")
+        if self.fuzz:
+            details.append(f"fuzz {self.fuzz}")
+        if self.whitespace:
+            details.append("ignoring whitespace")
+        return f"{text} ({', '.join(details)})" if details else text
+
+
+class HunkMatcher:
+    """Locate and apply hunks in one file's content.
+
+    Parameters
+    ----------
+    content : str
+        Current content of the file.
+    fuzz : int
+        Maximum number of context lines to ignore at each end of a hunk.
+    ignore_whitespace : bool
+        Retry a hunk ignoring whitespace differences if it doesn't match
+        exactly.
+
+    Examples
+    --------
+    >>> matcher = HunkMatcher(path.read_text(), fuzz=2)
+    >>> new_content, placements, failed = matcher.apply(file_patch.hunks)
+    >>> for placement in placements:
+    ...     print(placement)
+    Hunk #1 succeeded at 12 (offset +3 lines)
+    """
+
+    def __init__(self, content: str, fuzz: int = 2, ignore_whitespace: bool = True) -> None:
+        self.fuzz = max(0, fuzz)
+        self.ignore_whitespace = ignore_whitespace
+        self._lines = content.splitlines(keepends=True)
+        self._eol = "\r\n" if self._lines and self._lines[0].endswith("\r\n") else "\n"
+        self._keys: dict[bool, list[str]] = {False: [line.rstrip("\r\n") for line in self._lines]}
+        self._index: dict[bool, dict[str, list[int]]] = {}
+
+    def _file_keys(self, loose: bool) -> list[str]:
+        if loose not in self._keys:
+            self._keys[loose] = [_loose(key) for key in self._keys[False]]
+        return self._keys[loose]
+
+    def _positions(self, key: str, loose: bool) -> list[int]:
+        index = self._index.get(loose)
+        if index is None:
+            index = {}
+            for position, line in enumerate(self._file_keys(loose)):
+                index.setdefault(line, []).append(position)
+            self._index[loose] = index
+        return index.get(key, [])
+
+    def _search(self, pattern: list[str], expected: int, lower: int, loose: bool) -> int | None:
+        """Find the start of ``pattern`` closest to ``expected``, at or after ``lower``."""
+        anchor, positions = 0, None
+        for i, key in enumerate(pattern):
+            found = self._positions(key, loose)
+            if not found:
+                return None
+            if positions is None or len(found) < len(positions):
+                anchor, positions = i, found
+
+        keys = self._file_keys(loose)
+        last = len(keys) - len(pattern)
+        starts = [p - anchor for p in positions if lower <= p - anchor <= last]
+        for start in sorted(starts, key=lambda s: (abs(s - expected), s)):
+            if keys[start:start + len(pattern)] == pattern:
+                return start
+        return None
+
+    def locate(self, hunk: Hunk, offset: int = 0, lower: int = 0, number: int = 1) -> HunkPlacement | None:
+        """Find where a hunk applies.
+
+        Parameters
+        ----------
+        hunk : Hunk
+            The hunk to place.
+        offset : int
+            Offset of the previous hunk, applied to this hunk's hint.
+        lower : int
+            First line (0-based) the hunk may touch.
+        number : int
+            1-based position of the hunk, for reporting.
+
+        Returns
+        -------
+        HunkPlacement | None
+            The placement, or None if the hunk's lines aren't in the file.
+        """
+        changes = hunk.changes
+        old = [i for i, change in enumerate(changes) if not change.is_addition]
+
+        if not old:
+            # Pure insertion: "-N,0" means after line N
+            start = min(max(hunk.old_start + offset, lower), len(self._lines))
+            return HunkPlacement(
+                hunk, number, start, start, start - hunk.old_start, lines=self._replacement(changes, start)
+            )
+
+        leading = next((n for n, i in enumerate(old) if not changes[i].is_context), len(old))
+        trailing = next((n for n, i in enumerate(reversed(old)) if not changes[i].is_context), len(old))
+        hint = hunk.old_start - 1 + offset
+        attempts = [False, True] if self.ignore_whitespace else [False]
+        tried: set[tuple[int, int]] = set()
+
+        for fuzz in range(self.fuzz + 1):
+            head, tail = min(fuzz, leading), min(fuzz, trailing)
+            if (head, tail) in tried or head + tail >= len(old):
+                continue
+            tried.add((head, tail))
+            kept = old[head:len(old) - tail]
+            for loose in attempts:
+                pattern = [changes[i].content.rstrip("\r\n") for i in kept]
+                if loose:
+                    pattern = [_loose(line) for line in pattern]
+                start = self._search(pattern, hint + head, lower, loose)
+                if start is None:
+                    continue
+                # Keep additions next to the dropped context lines
+                first = old[head - 1] + 1 if head else 0
+                last = old[len(old) - tail] if tail else len(changes)
+                return HunkPlacement(
+                    hunk,
+                    number,
+                    start,
+                    start + len(kept),
+                    start - head - (hunk.old_start - 1),
+                    fuzz=max(head, tail),
+                    whitespace=loose,
+                    lines=self._replacement(changes[first:last], start),
+                )
+        return None
+
+    def _replacement(self, changes: list[Change], start: int) -> list[str]:
+        """New lines for a matched region, keeping the file's own context lines."""
+        lines: list[str] = []
+        position = start
+        for change in changes:
+            if change.is_addition:
+                lines.append(change.content.rstrip("\r\n") + self._eol)
+            else:
+                if change.is_context:
+                    lines.append(self._lines[position])
+                position += 1
+        return lines
+
+    def apply(self, hunks: Iterable[Hunk]) -> tuple[str, list[HunkPlacement], list[int]]:
+        """Apply hunks in order, each after the previous one.
+
+        Parameters
+        ----------
+        hunks : Iterable[Hunk]
+            Hunks of one file patch.
+
+        Returns
+        -------
+        tuple[str, list[HunkPlacement], list[int]]
+            The new content, the placements of the hunks that applied, and
+            the 1-based numbers of the hunks that didn't.
+        """
+        placements: list[HunkPlacement] = []
+        failed: list[int] = []
+        offset = lower = 0
+        for number, hunk in enumerate(hunks, 1):
+            placement = self.locate(hunk, offset, lower, number)
+            if placement is None:
+                failed.append(number)
+                continue
+            placements.append(placement)
+            offset, lower = placement.offset, placement.end
+
+        lines = list(self._lines)
+        for placement in reversed(placements):
+            lines[placement.start:placement.end] = placement.lines
+        for i in range(len(lines) - 1):
+            if not lines[i].endswith("\n"):
+                lines[i] += self._eol
+        return "".join(lines), placements, failed
@@ -23,8 +23,15 @@ from rejig.security.reporter import (
     SecurityReporter,
 )
 from rejig.security.secrets import (
+    SECRET_PATTERNS,
+    SecretPattern,
     SecretsScanner,
 )
+from rejig.security.taint import (
+    TaintAnalyzer,
+    TaintConfig,
+    TaintSink,
+)
 from rejig.security.targets import (
     SecurityFinding,
     SecurityTarget,
@@ -43,7 +50,12 @@ __all__ = [
     "SecurityFinding",
     # Scanners
     "SecretsScanner",
+    "SecretPattern",
+    "SECRET_PATTERNS",
     "VulnerabilityScanner",
+    "TaintAnalyzer",
+    "TaintConfig",
+    "TaintSink",
     # Reporting
     "SecurityReport",
     "SecurityReporter",
@@ -0,0 +1,228 @@
+"""File discovery and bounded-memory reading for the security scanners.
+
+``Rejig.files`` only lists Python files, but credentials mostly leak through
+configuration: ``.env`` files, YAML/TOML/JSON/INI configs, shell scripts and
+Dockerfiles. This module finds those files alongside the Python sources and
+reads them through ``mmap`` in line-aligned windows, so scanning a very large
+file never holds more than one window in memory.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+from rejig.targets.config import IniTarget, JsonTarget, TomlTarget, YamlTarget
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+
+
+# Config file suffixes, as understood by the config targets
+CONFIG_SUFFIXES = frozenset(
+    IniTarget.SUFFIXES + JsonTarget.SUFFIXES + TomlTarget.SUFFIXES + YamlTarget.SUFFIXES + (".conf",)
+)
+
+# Shell script suffixes
+SHELL_SUFFIXES = frozenset({".sh", ".bash", ".zsh", ".ksh"})
+
+# Directories never descended into
+SKIP_DIRS = frozenset({
+    ".git", ".hg", ".svn", ".tox", ".nox", ".venv", "venv", "env",
+    "node_modules", "__pycache__", ".mypy_cache", ".pytest_cache",
+    ".ruff_cache", "build", "dist", "site-packages",
+})
+
+# Bytes inspected by the binary/minified heuristic
+SNIFF_SIZE = 8192
+
+# Lines longer than this (in the sniffed prefix) mark a file as minified
+MINIFIED_LINE_LENGTH = 1000
+
+# Default window size and overlap for chunked reads
+CHUNK_SIZE = 1 << 20
+CHUNK_OVERLAP = 4096
+
+
+def is_config_file(path: Path) -> bool:
+    """Check whether a file is a non-Python file worth scanning for secrets.
+
+    Parameters
+    ----------
+    path : Path
+        File to check.
+
+    Returns
+    -------
+    bool
+        True for ``.env`` files, config files (TOML/YAML/JSON/INI/CFG/CONF),
+        shell scripts and Dockerfiles.
+    """
+    name = path.name.lower()
+    suffix = path.suffix.lower()
+    return (
+        name == ".env"
+        or name.startswith(".env.")
+        or suffix == ".env"
+        or suffix in CONFIG_SUFFIXES
+        or suffix in SHELL_SUFFIXES
+        or name == "dockerfile"
+        or name.startswith("dockerfile.")
+        or suffix == ".dockerfile"
+    )
+
+
+def discover_security_files(rejig: Rejig, include_config: bool = True) -> list[Path]:
+    """List the files the security scanners should look at.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The Rejig instance; its Python files are always included.
+    include_config : bool
+        Also include non-Python files (see ``is_config_file``) found under
+        the working directory, or in the working set of a restricted Rejig
+        (see ``Rejig.restrict_to``). Otherwise only applies when Rejig was
+        given a directory.
+
+    Returns
+    -------
+    list[Path]
+        Python files followed by the config files, each group sorted.
+    """
+    files = list(rejig.files)
+    if not include_config:
+        return files
+    if rejig.working_set is not None:
+        return files + [p for p in rejig.working_set if is_config_file(p)]
+    if not rejig.path.is_dir():
+        return files
+
+    extra: list[Path] = []
+    for dirpath, dirnames, filenames in os.walk(rejig.path.resolve()):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.endswith(".egg-info")]
+        for filename in filenames:
+            path = Path(dirpath, filename)
+            if is_config_file(path):
+                extra.append(path)
+    return files + sorted(extra)
+
+
+def is_binary_or_minified(head: bytes) -> bool:
+    """Heuristically decide whether a file should not be scanned as text.
+
+    Parameters
+    ----------
+    head : bytes
+        The first bytes of the file (``SNIFF_SIZE`` is enough).
+
+    Returns
+    -------
+    bool
+        True if the prefix contains a NUL byte (binary) or a line longer
+        than ``MINIFIED_LINE_LENGTH`` (minified/generated content).
+    """
+    head = head[:SNIFF_SIZE]
+    if b"\0" in head:
+        return True
+    start = 0
+    while True:
+        end = head.find(b"\n", start)
+        if end == -1:
+            # The last line may be cut off by the sniff window, but if even
+            # the part seen is too long, so is the line
+            return len(head) - start > MINIFIED_LINE_LENGTH
+        if end - start > MINIFIED_LINE_LENGTH:
+            return True
+        start = end + 1
+
+
+@dataclass
+class Window:
+    """A slice of a file, normally line-aligned.
+
+    Attributes
+    ----------
+    data : bytes
+        The window's bytes. Starts at a line boundary unless the previous
+        window had to cut an overlong line (see ``iter_windows``).
+    owned : int
+        Length of the prefix this window is responsible for. Bytes after it
+        are overlap, repeated at the start of the next window; callers should
+        only report matches that start before ``owned``.
+    offset : int
+        Byte offset of ``data`` in the file.
+    line : int
+        1-based line number of the first byte of ``data``.
+    """
+
+    data: bytes
+    owned: int
+    offset: int
+    line: int
+
+
+def iter_windows(
+    path: Path,
+    chunk_size: int | None = None,
+    overlap: int | None = None,
+    skip_binary: bool = False,
+) -> Iterator[Window]:
+    """Read a file through ``mmap`` in overlapping, line-aligned windows.
+
+    Each window owns roughly ``chunk_size`` bytes, cut at the next newline,
+    and carries about ``overlap`` bytes more (again up to a newline) so
+    matches spanning a window boundary are still seen whole. A newline is
+    only looked for up to ``overlap`` bytes past each cut; lines longer
+    than that are split, so a window never exceeds ``chunk_size + 3 *
+    overlap`` bytes.
+
+    Parameters
+    ----------
+    path : Path
+        File to read.
+    chunk_size : int, optional
+        Approximate number of bytes owned by each window. Defaults to
+        ``CHUNK_SIZE``.
+    overlap : int, optional
+        Approximate number of bytes repeated from the next window. Defaults
+        to ``CHUNK_OVERLAP``.
+    skip_binary : bool
+        Yield nothing if the file's first ``SNIFF_SIZE`` bytes look binary
+        or minified (see ``is_binary_or_minified``). The prefix is read
+        straight from the map, before any window is copied.
+
+    Yields
+    ------
+    Window
+        Consecutive windows; their owned parts cover the file exactly once.
+    """
+    chunk_size = CHUNK_SIZE if chunk_size is None else chunk_size
+    overlap = CHUNK_OVERLAP if overlap is None else overlap
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if skip_binary and is_binary_or_minified(mm[:SNIFF_SIZE]):
+                return
+            start, line = 0, 1
+            while start < size:
+                cut = start + chunk_size
+                end = _line_end(mm, cut, min(cut + overlap, size))
+                stop = _line_end(mm, end + overlap, min(end + 2 * overlap, size)) if end < size else end
+                data = mm[start:stop]
+                owned = end - start
+                yield Window(data=data, owned=owned, offset=start, line=line)
+                line += data.count(b"\n", 0, owned)
+                start = end
+
+
+def _line_end(mm: mmap.mmap, pos: int, limit: int) -> int:
+    """Offset just past the first newline in ``pos:limit`` (or ``limit``)."""
+    if pos >= limit:
+        return limit
+    newline = mm.find(b"\n", pos, limit)
+    return limit if newline == -1 else newline + 1
@@ -4,18 +4,33 @@ Generates comprehensive security reports in various formats:
 - JSON reports for automated processing
 - Markdown reports for human review
 - SARIF format for tool integration
+- JSON Lines and CSV for very large finding sets
+
+Reports written to a file are streamed from the scanners (see
+``rejig.core.writers``), so memory use doesn't grow with the number of
+findings.
 """
 from __future__ import annotations
 
+import io
 import json
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator
 
 from rejig.core.results import Result
+from rejig.core.writers import (
+    SARIF_LEVELS,
+    CsvWriter,
+    JsonLinesWriter,
+    SarifWriter,
+    default_sarif_rule,
+    format_for_path,
+    write_report,
+)
 from rejig.security.secrets import SecretsScanner
-from rejig.security.targets import SecurityTargetList, SecurityType
+from rejig.security.targets import SecurityFinding, SecurityTargetList, SecurityType, finding_to_dict
 from rejig.security.vulnerabilities import VulnerabilityScanner
 
 if TYPE_CHECKING:
@@ -149,6 +164,10 @@ class SecurityReport:
         return "\n".join(lines)
 
 
+# Columns of CSV reports
+_CSV_FIELDS = ("type", "severity", "file", "line", "name", "message", "code_snippet", "recommendation")
+
+
 class SecurityReporter:
     """Generate security analysis reports.
 
@@ -198,6 +217,7 @@ class SecurityReporter:
         self,
         output_path: Path | str | None = None,
         format: str = "json",
+        compress: bool | None = None,
     ) -> Result:
         """Generate a security report file.
 
@@ -206,13 +226,26 @@ class SecurityReporter:
         output_path : Path | str | None
             Path to write the report. If None, returns data in result.
         format : str
-            Output format: "json", "markdown", or "sarif". Default "json".
+            Output format: "json", "markdown", "sarif", "jsonl" or "csv".
+            Default "json".
+        compress : bool | None
+            Gzip the report file. If None, compress when ``output_path``
+            ends in ``.gz``.
 
         Returns
         -------
         Result
             Result containing the report data or file path.
         """
+        if format not in ("json", "markdown", "sarif", "jsonl", "csv"):
+            return Result(
+                success=False,
+                message=f"Unknown format: {format}. Use 'json', 'markdown', 'sarif', 'jsonl' or 'csv'.",
+            )
+
+        if output_path and format != "markdown":
+            return self.write_report(output_path, format, compress)
+
         report = self.generate_full_report()
 
         if format == "json":
@@ -222,10 +255,7 @@ class SecurityReporter:
         elif format == "sarif":
             content = self._format_sarif(report)
         else:
-            return Result(
-                success=False,
-                message=f"Unknown format: {format}. Use 'json', 'markdown', or 'sarif'.",
-            )
+            content = self._format_records(report, format)
 
         if output_path:
             output_path = Path(output_path)
@@ -249,6 +279,81 @@ class SecurityReporter:
             data=content if format != "json" else json.loads(content),
         )
 
+    def write_report(
+        self,
+        output_path: Path | str,
+        format: str | None = None,
+        compress: bool | None = None,
+        include_secrets: bool = True,
+        include_vulnerabilities: bool = True,
+    ) -> Result:
+        """Scan the project and stream the findings straight to a report file.
+
+        Findings are written as the scanners produce them and are never
+        collected, so memory use stays flat however many there are.
+
+        Parameters
+        ----------
+        output_path : Path | str
+            Path to write the report. A ``.gz`` suffix gzips the output.
+        format : str | None
+            "sarif", "jsonl", "csv" or "json". If None, guessed from the
+            file name.
+        compress : bool | None
+            Force gzip on or off regardless of the file name.
+        include_secrets : bool
+            Include hardcoded secrets analysis. Default True.
+        include_vulnerabilities : bool
+            Include vulnerability analysis. Default True.
+
+        Returns
+        -------
+        Result
+            Result with the written file in ``files_changed``.
+
+        Examples
+        --------
+        >>> SecurityReporter(rj).write_report("security.sarif.gz")
+        """
+        records = (
+            finding_to_dict(f)
+            for f in self._iter_findings(include_secrets, include_vulnerabilities)
+        )
+        return write_report(
+            records,
+            output_path,
+            format or format_for_path(output_path),
+            compress=compress,
+            root=self._rejig.root,
+            header={
+                "generated_at": datetime.now().isoformat(),
+                "project_root": str(self._rejig.root),
+            },
+            summary={"files_scanned": len(self._rejig.files)},
+            rules=self._get_sarif_rules(),
+            fields=_CSV_FIELDS,
+            tool_name="rejig-security",
+        )
+
+    def _iter_findings(
+        self,
+        include_secrets: bool,
+        include_vulnerabilities: bool,
+    ) -> Iterator[SecurityFinding]:
+        if include_secrets:
+            yield from self._secrets_scanner.iter_findings()
+        if include_vulnerabilities:
+            yield from self._vulnerability_scanner.iter_findings()
+
+    def _format_records(self, report: SecurityReport, format: str) -> str:
+        """Format report findings as JSON Lines or CSV."""
+        output = io.StringIO()
+        writer = JsonLinesWriter(output) if format == "jsonl" else CsvWriter(output, _CSV_FIELDS)
+        for finding in report.all_findings or ():
+            writer.write(finding_to_dict(finding))
+        writer.close()
+        return output.getvalue()
+
     def _format_json(self, report: SecurityReport) -> str:
         """Format report as JSON."""
         data = {
@@ -348,72 +453,29 @@ class SecurityReporter:
 
     def _format_sarif(self, report: SecurityReport) -> str:
         """Format report in SARIF format for tool integration."""
-        # SARIF 2.1.0 format
-        sarif = {
-            "$schema": "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json",
-            "version": "2.1.0",
-            "runs": [
-                {
-                    "tool": {
-                        "driver": {
-                            "name": "rejig-security",
-                            "version": "0.1.0",
-                            "informationUri": "https://github.com/example/rejig",
-                            "rules": self._get_sarif_rules(),
-                        }
-                    },
-                    "results": [],
-                }
-            ],
-        }
-
-        all_findings = report.all_findings
-        if all_findings:
-            for finding in all_findings:
-                sarif["runs"][0]["results"].append({
-                    "ruleId": finding.type.name,
-                    "level": self._severity_to_sarif_level(finding.severity),
-                    "message": {
-                        "text": finding.message,
-                    },
-                    "locations": [
-                        {
-                            "physicalLocation": {
-                                "artifactLocation": {
-                                    "uri": str(finding.file_path),
-                                },
-                                "region": {
-                                    "startLine": finding.line_number,
-                                },
-                            }
-                        }
-                    ],
-                })
-
-        return json.dumps(sarif, indent=2)
+        from rejig import __version__
+
+        output = io.StringIO()
+        writer = SarifWriter(
+            output,
+            tool_name="rejig-security",
+            tool_version=__version__,
+            information_uri="https://github.com/SpliFF/rejig",
+            rules=self._get_sarif_rules(),
+            root=report.project_root,
+        )
+        for finding in report.all_findings or ():
+            writer.write(finding_to_dict(finding))
+        writer.close()
+        return output.getvalue()
 
     def _get_sarif_rules(self) -> list[dict]:
         """Get SARIF rule definitions."""
-        rules = []
-        for stype in SecurityType:
-            rules.append({
-                "id": stype.name,
-                "name": stype.name.replace("_", " ").title(),
-                "shortDescription": {
-                    "text": stype.name.replace("_", " ").lower(),
-                },
-            })
-        return rules
+        return [default_sarif_rule(stype.name) for stype in SecurityType]
 
     def _severity_to_sarif_level(self, severity: str) -> str:
         """Convert severity to SARIF level."""
-        mapping = {
-            "critical": "error",
-            "high": "error",
-            "medium": "warning",
-            "low": "note",
-        }
-        return mapping.get(severity, "warning")
+        return SARIF_LEVELS.get(severity, "warning")
 
     def quick_scan(self) -> SecurityTargetList:
         """Perform a quick security scan for critical issues.
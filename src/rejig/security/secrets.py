@@ -0,0 +1,909 @@
+"""Hardcoded secrets detection.
+
+Detects credentials committed to source code:
+- Provider key formats (AWS, GitHub, Google, Stripe, Slack, ...)
+- Private keys, JWTs and credentials embedded in URLs
+- String literals assigned to secret-looking names (``password = "..."``)
+- High-entropy strings assigned to key/token-like names
+
+Besides Python sources, ``.env`` files, configs, shell scripts and
+Dockerfiles are scanned (see ``rejig.security.files``).
+
+Files are read through ``mmap`` in line-aligned windows. A single keyword
+alternation is run over each window to find the few lines that could hold a
+secret; only those lines are decoded and matched against the (anchored)
+provider regexes, and only files with a plausible secret assignment are
+parsed. Binary and minified files, lockfiles, tests and examples are
+skipped.
+"""
+from __future__ import annotations
+
+import math
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+import libcst as cst
+from libcst.metadata import MetadataWrapper, PositionProvider
+
+from rejig.security.files import discover_security_files, iter_windows
+from rejig.security.targets import (
+    SecurityFinding,
+    SecurityTarget,
+    SecurityTargetList,
+    SecurityType,
+)
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+
+
+@dataclass
+class SecretPattern:
+    """Pattern for detecting a specific kind of secret.
+
+    Attributes
+    ----------
+    name : str
+        Name of the secret pattern.
+    pattern : re.Pattern
+        Compiled regex. If it has a group named ``secret``, only that part
+        is checked against placeholder values.
+    security_type : SecurityType
+        Type of security finding.
+    severity : str
+        Severity level.
+    recommendation : str
+        Suggested fix.
+    keywords : tuple[str, ...]
+        Lowercase literals, one of which appears in every match. Lines
+        without any keyword are never matched against the regex; patterns
+        without keywords are run on every line.
+    """
+
+    name: str
+    pattern: re.Pattern
+    security_type: SecurityType
+    severity: str
+    recommendation: str
+    keywords: tuple[str, ...] = ()
+
+
+_ROTATE = "Remove the secret from source, rotate it, and load it from the environment or a secrets manager."
+
+SECRET_PATTERNS = [
+    # Cloud providers
+    SecretPattern(
+        name="AWS Access Key ID",
+        pattern=re.compile(r"\b(?:A3T[A-Z0-9]|AKIA|ASIA|ABIA|ACCA)[A-Z0-9]{16}\b"),
+        security_type=SecurityType.HARDCODED_API_KEY,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("akia", "asia", "abia", "acca", "a3t"),
+    ),
+    SecretPattern(
+        name="AWS Secret Access Key",
+        pattern=re.compile(
+            r"(?i)aws_?secret_?(?:access_?)?key\w*[\"']?\s*[:=]\s*[\"']?"
+            r"(?P<secret>[A-Za-z0-9/+=]{40})(?![A-Za-z0-9/+=])"
+        ),
+        security_type=SecurityType.HARDCODED_SECRET,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("aws",),
+    ),
+    SecretPattern(
+        name="Google API Key",
+        pattern=re.compile(r"\bAIza[0-9A-Za-z_-]{35}"),
+        security_type=SecurityType.HARDCODED_API_KEY,
+        severity="high",
+        recommendation=_ROTATE,
+        keywords=("aiza",),
+    ),
+    SecretPattern(
+        name="Google OAuth Client Secret",
+        pattern=re.compile(r"\bGOCSPX-[A-Za-z0-9_-]{28}"),
+        security_type=SecurityType.HARDCODED_SECRET,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("gocspx-",),
+    ),
+    SecretPattern(
+        name="Azure Storage Account Key",
+        pattern=re.compile(r"AccountKey=(?P<secret>[A-Za-z0-9+/]{86}==)"),
+        security_type=SecurityType.HARDCODED_API_KEY,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("accountkey=",),
+    ),
+    SecretPattern(
+        name="DigitalOcean Token",
+        pattern=re.compile(r"\bdo[opr]_v1_[a-f0-9]{64}\b"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("doo_v1_", "dop_v1_", "dor_v1_"),
+    ),
+    # Source control and package registries
+    SecretPattern(
+        name="GitHub Token",
+        pattern=re.compile(r"\bgh[pousr]_[A-Za-z0-9]{36,255}\b"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("ghp_", "gho_", "ghu_", "ghs_", "ghr_"),
+    ),
+    SecretPattern(
+        name="GitHub Fine-Grained Token",
+        pattern=re.compile(r"\bgithub_pat_[A-Za-z0-9_]{22,255}\b"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("github_pat_",),
+    ),
+    SecretPattern(
+        name="GitLab Token",
+        pattern=re.compile(r"\bglpat-[A-Za-z0-9_-]{20,}"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("glpat-",),
+    ),
+    SecretPattern(
+        name="npm Token",
+        pattern=re.compile(r"\bnpm_[A-Za-z0-9]{36}\b"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("npm_",),
+    ),
+    SecretPattern(
+        name="PyPI Token",
+        pattern=re.compile(r"\bpypi-AgEIcHlwaS5vcmc[A-Za-z0-9_-]{50,}"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("pypi-ageichlwas5vcmc",),
+    ),
+    # SaaS APIs
+    SecretPattern(
+        name="Stripe Live Key",
+        pattern=re.compile(r"\b[rs]k_live_[0-9a-zA-Z]{24,}"),
+        security_type=SecurityType.HARDCODED_API_KEY,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("sk_live_", "rk_live_"),
+    ),
+    SecretPattern(
+        name="Stripe Test Key",
+        pattern=re.compile(r"\b[rs]k_test_[0-9a-zA-Z]{24,}"),
+        security_type=SecurityType.HARDCODED_API_KEY,
+        severity="low",
+        recommendation="Load Stripe keys from the environment, even in test mode.",
+        keywords=("sk_test_", "rk_test_"),
+    ),
+    SecretPattern(
+        name="Slack Token",
+        pattern=re.compile(r"\bxox[abprs]-[0-9A-Za-z-]{10,}"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("xoxa-", "xoxb-", "xoxp-", "xoxr-", "xoxs-"),
+    ),
+    SecretPattern(
+        name="Slack Webhook URL",
+        pattern=re.compile(r"https://hooks\.slack\.com/services/T[A-Za-z0-9_]+/B[A-Za-z0-9_]+/[A-Za-z0-9_]+"),
+        security_type=SecurityType.HARDCODED_SECRET,
+        severity="high",
+        recommendation=_ROTATE,
+        keywords=("hooks.slack.com",),
+    ),
+    SecretPattern(
+        name="SendGrid API Key",
+        pattern=re.compile(r"\bSG\.[A-Za-z0-9_-]{22}\.[A-Za-z0-9_-]{43}\b"),
+        security_type=SecurityType.HARDCODED_API_KEY,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("sg.",),
+    ),
+    SecretPattern(
+        name="Mailgun API Key",
+        pattern=re.compile(r"\bkey-[0-9a-zA-Z]{32}\b"),
+        security_type=SecurityType.HARDCODED_API_KEY,
+        severity="high",
+        recommendation=_ROTATE,
+        keywords=("key-",),
+    ),
+    SecretPattern(
+        name="Square Access Token",
+        pattern=re.compile(r"\bsq0(?:atp|csp)-[0-9A-Za-z_-]{22,43}"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("sq0atp-", "sq0csp-"),
+    ),
+    SecretPattern(
+        name="Shopify Token",
+        pattern=re.compile(r"\bshp(?:at|ca|pa|ss)_[a-fA-F0-9]{32}\b"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("shpat_", "shpca_", "shppa_", "shpss_"),
+    ),
+    SecretPattern(
+        name="OpenAI API Key",
+        pattern=re.compile(r"\bsk-(?:proj-)?[A-Za-z0-9_-]{20,}T3BlbkFJ[A-Za-z0-9_-]{20,}"),
+        security_type=SecurityType.HARDCODED_API_KEY,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("t3blbkfj",),
+    ),
+    SecretPattern(
+        name="Anthropic API Key",
+        pattern=re.compile(r"\bsk-ant-(?:api|admin)\d{2}-[A-Za-z0-9_-]{80,}"),
+        security_type=SecurityType.HARDCODED_API_KEY,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("sk-ant-",),
+    ),
+    SecretPattern(
+        name="Databricks Token",
+        pattern=re.compile(r"\bdapi[a-f0-9]{32}\b"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("dapi",),
+    ),
+    SecretPattern(
+        name="HashiCorp Vault Token",
+        pattern=re.compile(r"\bhvs\.[A-Za-z0-9_-]{24,}"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="critical",
+        recommendation=_ROTATE,
+        keywords=("hvs.",),
+    ),
+    # Generic formats
+    SecretPattern(
+        name="Private Key",
+        pattern=re.compile(
+            r"-----BEGIN (?:RSA |EC |DSA |OPENSSH |PGP |ENCRYPTED )?PRIVATE KEY(?: BLOCK)?-----"
+        ),
+        security_type=SecurityType.HARDCODED_CRYPTO_KEY,
+        severity="critical",
+        recommendation="Never commit private keys. Store them outside the repository and rotate this one.",
+        keywords=("private key",),
+    ),
+    SecretPattern(
+        name="JWT",
+        pattern=re.compile(r"\beyJ[A-Za-z0-9_-]{10,}\.eyJ[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}"),
+        security_type=SecurityType.HARDCODED_TOKEN,
+        severity="medium",
+        recommendation="Don't embed JWTs in code; they are bearer credentials until they expire.",
+        keywords=("eyj",),
+    ),
+    SecretPattern(
+        name="Database URL with Credentials",
+        pattern=re.compile(
+            r"\b(?:postgres(?:ql)?|mysql|mariadb|mongodb(?:\+srv)?|rediss?|amqps?|mssql|oracle)(?:\+\w+)?://"
+            r"[^\s:@/'\"]+:(?P<secret>[^\s@/'\"]+)@[^\s'\"]+"
+        ),
+        security_type=SecurityType.HARDCODED_PASSWORD,
+        severity="high",
+        recommendation=(
+            "Build the connection URL from environment variables instead of embedding the password."
+        ),
+        keywords=("postgres", "mysql", "mariadb", "mongodb", "redis", "amqp", "mssql", "oracle"),
+    ),
+    SecretPattern(
+        name="Credentials in URL",
+        pattern=re.compile(r"\bhttps?://[^\s:@/'\"]+:(?P<secret>[^\s@/'\"]+)@[\w.-]+"),
+        security_type=SecurityType.HARDCODED_PASSWORD,
+        severity="high",
+        recommendation=(
+            "Pass credentials separately (e.g. an auth header) and load them from the environment."
+        ),
+        keywords=("http://", "https://"),
+    ),
+]
+
+# Variable names whose string values are treated as secrets
+SECRET_VAR_NAMES = frozenset({
+    # Passwords
+    "password", "passwd", "pwd", "pass", "passphrase",
+    "db_password", "database_password", "admin_password", "root_password",
+    "user_password", "smtp_password", "email_password", "mail_password",
+    # API keys
+    "api_key", "apikey", "api_secret", "api_secret_key", "access_key",
+    "access_key_id", "secret_access_key", "aws_secret_access_key",
+    "master_key", "app_key",
+    # Tokens
+    "token", "auth_token", "access_token", "refresh_token", "bearer_token",
+    "api_token", "session_token", "id_token", "oauth_token", "bot_token",
+    "github_token", "slack_token",
+    # Secrets
+    "secret", "secret_key", "client_secret", "app_secret", "jwt_secret",
+    "jwt_secret_key", "signing_secret", "webhook_secret", "consumer_secret",
+    "credentials", "connection_string",
+    # Crypto keys
+    "private_key", "encryption_key", "signing_key", "secret_token",
+})
+
+# Substrings that make an otherwise unknown name look like it holds a key;
+# values assigned to such names are reported only if they look random
+SECRET_NAME_HINTS = ("key", "secret", "token", "passw", "credential", "auth")
+
+# Values that are obviously not real secrets
+PLACEHOLDER_MARKERS = (
+    "xxxx", "****", "....", "your_", "your-", "changeme", "change_me",
+    "placeholder", "example", "dummy", "redacted", "replace_me", "insert_",
+    "${", "{{", "%(", "<",
+)
+
+# Files never scanned (dependency lockfiles hold hashes, not secrets)
+LOCKFILE_NAMES = frozenset({
+    "poetry.lock", "pipfile.lock", "package-lock.json", "yarn.lock",
+    "pnpm-lock.yaml", "cargo.lock", "composer.lock", "uv.lock", "pdm.lock",
+    "gemfile.lock", "go.sum",
+})
+
+# File name tokens and directory names marking example code
+EXAMPLE_NAMES = frozenset({"example", "examples", "sample", "samples"})
+
+# Minimum Shannon entropy (bits/char) and length for hint-named strings
+ENTROPY_THRESHOLD = 3.5
+ENTROPY_MIN_LENGTH = 16
+
+_PASSWORD_NAMES = ("pass", "pwd")
+_TOKEN_NAMES = ("token",)
+_API_KEY_NAMES = ("api_key", "apikey", "access_key", "master_key", "app_key")
+_CRYPTO_NAMES = ("private_key", "encryption_key", "signing_key")
+
+_SECRET_NAME_RE = re.compile(
+    r"^(?:\w*_)?(?:" + "|".join(sorted(SECRET_VAR_NAMES, key=len, reverse=True)) + r")$"
+)
+
+# Every name is_secret_assignment() accepts contains one of these, so the
+# prefilter keyed on them can't miss an assignment the detectors would report
+_NAME_KEYWORDS = frozenset(SECRET_VAR_NAMES) | frozenset(SECRET_NAME_HINTS)
+_ASSIGNMENT_KEYWORDS = tuple(sorted(
+    name for name in _NAME_KEYWORDS
+    if not any(other != name and other in name for other in _NAME_KEYWORDS)
+))
+
+# A string literal assigned to a name, attribute, keyword or dict key on one
+# line; used to decide whether a file is worth parsing
+_ASSIGNMENT_LINE_RE = re.compile(
+    r"(?P<name>[A-Za-z_][\w.]*)[\"']?\s*(?::\s*[\w\[\]., ]+)?(?<![=!<>])[:=]\s*[rbuRBU]{0,2}"
+    r"(?P<quote>[\"'])(?P<value>[^\"'\n]*)(?P=quote)"
+)
+
+# An unquoted or quoted value assigned to a key in a config-like file:
+# ``KEY=value``, ``export KEY=value``, ``key: value``, ``"key": "value"``,
+# ``ENV KEY=value``
+_CONFIG_ASSIGNMENT_RE = re.compile(
+    r"(?P<name>[A-Za-z_][\w.-]*)[\"']?\s*[:=]\s*[\"']?(?P<value>[^\s\"'#,;}]+)"
+)
+
+# Config values that reference a secret rather than contain one
+_REFERENCE_PREFIXES = ("$", "%", "!", "&", "*", "|", ">", "{", "[", "<")
+_NON_VALUES = frozenset({"null", "none", "true", "false", "~"})
+
+
+def shannon_entropy(value: str) -> float:
+    """Compute the Shannon entropy of a string in bits per character.
+
+    Parameters
+    ----------
+    value : str
+        The string to score.
+
+    Returns
+    -------
+    float
+        Entropy; random base64 scores around 6, English text around 4.
+    """
+    if not value:
+        return 0.0
+    length = len(value)
+    return -sum((n / length) * math.log2(n / length) for n in Counter(value).values())
+
+
+def is_placeholder(value: str) -> bool:
+    """Check whether a value is obviously not a real secret.
+
+    Parameters
+    ----------
+    value : str
+        Candidate secret value.
+
+    Returns
+    -------
+    bool
+        True for short values, repeated characters, template variables and
+        common placeholders.
+    """
+    if len(value) < 4 or len(set(value)) == 1:
+        return True
+    lowered = value.lower()
+    return any(marker in lowered for marker in PLACEHOLDER_MARKERS)
+
+
+def is_secret_name(name: str) -> bool:
+    """Check whether a variable/attribute/key name denotes a secret.
+
+    Parameters
+    ----------
+    name : str
+        Name, optionally dotted (``self.password``).
+
+    Returns
+    -------
+    bool
+        True if the last name component is (or ends with) a known secret name.
+    """
+    return _SECRET_NAME_RE.match(name.rsplit(".", 1)[-1].lower()) is not None
+
+
+def is_secret_assignment(name: str, value: str) -> bool:
+    """Check whether assigning ``value`` to ``name`` looks like a hardcoded secret.
+
+    Parameters
+    ----------
+    name : str
+        Variable, attribute, keyword or dict key name.
+    value : str
+        The literal string value.
+
+    Returns
+    -------
+    bool
+        True if ``name`` is a known secret name, or merely key-like
+        (see ``SECRET_NAME_HINTS``) and ``value`` looks randomly generated.
+    """
+    if is_placeholder(value):
+        return False
+    if is_secret_name(name):
+        return True
+    lowered = name.rsplit(".", 1)[-1].lower()
+    if not any(hint in lowered for hint in SECRET_NAME_HINTS):
+        return False
+    return (
+        len(value) >= ENTROPY_MIN_LENGTH
+        and not any(c.isspace() for c in value)
+        and any(c.isdigit() for c in value)
+        and any(c.isalpha() for c in value)
+        and shannon_entropy(value) >= ENTROPY_THRESHOLD
+    )
+
+
+def _secret_type_for_name(name: str) -> SecurityType:
+    """Pick the finding type for a secret variable name."""
+    lowered = name.rsplit(".", 1)[-1].lower()
+    if any(n in lowered for n in _CRYPTO_NAMES):
+        return SecurityType.HARDCODED_CRYPTO_KEY
+    if any(n in lowered for n in _API_KEY_NAMES):
+        return SecurityType.HARDCODED_API_KEY
+    if any(n in lowered for n in _TOKEN_NAMES):
+        return SecurityType.HARDCODED_TOKEN
+    if any(n in lowered for n in _PASSWORD_NAMES):
+        return SecurityType.HARDCODED_PASSWORD
+    return SecurityType.HARDCODED_SECRET
+
+
+def should_skip_file(path: Path) -> bool:
+    """Check whether a file is excluded from secret scanning by name.
+
+    Tests, examples and lockfiles are skipped: the first two routinely hold
+    fake credentials, the last holds hashes. A file counts as an example if
+    its name has an "example"/"sample" token (``config.example.yaml``,
+    ``sample_settings.py``, but not ``resample.py``) or it's in an
+    ``examples``/``samples`` directory.
+
+    Parameters
+    ----------
+    path : Path
+        File to check.
+
+    Returns
+    -------
+    bool
+        True if the file should not be scanned.
+    """
+    name = path.name.lower()
+    if name in LOCKFILE_NAMES or name == "conftest.py":
+        return True
+    stem = name.rsplit(".", 1)[0]
+    if stem.startswith("test_") or stem.endswith("_test"):
+        return True
+    if not EXAMPLE_NAMES.isdisjoint(re.split(r"[._-]", name)):
+        return True
+    return any(part.lower() in EXAMPLE_NAMES for part in path.parent.parts)
+
+
+class SecretAssignmentCollector(cst.CSTVisitor):
+    """Collect string literals assigned to secret-looking names.
+
+    Covers assignments (``password = "..."``, ``self.token = "..."``),
+    annotated assignments, keyword arguments (``connect(password="...")``)
+    and dict entries (``{"api_key": "..."}``).
+
+    Each finding is a ``(name, value, line_number, entropy)`` tuple.
+
+    Parameters
+    ----------
+    file_path : Path
+        Path of the file being visited.
+    """
+
+    METADATA_DEPENDENCIES = (PositionProvider,)
+
+    def __init__(self, file_path: Path) -> None:
+        self._file_path = file_path
+        self.findings: list[tuple[str, str, int, float]] = []
+
+    def _check(self, name: str | None, value: cst.BaseExpression, node: cst.CSTNode) -> None:
+        if not name or not isinstance(value, cst.SimpleString):
+            return
+        literal = value.evaluated_value
+        if not isinstance(literal, str) or not is_secret_assignment(name, literal):
+            return
+
+        try:
+            line = self.get_metadata(PositionProvider, node).start.line
+        except KeyError:
+            line = 0
+        self.findings.append((name, literal, line, shannon_entropy(literal)))
+
+    def visit_Assign(self, node: cst.Assign) -> None:
+        for target in node.targets:
+            self._check(_target_name(target.target), node.value, node)
+
+    def visit_AnnAssign(self, node: cst.AnnAssign) -> None:
+        if node.value is not None:
+            self._check(_target_name(node.target), node.value, node)
+
+    def visit_Arg(self, node: cst.Arg) -> None:
+        if node.keyword is not None:
+            self._check(node.keyword.value, node.value, node)
+
+    def visit_DictElement(self, node: cst.DictElement) -> None:
+        if isinstance(node.key, cst.SimpleString):
+            key = node.key.evaluated_value
+            if isinstance(key, str):
+                self._check(key, node.value, node)
+
+
+def _target_name(target: cst.BaseExpression) -> str | None:
+    """Get the dotted name of an assignment target."""
+    if isinstance(target, cst.Name):
+        return target.value
+    if isinstance(target, cst.Attribute):
+        base = _target_name(target.value)
+        return f"{base}.{target.attr.value}" if base else target.attr.value
+    return None
+
+
+class _KeywordIndex:
+    """One literal alternation over all pattern keywords."""
+
+    # Pseudo-pattern index for "line may contain a secret assignment"
+    ASSIGNMENT = -1
+
+    def __init__(self, patterns: list[SecretPattern]) -> None:
+        self.patterns = patterns
+        self.unkeyed = [i for i, p in enumerate(patterns) if not p.keywords]
+        self.by_keyword: dict[bytes, set[int]] = {}
+        for i, pattern in enumerate(patterns):
+            for keyword in pattern.keywords:
+                self.by_keyword.setdefault(keyword.lower().encode(), set()).add(i)
+        for keyword in _ASSIGNMENT_KEYWORDS:
+            self.by_keyword.setdefault(keyword.encode(), set()).add(self.ASSIGNMENT)
+
+        ordered = sorted(self.by_keyword, key=len, reverse=True)
+        self.regex = re.compile(b"|".join(re.escape(k) for k in ordered))
+        # The alternation consumes each hit, so keywords that can start
+        # inside another keyword (e.g. "key" in "private key") are checked
+        # explicitly at these offsets.
+        self.inner: dict[bytes, list[tuple[int, bytes]]] = {}
+        for keyword in ordered:
+            inner = [
+                (k, other)
+                for k in range(1, len(keyword))
+                for other in ordered
+                if other.startswith(keyword[k:]) or keyword[k:].startswith(other)
+            ]
+            if inner:
+                self.inner[keyword] = inner
+
+    def candidate_lines(self, lowered: bytes) -> dict[int, set[int]]:
+        """Map line start offsets to the patterns worth trying on that line."""
+        lines: dict[int, set[int]] = {}
+        for hit in self.regex.finditer(lowered):
+            pos = hit.start()
+            keyword = hit.group()
+            found = set(self.by_keyword[keyword])
+            for k, other in self.inner.get(keyword, ()):
+                if lowered.startswith(other, pos + k):
+                    found |= self.by_keyword[other]
+            line_start = lowered.rfind(b"\n", 0, pos) + 1
+            lines.setdefault(line_start, set()).update(found)
+        return lines
+
+
+_INDEX: _KeywordIndex | None = None
+
+
+def _get_index() -> _KeywordIndex:
+    global _INDEX
+    if _INDEX is None or _INDEX.patterns is not SECRET_PATTERNS:
+        _INDEX = _KeywordIndex(SECRET_PATTERNS)
+    return _INDEX
+
+
+def scan_file(path: Path) -> list[SecurityFinding]:
+    """Scan one file for hardcoded secrets.
+
+    Python files get provider patterns plus a parse for secret assignments;
+    other text files (``.env``, configs, shell scripts, Dockerfiles) get
+    provider patterns plus line-level ``name = value`` checks.
+
+    Parameters
+    ----------
+    path : Path
+        File to scan.
+
+    Returns
+    -------
+    list[SecurityFinding]
+        Findings, ordered by line.
+    """
+    if should_skip_file(path):
+        return []
+
+    index = _get_index()
+    is_python = path.suffix == ".py"
+    findings: list[SecurityFinding] = []
+    seen: set[tuple[int, str]] = set()
+    needs_parse = False
+
+    try:
+        for window in iter_windows(path, skip_binary=True):
+            data = window.data
+            candidates = index.candidate_lines(data.lower())
+            if index.unkeyed:
+                start = 0
+                while start < window.owned:
+                    candidates.setdefault(start, set()).update(index.unkeyed)
+                    start = data.find(b"\n", start) + 1 or len(data)
+
+            counted_to, line_no = 0, window.line
+            for line_start in sorted(candidates):
+                if line_start >= window.owned:
+                    # Overlap: the next window reports this line
+                    break
+                line_no += data.count(b"\n", counted_to, line_start)
+                counted_to = line_start
+                line_end = data.find(b"\n", line_start)
+                text = data[line_start:line_end if line_end != -1 else len(data)].decode("utf-8", "replace")
+                stripped = text.strip()
+                if stripped.startswith(("#", "//", ";")):
+                    continue
+                for i in sorted(candidates[line_start]):
+                    if i != _KeywordIndex.ASSIGNMENT:
+                        findings.extend(_match_pattern(path, index.patterns[i], text, line_no, seen))
+                    elif is_python:
+                        needs_parse = needs_parse or any(
+                            is_secret_assignment(m.group("name"), m.group("value"))
+                            for m in _ASSIGNMENT_LINE_RE.finditer(text)
+                        )
+                    else:
+                        findings.extend(_match_config_assignment(path, text, line_no, seen))
+    except (OSError, ValueError):
+        return findings
+
+    if needs_parse:
+        findings.extend(_scan_assignments(path, {line for line, _ in seen}))
+    findings.sort(key=lambda f: f.line_number)
+    return findings
+
+
+def _match_pattern(
+    path: Path, pattern: SecretPattern, text: str, line_no: int, seen: set[tuple[int, str]]
+) -> list[SecurityFinding]:
+    """Match one provider pattern against a line."""
+    findings = []
+    for match in pattern.pattern.finditer(text):
+        value = match.groupdict().get("secret") or match.group(0)
+        if is_placeholder(value) or (line_no, pattern.name) in seen:
+            continue
+        seen.add((line_no, pattern.name))
+        findings.append(
+            SecurityFinding(
+                type=pattern.security_type,
+                file_path=path,
+                line_number=line_no,
+                name=pattern.name,
+                message=f"Possible hardcoded secret: {pattern.name}",
+                severity=pattern.severity,
+                code_snippet=_redact(text.strip(), match.group(0))[:100],
+                context={"pattern": pattern.name, "entropy": round(shannon_entropy(value), 2)},
+                recommendation=pattern.recommendation,
+            )
+        )
+    return findings
+
+
+def _match_config_assignment(
+    path: Path, text: str, line_no: int, seen: set[tuple[int, str]]
+) -> list[SecurityFinding]:
+    """Report ``name = value`` / ``name: value`` secrets on a non-Python line."""
+    if any(line == line_no for line, _ in seen):
+        # A provider pattern already reported this line
+        return []
+    findings = []
+    for match in _CONFIG_ASSIGNMENT_RE.finditer(text):
+        name, value = match.group("name"), match.group("value")
+        if value[0] in _REFERENCE_PREFIXES or value.lower() in _NON_VALUES:
+            continue
+        if not is_secret_assignment(name, value):
+            continue
+        seen.add((line_no, name))
+        findings.append(_assignment_finding(path, name, value, line_no))
+    return findings
+
+
+def _scan_assignments(path: Path, reported_lines: set[int]) -> list[SecurityFinding]:
+    """Parse a Python file and report secret assignments."""
+    try:
+        wrapper = MetadataWrapper(cst.parse_module(path.read_bytes()))
+        collector = SecretAssignmentCollector(path)
+        wrapper.visit(collector)
+    except Exception:
+        return []
+
+    return [
+        _assignment_finding(path, name, value, line)
+        for name, value, line, _entropy in collector.findings
+        # Skip lines a provider pattern already reported
+        if line not in reported_lines
+    ]
+
+
+def _assignment_finding(path: Path, name: str, value: str, line: int) -> SecurityFinding:
+    """Build the finding for a secret value assigned to a name."""
+    known = is_secret_name(name)
+    return SecurityFinding(
+        type=_secret_type_for_name(name) if known else SecurityType.HARDCODED_SECRET,
+        file_path=path,
+        line_number=line,
+        name=name,
+        message=(
+            f"Hardcoded value assigned to '{name}'"
+            if known
+            else f"High-entropy string assigned to '{name}'"
+        ),
+        severity="high" if known else "medium",
+        code_snippet=_redact(f"{name} = {value!r}", value)[:100],
+        context={"entropy": round(shannon_entropy(value), 2)},
+        recommendation=_ROTATE,
+    )
+
+
+def _redact(text: str, secret: str) -> str:
+    """Mask most of a secret in a snippet so reports don't leak it."""
+    if len(secret) <= 8:
+        return text.replace(secret, "*" * len(secret))
+    return text.replace(secret, secret[:4] + "*" * (len(secret) - 4))
+
+
+def _scan_files(paths: list[Path]) -> list[SecurityFinding]:
+    """Scan a batch of files (used as the worker function)."""
+    findings: list[SecurityFinding] = []
+    for path in paths:
+        findings.extend(scan_file(path))
+    return findings
+
+
+class SecretsScanner:
+    """Scan for hardcoded secrets, API keys, passwords and tokens.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The Rejig instance to scan.
+    workers : int
+        Number of worker processes. With 1 (default), files are scanned in
+        this process.
+    include_config : bool
+        Also scan ``.env`` files, config files (TOML/YAML/JSON/INI),
+        shell scripts and Dockerfiles under the working directory.
+        Defaults to True.
+    """
+
+    def __init__(self, rejig: Rejig, workers: int = 1, include_config: bool = True) -> None:
+        self._rejig = rejig
+        self._workers = workers
+        self._include_config = include_config
+
+    def iter_findings(self) -> Iterator[SecurityFinding]:
+        """Yield secret findings file by file as they are found.
+
+        Unlike ``find_hardcoded_secrets``, findings are not collected, so
+        they can be streamed to a report (see ``rejig.core.writers``).
+
+        Yields
+        ------
+        SecurityFinding
+            Each finding, in file order.
+        """
+        files = discover_security_files(self._rejig, self._include_config)
+        workers = min(self._workers, max(1, len(files) // 64))
+        if workers <= 1:
+            for path in files:
+                yield from scan_file(path)
+            return
+
+        batch_size = max(1, len(files) // (workers * 4))
+        batches = [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch_findings in executor.map(_scan_files, batches):
+                yield from batch_findings
+
+    def _scan(self) -> list[SecurityFinding]:
+        return list(self.iter_findings())
+
+    def find_hardcoded_secrets(self) -> SecurityTargetList:
+        """Find all hardcoded secrets.
+
+        Returns
+        -------
+        SecurityTargetList
+            All secret findings.
+        """
+        return SecurityTargetList(
+            self._rejig, [SecurityTarget(self._rejig, f) for f in self._scan()]
+        )
+
+    def find_api_keys(self) -> SecurityTargetList:
+        """Find hardcoded API keys.
+
+        Returns
+        -------
+        SecurityTargetList
+            API key findings.
+        """
+        return self.find_hardcoded_secrets().by_type(SecurityType.HARDCODED_API_KEY)
+
+    def find_passwords(self) -> SecurityTargetList:
+        """Find hardcoded passwords.
+
+        Returns
+        -------
+        SecurityTargetList
+            Password findings.
+        """
+        return self.find_hardcoded_secrets().by_type(SecurityType.HARDCODED_PASSWORD)
+
+    def find_tokens(self) -> SecurityTargetList:
+        """Find hardcoded tokens.
+
+        Returns
+        -------
+        SecurityTargetList
+            Token findings.
+        """
+        return self.find_hardcoded_secrets().by_type(SecurityType.HARDCODED_TOKEN)
+
+    def find_private_keys(self) -> SecurityTargetList:
+        """Find committed private keys and hardcoded crypto keys.
+
+        Returns
+        -------
+        SecurityTargetList
+            Crypto key findings.
+        """
+        return self.find_hardcoded_secrets().by_type(SecurityType.HARDCODED_CRYPTO_KEY)
@@ -0,0 +1,788 @@
+"""Intra-procedural taint tracking for injection findings.
+
+Follows values through each function body, in one forward pass, from
+untrusted sources to SQL, shell and file-path sinks:
+
+    def search(request):
+        term = request.GET["q"]                     # source
+        sql = "SELECT * FROM t WHERE name = '" + term + "'"
+        cursor.execute(sql)                         # tainted sink -> finding
+
+Every expression evaluates to a ``TaintValue`` on a three-level lattice:
+
+- ``CONSTANT``: built only from literals and constants. Never reported,
+  so ``execute(f"SELECT * FROM {TABLE}")`` is not flagged.
+- ``UNKNOWN``: depends on parameters, free names or call results whose
+  origin is not known. Reported when string building (concatenation,
+  ``%``, ``.format()``, f-strings, ``join``) feeds the sink, or for shell
+  sinks, whenever the command isn't constant.
+- ``TAINTED``: derived from a configured source (``input()``,
+  ``sys.argv``, ``request.args``/``request.GET``, route handler
+  parameters, ...). Always reported.
+
+A function is a route handler if a decorator resolves (through
+``QualifiedNameProvider``) to a web framework: ``@api_view`` imported from
+``rest_framework``, or ``@app.route``/``@router.get`` where ``app`` was
+created by a framework call (``Flask(...)``, ``APIRouter()``) in the same
+file, or is imported into a file that itself imports the framework.
+
+Assignments in straight-line code overwrite a name's value; inside
+branches, loops and ``try`` blocks they are joined with the previous value.
+Each statement and expression is visited once, so analysis is linear in the
+size of the function. Flows across functions are not tracked.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Iterable
+
+import libcst as cst
+from libcst.metadata import PositionProvider, QualifiedNameProvider, QualifiedNameSource
+
+from rejig.security.targets import SecurityFinding, SecurityType
+
+
+class TaintLevel(IntEnum):
+    """How much a value may be influenced by an attacker."""
+
+    CONSTANT = 0
+    UNKNOWN = 1
+    TAINTED = 2
+
+
+@dataclass(frozen=True)
+class TaintValue:
+    """Abstract value of an expression.
+
+    Attributes
+    ----------
+    level : TaintLevel
+        Taint level.
+    built : bool
+        True if the value was produced by string building from a
+        non-constant part.
+    source : str | None
+        Description of the source, for ``TAINTED`` values.
+    """
+
+    level: TaintLevel = TaintLevel.CONSTANT
+    built: bool = False
+    source: str | None = None
+
+    def join(self, other: TaintValue) -> TaintValue:
+        """Least upper bound of two values."""
+        if other.level > self.level:
+            return TaintValue(other.level, self.built or other.built, other.source)
+        return TaintValue(self.level, self.built or other.built, self.source)
+
+
+CONSTANT = TaintValue()
+UNKNOWN = TaintValue(TaintLevel.UNKNOWN)
+
+
+@dataclass(frozen=True)
+class TaintSink:
+    """A call whose argument must not carry untrusted data.
+
+    Attributes
+    ----------
+    name : str
+        Dotted name of the called function.
+    security_type : SecurityType
+        Type of finding reported.
+    arg : int
+        Position of the checked argument.
+    keyword : str | None
+        Keyword name of the checked argument, if passed by keyword.
+    method : bool
+        Match ``name`` as a method on any object (``"execute"`` matches
+        ``cursor.execute`` and ``self.db.execute``).
+    """
+
+    name: str
+    security_type: SecurityType
+    arg: int = 0
+    keyword: str | None = None
+    method: bool = False
+
+
+DEFAULT_SOURCES = frozenset({
+    "input",
+    "raw_input",
+    "sys.argv",
+    "sys.stdin",
+    # Flask / Werkzeug
+    "request.args",
+    "request.form",
+    "request.values",
+    "request.json",
+    "request.data",
+    "request.cookies",
+    "request.headers",
+    "request.files",
+    "request.get_json",
+    "request.get_data",
+    "request.view_args",
+    # Django
+    "request.GET",
+    "request.POST",
+    "request.body",
+    "request.FILES",
+    "request.COOKIES",
+    "request.META",
+    # FastAPI / Starlette
+    "request.query_params",
+    "request.path_params",
+})
+
+DEFAULT_SANITIZERS = frozenset({
+    "int", "float", "bool", "len", "abs", "round", "hash", "ord",
+    "shlex.quote", "pipes.quote", "quote",
+    "os.path.basename", "secure_filename", "werkzeug.utils.secure_filename",
+    "html.escape", "escape", "markupsafe.escape", "bleach.clean",
+    "uuid.UUID", "UUID",
+})
+
+DEFAULT_SINKS = (
+    # SQL
+    TaintSink("execute", SecurityType.SQL_INJECTION, method=True),
+    TaintSink("executemany", SecurityType.SQL_INJECTION, method=True),
+    TaintSink("executescript", SecurityType.SQL_INJECTION, method=True),
+    TaintSink("mogrify", SecurityType.SQL_INJECTION, method=True),
+    TaintSink("raw", SecurityType.SQL_INJECTION, method=True),
+    TaintSink("extra", SecurityType.SQL_INJECTION, keyword="where", method=True),
+    TaintSink("sqlalchemy.text", SecurityType.SQL_INJECTION),
+    TaintSink("text", SecurityType.SQL_INJECTION),
+    TaintSink("read_sql", SecurityType.SQL_INJECTION, method=True),
+    TaintSink("read_sql_query", SecurityType.SQL_INJECTION, method=True),
+    # Shell
+    TaintSink("os.system", SecurityType.SHELL_INJECTION),
+    TaintSink("os.popen", SecurityType.SHELL_INJECTION),
+    TaintSink("commands.getoutput", SecurityType.SHELL_INJECTION),
+    TaintSink("commands.getstatusoutput", SecurityType.SHELL_INJECTION),
+    TaintSink("subprocess.getoutput", SecurityType.SHELL_INJECTION),
+    TaintSink("subprocess.getstatusoutput", SecurityType.SHELL_INJECTION),
+    TaintSink("subprocess.run", SecurityType.SHELL_INJECTION),
+    TaintSink("subprocess.call", SecurityType.SHELL_INJECTION),
+    TaintSink("subprocess.check_call", SecurityType.SHELL_INJECTION),
+    TaintSink("subprocess.check_output", SecurityType.SHELL_INJECTION),
+    TaintSink("subprocess.Popen", SecurityType.SHELL_INJECTION),
+    # File paths
+    TaintSink("open", SecurityType.PATH_TRAVERSAL),
+    TaintSink("io.open", SecurityType.PATH_TRAVERSAL),
+    TaintSink("os.open", SecurityType.PATH_TRAVERSAL),
+    TaintSink("os.remove", SecurityType.PATH_TRAVERSAL),
+    TaintSink("os.unlink", SecurityType.PATH_TRAVERSAL),
+    TaintSink("os.path.join", SecurityType.PATH_TRAVERSAL, arg=1),
+    TaintSink("send_file", SecurityType.PATH_TRAVERSAL),
+    TaintSink("send_from_directory", SecurityType.PATH_TRAVERSAL, arg=1),
+    TaintSink("FileResponse", SecurityType.PATH_TRAVERSAL),
+)
+
+# Decorator names that mark a function as a web request handler
+# (``@app.route``, ``@bp.get``, ``@router.post``, ``@api_view``, ...), when
+# the decorator resolves to one of the handler modules
+DEFAULT_HANDLER_DECORATORS = frozenset({
+    "route", "get", "post", "put", "patch", "delete", "head", "options",
+    "api_route", "websocket", "api_view", "require_http_methods",
+    "require_GET", "require_POST", "require_safe",
+})
+
+# Top-level packages of the web frameworks whose handlers are recognized
+DEFAULT_HANDLER_MODULES = frozenset({
+    "flask", "quart", "fastapi", "starlette", "django", "rest_framework",
+    "sanic", "bottle", "aiohttp", "falcon",
+})
+
+# Sinks whose command is only dangerous when run through a shell
+_SUBPROCESS_SINKS = frozenset({
+    "subprocess.run", "subprocess.call", "subprocess.check_call",
+    "subprocess.check_output", "subprocess.Popen",
+})
+
+# Injection types handled by the taint engine
+TAINT_TYPES = frozenset({
+    SecurityType.SQL_INJECTION,
+    SecurityType.SHELL_INJECTION,
+    SecurityType.PATH_TRAVERSAL,
+})
+
+_SINK_SEVERITY = {
+    SecurityType.SQL_INJECTION: "critical",
+    SecurityType.SHELL_INJECTION: "critical",
+    SecurityType.PATH_TRAVERSAL: "high",
+}
+
+_SINK_LABEL = {
+    SecurityType.SQL_INJECTION: "SQL query",
+    SecurityType.SHELL_INJECTION: "shell command",
+    SecurityType.PATH_TRAVERSAL: "file path",
+}
+
+_SINK_RECOMMENDATION = {
+    SecurityType.SQL_INJECTION: "Use parameterized queries instead of building SQL strings.",
+    SecurityType.SHELL_INJECTION: (
+        "Pass arguments as a list with shell=False, or quote them with shlex.quote()."
+    ),
+    SecurityType.PATH_TRAVERSAL: (
+        "Validate the path (e.g. secure_filename) and check it stays within the allowed directory."
+    ),
+}
+
+# String methods that build a new string from the receiver and arguments
+_BUILDING_METHODS = frozenset({"format", "format_map", "join", "replace", "__add__", "__mod__"})
+
+_CONSTANT_NAMES = frozenset({"True", "False", "None", "__name__", "__file__"})
+
+
+@dataclass
+class TaintConfig:
+    """Sources, sanitizers and sinks used by the taint engine.
+
+    Attributes
+    ----------
+    sources : frozenset[str]
+        Dotted names of untrusted calls and attributes. Any access through
+        them (``request.args.get(...)``, ``sys.argv[1]``) is tainted.
+    sanitizers : frozenset[str]
+        Calls whose result is safe whatever their input.
+    sinks : tuple[TaintSink, ...]
+        Calls to check.
+    handler_decorators : frozenset[str]
+        Decorator names marking request handlers, whose parameters are
+        tainted.
+    handler_modules : frozenset[str]
+        Top-level framework packages a handler decorator must resolve to.
+    """
+
+    sources: frozenset[str] = DEFAULT_SOURCES
+    sanitizers: frozenset[str] = DEFAULT_SANITIZERS
+    sinks: tuple[TaintSink, ...] = DEFAULT_SINKS
+    handler_decorators: frozenset[str] = DEFAULT_HANDLER_DECORATORS
+    handler_modules: frozenset[str] = DEFAULT_HANDLER_MODULES
+    _sinks_by_attr: dict[str, list[TaintSink]] = field(default_factory=dict, init=False, repr=False)
+    _anchor_regexes: dict[frozenset | None, re.Pattern] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for sink in self.sinks:
+            self._sinks_by_attr.setdefault(sink.name.rsplit(".", 1)[-1], []).append(sink)
+
+    def may_call_sink(self, content: str, types: Iterable[SecurityType] | None = None) -> bool:
+        """Cheap textual check for a call to any sink.
+
+        Files for which this returns False cannot contain a sink call and
+        need not be parsed.
+
+        Parameters
+        ----------
+        content : str
+            Source code.
+        types : Iterable[SecurityType], optional
+            Only consider sinks of these types. Defaults to all sinks.
+
+        Returns
+        -------
+        bool
+            True if some ``name(`` (or ``.name(`` for method sinks) occurs.
+        """
+        key = None if types is None else frozenset(types)
+        regex = self._anchor_regexes.get(key)
+        if regex is None:
+            alternatives = [
+                (r"\." if sink.method else r"(?<![\w.])") + re.escape(sink.name) + r"\s*\("
+                for sink in self.sinks
+                if key is None or sink.security_type in key
+            ]
+            regex = self._anchor_regexes[key] = re.compile("|".join(alternatives) or "(?!)")
+        return regex.search(content) is not None
+
+    def sink_for(self, call_name: str) -> TaintSink | None:
+        """Find the sink matching a dotted call name."""
+        for sink in self._sinks_by_attr.get(call_name.rsplit(".", 1)[-1], ()):
+            if call_name == sink.name or (sink.method and call_name.endswith("." + sink.name)):
+                return sink
+        return None
+
+    def is_source(self, dotted: str) -> bool:
+        """Check whether a dotted name is (or is an access through) a source."""
+        if dotted in self.sources:
+            return True
+        prefix = dotted
+        while "." in prefix:
+            prefix = prefix.rsplit(".", 1)[0]
+            if prefix in self.sources:
+                return True
+        return False
+
+
+class _Env:
+    """Name -> value bindings of one function, chained to its enclosing scope."""
+
+    def __init__(self, parent: _Env | None = None) -> None:
+        self.values: dict[str, TaintValue] = {}
+        self.parent = parent
+
+    def lookup(self, name: str) -> TaintValue | None:
+        env: _Env | None = self
+        while env is not None:
+            value = env.values.get(name)
+            if value is not None:
+                return value
+            env = env.parent
+        return None
+
+
+class TaintAnalyzer(cst.CSTVisitor):
+    """Find untrusted data reaching injection sinks, per function.
+
+    Visit with a ``MetadataWrapper``; findings are available afterwards in
+    ``findings``. Module-level code and every function (including nested
+    functions and methods) are analyzed separately.
+
+    Parameters
+    ----------
+    file_path : Path
+        Path of the file being analyzed.
+    config : TaintConfig, optional
+        Sources, sanitizers and sinks. Defaults to ``TaintConfig()``.
+    """
+
+    METADATA_DEPENDENCIES = (PositionProvider, QualifiedNameProvider)
+
+    def __init__(self, file_path: Path, config: TaintConfig | None = None) -> None:
+        self._file_path = file_path
+        self._config = config or TaintConfig()
+        self._env = _Env()
+        self._depth = 0
+        # Names bound to framework objects (``app = Flask(__name__)``)
+        self._framework_objects: set[str] = set()
+        self._imports_framework = False
+        self.findings: list[SecurityFinding] = []
+
+    # -------------------------------------------------------------------------
+    # Statements
+    # -------------------------------------------------------------------------
+
+    def visit_Module(self, node: cst.Module) -> bool:
+        self._imports_framework = any(self._is_framework(name) for name in _imported_modules(node))
+        self._block(node.body)
+        return False
+
+    def _block(self, body: Iterable[cst.CSTNode]) -> None:
+        for stmt in body:
+            self._statement(stmt)
+
+    def _suite(self, suite: cst.BaseSuite | None, conditional: bool = True) -> None:
+        if suite is None:
+            return
+        if conditional:
+            self._depth += 1
+        self._block(suite.body)
+        if conditional:
+            self._depth -= 1
+
+    def _statement(self, stmt: cst.CSTNode) -> None:
+        if isinstance(stmt, cst.SimpleStatementLine):
+            for small in stmt.body:
+                self._small_statement(small)
+        elif isinstance(stmt, cst.FunctionDef):
+            self._function(stmt)
+        elif isinstance(stmt, cst.ClassDef):
+            self._suite(stmt.body, conditional=False)
+        elif isinstance(stmt, cst.If):
+            self._expr(stmt.test)
+            self._suite(stmt.body)
+            if stmt.orelse is not None:
+                if isinstance(stmt.orelse, cst.If):
+                    self._depth += 1
+                    self._statement(stmt.orelse)
+                    self._depth -= 1
+                else:
+                    self._suite(stmt.orelse.body)
+        elif isinstance(stmt, cst.For):
+            self._assign(stmt.target, self._expr(stmt.iter), weak=True)
+            self._suite(stmt.body)
+            if stmt.orelse is not None:
+                self._suite(stmt.orelse.body)
+        elif isinstance(stmt, cst.While):
+            self._expr(stmt.test)
+            self._suite(stmt.body)
+            if stmt.orelse is not None:
+                self._suite(stmt.orelse.body)
+        elif isinstance(stmt, cst.Try):
+            self._suite(stmt.body)
+            for handler in stmt.handlers:
+                if handler.name is not None:
+                    self._assign(handler.name.name, UNKNOWN, weak=True)
+                self._suite(handler.body)
+            if stmt.orelse is not None:
+                self._suite(stmt.orelse.body)
+            if stmt.finalbody is not None:
+                self._suite(stmt.finalbody.body)
+        elif isinstance(stmt, cst.With):
+            for item in stmt.items:
+                value = self._expr(item.item)
+                if item.asname is not None:
+                    self._assign(item.asname.name, value)
+            self._suite(stmt.body, conditional=False)
+        elif isinstance(stmt, cst.BaseCompoundStatement):
+            # match and other compound statements: analyze the body only
+            body = getattr(stmt, "body", None)
+            if isinstance(body, cst.BaseSuite):
+                self._suite(body)
+
+    def _small_statement(self, small: cst.BaseSmallStatement) -> None:
+        if isinstance(small, cst.Assign):
+            value = self._expr(small.value)
+            for target in small.targets:
+                self._assign(target.target, value)
+                self._track_framework_object(target.target, small.value)
+        elif isinstance(small, cst.AnnAssign):
+            if small.value is not None:
+                self._assign(small.target, self._expr(small.value))
+                self._track_framework_object(small.target, small.value)
+        elif isinstance(small, cst.AugAssign):
+            current = self._expr(small.target)
+            value = current.join(self._expr(small.value))
+            if value.level > TaintLevel.CONSTANT:
+                value = TaintValue(value.level, True, value.source)
+            self._assign(small.target, value)
+        elif isinstance(small, cst.Expr):
+            self._expr(small.value)
+        elif isinstance(small, cst.Return) and small.value is not None:
+            self._expr(small.value)
+
+    def _function(self, node: cst.FunctionDef) -> None:
+        for decorator in node.decorators:
+            self._expr(decorator.decorator)
+
+        env = _Env(self._env)
+        handler = self._is_handler(node)
+        params = node.params
+        for param in (*params.posonly_params, *params.params, *params.kwonly_params):
+            name = param.name.value
+            if handler and name not in ("self", "cls") and not _is_dependency(param):
+                env.values[name] = TaintValue(
+                    TaintLevel.TAINTED, source=f"request handler parameter '{name}'"
+                )
+            else:
+                env.values[name] = UNKNOWN
+        for star in (params.star_arg, params.star_kwarg):
+            if isinstance(star, cst.Param):
+                env.values[star.name.value] = UNKNOWN
+
+        outer_env, outer_depth = self._env, self._depth
+        self._env, self._depth = env, 0
+        self._suite(node.body, conditional=False)
+        self._env, self._depth = outer_env, outer_depth
+        self._assign(node.name, UNKNOWN)
+
+    def _is_framework(self, dotted: str) -> bool:
+        return dotted.split(".", 1)[0] in self._config.handler_modules
+
+    def _resolves_to_framework(self, node: cst.CSTNode) -> bool:
+        names = self.get_metadata(QualifiedNameProvider, node, set())
+        return any(self._is_framework(name.name) for name in names)
+
+    def _track_framework_object(self, target: cst.BaseExpression, value: cst.BaseExpression) -> None:
+        if isinstance(target, cst.Name) and isinstance(value, cst.Call):
+            if self._resolves_to_framework(value.func):
+                self._framework_objects.add(target.value)
+
+    def _is_framework_object(self, node: cst.BaseExpression) -> bool:
+        if isinstance(node, cst.Name) and node.value in self._framework_objects:
+            return True
+        for name in self.get_metadata(QualifiedNameProvider, node, set()):
+            if self._is_framework(name.name):
+                return True
+            # An application object imported from the project itself
+            if name.source == QualifiedNameSource.IMPORT and self._imports_framework:
+                return True
+        return False
+
+    def _is_handler(self, node: cst.FunctionDef) -> bool:
+        for decorator in node.decorators:
+            expr = decorator.decorator
+            if isinstance(expr, cst.Call):
+                expr = expr.func
+            if isinstance(expr, cst.Attribute):
+                name = expr.attr.value
+            elif isinstance(expr, cst.Name):
+                name = expr.value
+            else:
+                continue
+            if name not in self._config.handler_decorators:
+                continue
+            if self._resolves_to_framework(expr):
+                return True
+            if isinstance(expr, cst.Attribute) and self._is_framework_object(expr.value):
+                return True
+        return False
+
+    def _assign(self, target: cst.BaseExpression, value: TaintValue, weak: bool = False) -> None:
+        if isinstance(target, cst.Name):
+            name = target.value
+            if weak or self._depth > 0:
+                previous = self._env.values.get(name)
+                if previous is not None:
+                    value = previous.join(value)
+            self._env.values[name] = value
+        elif isinstance(target, (cst.Tuple, cst.List)):
+            for element in target.elements:
+                self._assign(element.value, value, weak)
+        elif isinstance(target, cst.StarredElement):
+            self._assign(target.value, value, weak)
+        elif isinstance(target, (cst.Attribute, cst.Subscript)):
+            # obj.attr = value / obj[key] = value: track the dotted name
+            dotted = _dotted_name(target) if isinstance(target, cst.Attribute) else None
+            if dotted is not None:
+                previous = self._env.values.get(dotted)
+                self._env.values[dotted] = previous.join(value) if previous else value
+            else:
+                self._expr(target)
+
+    # -------------------------------------------------------------------------
+    # Expressions
+    # -------------------------------------------------------------------------
+
+    def _expr(self, node: cst.BaseExpression | None) -> TaintValue:
+        if node is None:
+            return CONSTANT
+        if isinstance(node, (cst.SimpleString, cst.Integer, cst.Float, cst.Imaginary, cst.Ellipsis)):
+            return CONSTANT
+        if isinstance(node, cst.ConcatenatedString):
+            return self._built(self._expr(node.left).join(self._expr(node.right)))
+        if isinstance(node, cst.FormattedString):
+            value = CONSTANT
+            for part in node.parts:
+                if isinstance(part, cst.FormattedStringExpression):
+                    value = value.join(self._expr(part.expression))
+            return self._built(value)
+        if isinstance(node, cst.Name):
+            return self._name(node.value)
+        if isinstance(node, cst.Attribute):
+            return self._attribute(node)
+        if isinstance(node, cst.Subscript):
+            value = self._expr(node.value)
+            for element in node.slice:
+                if isinstance(element.slice, cst.Index):
+                    self._expr(element.slice.value)
+            return TaintValue(value.level, False, value.source)
+        if isinstance(node, cst.Call):
+            return self._call(node)
+        if isinstance(node, cst.BinaryOperation):
+            value = self._expr(node.left).join(self._expr(node.right))
+            if isinstance(node.operator, (cst.Add, cst.Modulo)):
+                return self._built(value)
+            return value
+        if isinstance(node, cst.BooleanOperation):
+            return self._expr(node.left).join(self._expr(node.right))
+        if isinstance(node, cst.UnaryOperation):
+            return self._expr(node.expression)
+        if isinstance(node, cst.Comparison):
+            self._expr(node.left)
+            for comparison in node.comparisons:
+                self._expr(comparison.comparator)
+            return CONSTANT
+        if isinstance(node, cst.IfExp):
+            self._expr(node.test)
+            return self._expr(node.body).join(self._expr(node.orelse))
+        if isinstance(node, (cst.Tuple, cst.List, cst.Set)):
+            value = CONSTANT
+            for element in node.elements:
+                value = value.join(self._expr(element.value))
+            return TaintValue(value.level, False, value.source)
+        if isinstance(node, cst.Dict):
+            value = CONSTANT
+            for element in node.elements:
+                if isinstance(element, cst.DictElement):
+                    self._expr(element.key)
+                value = value.join(self._expr(element.value))
+            return TaintValue(value.level, False, value.source)
+        if isinstance(node, cst.NamedExpr):
+            value = self._expr(node.value)
+            self._assign(node.target, value)
+            return value
+        if isinstance(node, (cst.Await, cst.Yield)):
+            inner = node.expression if isinstance(node, cst.Await) else node.value
+            return self._expr(inner) if isinstance(inner, cst.BaseExpression) else UNKNOWN
+        # Lambdas, comprehensions, ...: origin unknown
+        return UNKNOWN
+
+    @staticmethod
+    def _built(value: TaintValue) -> TaintValue:
+        if value.level == TaintLevel.CONSTANT:
+            return value
+        return TaintValue(value.level, True, value.source)
+
+    def _name(self, name: str) -> TaintValue:
+        value = self._env.lookup(name)
+        if value is not None:
+            return value
+        if name in _CONSTANT_NAMES or name.isupper():
+            return CONSTANT
+        if self._config.is_source(name):
+            return TaintValue(TaintLevel.TAINTED, source=name)
+        return UNKNOWN
+
+    def _attribute(self, node: cst.Attribute) -> TaintValue:
+        dotted = _dotted_name(node)
+        if dotted is not None:
+            if self._config.is_source(dotted):
+                return TaintValue(TaintLevel.TAINTED, source=dotted)
+            tracked = self._env.lookup(dotted)
+            if tracked is not None:
+                return tracked
+        base = self._expr(node.value)
+        if base.level == TaintLevel.TAINTED:
+            return TaintValue(TaintLevel.TAINTED, False, base.source)
+        if node.attr.value.isupper():
+            # settings.TABLE_NAME and similar constants
+            return CONSTANT
+        return UNKNOWN
+
+    def _call(self, node: cst.Call) -> TaintValue:
+        call_name = _dotted_name(node.func)
+        args = [self._expr(arg.value) for arg in node.args]
+        joined_args = CONSTANT
+        for value in args:
+            joined_args = joined_args.join(value)
+
+        receiver = CONSTANT
+        method = None
+        if isinstance(node.func, cst.Attribute):
+            method = node.func.attr.value
+            receiver = self._expr(node.func.value)
+        elif not isinstance(node.func, cst.Name):
+            self._expr(node.func)
+
+        if call_name is not None:
+            self._check_sink(node, call_name, args)
+            if call_name in self._config.sanitizers:
+                return CONSTANT
+            if self._config.is_source(call_name):
+                return TaintValue(TaintLevel.TAINTED, source=f"{call_name}()")
+
+        if method in _BUILDING_METHODS:
+            return self._built(receiver.join(joined_args))
+        if method is not None and receiver.level == TaintLevel.TAINTED:
+            # Methods of untrusted values (.get(), .strip(), ...) stay untrusted
+            return TaintValue(TaintLevel.TAINTED, False, receiver.source)
+        if joined_args.level == TaintLevel.TAINTED:
+            # Conservatively assume calls propagate untrusted arguments
+            return TaintValue(TaintLevel.TAINTED, False, joined_args.source)
+        if call_name in ("str", "repr") and args:
+            return args[0]
+        return UNKNOWN
+
+    # -------------------------------------------------------------------------
+    # Sinks
+    # -------------------------------------------------------------------------
+
+    def _check_sink(self, node: cst.Call, call_name: str, args: list[TaintValue]) -> None:
+        sink = self._config.sink_for(call_name)
+        if sink is None:
+            return
+
+        value = None
+        positional = [i for i, arg in enumerate(node.args) if arg.keyword is None and not arg.star]
+        if sink.keyword is not None:
+            for i, arg in enumerate(node.args):
+                if arg.keyword is not None and arg.keyword.value == sink.keyword:
+                    value = args[i]
+        if value is None and sink.arg < len(positional):
+            value = args[positional[sink.arg]]
+        if value is None:
+            return
+
+        if sink.name in _SUBPROCESS_SINKS and not _uses_shell(node):
+            return
+        if sink.security_type == SecurityType.SHELL_INJECTION:
+            # Any non-constant shell command is worth a look
+            value = self._built(value)
+
+        if value.level == TaintLevel.TAINTED:
+            self._report(node, call_name, sink, value, "high")
+        elif value.level == TaintLevel.UNKNOWN and value.built:
+            self._report(node, call_name, sink, value, "medium")
+
+    def _report(
+        self,
+        node: cst.Call,
+        call_name: str,
+        sink: TaintSink,
+        value: TaintValue,
+        confidence: str,
+    ) -> None:
+        label = _SINK_LABEL[sink.security_type]
+        if value.level == TaintLevel.TAINTED:
+            message = f"Untrusted data from {value.source} reaches {label} in {call_name}()"
+            severity = _SINK_SEVERITY[sink.security_type]
+        else:
+            message = f"{label[0].upper()}{label[1:]} built from non-constant data in {call_name}()"
+            severity = "high" if sink.security_type != SecurityType.PATH_TRAVERSAL else "medium"
+        try:
+            line = self.get_metadata(PositionProvider, node).start.line
+        except KeyError:
+            line = 0
+        self.findings.append(
+            SecurityFinding(
+                type=sink.security_type,
+                file_path=self._file_path,
+                line_number=line,
+                name=call_name,
+                message=message,
+                severity=severity,
+                context={"sink": call_name, "source": value.source, "confidence": confidence},
+                recommendation=_SINK_RECOMMENDATION[sink.security_type],
+            )
+        )
+
+
+def _dotted_name(node: cst.BaseExpression) -> str | None:
+    """Get ``a.b.c`` for a Name/Attribute chain, or None."""
+    parts = []
+    while isinstance(node, cst.Attribute):
+        parts.append(node.attr.value)
+        node = node.value
+    if not isinstance(node, cst.Name):
+        return None
+    parts.append(node.value)
+    return ".".join(reversed(parts))
+
+
+def _uses_shell(node: cst.Call) -> bool:
+    """Check for a ``shell=<truthy>`` keyword argument."""
+    for arg in node.args:
+        if arg.keyword is not None and arg.keyword.value == "shell":
+            return not (isinstance(arg.value, cst.Name) and arg.value.value in ("False", "None"))
+    return False
+
+
+def _imported_modules(module: cst.Module) -> Iterable[str]:
+    """Modules imported by top-level import statements."""
+    for stmt in module.body:
+        if not isinstance(stmt, cst.SimpleStatementLine):
+            continue
+        for small in stmt.body:
+            if isinstance(small, cst.Import):
+                for alias in small.names:
+                    name = _dotted_name(alias.name)
+                    if name is not None:
+                        yield name
+            elif isinstance(small, cst.ImportFrom) and small.module is not None and not small.relative:
+                name = _dotted_name(small.module)
+                if name is not None:
+                    yield name
+
+
+def _is_dependency(param: cst.Param) -> bool:
+    """Check for FastAPI-style injected parameters (``db=Depends(get_db)``)."""
+    default = param.default
+    if isinstance(default, cst.Call):
+        name = _dotted_name(default.func)
+        return name is not None and name.rsplit(".", 1)[-1] in ("Depends", "Security")
+    return False
@@ -273,27 +273,9 @@ class SecurityTargetList(FindingTargetList[SecurityTarget, SecurityType]):
 
     # ===== Output methods (override to include security-specific fields) =====
 
-    def to_list_of_dicts(self) -> list[dict]:
-        """Convert to list of dictionaries for serialization.
-
-        Returns
-        -------
-        list[dict]
-            List of finding dictionaries.
-        """
-        return [
-            {
-                "type": t.type.name,
-                "file": str(t.file_path),
-                "line": t.line_number,
-                "name": t.name,
-                "message": t.message,
-                "severity": t.severity,
-                "code_snippet": t.code_snippet,
-                "recommendation": t.recommendation,
-            }
-            for t in self._targets
-        ]
+    def _to_dict(self, target: SecurityTarget) -> dict:
+        """Convert one finding to a dictionary for serialization."""
+        return finding_to_dict(target)
 
     def summary(self) -> str:
         """Generate a summary string of findings.
@@ -321,3 +303,28 @@ class SecurityTargetList(FindingTargetList[SecurityTarget, SecurityType]):
             lines.append(f"  {stype.name}: {count}")
 
         return "\n".join(lines)
+
+
+def finding_to_dict(finding: SecurityFinding | SecurityTarget) -> dict:
+    """Convert a security finding (or target) to a dictionary for serialization.
+
+    Parameters
+    ----------
+    finding : SecurityFinding | SecurityTarget
+        The finding to convert.
+
+    Returns
+    -------
+    dict
+        The finding's fields, as used by reports.
+    """
+    return {
+        "type": finding.type.name,
+        "file": str(finding.file_path),
+        "line": finding.line_number,
+        "name": finding.name,
+        "message": finding.message,
+        "severity": finding.severity,
+        "code_snippet": finding.code_snippet,
+        "recommendation": finding.recommendation,
+    }
@@ -11,12 +11,16 @@ Detects common vulnerability patterns:
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator
 
 import libcst as cst
+from libcst.metadata import MetadataWrapper, PositionProvider
 
+from rejig.security.files import discover_security_files, iter_windows
+from rejig.security.taint import TAINT_TYPES, TaintAnalyzer, TaintConfig
 from rejig.security.targets import (
     SecurityFinding,
     SecurityTarget,
@@ -46,6 +50,9 @@ class VulnerabilityPattern:
         Description of the vulnerability.
     recommendation : str
         Suggested fix.
+    anchors : tuple[str, ...]
+        Literals that every match starts with. Used to prefilter files in a
+        single pass; patterns without anchors are always run in full.
     """
 
     name: str
@@ -54,6 +61,7 @@ class VulnerabilityPattern:
     severity: str
     message: str
     recommendation: str
+    anchors: tuple[str, ...] = ()
 
 
 # SQL Injection patterns
@@ -65,6 +73,7 @@ SQL_INJECTION_PATTERNS = [
         severity="critical",
         message="Potential SQL injection via string formatting",
         recommendation="Use parameterized queries instead of string formatting.",
+        anchors=("execute", "raw", "query"),
     ),
     VulnerabilityPattern(
         name="f-string in SQL",
@@ -73,6 +82,7 @@ SQL_INJECTION_PATTERNS = [
         severity="critical",
         message="Potential SQL injection via f-string",
         recommendation="Use parameterized queries instead of f-strings.",
+        anchors=("execute", "raw", "query"),
     ),
     VulnerabilityPattern(
         name="String concatenation in SQL",
@@ -81,6 +91,7 @@ SQL_INJECTION_PATTERNS = [
         severity="critical",
         message="Potential SQL injection via string concatenation",
         recommendation="Use parameterized queries instead of string concatenation.",
+        anchors=("execute", "raw", "query"),
     ),
     VulnerabilityPattern(
         name=".format() in SQL",
@@ -89,6 +100,7 @@ SQL_INJECTION_PATTERNS = [
         severity="critical",
         message="Potential SQL injection via .format()",
         recommendation="Use parameterized queries instead of .format().",
+        anchors=("execute", "raw", "query"),
     ),
 ]
 
@@ -101,6 +113,7 @@ SHELL_INJECTION_PATTERNS = [
         severity="critical",
         message="Potential shell injection via os.system()",
         recommendation="Use subprocess with shell=False and pass arguments as a list.",
+        anchors=("os.system",),
     ),
     VulnerabilityPattern(
         name="subprocess with shell=True",
@@ -109,6 +122,7 @@ SHELL_INJECTION_PATTERNS = [
         severity="high",
         message="Subprocess with shell=True can be dangerous",
         recommendation="Avoid shell=True. Pass command as a list instead.",
+        anchors=("subprocess.",),
     ),
     VulnerabilityPattern(
         name="os.popen",
@@ -117,6 +131,7 @@ SHELL_INJECTION_PATTERNS = [
         severity="high",
         message="os.popen is deprecated and can be vulnerable to injection",
         recommendation="Use subprocess module with shell=False instead.",
+        anchors=("os.popen",),
     ),
     VulnerabilityPattern(
         name="commands module",
@@ -125,6 +140,7 @@ SHELL_INJECTION_PATTERNS = [
         severity="high",
         message="commands module is vulnerable to shell injection",
         recommendation="Use subprocess module with shell=False instead.",
+        anchors=("commands.",),
     ),
 ]
 
@@ -137,6 +153,7 @@ UNSAFE_DESERIALIZATION_PATTERNS = [
         severity="high",
         message="Pickle deserialization can execute arbitrary code",
         recommendation="Avoid pickle for untrusted data. Use JSON or other safe formats.",
+        anchors=("pickle.",),
     ),
     VulnerabilityPattern(
         name="cPickle.load",
@@ -145,6 +162,7 @@ UNSAFE_DESERIALIZATION_PATTERNS = [
         severity="high",
         message="cPickle deserialization can execute arbitrary code",
         recommendation="Avoid pickle for untrusted data. Use JSON or other safe formats.",
+        anchors=("cPickle.",),
     ),
     VulnerabilityPattern(
         name="yaml.load without Loader",
@@ -153,6 +171,7 @@ UNSAFE_DESERIALIZATION_PATTERNS = [
         severity="critical",
         message="yaml.load without Loader can execute arbitrary code",
         recommendation="Use yaml.safe_load() or specify Loader=yaml.SafeLoader.",
+        anchors=("yaml.load",),
     ),
     VulnerabilityPattern(
         name="yaml.unsafe_load",
@@ -161,6 +180,7 @@ UNSAFE_DESERIALIZATION_PATTERNS = [
         severity="critical",
         message="yaml.unsafe_load can execute arbitrary code",
         recommendation="Use yaml.safe_load() instead.",
+        anchors=("yaml.unsafe_load",),
     ),
     VulnerabilityPattern(
         name="shelve.open",
@@ -169,6 +189,7 @@ UNSAFE_DESERIALIZATION_PATTERNS = [
         severity="medium",
         message="shelve uses pickle internally, which can be unsafe",
         recommendation="Avoid shelve for untrusted data. Use safer alternatives.",
+        anchors=("shelve.open",),
     ),
     VulnerabilityPattern(
         name="marshal.load",
@@ -177,6 +198,7 @@ UNSAFE_DESERIALIZATION_PATTERNS = [
         severity="medium",
         message="marshal deserialization can be unsafe",
         recommendation="Use JSON or other safe formats for untrusted data.",
+        anchors=("marshal.",),
     ),
 ]
 
@@ -189,6 +211,7 @@ EVAL_EXEC_PATTERNS = [
         severity="critical",
         message="eval() with variable input can execute arbitrary code",
         recommendation="Avoid eval(). Use ast.literal_eval() for safe evaluation.",
+        anchors=("eval",),
     ),
     VulnerabilityPattern(
         name="exec with variable",
@@ -197,6 +220,7 @@ EVAL_EXEC_PATTERNS = [
         severity="critical",
         message="exec() with variable input can execute arbitrary code",
         recommendation="Avoid exec() with untrusted input entirely.",
+        anchors=("exec",),
     ),
     VulnerabilityPattern(
         name="compile with exec",
@@ -205,6 +229,7 @@ EVAL_EXEC_PATTERNS = [
         severity="high",
         message="compile() with exec mode can be dangerous",
         recommendation="Ensure input to compile() is trusted.",
+        anchors=("compile",),
     ),
 ]
 
@@ -217,6 +242,7 @@ PATH_TRAVERSAL_PATTERNS = [
         severity="high",
         message="Potential path traversal via string concatenation/f-string",
         recommendation="Validate and sanitize file paths. Use pathlib for path manipulation.",
+        anchors=("open",),
     ),
     VulnerabilityPattern(
         name="os.path.join with user input",
@@ -225,6 +251,7 @@ PATH_TRAVERSAL_PATTERNS = [
         severity="medium",
         message="os.path.join doesn't prevent path traversal",
         recommendation="Validate paths don't contain .. and are within allowed directories.",
+        anchors=("os.path.join",),
     ),
 ]
 
@@ -237,6 +264,7 @@ INSECURE_RANDOM_PATTERNS = [
         severity="medium",
         message="random module is not cryptographically secure",
         recommendation="Use secrets module for security-sensitive random values.",
+        anchors=("random.",),
     ),
 ]
 
@@ -249,6 +277,7 @@ WEAK_CRYPTO_PATTERNS = [
         severity="medium",
         message="MD5 is cryptographically broken",
         recommendation="Use SHA-256 or better for cryptographic purposes.",
+        anchors=("hashlib.md5", "MD5.new"),
     ),
     VulnerabilityPattern(
         name="SHA1 hash",
@@ -257,6 +286,7 @@ WEAK_CRYPTO_PATTERNS = [
         severity="medium",
         message="SHA-1 is deprecated for cryptographic use",
         recommendation="Use SHA-256 or better for cryptographic purposes.",
+        anchors=("hashlib.sha1", "SHA.new"),
     ),
     VulnerabilityPattern(
         name="DES encryption",
@@ -265,6 +295,7 @@ WEAK_CRYPTO_PATTERNS = [
         severity="high",
         message="DES/3DES are deprecated encryption algorithms",
         recommendation="Use AES encryption instead.",
+        anchors=("DES.new", "DES3.new"),
     ),
 ]
 
@@ -277,6 +308,7 @@ SSL_PATTERNS = [
         severity="high",
         message="SSL certificate verification is disabled",
         recommendation="Enable SSL certificate verification in production.",
+        anchors=("verify",),
     ),
     VulnerabilityPattern(
         name="Insecure SSL context",
@@ -285,6 +317,7 @@ SSL_PATTERNS = [
         severity="high",
         message="SSL certificate validation is disabled",
         recommendation="Use ssl.CERT_REQUIRED for proper certificate validation.",
+        anchors=("ssl.CERT_NONE",),
     ),
     VulnerabilityPattern(
         name="SSLv2/SSLv3",
@@ -293,13 +326,147 @@ SSL_PATTERNS = [
         severity="critical",
         message="SSLv2/SSLv3 are deprecated and insecure",
         recommendation="Use TLS 1.2 or higher.",
+        anchors=("ssl.PROTOCOL_SSLv",),
     ),
 ]
 
 
+ALL_PATTERNS = (
+    SQL_INJECTION_PATTERNS
+    + SHELL_INJECTION_PATTERNS
+    + UNSAFE_DESERIALIZATION_PATTERNS
+    + EVAL_EXEC_PATTERNS
+    + PATH_TRAVERSAL_PATTERNS
+    + INSECURE_RANDOM_PATTERNS
+    + WEAK_CRYPTO_PATTERNS
+    + SSL_PATTERNS
+)
+
+# Calls inspected by VulnerabilityCallCollector; files without any of these
+# are not parsed.
+CALL_ANCHORS = ("eval", "exec", "subprocess.", "open")
+
+
+class _AnchorGroup:
+    """Patterns whose anchors are searched with one literal alternation."""
+
+    def __init__(self, patterns: list[VulnerabilityPattern], ignore_case: bool) -> None:
+        self.ignore_case = ignore_case
+        self.patterns = patterns
+        self.by_first_char: dict[str, list[tuple[VulnerabilityPattern, tuple[str, ...]]]] = {}
+        literals: set[str] = set()
+        for pattern in patterns:
+            anchors = tuple(a.lower() for a in pattern.anchors) if ignore_case else pattern.anchors
+            for first in {a[0] for a in anchors}:
+                self.by_first_char.setdefault(first, []).append((pattern, anchors))
+            literals.update(anchors)
+
+        # Longest literals first so the alternation prefers specific anchors
+        ordered = sorted(literals, key=len, reverse=True)
+        self.regex = re.compile("|".join(re.escape(a) for a in ordered))
+        self.fallback = re.compile(self.regex.pattern, re.IGNORECASE) if ignore_case else None
+
+        # The alternation consumes each hit, so anchors that can start inside
+        # another anchor (e.g. "open" in "os.popen") are checked explicitly.
+        self.inner: dict[str, list[int]] = {}
+        for anchor in ordered:
+            offsets = [
+                k
+                for k in range(1, len(anchor))
+                if any(other.startswith(anchor[k:]) or anchor[k:].startswith(other) for other in ordered)
+            ]
+            if offsets:
+                self.inner[anchor] = offsets
+
+    def scan(self, content: str, matches: list[tuple[VulnerabilityPattern, re.Match]]) -> None:
+        haystack = content
+        finder = self.regex
+        if self.ignore_case:
+            haystack = content.lower()
+            if len(haystack) != len(content):
+                # Lowercasing changed offsets; search the original instead
+                haystack, finder = content, self.fallback
+
+        # End of the last match per pattern, to keep finditer's
+        # non-overlapping semantics
+        last_end: dict[int, int] = {}
+        for hit in finder.finditer(haystack):
+            pos = hit.start()
+            anchor = hit.group().lower() if self.ignore_case else hit.group()
+            positions = [pos]
+            positions.extend(pos + k for k in self.inner.get(anchor, ()))
+            for start in positions:
+                first = haystack[start].lower() if self.ignore_case else haystack[start]
+                for pattern, anchors in self.by_first_char.get(first, ()):
+                    if start < last_end.get(id(pattern), 0):
+                        continue
+                    if self.ignore_case:
+                        window = haystack[start:start + len(max(anchors, key=len))].lower()
+                        if not any(window.startswith(a) for a in anchors):
+                            continue
+                    elif not any(haystack.startswith(a, start) for a in anchors):
+                        continue
+                    match = pattern.pattern.match(content, start)
+                    if match:
+                        last_end[id(pattern)] = match.end()
+                        matches.append((pattern, match))
+
+
+class PatternIndex:
+    """A set of vulnerability patterns compiled for single-pass scanning.
+
+    Pattern anchors are merged into one literal alternation (one for
+    case-sensitive patterns, one searched over the lowercased text for
+    case-insensitive ones), so a file is searched once to find every position
+    where some pattern could start. Only the patterns anchored at that
+    position are then tried, with ``pattern.match``. Results are identical
+    to running ``finditer`` for each pattern separately.
+
+    Parameters
+    ----------
+    patterns : list[VulnerabilityPattern]
+        Patterns to compile.
+    """
+
+    def __init__(self, patterns: list[VulnerabilityPattern]) -> None:
+        self.patterns = list(patterns)
+        self._unanchored = [p for p in self.patterns if not p.anchors]
+        self._groups: list[_AnchorGroup] = []
+        for ignore_case in (False, True):
+            group = [
+                p for p in self.patterns
+                if p.anchors and bool(p.pattern.flags & re.IGNORECASE) == ignore_case
+            ]
+            if group:
+                self._groups.append(_AnchorGroup(group, ignore_case))
+
+    def scan(self, content: str) -> list[tuple[VulnerabilityPattern, re.Match]]:
+        """Find all pattern matches in a text.
+
+        Parameters
+        ----------
+        content : str
+            Text to scan.
+
+        Returns
+        -------
+        list[tuple[VulnerabilityPattern, re.Match]]
+            Matches in order of position.
+        """
+        matches: list[tuple[VulnerabilityPattern, re.Match]] = []
+        for group in self._groups:
+            group.scan(content, matches)
+        for pattern in self._unanchored:
+            matches.extend((pattern, m) for m in pattern.pattern.finditer(content))
+        matches.sort(key=lambda item: item[1].start())
+        return matches
+
+
 class VulnerabilityCallCollector(cst.CSTVisitor):
     """Collect potentially vulnerable function calls using CST analysis."""
 
+    METADATA_DEPENDENCIES = (PositionProvider,)
+
     def __init__(self, file_path: Path) -> None:
         self._file_path = file_path
         self._findings: list[SecurityFinding] = []
@@ -318,6 +485,13 @@ class VulnerabilityCallCollector(cst.CSTVisitor):
 
         return True
 
+    def _get_line(self, node: cst.CSTNode) -> int:
+        """Get the 1-based line of a node (0 if positions aren't available)."""
+        try:
+            return self.get_metadata(PositionProvider, node).start.line
+        except KeyError:
+            return 0
+
     def _get_call_name(self, node: cst.Call) -> str | None:
         """Extract the full name of a function call."""
         if isinstance(node.func, cst.Name):
@@ -347,7 +521,7 @@ class VulnerabilityCallCollector(cst.CSTVisitor):
                     SecurityFinding(
                         type=SecurityType.UNSAFE_EVAL if func_name == "eval" else SecurityType.UNSAFE_EXEC,
                         file_path=self._file_path,
-                        line_number=0,  # Will be filled in later
+                        line_number=self._get_line(node),
                         name=func_name,
                         message=f"{func_name}() with variable input is dangerous",
                         severity="critical",
@@ -368,7 +542,7 @@ class VulnerabilityCallCollector(cst.CSTVisitor):
                         SecurityFinding(
                             type=SecurityType.SHELL_INJECTION,
                             file_path=self._file_path,
-                            line_number=0,
+                            line_number=self._get_line(node),
                             name=func_name,
                             message="subprocess with shell=True is vulnerable to injection",
                             severity="high",
@@ -389,7 +563,7 @@ class VulnerabilityCallCollector(cst.CSTVisitor):
                     SecurityFinding(
                         type=SecurityType.PATH_TRAVERSAL,
                         file_path=self._file_path,
-                        line_number=0,
+                        line_number=self._get_line(node),
                         name="open",
                         message="File path constructed dynamically may be vulnerable",
                         severity="medium",
@@ -402,53 +576,209 @@ class VulnerabilityCallCollector(cst.CSTVisitor):
         return self._findings
 
 
+# Patterns compiled once per distinct pattern set
+_INDEXES: dict[tuple[int, ...], PatternIndex] = {}
+
+
+def _get_index(patterns: list[VulnerabilityPattern]) -> PatternIndex:
+    key = tuple(id(p) for p in patterns)
+    index = _INDEXES.get(key)
+    if index is None:
+        index = _INDEXES[key] = PatternIndex(patterns)
+    return index
+
+
 class VulnerabilityScanner:
     """Scan for common security vulnerabilities.
 
     Detects SQL injection, command injection, unsafe deserialization,
     and other common vulnerability patterns.
+
+    Each file is read once and searched in a single pass for all requested
+    patterns. Files that call ``eval``/``exec``/``subprocess``/``open`` are
+    additionally parsed once for call-level checks that regexes can't
+    express; those findings are merged in unless a pattern already reported
+    the same issue on the same line. The same parse feeds the taint engine,
+    which replaces the SQL/shell/path patterns of each type whose sinks the
+    file calls.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The Rejig instance to scan.
+    include_config : bool
+        Also scan non-Python files (configs, shell scripts, Dockerfiles; see
+        ``rejig.security.files``) with the regex patterns. These are read in
+        bounded ``mmap`` windows and never parsed. Defaults to False, since
+        most patterns target Python code.
+    taint : bool
+        Use intra-procedural taint tracking (``rejig.security.taint``)
+        instead of line patterns for SQL, shell and path injection in
+        Python files. Defaults to True; files that fail to parse fall back
+        to the patterns.
+    taint_config : TaintConfig, optional
+        Sources, sanitizers and sinks for taint tracking.
     """
 
-    def __init__(self, rejig: Rejig) -> None:
+    def __init__(
+        self,
+        rejig: Rejig,
+        include_config: bool = False,
+        taint: bool = True,
+        taint_config: TaintConfig | None = None,
+    ) -> None:
         self._rejig = rejig
+        self._include_config = include_config
+        self._taint = taint
+        self._taint_config = taint_config or TaintConfig()
+
+    def _scan_file(
+        self,
+        file_path: Path,
+        index: PatternIndex,
+        types: set[SecurityType],
+    ) -> list[SecurityFinding]:
+        """Scan a single file for the given patterns and call checks."""
+        if file_path.suffix != ".py":
+            return self._scan_text_file(file_path, index)
+
+        content = file_path.read_text()
+        matches = index.scan(content)
+        findings: list[SecurityFinding] = []
+
+        if matches:
+            line_starts = [0]
+            line_starts.extend(m.end() for m in re.finditer("\n", content))
+            lines = content.splitlines()
+
+            for pattern_def, match in matches:
+                line_num = bisect_right(line_starts, match.start())
+                line_content = lines[line_num - 1] if line_num <= len(lines) else ""
+
+                # Skip comments
+                stripped = line_content.strip()
+                if stripped.startswith("#"):
+                    continue
+
+                findings.append(
+                    SecurityFinding(
+                        type=pattern_def.security_type,
+                        file_path=file_path,
+                        line_number=line_num,
+                        name=pattern_def.name,
+                        message=pattern_def.message,
+                        severity=pattern_def.severity,
+                        code_snippet=stripped[:100],
+                        recommendation=pattern_def.recommendation,
+                    )
+                )
 
-    def _scan_patterns(
-        self, patterns: list[VulnerabilityPattern]
-    ) -> SecurityTargetList:
-        """Scan files for patterns and return findings."""
-        findings: list[SecurityTarget] = []
-
-        for file_path in self._rejig.files:
+        call_types = {
+            SecurityType.UNSAFE_EVAL,
+            SecurityType.UNSAFE_EXEC,
+            SecurityType.SHELL_INJECTION,
+            SecurityType.PATH_TRAVERSAL,
+        }
+        # Taint analysis only covers the types whose sinks the file may call;
+        # the others keep their pattern findings
+        taint_types = {
+            t for t in (types & TAINT_TYPES if self._taint else ())
+            if self._taint_config.may_call_sink(content, {t})
+        }
+        run_calls = bool(types & call_types) and any(anchor in content for anchor in CALL_ANCHORS)
+        run_taint = bool(taint_types)
+        if run_calls or run_taint:
             try:
-                content = file_path.read_text()
-                lines = content.splitlines()
+                wrapper = MetadataWrapper(cst.parse_module(content))
+                collector = VulnerabilityCallCollector(file_path)
+                analyzer = TaintAnalyzer(file_path, self._taint_config)
+                if run_calls:
+                    wrapper.visit(collector)
+                if run_taint:
+                    wrapper.visit(analyzer)
+            except Exception:
+                return findings
+
+            if taint_types:
+                # Dataflow results supersede the line patterns for the
+                # injection types whose sinks the analysis covered
+                findings = [f for f in findings if f.type not in taint_types]
+
+            reported = {(f.line_number, f.type) for f in findings}
+            lines = content.splitlines()
+            call_findings = [f for f in collector.findings if f.type not in taint_types]
+            for finding in call_findings + analyzer.findings:
+                if finding.type not in types or (finding.line_number, finding.type) in reported:
+                    continue
+                if 0 < finding.line_number <= len(lines):
+                    finding.code_snippet = lines[finding.line_number - 1].strip()[:100]
+                reported.add((finding.line_number, finding.type))
+                findings.append(finding)
+            findings.sort(key=lambda f: f.line_number)
+
+        return findings
+
+    def _scan_text_file(self, file_path: Path, index: PatternIndex) -> list[SecurityFinding]:
+        """Scan a non-Python file for the given patterns, window by window."""
+        findings: list[SecurityFinding] = []
+        for window in iter_windows(file_path, skip_binary=True):
+            content = window.data.decode("utf-8", "replace")
+            owned = len(window.data[:window.owned].decode("utf-8", "replace"))
+            for pattern_def, match in index.scan(content):
+                if match.start() >= owned:
+                    # Overlap: reported by the next window
+                    break
+                line_start = content.rfind("\n", 0, match.start()) + 1
+                line_end = content.find("\n", match.start())
+                stripped = content[line_start:line_end if line_end != -1 else len(content)].strip()
+                if stripped.startswith(("#", "//", ";")):
+                    continue
+                findings.append(
+                    SecurityFinding(
+                        type=pattern_def.security_type,
+                        file_path=file_path,
+                        line_number=window.line + content.count("\n", 0, match.start()),
+                        name=pattern_def.name,
+                        message=pattern_def.message,
+                        severity=pattern_def.severity,
+                        code_snippet=stripped[:100],
+                        recommendation=pattern_def.recommendation,
+                    )
+                )
+        return findings
 
-                for pattern_def in patterns:
-                    for match in pattern_def.pattern.finditer(content):
-                        line_num = content[:match.start()].count("\n") + 1
-                        line_content = lines[line_num - 1] if line_num <= len(lines) else ""
+    def iter_findings(self, patterns: list[VulnerabilityPattern] | None = None) -> Iterator[SecurityFinding]:
+        """Yield vulnerability findings file by file as they are found.
 
-                        # Skip comments
-                        stripped = line_content.strip()
-                        if stripped.startswith("#"):
-                            continue
+        Unlike the ``find_*`` methods, findings are not collected, so they
+        can be streamed to a report (see ``rejig.core.writers``).
 
-                        finding = SecurityFinding(
-                            type=pattern_def.security_type,
-                            file_path=file_path,
-                            line_number=line_num,
-                            name=pattern_def.name,
-                            message=pattern_def.message,
-                            severity=pattern_def.severity,
-                            code_snippet=line_content.strip()[:100],
-                            recommendation=pattern_def.recommendation,
-                        )
-                        findings.append(SecurityTarget(self._rejig, finding))
+        Parameters
+        ----------
+        patterns : list[VulnerabilityPattern] | None
+            Patterns to scan for. Defaults to all patterns.
+
+        Yields
+        ------
+        SecurityFinding
+            Each finding, in file order.
+        """
+        patterns = ALL_PATTERNS if patterns is None else patterns
+        index = _get_index(patterns)
+        types = {p.security_type for p in patterns}
 
+        for file_path in discover_security_files(self._rejig, self._include_config):
+            try:
+                file_findings = self._scan_file(file_path, index, types)
             except Exception:
                 continue
+            yield from file_findings
 
-        return SecurityTargetList(self._rejig, findings)
+    def _scan(self, patterns: list[VulnerabilityPattern]) -> SecurityTargetList:
+        """Scan all files for patterns (plus matching call checks)."""
+        return SecurityTargetList(
+            self._rejig, [SecurityTarget(self._rejig, f) for f in self.iter_findings(patterns)]
+        )
 
     def find_sql_injection_risks(self) -> SecurityTargetList:
         """Find potential SQL injection vulnerabilities.
@@ -458,7 +788,7 @@ class VulnerabilityScanner:
         SecurityTargetList
             SQL injection risk findings.
         """
-        return self._scan_patterns(SQL_INJECTION_PATTERNS)
+        return self._scan(SQL_INJECTION_PATTERNS)
 
     def find_shell_injection_risks(self) -> SecurityTargetList:
         """Find potential shell/command injection vulnerabilities.
@@ -468,7 +798,7 @@ class VulnerabilityScanner:
         SecurityTargetList
             Shell injection risk findings.
         """
-        return self._scan_patterns(SHELL_INJECTION_PATTERNS)
+        return self._scan(SHELL_INJECTION_PATTERNS)
 
     def find_unsafe_yaml_load(self) -> SecurityTargetList:
         """Find unsafe YAML loading.
@@ -479,7 +809,7 @@ class VulnerabilityScanner:
             Unsafe YAML load findings.
         """
         patterns = [p for p in UNSAFE_DESERIALIZATION_PATTERNS if "yaml" in p.name.lower()]
-        return self._scan_patterns(patterns)
+        return self._scan(patterns)
 
     def find_unsafe_pickle(self) -> SecurityTargetList:
         """Find unsafe pickle usage.
@@ -490,7 +820,7 @@ class VulnerabilityScanner:
             Unsafe pickle findings.
         """
         patterns = [p for p in UNSAFE_DESERIALIZATION_PATTERNS if "pickle" in p.name.lower()]
-        return self._scan_patterns(patterns)
+        return self._scan(patterns)
 
     def find_unsafe_deserialization(self) -> SecurityTargetList:
         """Find all unsafe deserialization patterns.
@@ -500,7 +830,7 @@ class VulnerabilityScanner:
         SecurityTargetList
             All unsafe deserialization findings.
         """
-        return self._scan_patterns(UNSAFE_DESERIALIZATION_PATTERNS)
+        return self._scan(UNSAFE_DESERIALIZATION_PATTERNS)
 
     def find_unsafe_eval(self) -> SecurityTargetList:
         """Find dangerous eval/exec usage.
@@ -510,7 +840,7 @@ class VulnerabilityScanner:
         SecurityTargetList
             Unsafe eval/exec findings.
         """
-        return self._scan_patterns(EVAL_EXEC_PATTERNS)
+        return self._scan(EVAL_EXEC_PATTERNS)
 
     def find_path_traversal_risks(self) -> SecurityTargetList:
         """Find potential path traversal vulnerabilities.
@@ -520,7 +850,7 @@ class VulnerabilityScanner:
         SecurityTargetList
             Path traversal risk findings.
         """
-        return self._scan_patterns(PATH_TRAVERSAL_PATTERNS)
+        return self._scan(PATH_TRAVERSAL_PATTERNS)
 
     def find_insecure_random(self) -> SecurityTargetList:
         """Find insecure random number generation.
@@ -530,7 +860,7 @@ class VulnerabilityScanner:
         SecurityTargetList
             Insecure random findings.
         """
-        return self._scan_patterns(INSECURE_RANDOM_PATTERNS)
+        return self._scan(INSECURE_RANDOM_PATTERNS)
 
     def find_weak_crypto(self) -> SecurityTargetList:
         """Find weak cryptography usage.
@@ -540,7 +870,7 @@ class VulnerabilityScanner:
         SecurityTargetList
             Weak cryptography findings.
         """
-        return self._scan_patterns(WEAK_CRYPTO_PATTERNS)
+        return self._scan(WEAK_CRYPTO_PATTERNS)
 
     def find_insecure_ssl(self) -> SecurityTargetList:
         """Find insecure SSL/TLS configuration.
@@ -550,24 +880,16 @@ class VulnerabilityScanner:
         SecurityTargetList
             Insecure SSL findings.
         """
-        return self._scan_patterns(SSL_PATTERNS)
+        return self._scan(SSL_PATTERNS)
 
     def find_all_vulnerabilities(self) -> SecurityTargetList:
         """Find all vulnerability patterns.
 
+        Every file is scanned once for all categories.
+
         Returns
         -------
         SecurityTargetList
             All vulnerability findings combined.
         """
-        all_patterns = (
-            SQL_INJECTION_PATTERNS
-            + SHELL_INJECTION_PATTERNS
-            + UNSAFE_DESERIALIZATION_PATTERNS
-            + EVAL_EXEC_PATTERNS
-            + PATH_TRAVERSAL_PATTERNS
-            + INSECURE_RANDOM_PATTERNS
-            + WEAK_CRYPTO_PATTERNS
-            + SSL_PATTERNS
-        )
-        return self._scan_patterns(all_patterns)
+        return self._scan(ALL_PATTERNS)
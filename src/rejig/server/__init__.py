@@ -0,0 +1,50 @@
+"""Long-running JSON-RPC server mode.
+
+Keeps one Rejig instance, its analysis cache and a symbol index warm
+between requests from editors, agents and other tools.
+
+Classes
+-------
+RejigServer
+    JSON-RPC dispatcher with stdio and Unix-socket transports.
+
+RejigClient
+    Client for a server listening on a Unix socket.
+
+SymbolIndex
+    Index of the files defining each class and function name.
+
+RpcError
+    A JSON-RPC error.
+
+Functions
+---------
+to_jsonable
+    Convert rejig return values into JSON-serializable data.
+
+Examples
+--------
+Start a server from the command line::
+
+    rejig serve src/ --socket /tmp/rejig.sock
+
+Then query it::
+
+    from rejig.server import RejigClient
+
+    with RejigClient("/tmp/rejig.sock") as client:
+        print(client.call(["find_class", "User"], ["get_content"])["data"])
+"""
+from __future__ import annotations
+
+from rejig.server.client import RejigClient
+from rejig.server.server import RejigServer, RpcError, to_jsonable
+from rejig.server.symbols import SymbolIndex
+
+__all__ = [
+    "RejigClient",
+    "RejigServer",
+    "RpcError",
+    "SymbolIndex",
+    "to_jsonable",
+]
@@ -0,0 +1,78 @@
+"""Client for a RejigServer listening on a Unix socket."""
+from __future__ import annotations
+
+import itertools
+import json
+import socket
+from pathlib import Path
+from typing import Any
+
+from rejig.server.server import INTERNAL_ERROR, RpcError
+
+
+class RejigClient:
+    """Send JSON-RPC requests to a running ``rejig serve --socket`` process.
+
+    Parameters
+    ----------
+    socket_path : str | Path
+        Path of the server's Unix socket.
+    timeout : float | None
+        Seconds to wait for a response (None waits forever).
+
+    Examples
+    --------
+    >>> with RejigClient("/tmp/rejig.sock") as client:
+    ...     result = client.call(["find_class", "User"], ["get_content"])
+    ...     print(result["data"])
+    """
+
+    def __init__(self, socket_path: str | Path, timeout: float | None = None) -> None:
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(str(socket_path))
+        self._file = self._socket.makefile("rwb")
+        self._ids = itertools.count(1)
+
+    def request(self, method: str, params: Any = None) -> Any:
+        """Call a server method and return its result.
+
+        Raises
+        ------
+        RpcError
+            If the server answers with an error.
+        """
+        message: dict[str, Any] = {"jsonrpc": "2.0", "id": next(self._ids), "method": method}
+        if params is not None:
+            message["params"] = params
+        self._file.write(json.dumps(message).encode("utf-8") + b"\n")
+        self._file.flush()
+
+        line = self._file.readline()
+        if not line:
+            raise RpcError(INTERNAL_ERROR, "Connection closed by server")
+        response = json.loads(line)
+        if "error" in response:
+            error = response["error"]
+            raise RpcError(error["code"], error["message"], error.get("data"))
+        return response["result"]
+
+    def call(self, *chain: Any) -> Any:
+        """Evaluate a chain of fluent API steps, e.g. ``["find_class", "User"]``."""
+        return self.request("call", {"chain": list(chain)})
+
+    def transaction(self, *chains: list[Any], commit: bool = True) -> Any:
+        """Evaluate several chains in one server-side transaction."""
+        return self.request("transaction", {"calls": list(chains), "commit": commit})
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> RejigClient:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return False
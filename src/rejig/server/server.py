@@ -0,0 +1,534 @@
+"""JSON-RPC server keeping one Rejig instance warm between requests.
+
+Editors and agents that drive rejig usually issue many small requests
+against the same project. Building a fresh ``Rejig`` for each one pays
+file discovery and parsing every time; ``RejigServer`` keeps the file
+list, the analysis cache and a symbol index in memory instead, so a
+follow-up ``find_class(...).get_content()`` parses only the file that
+defines the class.
+
+The protocol is JSON-RPC 2.0, one JSON message per line, over stdio or a
+Unix socket. Methods:
+
+- ``call``: evaluate a chain of fluent API calls starting at the Rejig
+  instance, e.g. ``{"chain": [["find_class", "User"], ["get_content"]]}``.
+- ``transaction``: evaluate several chains in one transaction and commit
+  their pending changes together if every one succeeds (operations that
+  don't record changes in transactions still write immediately).
+- ``status``, ``refresh``, ``shutdown``: server housekeeping.
+- Any other public ``Rejig`` method name is called directly with the
+  request's params (a list of positional or an object of keyword
+  arguments), e.g. ``find_unused_imports`` or ``organize_all_imports``.
+
+Chain steps are ``[name, *args]`` or ``{"method": name, "args": [...],
+"kwargs": {...}}``. Arguments of the form ``{"$path": "..."}`` are passed
+as a ``Path`` resolved against the project root. Return values are
+serialized with ``to_jsonable``.
+
+Only public attributes can be reached, but the server executes any
+refactoring a client asks for: expose it to trusted local clients only.
+"""
+from __future__ import annotations
+
+import dataclasses
+import enum
+import inspect
+import json
+import os
+import socketserver
+import stat
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Iterable
+
+from rejig.core.rejig import Rejig
+from rejig.core.results import BatchResult, ErrorResult, Result
+from rejig.server.symbols import SymbolIndex
+from rejig.targets.base import Target
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# Directory times within this window of a scan may hide a later change made
+# in the same clock tick, so such directories are checked again next time.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class RpcError(Exception):
+    """A JSON-RPC error, raised by the dispatcher or returned to a client.
+
+    Parameters
+    ----------
+    code : int
+        JSON-RPC error code.
+    message : str
+        Description of the error.
+    data : Any
+        Optional extra information.
+    """
+
+    def __init__(self, code: int, message: str, data: Any = None) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the JSON-RPC error object."""
+        error: dict[str, Any] = {"code": self.code, "message": self.message}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert a rejig return value into JSON-serializable data.
+
+    Results and batch results become objects with their fields (paths as
+    strings), targets become ``{"type", "repr"}`` objects, dataclasses
+    become objects, objects with a ``to_dict`` method are converted through
+    it, and target lists and other iterables become lists. Anything else is
+    represented by its ``repr``.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return to_jsonable(value.value)
+    if isinstance(value, BatchResult):
+        return {
+            "success": value.success,
+            "results": [to_jsonable(r) for r in value.results],
+            "files_changed": [str(p) for p in value.files_changed],
+            "diff": value.diff,
+            "diffs": {str(p): d for p, d in value.diffs.items()},
+        }
+    if isinstance(value, Result):
+        data = {
+            "success": value.success,
+            "message": value.message,
+            "files_changed": [str(p) for p in value.files_changed],
+            "data": to_jsonable(value.data),
+            "diff": value.diff,
+            "diffs": {str(p): d for p, d in value.diffs.items()},
+        }
+        if isinstance(value, ErrorResult):
+            data["operation"] = value.operation
+            data["exception"] = repr(value.exception) if value.exception is not None else None
+        return data
+    if isinstance(value, Target):
+        return {"type": type(value).__name__, "repr": repr(value)}
+    if isinstance(value, dict):
+        return {str(to_jsonable(k)): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((to_jsonable(v) for v in value), key=repr)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: to_jsonable(getattr(value, f.name)) for f in dataclasses.fields(value)}
+    if callable(getattr(value, "to_dict", None)):
+        return to_jsonable(value.to_dict())
+    if isinstance(value, Iterable):
+        return [to_jsonable(v) for v in value]
+    return repr(value)
+
+
+def _parse_step(step: Any) -> tuple[str, list[Any], dict[str, Any]]:
+    """Split a chain step into name, positional and keyword arguments."""
+    if isinstance(step, str):
+        return step, [], {}
+    if isinstance(step, list) and step and isinstance(step[0], str):
+        return step[0], step[1:], {}
+    if isinstance(step, dict) and isinstance(step.get("method"), str):
+        args = step.get("args", [])
+        kwargs = step.get("kwargs", {})
+        if isinstance(args, list) and isinstance(kwargs, dict):
+            return step["method"], args, kwargs
+    raise RpcError(INVALID_PARAMS, f"Invalid chain step: {step!r}")
+
+
+class RejigServer:
+    """JSON-RPC front end for a long-lived Rejig instance.
+
+    Parameters
+    ----------
+    path : str | Path
+        Project path, as for ``Rejig``.
+    dry_run : bool
+        If True, operations report diffs without writing files.
+    cache_dir : str | Path | None
+        Directory to persist analysis caches in, as for ``Rejig``.
+
+    Examples
+    --------
+    >>> server = RejigServer("src/")
+    >>> server.warm()
+    >>> server.handle('{"jsonrpc": "2.0", "id": 1, "method": "call", '
+    ...               '"params": {"chain": [["find_class", "User"], ["get_content"]]}}')
+    >>> server.serve_unix("/tmp/rejig.sock")
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        dry_run: bool = False,
+        cache_dir: str | Path | None = None,
+    ) -> None:
+        self.rejig = Rejig(path, dry_run=dry_run, cache_dir=cache_dir)
+        self.symbols = SymbolIndex(self.rejig)
+        self._lock = threading.RLock()
+        self._dir_stamps: dict[str, int] | None = None
+        self._scanned_at = 0
+        self._files: list[Path] | None = None
+        self._requests = 0
+        self._running = True
+        self._on_shutdown: list[Any] = []
+
+    # -------------------------------------------------------------------------
+    # Warm State
+    # -------------------------------------------------------------------------
+
+    def _scan_dirs(self) -> dict[str, int]:
+        """Record the modification time of every directory under root."""
+        self._scanned_at = time.time_ns()
+        stamps: dict[str, int] = {}
+        pending = [str(self.rejig.root)]
+        while pending:
+            directory = pending.pop()
+            try:
+                stamps[directory] = os.stat(directory).st_mtime_ns
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+            except OSError:
+                continue
+        return stamps
+
+    def _dirs_changed(self) -> bool:
+        """Check whether files were added to or removed from any directory."""
+        if self._dir_stamps is None:
+            return True
+        racy = self._scanned_at - RACY_WINDOW_NS
+        for directory, mtime in self._dir_stamps.items():
+            try:
+                if mtime >= racy or os.stat(directory).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def warm(self) -> None:
+        """Discover files and build the symbol index ahead of the first request."""
+        with self._lock:
+            self._sync()
+            if not self.symbols.built:
+                self.symbols.build()
+
+    def refresh(self) -> None:
+        """Rediscover files and rebuild the symbol index.
+
+        Rarely needed: created and deleted files are noticed through
+        directory modification times, and edits through file fingerprints.
+        """
+        with self._lock:
+            self._dir_stamps = None
+            self._sync()
+            self.symbols.build()
+
+    def _sync(self) -> None:
+        """Pick up files created or deleted since the last request.
+
+        Directory modification times change when entries are added or
+        removed, so checking them is enough to know when to rediscover
+        files. Edits to existing files need no action here: cached analyses
+        are validated against each file's fingerprint when read.
+        """
+        if not self._dirs_changed():
+            return
+        self._dir_stamps = self._scan_dirs()
+        before = self._files
+        self.rejig.reset_files()
+        self._files = list(self.rejig.files)
+        if self._files != before:
+            self.symbols.invalidate()
+
+    # -------------------------------------------------------------------------
+    # Dispatch
+    # -------------------------------------------------------------------------
+
+    def handle(self, message: str) -> str | None:
+        """Handle one JSON-RPC message (a request, notification or batch).
+
+        Parameters
+        ----------
+        message : str
+            The raw JSON text.
+
+        Returns
+        -------
+        str | None
+            The JSON response, or None if there is nothing to send back.
+        """
+        try:
+            request = json.loads(message)
+        except ValueError as e:
+            return json.dumps(self._error(None, RpcError(PARSE_ERROR, f"Parse error: {e}")))
+        response = self.dispatch(request)
+        return json.dumps(response) if response is not None else None
+
+    def dispatch(self, request: Any) -> Any:
+        """Handle a decoded JSON-RPC request, notification or batch.
+
+        Returns
+        -------
+        Any
+            The response object (a list for batches), or None for
+            notifications.
+        """
+        if isinstance(request, list):
+            if not request:
+                return self._error(None, RpcError(INVALID_REQUEST, "Empty batch"))
+            responses = [r for r in (self._dispatch_one(item) for item in request) if r is not None]
+            return responses or None
+        return self._dispatch_one(request)
+
+    def _dispatch_one(self, request: Any) -> dict[str, Any] | None:
+        if (
+            not isinstance(request, dict)
+            or request.get("jsonrpc") != "2.0"
+            or not isinstance(request.get("method"), str)
+        ):
+            return self._error(None, RpcError(INVALID_REQUEST, "Invalid request"))
+
+        request_id = request.get("id")
+        is_notification = "id" not in request
+        try:
+            with self._lock:
+                self._requests += 1
+                self._sync()
+                result = self._call_method(request["method"], request.get("params"))
+        except RpcError as e:
+            return None if is_notification else self._error(request_id, e)
+        except Exception as e:
+            error = RpcError(INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+            return None if is_notification else self._error(request_id, error)
+
+        if is_notification:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": to_jsonable(result)}
+
+    @staticmethod
+    def _error(request_id: Any, error: RpcError) -> dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": request_id, "error": error.to_dict()}
+
+    def _call_method(self, method: str, params: Any) -> Any:
+        if method == "call":
+            return self._evaluate(self._params_chain(params))
+        if method == "transaction":
+            return self._transaction(params)
+        if method == "status":
+            return self._status()
+        if method == "refresh":
+            self.refresh()
+            return self._status()
+        if method == "shutdown":
+            self._running = False
+            for callback in self._on_shutdown:
+                callback()
+            return None
+
+        if params is None:
+            step: Any = [method]
+        elif isinstance(params, list):
+            step = [method, *params]
+        elif isinstance(params, dict):
+            step = {"method": method, "args": [], "kwargs": params}
+        else:
+            raise RpcError(INVALID_PARAMS, "Params must be an array or an object")
+        return self._evaluate([step])
+
+    @staticmethod
+    def _params_chain(params: Any) -> list[Any]:
+        chain = params.get("chain") if isinstance(params, dict) else params
+        if not isinstance(chain, list) or not chain:
+            raise RpcError(INVALID_PARAMS, "Expected a non-empty 'chain'")
+        return chain
+
+    def _status(self) -> dict[str, Any]:
+        return {
+            "root": str(self.rejig.root),
+            "files": len(self.rejig.files),
+            "dry_run": self.rejig.dry_run,
+            "indexed": self.symbols.built,
+            "requests": self._requests,
+        }
+
+    def _transaction(self, params: Any) -> dict[str, Any]:
+        """Evaluate chains in one transaction, committing only if all succeed."""
+        calls = params.get("calls") if isinstance(params, dict) else None
+        if not isinstance(calls, list) or not calls:
+            raise RpcError(INVALID_PARAMS, "Expected a non-empty 'calls' list of chains")
+        commit = params.get("commit", True)
+
+        with self.rejig.transaction() as tx:
+            results = [self._evaluate(self._params_chain(chain)) for chain in calls]
+            failed = any(isinstance(r, (Result, BatchResult)) and not r for r in results)
+            response: dict[str, Any] = {"results": results, "preview": tx.preview()}
+            if commit and not failed:
+                response["commit"] = tx.commit()
+            else:
+                response["commit"] = tx.rollback()
+        return response
+
+    def _evaluate(self, chain: list[Any]) -> Any:
+        """Evaluate a chain of attribute calls starting at the Rejig instance."""
+        value: Any = self.rejig
+        for step in chain:
+            value = self._step(value, *_parse_step(step))
+        return value
+
+    def _step(self, obj: Any, name: str, args: list[Any], kwargs: dict[str, Any]) -> Any:
+        if name.startswith("_") or (obj is self.rejig and name == "transaction"):
+            raise RpcError(METHOD_NOT_FOUND, f"Method not found: {name}")
+        args = [self._decode(a) for a in args]
+        kwargs = {k: self._decode(v) for k, v in kwargs.items()}
+
+        if obj is self.rejig and name in ("find_class", "find_function"):
+            return self._find(name, args, kwargs)
+
+        try:
+            attr = getattr(obj, name)
+        except AttributeError:
+            raise RpcError(METHOD_NOT_FOUND, f"{type(obj).__name__} has no attribute {name!r}") from None
+        if not callable(attr):
+            if args or kwargs:
+                raise RpcError(INVALID_PARAMS, f"{type(obj).__name__}.{name} is not callable")
+            return attr
+
+        try:
+            inspect.signature(attr).bind(*args, **kwargs)
+        except TypeError as e:
+            raise RpcError(INVALID_PARAMS, f"{name}: {e}") from None
+        except ValueError:
+            pass  # No signature available; let the call decide
+        return attr(*args, **kwargs)
+
+    def _find(self, name: str, args: list[Any], kwargs: dict[str, Any]) -> Target:
+        """Resolve find_class / find_function through the symbol index."""
+        method = getattr(self.rejig, name)
+        try:
+            bound = inspect.signature(method).bind(*args, **kwargs)
+        except TypeError as e:
+            raise RpcError(INVALID_PARAMS, f"{name}: {e}") from None
+        symbol = next(iter(bound.arguments.values()))
+        if not isinstance(symbol, str):
+            raise RpcError(INVALID_PARAMS, f"{name}: expected a name, got {symbol!r}")
+
+        path = self.symbols.locate("class" if name == "find_class" else "function", symbol)
+        if path is None:
+            # Search an empty working set: the target reports "not found"
+            # exactly as a full scan would, without parsing every file.
+            return getattr(self.rejig.restrict_to([]), name)(symbol)
+        if name == "find_class":
+            from rejig.targets.python.class_ import ClassTarget
+
+            return ClassTarget(self.rejig, symbol, path)
+        from rejig.targets.python.function import FunctionTarget
+
+        return FunctionTarget(self.rejig, symbol, path)
+
+    def _decode(self, value: Any) -> Any:
+        """Turn ``{"$path": ...}`` arguments into paths resolved against root."""
+        if isinstance(value, dict):
+            if set(value) == {"$path"} and isinstance(value["$path"], str):
+                path = Path(value["$path"])
+                return path if path.is_absolute() else self.rejig.root / path
+            return {k: self._decode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._decode(v) for v in value]
+        return value
+
+    # -------------------------------------------------------------------------
+    # Transports
+    # -------------------------------------------------------------------------
+
+    def serve_stdio(self, stdin: IO[str] | None = None, stdout: IO[str] | None = None) -> None:
+        """Serve line-delimited JSON-RPC until EOF or a shutdown request.
+
+        Parameters
+        ----------
+        stdin : IO[str] | None
+            Stream to read requests from (default ``sys.stdin``).
+        stdout : IO[str] | None
+            Stream to write responses to (default ``sys.stdout``).
+        """
+        stdin = stdin if stdin is not None else sys.stdin
+        stdout = stdout if stdout is not None else sys.stdout
+        for line in stdin:
+            if not line.strip():
+                continue
+            response = self.handle(line)
+            if response is not None:
+                stdout.write(response + "\n")
+                stdout.flush()
+            if not self._running:
+                break
+
+    def serve_unix(self, socket_path: str | Path, ready: threading.Event | None = None) -> None:
+        """Serve line-delimited JSON-RPC on a Unix socket until shutdown.
+
+        Each connection is handled on its own thread; requests are executed
+        one at a time against the shared Rejig instance.
+
+        Parameters
+        ----------
+        socket_path : str | Path
+            Path of the socket to create. A stale socket at this path is
+            replaced.
+        ready : threading.Event | None
+            Set once the socket is accepting connections.
+        """
+        socket_path = str(socket_path)
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.unlink(socket_path)
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for raw in self.rfile:
+                    line = raw.decode("utf-8")
+                    if not line.strip():
+                        continue
+                    response = server.handle(line)
+                    if response is not None:
+                        self.wfile.write(response.encode("utf-8") + b"\n")
+                        self.wfile.flush()
+                    if not server._running:
+                        break
+
+        class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        with UnixServer(socket_path, Handler) as unix_server:
+            def stop() -> None:
+                # shutdown() waits for serve_forever(), so it can't run on a handler thread
+                threading.Thread(target=unix_server.shutdown, daemon=True).start()
+
+            self._on_shutdown.append(stop)
+            if ready is not None:
+                ready.set()
+            try:
+                unix_server.serve_forever(poll_interval=0.1)
+            finally:
+                self._on_shutdown.remove(stop)
+                if os.path.exists(socket_path):
+                    os.unlink(socket_path)
@@ -0,0 +1,141 @@
+"""Symbol index: which file defines each class and module-level function.
+
+``Rejig.find_class`` and ``Rejig.find_function`` locate a name by parsing
+files in working-set order until one defines it. A long-running server
+answers the same lookups over and over, so it records the names each file
+defines once and resolves lookups from memory afterwards.
+
+Per-file entries are kept in the Rejig analysis cache, so rebuilding the
+index only re-parses files that changed.
+"""
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rejig.core.rejig import Rejig
+
+# Cache namespace for per-file symbol names
+CACHE_NAMESPACE = "symbols"
+
+
+def collect_symbols(code: str) -> dict[str, list[str]]:
+    """Collect the names of the classes and functions a module defines.
+
+    Names are listed the way ``find_class_line`` and ``find_function_line``
+    see them: every class outside a function (nested classes included) and
+    every function outside a class. Uses ``ast``, which is much faster than
+    a libcst parse with position metadata; targets still confirm the
+    definition in the located file.
+
+    Raises
+    ------
+    SyntaxError
+        If the code doesn't parse.
+    """
+    classes: list[str] = []
+    functions: list[str] = []
+    pending: list[tuple[ast.AST, bool]] = [(ast.parse(code), False)]
+    while pending:
+        node, in_class = pending.pop()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                classes.append(child.name)
+                pending.append((child, True))
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if not in_class:
+                    functions.append(child.name)
+            elif isinstance(child, ast.stmt):
+                pending.append((child, in_class))
+    return {"classes": classes, "functions": functions}
+
+
+class SymbolIndex:
+    """Index of the files defining each class and function name.
+
+    Parameters
+    ----------
+    rejig : Rejig
+        The parent Rejig instance.
+
+    Examples
+    --------
+    >>> index = SymbolIndex(rj)
+    >>> index.build()
+    >>> index.locate("class", "User")
+    PosixPath('/project/myapp/models.py')
+    """
+
+    def __init__(self, rejig: Rejig) -> None:
+        self._rejig = rejig
+        self._definitions: dict[str, dict[str, list[Path]]] = {"class": {}, "function": {}}
+        self._built = False
+
+    @property
+    def built(self) -> bool:
+        """Whether the index has been built since it was last invalidated."""
+        return self._built
+
+    def invalidate(self) -> None:
+        """Forget the index so the next lookup rebuilds it."""
+        self._built = False
+
+    def build(self) -> None:
+        """Scan the working set once, reusing cached entries of unchanged files."""
+        cache = self._rejig.cache
+        self._definitions = {"class": {}, "function": {}}
+
+        for file_path in self._rejig.files:
+            data = cache.get(CACHE_NAMESPACE, file_path)
+            if data is None:
+                try:
+                    data = collect_symbols(file_path.read_text())
+                except Exception:
+                    data = {"classes": [], "functions": []}
+                cache.put(CACHE_NAMESPACE, file_path, data)
+            for kind, key in (("class", "classes"), ("function", "functions")):
+                for name in data[key]:
+                    files = self._definitions[kind].setdefault(name, [])
+                    if not files or files[-1] != file_path:
+                        files.append(file_path)
+
+        cache.prune(CACHE_NAMESPACE, set(self._rejig.files))
+        cache.save()
+        self._built = True
+
+    def _lookup(self, kind: str, name: str) -> Path | None:
+        files = self._definitions[kind].get(name)
+        return files[0] if files else None
+
+    def _is_current(self, path: Path) -> bool:
+        return self._rejig.cache.get(CACHE_NAMESPACE, path) is not None
+
+    def locate(self, kind: str, name: str) -> Path | None:
+        """Get the first file in working-set order that defines a name.
+
+        The answer is checked against the file on disk: if the file has
+        changed, or the name isn't indexed, the index is rebuilt (re-parsing
+        only changed files) before answering.
+
+        Parameters
+        ----------
+        kind : str
+            "class" or "function".
+        name : str
+            Name of the class or function.
+
+        Returns
+        -------
+        Path | None
+            The defining file, or None if no file defines the name.
+        """
+        if kind not in self._definitions:
+            raise ValueError(f"Unknown symbol kind: {kind!r}")
+        if self._built:
+            path = self._lookup(kind, name)
+            if path is not None and self._is_current(path):
+                return path
+        self.build()
+        return self._lookup(kind, name)
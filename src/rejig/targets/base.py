@@ -29,6 +29,7 @@ from rejig.core.results import BatchResult, ErrorResult, Result
 if TYPE_CHECKING:
     from typing import Self
 
+    from rejig.core.baseline import Baseline
     from rejig.core.rejig import Rejig
 
 
@@ -1236,30 +1237,132 @@ class FindingTargetList(TargetList[FT], Generic[FT, E]):
         )
         return self._create_list(sorted_targets)
 
+    # ===== Baselines =====
+
+    def fingerprints(self) -> list[str]:
+        """Compute stable fingerprints for the findings.
+
+        Returns
+        -------
+        list[str]
+            One fingerprint per finding, in list order. See
+            ``rejig.core.baseline`` for how they are built.
+        """
+        from rejig.core.baseline import fingerprint_findings
+
+        return fingerprint_findings((t.finding for t in self._targets), self._rejig.root)
+
+    def to_baseline(self) -> Baseline:
+        """Create a baseline accepting all findings in this list.
+
+        Returns
+        -------
+        Baseline
+            Baseline to save and later pass to ``new_since``.
+
+        Examples
+        --------
+        >>> rj.find_security_issues().to_baseline().save("security-baseline.json")
+        """
+        from rejig.core.baseline import Baseline
+
+        return Baseline.from_findings((t.finding for t in self._targets), self._rejig.root)
+
+    def new_since(self, baseline: Baseline | str | Path) -> Self:
+        """Filter to findings not present in a baseline.
+
+        Parameters
+        ----------
+        baseline : Baseline | str | Path
+            A baseline, or the path of a baseline file. A missing file counts
+            as an empty baseline.
+
+        Returns
+        -------
+        Self
+            Findings whose fingerprint is not in the baseline.
+
+        Examples
+        --------
+        >>> new = rj.find_security_issues().new_since("security-baseline.json")
+        >>> if new:
+        ...     print(new.summary())
+        """
+        from rejig.core.baseline import Baseline
+
+        if not isinstance(baseline, Baseline):
+            baseline = Baseline.load(baseline)
+        return self._create_list(
+            [t for t, fp in zip(self._targets, self.fingerprints()) if fp not in baseline]
+        )
+
     # ===== Output methods =====
 
-    def to_list_of_dicts(self) -> list[dict]:
-        """Convert to list of dictionaries for serialization.
+    def _to_dict(self, target: FT) -> dict:
+        """Convert one finding to a dictionary for serialization.
 
         Returns base fields common to all finding types.
         Subclasses can override to add additional fields.
+        """
+        return {
+            "type": target.type.name,
+            "file": str(target.file_path),
+            "line": target.line_number,
+            "name": target.name,
+            "message": target.message,
+            "severity": target.severity,
+        }
+
+    def to_list_of_dicts(self) -> list[dict]:
+        """Convert to list of dictionaries for serialization.
 
         Returns
         -------
         list[dict]
             List of finding dictionaries.
         """
-        return [
-            {
-                "type": t.type.name,
-                "file": str(t.file_path),
-                "line": t.line_number,
-                "name": t.name,
-                "message": t.message,
-                "severity": t.severity,
-            }
-            for t in self._targets
-        ]
+        return [self._to_dict(t) for t in self._targets]
+
+    def write_report(
+        self,
+        path: str | Path,
+        format: str | None = None,
+        compress: bool | None = None,
+    ) -> Result:
+        """Stream the findings to a report file.
+
+        Findings are serialized one at a time, so memory use doesn't grow
+        with the size of the report.
+
+        Parameters
+        ----------
+        path : str | Path
+            Destination file. A ``.gz`` suffix gzips the output.
+        format : str | None
+            "sarif", "jsonl", "csv" or "json". If None, guessed from the
+            file name.
+        compress : bool | None
+            Force gzip on or off regardless of the file name.
+
+        Returns
+        -------
+        Result
+            Result with the written file in ``files_changed``.
+
+        Examples
+        --------
+        >>> rj.find_security_issues().write_report("findings.sarif")
+        >>> rj.find_dead_code().write_report("dead-code.jsonl.gz")
+        """
+        from rejig.core.writers import write_report
+
+        return write_report(
+            (self._to_dict(t) for t in self._targets),
+            path,
+            format,
+            compress=compress,
+            root=self._rejig.root,
+        )
 
     def summary(self) -> str:
         """Generate a summary string of findings.
@@ -31,6 +31,9 @@ class IniTarget(Target):
     >>> ini.set("metadata", "version", "1.0.0")
     """
 
+    # File suffixes handled by this target
+    SUFFIXES: tuple[str, ...] = (".ini", ".cfg")
+
     def __init__(self, rejig: Rejig, path: str | Path) -> None:
         super().__init__(rejig)
         self.path = Path(path) if isinstance(path, str) else path
@@ -30,6 +30,9 @@ class JsonTarget(Target):
     >>> json_file.set("version", "1.0.0")
     """
 
+    # File suffixes handled by this target
+    SUFFIXES: tuple[str, ...] = (".json",)
+
     def __init__(self, rejig: Rejig, path: str | Path) -> None:
         super().__init__(rejig)
         self.path = Path(path) if isinstance(path, str) else path
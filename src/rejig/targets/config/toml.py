@@ -47,6 +47,9 @@ class TomlTarget(Target):
     >>> toml.get_section("tool.black")
     """
 
+    # File suffixes handled by this target
+    SUFFIXES: tuple[str, ...] = (".toml",)
+
     def __init__(self, rejig: Rejig, path: str | Path) -> None:
         super().__init__(rejig)
         self.path = Path(path) if isinstance(path, str) else path
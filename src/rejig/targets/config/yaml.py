@@ -38,6 +38,9 @@ class YamlTarget(Target):
     >>> yaml_file.set("database.port", 5432)
     """
 
+    # File suffixes handled by this target
+    SUFFIXES: tuple[str, ...] = (".yaml", ".yml")
+
     def __init__(self, rejig: Rejig, path: str | Path) -> None:
         super().__init__(rejig)
         self.path = Path(path) if isinstance(path, str) else path
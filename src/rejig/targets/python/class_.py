@@ -612,7 +612,7 @@ class ClassTarget(Target):
         return self._transform(transformer)
 
     def move_to(self, destination: str | Target) -> Result:
-        """Move this class to a different module using rope.
+        """Move this class to a different module, updating its imports.
 
         Parameters
         ----------
@@ -73,6 +73,9 @@ class FileTarget(Target):
 
     def _write_content(self, content: str) -> Result:
         """Write content to this file (internal helper)."""
+        if self._rejig.current_transaction is not None:
+            original = self._get_file_content(self.path) or ""
+            return self._write_with_diff(self.path, original, content, f"modify {self.path}")
         if self.dry_run:
             return Result(
                 success=True,
@@ -673,27 +676,28 @@ class FileTarget(Target):
         >>> result = file.remove_unused_imports()
         >>> print(result.message)
         """
-        unused = self.find_unused_imports()
-        if not unused:
-            return Result(success=True, message="No unused imports found")
-
-        # Delete in reverse order to avoid line number shifts
-        unused_sorted = sorted(
-            unused.to_list(),
-            key=lambda t: t.line_number,
-            reverse=True,
-        )
+        from rejig.imports.analyzer import remove_unused_imports_from_code
 
-        count = 0
-        for imp in unused_sorted:
-            result = imp.delete()
-            if result.success:
-                count += 1
+        content = self._get_file_content(self.path)
+        if content is None:
+            return self._operation_failed("remove_unused_imports", f"File not found: {self.path}")
+        try:
+            new_content, removed = remove_unused_imports_from_code(content)
+        except Exception as e:
+            return self._operation_failed("remove_unused_imports", f"Failed to parse file: {e}", e)
+        if not removed:
+            return Result(success=True, message="No unused imports found")
 
+        count = sum(len(info.names) for info in removed)
+        result = self._write_with_diff(self.path, content, new_content, f"remove {count} unused imports")
+        if not result.success:
+            return result
         return Result(
             success=True,
             message=f"Removed {count} unused imports from {self.path}",
-            files_changed=[self.path] if count > 0 else [],
+            files_changed=result.files_changed,
+            diff=result.diff,
+            diffs=result.diffs,
         )
 
     def add_missing_imports(self, import_mapping: dict[str, str] | None = None) -> Result:
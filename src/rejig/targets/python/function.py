@@ -484,7 +484,7 @@ class FunctionTarget(Target):
             return self._operation_failed("rename", f"Failed to rename function: {e}", e)
 
     def move_to(self, destination: str | Target) -> Result:
-        """Move this function to a different module using rope.
+        """Move this function to a different module, updating its imports.
 
         Parameters
         ----------
@@ -381,10 +381,39 @@ class RemoveImportTransformer(cst.CSTTransformer):
             code = cst.Module(body=[cst.SimpleStatementLine(body=[stmt])]).code.strip()
             if code == self.import_info.import_statement:
                 self.removed = True
-                return cst.RemovalSentinel.REMOVE
+                kept = self._kept_names(stmt)
+                if not kept:
+                    return cst.RemovalSentinel.REMOVE
+                # Only some of the statement's names are being removed
+                kept[-1] = kept[-1].with_changes(comma=cst.MaybeSentinel.DEFAULT)
+                new_stmt = stmt.with_changes(names=kept)
+                if isinstance(stmt, cst.ImportFrom):
+                    new_stmt = new_stmt.with_changes(lpar=None, rpar=None)
+                return updated_node.with_changes(
+                    body=[new_stmt if s is stmt else s for s in updated_node.body]
+                )
 
         return updated_node
 
+    def _kept_names(self, stmt: cst.Import | cst.ImportFrom) -> list[cst.ImportAlias]:
+        """Aliases of stmt that aren't in the import info."""
+        if isinstance(stmt.names, cst.ImportStar):
+            return []
+        kept = []
+        for alias in stmt.names:
+            name = cst.Module(body=[]).code_for_node(alias.name)
+            asname = (
+                alias.asname.name.value
+                if alias.asname and isinstance(alias.asname.name, cst.Name)
+                else None
+            )
+            if name in self.import_info.names and (
+                asname is None or self.import_info.aliases.get(asname) == name
+            ):
+                continue
+            kept.append(alias)
+        return kept
+
 
 class ConvertToAbsoluteTransformer(cst.CSTTransformer):
     """Transformer to convert relative imports to absolute."""
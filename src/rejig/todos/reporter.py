@@ -5,8 +5,11 @@ import csv
 import io
 import json
 from collections import Counter
+from pathlib import Path
 from typing import TYPE_CHECKING
 
+from rejig.core.results import ErrorResult, Result
+from rejig.core.writers import CsvWriter, JsonLinesWriter, JsonWriter, format_for_path, open_report
 from rejig.targets.python.todo import TodoTarget, TodoTargetList
 
 if TYPE_CHECKING:
@@ -159,20 +162,7 @@ class TodoReporter:
 
         data = {
             "summary": self.summary(),
-            "todos": [
-                {
-                    "type": todo.todo_type,
-                    "text": todo.todo_text,
-                    "file": str(todo.file_path),
-                    "line": todo.line_number,
-                    "author": todo.author,
-                    "issue_ref": todo.issue_ref,
-                    "priority": todo.priority,
-                    "is_high_priority": todo.is_high_priority,
-                    "date": todo.todo_date.isoformat() if todo.todo_date else None,
-                }
-                for todo in todos_list
-            ],
+            "todos": [_todo_to_dict(todo) for todo in todos_list],
         }
 
         return json.dumps(data, indent=indent)
@@ -219,6 +209,68 @@ class TodoReporter:
 
         return output.getvalue()
 
+    def write_report(
+        self,
+        path: str | Path,
+        format: str | None = None,
+        compress: bool | None = None,
+    ) -> Result:
+        """Stream the TODOs to a report file.
+
+        TODOs are serialized one at a time rather than building the whole
+        report in memory.
+
+        Parameters
+        ----------
+        path : str | Path
+            Destination file. A ``.gz`` suffix gzips the output.
+        format : str | None
+            "jsonl", "csv" or "json" (same layout as ``to_json()``). If
+            None, guessed from the file name.
+        compress : bool | None
+            Force gzip on or off regardless of the file name.
+
+        Returns
+        -------
+        Result
+            Result with the written file in ``files_changed``.
+
+        Examples
+        --------
+        >>> TodoReporter(rj, rj.find_todos()).write_report("todos.jsonl.gz")
+        """
+        format = format or format_for_path(path)
+        if format not in ("jsonl", "csv", "json"):
+            return ErrorResult(
+                message=f"Unknown format: {format}. Use 'jsonl', 'csv' or 'json'.",
+                operation="write_report",
+            )
+
+        path = Path(path)
+        try:
+            with open_report(path, compress) as stream:
+                if format == "jsonl":
+                    writer = JsonLinesWriter(stream)
+                elif format == "csv":
+                    writer = CsvWriter(stream)
+                else:
+                    writer = JsonWriter(stream, {"summary": self.summary()}, key="todos")
+                for todo in self._todos:
+                    writer.write(_todo_to_dict(todo))
+                writer.close()
+        except OSError as e:
+            return ErrorResult(
+                message=f"Failed to write TODO report: {e}",
+                exception=e,
+                operation="write_report",
+            )
+
+        return Result(
+            success=True,
+            message=f"Wrote {writer.count} TODOs to {path}",
+            files_changed=[path],
+        )
+
     def to_table(self) -> str:
         """Generate an ASCII table report of TODOs.
 
@@ -262,3 +314,18 @@ class TodoReporter:
             )
 
         return "\n".join(lines)
+
+
+def _todo_to_dict(todo: TodoTarget) -> dict:
+    """Convert a TODO to a dictionary for serialization."""
+    return {
+        "type": todo.todo_type,
+        "text": todo.todo_text,
+        "file": str(todo.file_path),
+        "line": todo.line_number,
+        "author": todo.author,
+        "issue_ref": todo.issue_ref,
+        "priority": todo.priority,
+        "is_high_priority": todo.is_high_priority,
+        "date": todo.todo_date.isoformat() if todo.todo_date else None,
+    }
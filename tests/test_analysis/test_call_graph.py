@@ -0,0 +1,213 @@
+"""
+Tests for rejig.analysis.call_graph module.
+
+This module tests call graph construction:
+- Function/method node collection
+- Call resolution through imports, re-exports and inheritance
+- Dynamic call marking
+- Reachability and recursion queries
+- Per-file caching of the parsed call data
+
+Coverage targets:
+- CallCollector for per-file functions, classes, imports and calls
+- CallGraph linking across modules
+- reachable_from / callers_of / find_recursive_groups
+- Cache reuse and on-disk persistence via Rejig(cache_dir=...)
+"""
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.analysis.call_graph import MODULE_NODE, CallGraph
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """Create a small package exercising cross-module calls."""
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from pkg.impl import helper\n")
+    (pkg / "impl.py").write_text(textwrap.dedent('''\
+        def helper():
+            return inner_helper()
+
+        def inner_helper():
+            return len([])
+
+        class Base:
+            def __init__(self):
+                self.setup()
+
+            def setup(self):
+                pass
+
+        class Child(Base):
+            def setup(self):
+                super().setup()
+
+            def go(self, cb):
+                cb()
+                return handlers["x"]()
+
+        def even(n):
+            return n == 0 or odd(n - 1)
+
+        def odd(n):
+            return n != 0 and even(n - 1)
+
+        def unused():
+            pass
+    '''))
+    (pkg / "cli.py").write_text(textwrap.dedent('''\
+        import os
+        from pkg import helper
+        from pkg.impl import Child, even
+
+        def main():
+            helper()
+            child = Child()
+            child.go(print)
+            even(4)
+            return os.path.join("a", "b")
+    '''))
+    return tmp_path
+
+
+# =============================================================================
+# Construction Tests
+# =============================================================================
+
+class TestCallGraphBuild:
+    """Tests for building a CallGraph from a project."""
+
+    def test_collects_nodes(self, project: Path):
+        """Every function, method and module body becomes a node."""
+        graph = Rejig(str(project)).get_call_graph()
+
+        assert "pkg.impl.helper" in graph
+        assert "pkg.impl.Child.setup" in graph
+        assert f"pkg.cli.{MODULE_NODE}" in graph
+        node = graph.get_node("pkg.impl.Child.go")
+        assert node is not None
+        assert node.short_name == "go"
+        assert node.line_number > 0
+
+    def test_resolves_reexport(self, project: Path):
+        """Calls through a package re-export resolve to the definition."""
+        graph = Rejig(str(project)).get_call_graph()
+        assert "pkg.impl.helper" in graph.get_callees("pkg.cli.main")
+
+    def test_constructor_maps_to_init(self, project: Path):
+        """Calling a class links to its (inherited) __init__."""
+        graph = Rejig(str(project)).get_call_graph()
+        assert "pkg.impl.Base.__init__" in graph.get_callees("pkg.cli.main")
+
+    def test_self_call_includes_overrides(self, project: Path):
+        """self.method() links to the method and subclass overrides."""
+        graph = Rejig(str(project)).get_call_graph()
+        callees = graph.get_callees("pkg.impl.Base.__init__")
+        assert callees == {"pkg.impl.Base.setup", "pkg.impl.Child.setup"}
+
+    def test_super_call(self, project: Path):
+        """super().method() resolves to the base class method."""
+        graph = Rejig(str(project)).get_call_graph()
+        assert "pkg.impl.Base.setup" in graph.get_callees("pkg.impl.Child.setup")
+
+    def test_dynamic_calls_marked(self, project: Path):
+        """Calls through parameters and subscripts are flagged as dynamic."""
+        graph = Rejig(str(project)).get_call_graph()
+        dynamic = {site.expression for site in graph.get_dynamic_calls()}
+        assert "cb" in dynamic
+        assert 'handlers["x"]' in dynamic
+
+    def test_builtins_and_external_not_dynamic(self, project: Path):
+        """Builtins and third-party calls are resolved, not dynamic."""
+        graph = Rejig(str(project)).get_call_graph()
+        sites = graph.get_call_sites("pkg.cli.main")
+        by_expr = {site.expression: site for site in sites}
+        assert by_expr["os.path.join"].callee == "os.path.join"
+        assert not by_expr["os.path.join"].dynamic
+
+    def test_syntax_error_skipped(self, project: Path):
+        """Files that fail to parse do not break the build."""
+        (project / "pkg" / "broken.py").write_text("def (:\n")
+        graph = Rejig(str(project)).get_call_graph()
+        assert "pkg.impl.helper" in graph
+
+
+# =============================================================================
+# Query Tests
+# =============================================================================
+
+class TestCallGraphQueries:
+    """Tests for reachability and recursion queries."""
+
+    def test_reachable_from(self, project: Path):
+        """reachable_from returns the transitive callees of entry points."""
+        graph = Rejig(str(project)).get_call_graph()
+        reached = graph.reachable_from("main")
+        assert "pkg.impl.inner_helper" in reached
+        assert "pkg.impl.odd" in reached
+        assert "pkg.impl.unused" not in reached
+
+    def test_callers_of(self, project: Path):
+        """callers_of returns every function that can reach the target."""
+        graph = Rejig(str(project)).get_call_graph()
+        callers = graph.callers_of("pkg.impl.inner_helper")
+        assert "pkg.impl.helper" in callers
+        assert "pkg.cli.main" in callers
+
+    def test_can_reach(self, project: Path):
+        graph = Rejig(str(project)).get_call_graph()
+        assert graph.can_reach("pkg.cli.main", "pkg.impl.inner_helper")
+        assert not graph.can_reach("pkg.impl.unused", "pkg.impl.helper")
+
+    def test_find_recursive_groups(self, project: Path):
+        """Mutually recursive functions form one group."""
+        graph = Rejig(str(project)).get_call_graph()
+        groups = graph.find_recursive_groups()
+        assert ["pkg.impl.even", "pkg.impl.odd"] in [sorted(g) for g in groups]
+
+    def test_to_dict(self, project: Path):
+        graph = Rejig(str(project)).get_call_graph()
+        data = graph.to_dict()
+        assert "pkg.impl.helper" in data["pkg.cli.main"]
+
+
+# =============================================================================
+# Cache Tests
+# =============================================================================
+
+class TestCallGraphCache:
+    """Tests for per-file caching of call data."""
+
+    def test_persists_cache(self, project: Path):
+        """With cache_dir set, per-file data is written to disk."""
+        rj = Rejig(str(project), cache_dir=".cache")
+        rj.get_call_graph()
+        assert (project / ".cache" / "call_graph.json").exists()
+
+    def test_reuses_cache(self, project: Path, monkeypatch: pytest.MonkeyPatch):
+        """A second build only re-parses files that changed."""
+        Rejig(str(project), cache_dir=".cache").get_call_graph()
+
+        parsed: list[Path] = []
+        original = CallGraph._collect_file
+
+        def tracking(self, file_path):
+            parsed.append(file_path)
+            return original(self, file_path)
+
+        monkeypatch.setattr(CallGraph, "_collect_file", tracking)
+        Rejig(str(project), cache_dir=".cache").get_call_graph()
+        assert parsed == []
+
+        cli = project / "pkg" / "cli.py"
+        cli.write_text(cli.read_text() + "\ndef extra():\n    main()\n")
+        graph = Rejig(str(project), cache_dir=".cache").get_call_graph()
+        assert parsed == [cli]
+        assert "pkg.cli.main" in graph.get_callees("pkg.cli.extra")
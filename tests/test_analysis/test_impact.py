@@ -0,0 +1,203 @@
+"""
+Tests for rejig.analysis.impact module.
+
+This module tests test impact selection:
+- Module naming for src/ layouts
+- Reverse import closure from changed files to test files
+- conftest.py and project config changes
+- git-based change detection and call graph narrowing
+
+Coverage targets:
+- ImpactAnalyzer.module_name / is_test_file
+- ImpactAnalyzer.select with explicit changes
+- ImpactAnalyzer.select with since= (git diff)
+- Rejig.select_tests entry point
+"""
+from __future__ import annotations
+
+import shutil
+import subprocess
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.analysis.impact import ImpactAnalyzer, ImpactSelection
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """Create a src/ layout project with a tests directory."""
+    pkg = tmp_path / "src" / "app"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "core.py").write_text(textwrap.dedent('''\
+        def compute(x):
+            return x * 2
+
+
+        def other(x):
+            return x + 1
+    '''))
+    (pkg / "api.py").write_text("from .core import compute\n\n\ndef handle(x):\n    return compute(x)\n")
+    (pkg / "util.py").write_text("def slug(s):\n    return s.lower()\n")
+
+    tests = tmp_path / "tests"
+    tests.mkdir()
+    (tests / "conftest.py").write_text("")
+    (tests / "test_api.py").write_text(
+        "from app.api import handle\n\n\ndef test_handle():\n    assert handle(1) == 2\n"
+    )
+    (tests / "test_core.py").write_text(textwrap.dedent('''\
+        from app import core
+
+
+        def test_compute():
+            assert core.compute(1) == 2
+
+
+        class TestOther:
+            def test_other(self):
+                assert core.other(1) == 2
+    '''))
+    (tests / "test_util.py").write_text(
+        "from app.util import slug\n\n\ndef test_slug():\n    assert slug('A') == 'a'\n"
+    )
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'app'\n")
+    return tmp_path
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+# =============================================================================
+# Module Naming Tests
+# =============================================================================
+
+class TestModuleNames:
+    """Tests for package-aware module naming."""
+
+    def test_src_layout(self, project: Path):
+        analyzer = ImpactAnalyzer(Rejig(str(project)))
+        assert analyzer.module_name(project / "src" / "app" / "core.py") == "app.core"
+        assert analyzer.module_name(project / "src" / "app" / "__init__.py") == "app"
+        assert analyzer.module_name(project / "tests" / "test_api.py") == "test_api"
+
+    def test_is_test_file(self, project: Path):
+        analyzer = ImpactAnalyzer(Rejig(str(project)))
+        assert analyzer.is_test_file(Path("tests/test_api.py"))
+        assert analyzer.is_test_file(Path("tests/api_test.py"))
+        assert not analyzer.is_test_file(Path("tests/conftest.py"))
+
+
+# =============================================================================
+# Selection Tests
+# =============================================================================
+
+class TestSelectTests:
+    """Tests for selecting tests from explicit changes."""
+
+    def test_direct_import(self, project: Path):
+        selection = Rejig(str(project)).select_tests(changed=["src/app/util.py"])
+        assert isinstance(selection, ImpactSelection)
+        assert selection.node_ids == ["tests/test_util.py"]
+        assert not selection.run_all
+
+    def test_transitive_import(self, project: Path):
+        """Tests importing a module that imports the change are selected."""
+        selection = Rejig(str(project)).select_tests(changed=["src/app/core.py"])
+        assert selection.node_ids == ["tests/test_api.py", "tests/test_core.py"]
+        assert "app.api" in selection.affected_modules
+
+    def test_package_init_affects_submodule_importers(self, project: Path):
+        selection = Rejig(str(project)).select_tests(changed=["src/app/__init__.py"])
+        assert len(selection) == 3
+
+    def test_changed_test_file_selected(self, project: Path):
+        selection = Rejig(str(project)).select_tests(changed=["tests/test_util.py"])
+        assert selection.node_ids == ["tests/test_util.py"]
+
+    def test_conftest_selects_tests_below(self, project: Path):
+        selection = Rejig(str(project)).select_tests(changed=["tests/conftest.py"])
+        assert len(selection) == 3
+
+    def test_config_change_runs_all(self, project: Path):
+        selection = Rejig(str(project)).select_tests(changed=["pyproject.toml"])
+        assert selection.run_all
+        assert "pyproject.toml" in selection.reason
+        assert len(selection) == 3
+
+    def test_docs_change_selects_nothing(self, project: Path):
+        selection = Rejig(str(project)).select_tests(changed=["README.md"])
+        assert not selection
+        assert selection.to_pytest_args() == []
+
+    def test_deleted_module(self, project: Path):
+        """Importers of a deleted module are still selected."""
+        (project / "src" / "app" / "util.py").unlink()
+        selection = Rejig(str(project)).select_tests(changed=["src/app/util.py"])
+        assert selection.node_ids == ["tests/test_util.py"]
+
+    def test_uses_cache(self, project: Path):
+        rj = Rejig(str(project), cache_dir=".cache")
+        rj.select_tests(changed=["src/app/util.py"])
+        assert (project / ".cache" / "impact_imports.json").exists()
+
+
+# =============================================================================
+# Git Integration Tests
+# =============================================================================
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+class TestSelectTestsSince:
+    """Tests for selecting tests from a git diff."""
+
+    @pytest.fixture
+    def repo(self, project: Path) -> Path:
+        _git(project, "init", "-q")
+        _git(project, "add", ".")
+        _git(project, "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-qm", "init")
+        return project
+
+    def test_since(self, repo: Path):
+        util = repo / "src" / "app" / "util.py"
+        util.write_text(util.read_text().replace("lower", "casefold"))
+        selection = Rejig(str(repo)).select_tests(since="HEAD")
+        assert selection.node_ids == ["tests/test_util.py"]
+
+    def test_untracked_file(self, repo: Path):
+        (repo / "tests" / "test_new.py").write_text("def test_new():\n    pass\n")
+        selection = Rejig(str(repo)).select_tests(since="HEAD")
+        assert selection.node_ids == ["tests/test_new.py"]
+
+    def test_removed_line_looking_like_header(self, repo: Path):
+        """A removed "-- ..." line shows up as "--- ..." inside a hunk, not a file header."""
+        schema = repo / "src" / "app" / "schema.sql"
+        schema.write_text("-- a/src/app/api.py\nCREATE TABLE t (id int);\n")
+        _git(repo, "add", ".")
+        _git(repo, "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-qm", "schema")
+        schema.write_text("CREATE TABLE t (id int);\n")
+
+        files, lines = ImpactAnalyzer(Rejig(str(repo))).changed_since("HEAD")
+
+        assert files == [schema.resolve()]
+        assert list(lines) == [schema.resolve()]
+
+    def test_bad_revision_runs_all(self, repo: Path):
+        selection = Rejig(str(repo)).select_tests(since="no-such-rev")
+        assert selection.run_all
+
+    def test_call_graph_narrows_to_tests(self, repo: Path):
+        """Only tests that call the changed function are selected."""
+        core = repo / "src" / "app" / "core.py"
+        core.write_text(core.read_text().replace("x + 1", "x + 2"))
+        selection = Rejig(str(repo)).select_tests(since="HEAD", use_call_graph=True)
+        assert selection.node_ids == ["tests/test_core.py::TestOther::test_other"]
+
+    def test_call_graph_module_level_change_not_narrowed(self, repo: Path):
+        core = repo / "src" / "app" / "core.py"
+        core.write_text("CONSTANT = 1\n" + core.read_text())
+        selection = Rejig(str(repo)).select_tests(since="HEAD", use_call_graph=True)
+        assert selection.node_ids == ["tests/test_api.py", "tests/test_core.py"]
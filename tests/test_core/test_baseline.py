@@ -0,0 +1,186 @@
+"""
+Tests for rejig.core.baseline module.
+
+This module tests finding baselines:
+- Fingerprint stability
+- Baseline save/load and update
+- FindingTargetList.new_since / to_baseline
+- Rejig.restrict_to working sets
+"""
+from __future__ import annotations
+
+import json
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Baseline, Rejig
+from rejig.core.baseline import fingerprint_findings
+from rejig.security.targets import SecurityFinding, SecurityType
+
+SOURCE = textwrap.dedent('''\
+    import os
+
+
+    class Runner:
+        def run(self, cmd):
+            os.system("sh -c " + cmd)
+
+        def other(self, cmd):
+            os.system("sh -c " + cmd)
+''')
+
+
+def finding(path: Path, line: int) -> SecurityFinding:
+    """Create a shell injection finding."""
+    return SecurityFinding(
+        type=SecurityType.SHELL_INJECTION,
+        file_path=path,
+        line_number=line,
+        name="os.system",
+        message="Shell command built from non-constant data",
+    )
+
+
+# =============================================================================
+# Fingerprint Tests
+# =============================================================================
+
+class TestFingerprints:
+    """Tests for fingerprint_findings."""
+
+    def test_independent_of_line_numbers(self, tmp_path: Path):
+        """Inserting lines above a finding should not change its fingerprint."""
+        path = tmp_path / "runner.py"
+        path.write_text(SOURCE)
+        before = fingerprint_findings([finding(path, 6)], tmp_path)
+
+        path.write_text("# header\n\n" + SOURCE)
+        after = fingerprint_findings([finding(path, 8)], tmp_path)
+
+        assert before == after
+
+    def test_enclosing_symbol(self, tmp_path: Path):
+        """Identical lines in different functions should differ."""
+        path = tmp_path / "runner.py"
+        path.write_text(SOURCE)
+
+        run, other = fingerprint_findings([finding(path, 6), finding(path, 9)], tmp_path)
+
+        assert run != other
+
+    def test_independent_of_checkout_location(self, tmp_path: Path):
+        """Fingerprints should only depend on paths relative to the root."""
+        fingerprints = []
+        for name in ("a", "b"):
+            root = tmp_path / name
+            root.mkdir()
+            (root / "runner.py").write_text(SOURCE)
+            fingerprints.append(fingerprint_findings([finding(root / "runner.py", 6)], root))
+
+        assert fingerprints[0] == fingerprints[1]
+
+    def test_duplicates_numbered(self, tmp_path: Path):
+        """Identical findings in one scope should get distinct fingerprints."""
+        path = tmp_path / "dup.py"
+        path.write_text("os.system(x)\nos.system(x)\n")
+
+        first, second = fingerprint_findings([finding(path, 2), finding(path, 1)], tmp_path)
+
+        assert first != second
+        assert second.endswith(":0")
+
+
+# =============================================================================
+# Baseline Tests
+# =============================================================================
+
+class TestBaseline:
+    """Tests for the Baseline class."""
+
+    def test_save_and_load(self, tmp_path: Path):
+        """Saved baselines should load back identically."""
+        path = tmp_path / "runner.py"
+        path.write_text(SOURCE)
+        baseline = Baseline.from_findings([finding(path, 6)], tmp_path)
+
+        result = baseline.save(tmp_path / "out" / "baseline.json")
+        loaded = Baseline.load(tmp_path / "out" / "baseline.json")
+
+        assert result.success
+        assert loaded.entries == baseline.entries
+        assert loaded.entries[0]["file"] == "runner.py"
+
+    def test_load_missing(self, tmp_path: Path):
+        """A missing baseline file should load as empty."""
+        assert len(Baseline.load(tmp_path / "missing.json")) == 0
+
+    def test_load_invalid(self, tmp_path: Path):
+        """A file of the wrong format should be rejected."""
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps({"version": 99}))
+
+        with pytest.raises(ValueError):
+            Baseline.load(path)
+
+    def test_update_carries_forward_unscanned(self):
+        """Entries of files that weren't rescanned should be kept."""
+        old = Baseline([
+            {"fingerprint": "a:0", "file": "a.py", "line": 1},
+            {"fingerprint": "b:0", "file": "b.py", "line": 1, "reason": "accepted risk"},
+        ])
+        current = Baseline([{"fingerprint": "b:0", "file": "b.py", "line": 3}])
+
+        merged = old.update(current, ["b.py"])
+
+        assert [e["fingerprint"] for e in merged.entries] == ["a:0", "b:0"]
+        assert merged.entries[1]["line"] == 3
+        assert merged.entries[1]["reason"] == "accepted risk"
+
+    def test_update_replaces_all(self):
+        """Without scanned files, the new baseline should replace the old one."""
+        old = Baseline([{"fingerprint": "a:0", "file": "a.py", "line": 1}])
+
+        assert len(old.update(Baseline())) == 0
+
+
+# =============================================================================
+# FindingTargetList Integration Tests
+# =============================================================================
+
+class TestNewSince:
+    """Tests for FindingTargetList.new_since and Rejig.restrict_to."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        """Create a project with one existing finding."""
+        (tmp_path / "runner.py").write_text(SOURCE)
+        (tmp_path / "clean.py").write_text("x = 1\n")
+        return tmp_path
+
+    def test_only_new_findings(self, project: Path):
+        """Findings in the baseline should be filtered out."""
+        rj = Rejig(str(project))
+        rj.find_shell_injection_risks().to_baseline().save(project / "baseline.json")
+
+        (project / "runner.py").write_text("# moved down\n" + SOURCE)
+        (project / "clean.py").write_text("import os\nos.system('rm ' + name)\n")
+        new = Rejig(str(project)).find_shell_injection_risks().new_since(project / "baseline.json")
+
+        assert [(t.file_path.name, t.line_number) for t in new] == [("clean.py", 2)]
+
+    def test_restricted_scan(self, project: Path):
+        """A restricted Rejig should scan only its working set."""
+        rj = Rejig(str(project))
+        baseline = rj.find_shell_injection_risks().to_baseline()
+        (project / "clean.py").write_text("import os\nos.system('rm ' + name)\n")
+
+        pr = rj.restrict_to(["clean.py", "deleted.py"])
+        findings = pr.find_shell_injection_risks()
+        updated = baseline.update(findings.to_baseline(), pr.working_set, pr.root)
+
+        assert pr.files == [(project / "clean.py").resolve()]
+        assert len(findings.new_since(baseline)) == 1
+        assert updated.files == {"runner.py", "clean.py"}
+        assert len(updated) == 3
@@ -0,0 +1,108 @@
+"""
+Tests for rejig.core.cache and rejig.core.graphs.
+
+Coverage targets:
+- AnalysisCache get/put with fingerprint validation
+- Persistence, invalidation and pruning
+- Iterative reachability and Tarjan SCC helpers
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from rejig.core.cache import AnalysisCache, file_fingerprint
+from rejig.core.graphs import reachable, strongly_connected_components
+
+
+# =============================================================================
+# AnalysisCache Tests
+# =============================================================================
+
+class TestAnalysisCache:
+    """Tests for AnalysisCache."""
+
+    def test_memory_only(self, tmp_path: Path):
+        source = tmp_path / "a.py"
+        source.write_text("x = 1\n")
+        cache = AnalysisCache()
+
+        assert not cache.persistent
+        assert cache.get("ns", source) is None
+        cache.put("ns", source, {"value": 1})
+        assert cache.get("ns", source) == {"value": 1}
+
+    def test_stale_entry_ignored(self, tmp_path: Path):
+        """Entries are dropped once the file's size or mtime changes."""
+        source = tmp_path / "a.py"
+        source.write_text("x = 1\n")
+        cache = AnalysisCache()
+        cache.put("ns", source, [1])
+
+        source.write_text("x = 12\n")
+        assert cache.get("ns", source) is None
+
+    def test_persists_between_instances(self, tmp_path: Path):
+        source = tmp_path / "a.py"
+        source.write_text("x = 1\n")
+        cache_dir = tmp_path / "cache"
+
+        cache = AnalysisCache(cache_dir)
+        cache.put("ns", source, [1, 2])
+        cache.save()
+
+        assert (cache_dir / "ns.json").exists()
+        assert AnalysisCache(cache_dir).get("ns", source) == [1, 2]
+
+    def test_invalidate_and_prune(self, tmp_path: Path):
+        a = tmp_path / "a.py"
+        b = tmp_path / "b.py"
+        a.write_text("a = 1\n")
+        b.write_text("b = 1\n")
+        cache = AnalysisCache()
+        cache.put("ns", a, 1)
+        cache.put("ns", b, 2)
+
+        cache.invalidate(a)
+        assert cache.get("ns", a) is None
+        assert cache.get("ns", b) == 2
+
+        cache.prune("ns", set())
+        assert cache.get("ns", b) is None
+
+    def test_corrupt_file_ignored(self, tmp_path: Path):
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        (cache_dir / "ns.json").write_text("{not json")
+        source = tmp_path / "a.py"
+        source.write_text("")
+        assert AnalysisCache(cache_dir).get("ns", source) is None
+
+    def test_fingerprint_missing_file(self, tmp_path: Path):
+        assert file_fingerprint(tmp_path / "missing.py") is None
+
+
+# =============================================================================
+# Graph Algorithm Tests
+# =============================================================================
+
+class TestGraphAlgorithms:
+    """Tests for reachable() and strongly_connected_components()."""
+
+    def test_reachable(self):
+        successors = [[1], [2], [], [0]]
+        assert sorted(reachable(successors, [0])) == [0, 1, 2]
+        assert sorted(reachable(successors, [3])) == [0, 1, 2, 3]
+
+    def test_scc_reverse_topological(self):
+        # 0 -> 1 <-> 2 -> 3
+        successors = [[1], [2], [1, 3], []]
+        components = strongly_connected_components(successors)
+        assert [sorted(c) for c in components] == [[3], [1, 2], [0]]
+
+    def test_scc_deep_chain(self):
+        """Long chains don't hit the recursion limit."""
+        n = 50_000
+        successors = [[i + 1] for i in range(n - 1)] + [[0]]
+        components = strongly_connected_components(successors)
+        assert len(components) == 1
+        assert len(components[0]) == n
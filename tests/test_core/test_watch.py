@@ -0,0 +1,213 @@
+"""
+Tests for rejig.core.watch.
+
+Coverage targets:
+- PollingWatcher and InotifyWatcher change detection
+- WatchSession re-analyzing only changed files (and importers)
+- Finding deltas matched by fingerprint
+- Rejig.watch()
+"""
+from __future__ import annotations
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.core.watch import (
+    FindingDelta,
+    InotifyWatcher,
+    PollingWatcher,
+    WatchSession,
+    create_watcher,
+)
+
+BARE_EXCEPT = "def f():\n    try:\n        pass\n    except:\n        pass\n"
+
+
+def inotify_watcher(root: Path) -> InotifyWatcher:
+    if not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux-only")
+    try:
+        return InotifyWatcher(root)
+    except OSError as e:
+        pytest.skip(f"inotify unavailable: {e}")
+
+
+class ManualWatcher(PollingWatcher):
+    """Polling watcher that never sleeps, for deterministic tests."""
+
+    def __init__(self, root: Path) -> None:
+        super().__init__(root, interval=0)
+
+
+# =============================================================================
+# Watcher Tests
+# =============================================================================
+
+class TestPollingWatcher:
+    """Tests for PollingWatcher."""
+
+    def test_created_modified_deleted(self, tmp_path: Path):
+        (tmp_path / "a.py").write_text("x = 1\n")
+        (tmp_path / "b.py").write_text("y = 1\n")
+        watcher = PollingWatcher(tmp_path)
+
+        assert watcher.poll() == set()
+        (tmp_path / "a.py").write_text("x = 22\n")
+        (tmp_path / "b.py").unlink()
+        (tmp_path / "c.py").write_text("")
+        (tmp_path / "notes.txt").write_text("ignored")
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "hook.py").write_text("")
+
+        assert watcher.poll() == {tmp_path / "a.py", tmp_path / "b.py", tmp_path / "c.py"}
+        assert watcher.poll(timeout=0.01) == set()
+
+    def test_create_watcher_polling(self, tmp_path: Path):
+        assert isinstance(create_watcher(tmp_path, polling=True), PollingWatcher)
+
+
+class TestInotifyWatcher:
+    """Tests for InotifyWatcher."""
+
+    def test_file_changes(self, tmp_path: Path):
+        (tmp_path / "a.py").write_text("x = 1\n")
+        with inotify_watcher(tmp_path) as watcher:
+            assert watcher.poll() == set()
+            (tmp_path / "a.py").write_text("x = 2\n")
+            (tmp_path / "data.json").write_text("{}")
+
+            assert watcher.poll(timeout=2) == {tmp_path / "a.py"}
+
+    def test_new_and_removed_directories(self, tmp_path: Path):
+        with inotify_watcher(tmp_path) as watcher:
+            (tmp_path / "pkg").mkdir()
+            (tmp_path / "pkg" / "mod.py").write_text("")
+            changed = watcher.poll(timeout=2)
+            # The file may be reported by the directory scan or as an event
+            changed |= watcher.poll(timeout=0.1)
+            assert tmp_path / "pkg" / "mod.py" in changed
+
+            (tmp_path / "pkg" / "mod.py").write_text("x = 1\n")
+            assert watcher.poll(timeout=2) == {tmp_path / "pkg" / "mod.py"}
+
+            shutil.move(str(tmp_path / "pkg"), str(tmp_path.parent / f"{tmp_path.name}-moved"))
+            assert tmp_path / "pkg" in watcher.poll(timeout=2)
+
+
+# =============================================================================
+# WatchSession Tests
+# =============================================================================
+
+class TestWatchSession:
+    """Tests for incremental re-analysis."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        (tmp_path / "a.py").write_text(BARE_EXCEPT)
+        (tmp_path / "b.py").write_text("x = 1\n")
+        (tmp_path / "c.py").write_text("import a\n")
+        return tmp_path
+
+    def session(self, project: Path, scope: str = "file") -> tuple[WatchSession, list[list[Path]]]:
+        """Session with a bare-except analyzer recording the files it saw."""
+        seen: list[list[Path]] = []
+
+        def analyzer(rj: Rejig):
+            seen.append(sorted(p.name for p in rj.files))
+            return rj.find_bare_excepts()
+
+        session = WatchSession(Rejig(str(project)), watcher=ManualWatcher(project))
+        session.register("bare", analyzer, scope=scope)
+        return session, seen
+
+    def test_start_reports_all(self, project: Path):
+        session, seen = self.session(project)
+        deltas: list[FindingDelta] = []
+        session.subscribe(deltas.append)
+
+        result = session.start()
+
+        assert [len(d.added) for d in result] == [1]
+        assert deltas == result
+        assert seen == [["a.py", "b.py", "c.py"]]
+        assert [t.file_path for t in session.findings("bare")] == [project / "a.py"]
+
+    def test_only_changed_files_reanalyzed(self, project: Path):
+        session, seen = self.session(project)
+        session.start()
+        (project / "b.py").write_text(BARE_EXCEPT + "\n\n")
+
+        deltas = session.poll()
+
+        assert seen[-1] == ["b.py"]
+        assert len(deltas) == 1
+        assert [t.file_path for t in deltas[0].added] == [project / "b.py"]
+        assert deltas[0].removed == []
+        assert len(session.findings("bare")) == 2
+
+    def test_moved_finding_is_not_a_change(self, project: Path):
+        """Findings are matched by fingerprint, not line number."""
+        session, _ = self.session(project)
+        session.start()
+        notified: list[FindingDelta] = []
+        session.subscribe(notified.append)
+        (project / "a.py").write_text("import os\n\n\n" + BARE_EXCEPT)
+
+        assert session.poll() == []
+        assert notified == []
+        assert session.findings("bare")[0].line_number == 7
+
+    def test_fixed_and_deleted_files(self, project: Path):
+        session, _ = self.session(project)
+        session.start()
+        (project / "b.py").write_text(BARE_EXCEPT)
+        session.poll()
+
+        (project / "a.py").write_text("def f():\n    pass\n")
+        (project / "b.py").unlink()
+        deltas = session.poll()
+
+        assert sorted(t.file_path.name for t in deltas[0].removed) == ["a.py", "b.py"]
+        assert session.findings("bare") == []
+
+    def test_dependents_scope(self, project: Path):
+        """Importers of a changed module are re-analyzed with it."""
+        session, seen = self.session(project, scope="dependents")
+        session.start()
+
+        session.update(["a.py"])
+
+        assert seen[-1] == ["a.py", "c.py"]
+
+    def test_project_scope(self, project: Path):
+        session, seen = self.session(project, scope="project")
+        session.start()
+
+        session.update([project / "b.py"])
+
+        assert seen[-1] == ["a.py", "b.py", "c.py"]
+
+    def test_register_validation(self, project: Path):
+        session = WatchSession(Rejig(str(project)), watcher=ManualWatcher(project))
+        session.register("bare", "find_bare_excepts")
+
+        with pytest.raises(ValueError):
+            session.register("bare", "find_bare_excepts")
+        with pytest.raises(ValueError):
+            session.register("other", "find_bare_excepts", scope="everything")
+
+    def test_rejig_watch(self, project: Path):
+        session = Rejig(str(project)).watch(["find_bare_excepts"], polling=True, interval=0)
+
+        deltas = session.start()
+
+        assert isinstance(session.watcher, PollingWatcher)
+        assert deltas[0].analyzer == "find_bare_excepts"
+        assert len(deltas[0].added) == 1
+        (project / "b.py").write_text(BARE_EXCEPT)
+        assert len(session.poll(timeout=1)[0].added) == 1
+        session.close()
@@ -0,0 +1,221 @@
+"""
+Tests for rejig.core.writers module.
+
+This module tests the streaming report writers:
+- JSON Lines, CSV and JSON documents
+- SARIF with deduplicated rule and artifact tables
+- gzip output and format detection
+- write_report on finding lists and reporters
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.core.writers import (
+    CsvWriter,
+    JsonLinesWriter,
+    JsonWriter,
+    SarifWriter,
+    format_for_path,
+    write_report,
+)
+from rejig.security.reporter import SecurityReporter
+from rejig.todos.reporter import TodoReporter
+
+
+def record(i: int, file: str = "a.py", type: str = "SQL_INJECTION") -> dict:
+    """Create a finding record."""
+    return {"type": type, "file": file, "line": i, "message": f"finding {i}", "severity": "high"}
+
+
+# =============================================================================
+# Writer Tests
+# =============================================================================
+
+class TestWriters:
+    """Tests for the individual writers."""
+
+    def test_jsonl(self):
+        """Should write one JSON object per line."""
+        out = io.StringIO()
+        writer = JsonLinesWriter(out)
+        for i in range(3):
+            writer.write(record(i))
+        writer.close()
+
+        lines = out.getvalue().splitlines()
+        assert [json.loads(line)["line"] for line in lines] == [0, 1, 2]
+
+    def test_csv_fields_from_first_record(self):
+        """Should take the header from the first record and blank out None."""
+        out = io.StringIO()
+        writer = CsvWriter(out)
+        writer.write({**record(1), "name": None})
+        writer.close()
+
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        assert rows == [{**{k: str(v) for k, v in record(1).items()}, "name": ""}]
+
+    @pytest.mark.parametrize("count", [0, 1, 3])
+    def test_json_document(self, count: int):
+        """Should produce a valid document with header, records and trailer."""
+        out = io.StringIO()
+        writer = JsonWriter(out, {"project_root": "/src"})
+        for i in range(count):
+            writer.write(record(i))
+        writer.close({"summary": {"total": count}})
+
+        data = json.loads(out.getvalue())
+        assert list(data) == ["project_root", "findings", "summary"]
+        assert len(data["findings"]) == count
+        assert data["summary"] == {"total": count}
+
+    def test_sarif_tables_deduplicated(self, tmp_path: Path):
+        """Rules and artifacts should be stored once and referenced by index."""
+        out = io.StringIO()
+        writer = SarifWriter(out, rules=[{"id": "SQL_INJECTION"}], root=tmp_path)
+        writer.write(record(1, str(tmp_path / "a.py")))
+        writer.write(record(2, str(tmp_path / "b.py"), "UNSAFE_EVAL"))
+        writer.write(record(3, str(tmp_path / "a.py"), "UNSAFE_EVAL"))
+        writer.close()
+
+        run = json.loads(out.getvalue())["runs"][0]
+        assert [r["id"] for r in run["tool"]["driver"]["rules"]] == ["SQL_INJECTION", "UNSAFE_EVAL"]
+        assert [a["location"]["uri"] for a in run["artifacts"]] == ["a.py", "b.py"]
+        assert [r["ruleIndex"] for r in run["results"]] == [0, 1, 1]
+        locations = [r["locations"][0]["physicalLocation"]["artifactLocation"] for r in run["results"]]
+        assert [loc["index"] for loc in locations] == [0, 1, 0]
+        assert locations[0]["uriBaseId"] == "SRCROOT"
+        assert run["originalUriBaseIds"]["SRCROOT"]["uri"] == tmp_path.resolve().as_uri() + "/"
+
+    def test_sarif_empty(self):
+        """An empty log should still be valid SARIF."""
+        out = io.StringIO()
+        SarifWriter(out).close()
+
+        data = json.loads(out.getvalue())
+        assert data["version"] == "2.1.0"
+        assert data["runs"][0]["results"] == []
+
+
+# =============================================================================
+# write_report Tests
+# =============================================================================
+
+class TestWriteReport:
+    """Tests for write_report."""
+
+    @pytest.mark.parametrize("name, expected", [
+        ("out.sarif", "sarif"),
+        ("out.sarif.gz", "sarif"),
+        ("out.jsonl", "jsonl"),
+        ("out.CSV", "csv"),
+        ("out.txt", None),
+    ])
+    def test_format_for_path(self, name: str, expected: str | None):
+        """Should guess formats from file names."""
+        assert format_for_path(name) == expected
+
+    def test_gzip(self, tmp_path: Path):
+        """Paths ending in .gz should be compressed."""
+        path = tmp_path / "out" / "findings.jsonl.gz"
+
+        result = write_report((record(i) for i in range(100)), path)
+
+        assert result.success
+        assert result.data["count"] == 100
+        with gzip.open(path, "rt") as f:
+            assert len(f.read().splitlines()) == 100
+
+    def test_json_summary(self, tmp_path: Path):
+        """JSON reports should end with a summary of what was written."""
+        path = tmp_path / "findings.json"
+
+        write_report([record(1), record(2, type="UNSAFE_EVAL")], path, summary={"files_scanned": 2})
+        summary = json.loads(path.read_text())["summary"]
+
+        assert summary["total_findings"] == 2
+        assert summary["high"] == 2
+        assert summary["files_scanned"] == 2
+        assert summary["by_type"] == {"SQL_INJECTION": 1, "UNSAFE_EVAL": 1}
+
+    def test_unknown_format(self, tmp_path: Path):
+        """Unknown formats should return an error result."""
+        result = write_report([], tmp_path / "out.txt")
+
+        assert not result.success
+        assert "Unknown format" in result.message
+
+
+# =============================================================================
+# Integration Tests
+# =============================================================================
+
+class TestReportIntegration:
+    """Tests for streaming reports from finding lists and reporters."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        """Create a project with security findings and TODOs."""
+        (tmp_path / "config.py").write_text('password = "mysupersecretpassword"\n')
+        (tmp_path / "db.py").write_text(textwrap.dedent('''\
+            # TODO: use parameters
+            def find(cursor, name):
+                cursor.execute("SELECT * FROM users WHERE name = '" + name + "'")
+        '''))
+        return tmp_path
+
+    def test_finding_list_write_report(self, project: Path):
+        """Finding lists should write all their findings."""
+        rj = Rejig(str(project))
+        findings = rj.find_sql_injection_risks()
+
+        result = findings.write_report(project / "sql.csv")
+        rows = list(csv.DictReader((project / "sql.csv").open()))
+
+        assert result.success
+        assert [row["line"] for row in rows] == ["3"]
+        assert rows[0]["code_snippet"].startswith("cursor.execute")
+
+    def test_security_reporter_streams(self, project: Path):
+        """The security reporter should stream all scanner findings."""
+        reporter = SecurityReporter(Rejig(str(project)))
+        expected = reporter.generate_full_report().total_findings
+
+        result = reporter.generate_security_report(project / "report.sarif.gz", format="sarif")
+        with gzip.open(project / "report.sarif.gz", "rt") as f:
+            run = json.load(f)["runs"][0]
+
+        assert result.success
+        assert run["tool"]["driver"]["name"] == "rejig-security"
+        assert len(run["results"]) == expected
+        assert {a["location"]["uri"] for a in run["artifacts"]} == {"config.py", "db.py"}
+
+    def test_security_reporter_jsonl_in_memory(self, project: Path):
+        """Without a path, JSON Lines should be returned as a string."""
+        reporter = SecurityReporter(Rejig(str(project)))
+
+        result = reporter.generate_security_report(format="jsonl")
+
+        assert result.success
+        assert {json.loads(line)["file"].rsplit("/", 1)[-1] for line in result.data.splitlines()} == {
+            "config.py", "db.py",
+        }
+
+    def test_todo_reporter(self, project: Path):
+        """The TODO reporter should stream TODOs in the to_json() layout."""
+        rj = Rejig(str(project))
+        reporter = TodoReporter(rj, rj.find_todos())
+
+        result = reporter.write_report(project / "todos.json")
+
+        assert result.success
+        assert json.loads((project / "todos.json").read_text()) == json.loads(reporter.to_json())
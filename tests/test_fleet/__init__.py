@@ -0,0 +1 @@
+"""Tests for rejig.fleet module."""
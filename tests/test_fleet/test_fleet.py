@@ -0,0 +1,180 @@
+"""
+Tests for rejig.fleet.runner module.
+
+This module tests running one script over many repositories:
+- Callable, rejig-code and Patch scripts
+- Per-repository transactions (rollback when an operation fails)
+- Exceptions, timeouts and missing repositories
+- The concurrency limit and the combined summary
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.core.results import ErrorResult, Result
+from rejig.fleet import Fleet, FleetResult, RepoResult
+from rejig.fleet.runner import run_in_repo
+from rejig.patching import parse_patch
+
+ORIGINAL = "import os\nimport sys\n\nprint(sys.argv)\n"
+CLEANED = "import sys\n\nprint(sys.argv)\n"
+
+
+# Scripts are module-level so they pickle under any start method
+
+def remove_unused(rj: Rejig) -> Result:
+    return rj.file("main.py").remove_unused_imports()
+
+
+def remove_then_fail(rj: Rejig) -> list[Result]:
+    return [
+        rj.file("main.py").remove_unused_imports(),
+        ErrorResult(message="second step failed"),
+    ]
+
+
+def explode(rj: Rejig) -> None:
+    raise RuntimeError("boom")
+
+
+def sleep_forever(rj: Rejig) -> None:
+    time.sleep(60)
+
+
+def make_repo(root: Path, content: str = ORIGINAL) -> Path:
+    root.mkdir()
+    (root / "main.py").write_text(content)
+    return root
+
+
+@pytest.fixture
+def repos(tmp_path: Path) -> list[Path]:
+    return [make_repo(tmp_path / f"repo{i}") for i in range(3)]
+
+
+# =============================================================================
+# run_in_repo Tests
+# =============================================================================
+
+class TestRunInRepo:
+    """Tests for the per-repository worker body."""
+
+    def test_commits_changes(self, repos: list[Path]):
+        result = run_in_repo(repos[0], remove_unused)
+
+        assert result.success
+        assert (repos[0] / "main.py").read_text() == CLEANED
+        assert result.files_changed == [repos[0] / "main.py"]
+        assert "-import os" in result.diff
+
+    def test_failure_rolls_back(self, repos: list[Path]):
+        result = run_in_repo(repos[0], remove_then_fail)
+
+        assert not result.success
+        assert "second step failed" in result.message
+        assert result.commit is None
+        assert (repos[0] / "main.py").read_text() == ORIGINAL
+
+    def test_exception_is_reported(self, repos: list[Path]):
+        result = run_in_repo(repos[0], explode)
+
+        assert not result.success
+        assert "RuntimeError: boom" in result.message
+        assert "Traceback" in result.error
+
+    def test_dry_run(self, repos: list[Path]):
+        result = run_in_repo(repos[0], remove_unused, dry_run=True)
+
+        assert result.success
+        assert "[DRY RUN]" in result.message
+        assert result.diffs
+        assert (repos[0] / "main.py").read_text() == ORIGINAL
+
+    def test_rejig_code_script(self, repos: list[Path]):
+        code = 'target = rj.file("main.py")\ntarget.remove_unused_imports()\n'
+
+        result = run_in_repo(repos[0], code)
+
+        assert result.success
+        assert len(result.results) == 1
+        assert (repos[0] / "main.py").read_text() == CLEANED
+
+    def test_patch_script(self, repos: list[Path]):
+        patch = parse_patch(
+            "--- a/main.py\n"
+            "+++ b/main.py\n"
+            "@@ -1,4 +1,3 @@\n"
+            "-import os\n"
+            " import sys\n"
+            " \n"
+            " print(sys.argv)\n"
+        )
+
+        result = run_in_repo(repos[0], patch)
+
+        assert result.success
+        assert (repos[0] / "main.py").read_text() == CLEANED
+
+
+# =============================================================================
+# Fleet Tests
+# =============================================================================
+
+class TestFleet:
+    """Tests for running a script across repositories."""
+
+    def test_runs_every_repo(self, repos: list[Path]):
+        summary = Fleet(repos, workers=2).run(remove_unused)
+
+        assert isinstance(summary, FleetResult)
+        assert summary.success
+        assert [r.root for r in summary] == [r.resolve() for r in repos]
+        assert all((r / "main.py").read_text() == CLEANED for r in repos)
+        assert len(summary.diffs) == 3
+
+    def test_failures_are_per_repo(self, tmp_path: Path, repos: list[Path]):
+        broken = tmp_path / "broken"
+        broken.mkdir()
+        missing = tmp_path / "missing"
+
+        summary = Fleet([repos[0], broken, missing]).run(remove_unused)
+
+        assert not summary.success
+        assert [r.success for r in summary] == [True, False, False]
+        assert "Not a directory" in summary.repos[2].message
+        assert len(summary.failed) == 2
+
+    def test_spawn_start_method(self, repos: list[Path]):
+        summary = Fleet(repos[:1], start_method="spawn").run(remove_unused)
+
+        assert summary.success
+        assert (repos[0] / "main.py").read_text() == CLEANED
+
+    def test_timeout_kills_worker(self, repos: list[Path]):
+        started = time.monotonic()
+
+        summary = Fleet(repos[:2], workers=2, timeout=0.5).run(sleep_forever)
+
+        assert time.monotonic() - started < 10
+        assert len(summary.timed_out) == 2
+        assert "Timed out" in summary.repos[0].message
+
+    def test_concurrency_limit(self, repos: list[Path]):
+        summary = Fleet(repos, workers=1).run(remove_unused)
+
+        assert summary.success
+        # With one worker the repositories run back to back
+        assert summary.duration >= sum(r.duration for r in summary) * 0.9
+
+    def test_summary(self, repos: list[Path]):
+        summary = Fleet(repos[:2]).run(remove_unused)
+        text = summary.summary()
+
+        assert text.startswith("Fleet: 2/2 repositories succeeded")
+        assert "[ok]" in text
+        assert "1 files" in text
+        assert isinstance(summary.repos[0], RepoResult)
@@ -3,7 +3,7 @@ Tests for rejig.imports.analyzer module.
 
 This module tests ImportAnalyzer and ImportInfo for analyzing imports:
 - Extracting imports from Python files
-- Detecting unused imports
+- Detecting unused imports with scope analysis, and removing them
 - Detecting potentially missing imports
 - Handling various import styles (regular, from, relative, star)
 - Handling aliases and TYPE_CHECKING blocks
@@ -492,6 +492,176 @@ class TestImportAnalyzerFindUnusedImports:
         assert len(star_imports) == 0
 
 
+    def test_scope_analysis(self, rejig: Rejig, tmp_path: Path):
+        """
+        Shadowed names aren't uses; __all__, string annotations and
+        TYPE_CHECKING imports used in annotations are.
+        """
+        content = textwrap.dedent('''\
+            from typing import TYPE_CHECKING
+            import json
+            from pkg import exported, api as api
+
+            if TYPE_CHECKING:
+                from decimal import Decimal
+                from fractions import Fraction
+
+            __all__ = ["exported"]
+
+
+            def f(x: "Decimal"):
+                json = x
+                return json
+        ''')
+        file_path = tmp_path / "test.py"
+        file_path.write_text(content)
+
+        unused = ImportAnalyzer(rejig).find_unused_imports(file_path)
+
+        assert [(imp.line_number, imp.names) for imp in unused] == [
+            (2, ["json"]),
+            (7, ["Fraction"]),
+        ]
+        assert unused[1].is_type_checking
+
+    def test_partially_unused_statement(self, rejig: Rejig, tmp_path: Path):
+        """
+        Only the unused names of a statement are reported.
+        """
+        file_path = tmp_path / "test.py"
+        file_path.write_text("from typing import Any, List as L, Dict\nx: Any\n")
+
+        (unused,) = ImportAnalyzer(rejig).find_unused_imports(file_path)
+
+        assert unused.names == ["List", "Dict"]
+        assert unused.aliases == {"L": "List"}
+        assert unused.import_statement == "from typing import Any, List as L, Dict"
+
+    def test_nested_and_dotted_imports(self, rejig: Rejig, tmp_path: Path):
+        """
+        Function-level imports are checked in their own scope.
+        """
+        content = textwrap.dedent('''\
+            import os.path
+
+            def f():
+                import re
+                import sys
+                return os.path.join(sys.prefix)
+        ''')
+        file_path = tmp_path / "test.py"
+        file_path.write_text(content)
+
+        unused = ImportAnalyzer(rejig).find_unused_imports(file_path)
+
+        assert [(imp.line_number, imp.names) for imp in unused] == [(4, ["re"])]
+
+
+# =============================================================================
+# Unused Import Removal Tests
+# =============================================================================
+
+class TestRemoveUnusedImports:
+    """Tests for removing unused imports in one pass per file."""
+
+    CONTENT = textwrap.dedent('''\
+        """Module."""
+
+        import os
+        # Typing helpers
+        from typing import Any, Dict
+        import sys
+
+
+        def f() -> Any:
+            import re
+            return sys.argv
+    ''')
+
+    EXPECTED = textwrap.dedent('''\
+        """Module."""
+
+        # Typing helpers
+        from typing import Any
+        import sys
+
+
+        def f() -> Any:
+            return sys.argv
+    ''')
+
+    def test_file_target(self, tmp_path: Path):
+        """
+        FileTarget.remove_unused_imports() removes names, keeping comments.
+        """
+        file_path = tmp_path / "mod.py"
+        file_path.write_text(self.CONTENT)
+
+        result = Rejig(str(tmp_path)).file(file_path).remove_unused_imports()
+
+        assert result.success
+        assert result.message == f"Removed 3 unused imports from {file_path}"
+        assert file_path.read_text() == self.EXPECTED
+
+    def test_import_target_delete_partial(self, tmp_path: Path):
+        """
+        Deleting a narrowed ImportTarget keeps the statement's used names.
+        """
+        file_path = tmp_path / "mod.py"
+        file_path.write_text(self.CONTENT)
+        rejig = Rejig(str(tmp_path))
+
+        unused = rejig.file(file_path).find_unused_imports()
+        partial = next(imp for imp in unused if imp.names == ["Dict"])
+
+        assert partial.delete().success
+        assert "from typing import Any\n" in file_path.read_text()
+
+    def test_all_files(self, tmp_path: Path):
+        """
+        Rejig.remove_all_unused_imports() changes files in one transaction.
+        """
+        (tmp_path / "a.py").write_text(self.CONTENT)
+        (tmp_path / "b.py").write_text("import sys\nprint(sys)\n")
+
+        result = Rejig(str(tmp_path)).remove_all_unused_imports()
+
+        assert result.success
+        assert result.message == "Removed 3 unused imports from 1 files"
+        assert result.files_changed == [tmp_path / "a.py"]
+        assert [imp.names for imp in result.data["removed"][tmp_path / "a.py"]] == [
+            ["os"], ["Dict"], ["re"],
+        ]
+        assert (tmp_path / "a.py").read_text() == self.EXPECTED
+
+    def test_dry_run(self, tmp_path: Path):
+        """
+        In dry-run mode the diff is returned and nothing is written.
+        """
+        (tmp_path / "a.py").write_text(self.CONTENT)
+
+        result = Rejig(str(tmp_path), dry_run=True).remove_all_unused_imports()
+
+        assert result.success
+        assert "-import os" in result.diff
+        assert (tmp_path / "a.py").read_text() == self.CONTENT
+
+    def test_workers(self, tmp_path: Path):
+        """
+        Worker processes give the same results as a single process.
+        """
+        for i in range(130):
+            (tmp_path / f"m{i}.py").write_text(f"import os\nimport sys\nx = sys.argv[{i}]\n")
+
+        rejig = Rejig(str(tmp_path))
+        serial = ImportAnalyzer(rejig).find_all_unused_imports()
+        parallel = ImportAnalyzer(rejig).find_all_unused_imports(workers=2)
+
+        assert len(serial) == 130
+        assert parallel == serial
+        assert len(rejig.find_unused_imports(workers=2)) == 130
+
+
 # =============================================================================
 # ImportAnalyzer.find_potentially_missing_imports() Tests
 # =============================================================================
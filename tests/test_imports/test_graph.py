@@ -5,7 +5,7 @@ This module tests import graph analysis:
 - ImportEdge dataclass
 - CircularImport dataclass
 - ImportGraph class
-- Circular import detection
+- Circular import detection (strongly connected components, minimal cycles)
 - Dependency analysis
 """
 from __future__ import annotations
@@ -16,7 +16,7 @@ from pathlib import Path
 import pytest
 
 from rejig import Rejig
-from rejig.imports.graph import CircularImport, ImportEdge, ImportGraph
+from rejig.imports.graph import CircularImport, ImportCycleGroup, ImportEdge, ImportGraph
 
 
 # =============================================================================
@@ -320,6 +320,132 @@ class TestImportGraphFindCircularImports:
         assert graph._built is True
 
 
+# =============================================================================
+# Strongly Connected Component Tests
+# =============================================================================
+
+def graph_of(tmp_path: Path, edges: dict[str, list[str]]) -> ImportGraph:
+    """An ImportGraph with the given adjacency, without reading files."""
+    graph = ImportGraph(Rejig(str(tmp_path)))
+    graph._built = True
+    for module, targets in edges.items():
+        for target in targets:
+            graph._graph[module].add(target)
+            graph._reverse_graph[target].add(module)
+            edge = ImportEdge(from_module=module, to_module=target)
+            graph._edges.append(edge)
+            graph._edge_index[(module, target)].append(edge)
+    return graph
+
+
+class TestImportGraphCycleGroups:
+    """Tests for SCC-based cycle detection."""
+
+    def test_all_cycles_in_component_reported(self, tmp_path: Path):
+        """Cycles sharing modules are all found, not only DFS back-edges."""
+        # a -> b -> a, b -> c -> a, and d importing into the cycle
+        graph = graph_of(tmp_path, {
+            "a": ["b"], "b": ["a", "c"], "c": ["a"], "d": ["a"],
+        })
+
+        groups = graph.find_cycle_groups()
+
+        assert len(groups) == 1
+        assert isinstance(groups[0], ImportCycleGroup)
+        assert groups[0].modules == ["a", "b", "c"]
+        assert [c.cycle for c in groups[0].cycles] == [["a", "b"], ["a", "b", "c"]]
+        assert [str(c) for c in graph.find_circular_imports()] == [
+            "a -> b -> a",
+            "a -> b -> c -> a",
+        ]
+
+    def test_separate_components_and_self_import(self, tmp_path: Path):
+        """Each component is its own group; a self-import is a cycle."""
+        graph = graph_of(tmp_path, {
+            "a": ["b"], "b": ["a"], "x": ["y"], "y": ["x"], "s": ["s"], "t": ["a"],
+        })
+
+        assert graph.find_strongly_connected_components() == [
+            ["a", "b"], ["s"], ["x", "y"],
+        ]
+
+    def test_cycle_edges_from_index(self, tmp_path: Path):
+        """Each cycle carries the edges that form it, in order."""
+        graph = graph_of(tmp_path, {"b": ["c"], "c": ["a"], "a": ["b"]})
+
+        (cycle,) = graph.find_circular_imports()
+
+        assert cycle.cycle == ["a", "b", "c"]
+        assert [(e.from_module, e.to_module) for e in cycle.edges] == [
+            ("a", "b"), ("b", "c"), ("c", "a"),
+        ]
+        assert graph.get_edges_between("a", "b") == [cycle.edges[0]]
+        assert graph.get_edges_between("b", "a") == []
+
+    def test_deep_chain(self, tmp_path: Path):
+        """Chains longer than the recursion limit don't overflow."""
+        count = 5000
+        edges = {f"m{i}": [f"m{i + 1}"] for i in range(count)}
+        edges[f"m{count}"] = ["m0"]
+        graph = graph_of(tmp_path, edges)
+
+        (component,) = graph.find_strongly_connected_components()
+
+        assert len(component) == count + 1
+
+    def test_shortest_cycle(self, tmp_path: Path):
+        """shortest_cycle returns the shortest cycle through a module."""
+        graph = graph_of(tmp_path, {
+            "a": ["b", "c"], "b": ["c"], "c": ["a"], "d": ["a"],
+        })
+
+        assert graph.shortest_cycle("a").cycle == ["a", "c"]
+        assert graph.shortest_cycle("b").cycle == ["a", "b", "c"]
+        assert graph.shortest_cycle("d") is None
+
+    def test_cycle_between_files(self, tmp_path: Path):
+        """Relative imports of sibling modules form a cycle."""
+        pkg_dir = tmp_path / "pkg"
+        pkg_dir.mkdir()
+        (pkg_dir / "__init__.py").write_text("")
+        (pkg_dir / "a.py").write_text("from . import b")
+        (pkg_dir / "b.py").write_text("from pkg.a import helper")
+
+        graph = ImportGraph(Rejig(str(tmp_path)))
+
+        assert [str(c) for c in graph.find_circular_imports()] == [
+            "pkg.a -> pkg.b -> pkg.a"
+        ]
+
+
+# =============================================================================
+# Import Target Resolution Tests
+# =============================================================================
+
+class TestImportTargets:
+    """Tests for resolving imports to full module names."""
+
+    def test_full_dotted_names(self, tmp_path: Path):
+        """Absolute imports keep their full module names."""
+        pkg_dir = tmp_path / "pkg" / "sub"
+        pkg_dir.mkdir(parents=True)
+        (tmp_path / "pkg" / "__init__.py").write_text("")
+        (pkg_dir / "__init__.py").write_text("")
+        (pkg_dir / "models.py").write_text("")
+        (tmp_path / "main.py").write_text(textwrap.dedent('''\
+            import os.path, json
+            from pkg.sub.models import User
+            from pkg.sub import models, VERSION
+        '''))
+
+        graph = ImportGraph(Rejig(str(tmp_path)))
+
+        assert graph.get_dependencies("main") == {
+            "os.path", "json", "pkg.sub.models", "pkg.sub",
+        }
+        assert len(graph.get_edges_between("main", "pkg.sub.models")) == 2
+
+
 # =============================================================================
 # ImportGraph.get_edges() Tests
 # =============================================================================
@@ -0,0 +1,105 @@
+"""
+Tests for rejig.imports.index module.
+
+This module tests the import-site index:
+- Collecting import targets, with relative imports resolved
+- Looking up the sites that can reach a dotted name
+- Reusing cached entries for unchanged files
+"""
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.imports.index import ImportSiteIndex, collect_import_sites, resolve_relative
+
+
+# =============================================================================
+# Collection Tests
+# =============================================================================
+
+class TestCollectImportSites:
+    """Tests for collect_import_sites and resolve_relative."""
+
+    def test_targets_and_spans(self):
+        """Every import is recorded with its absolute target and lines."""
+        code = textwrap.dedent('''\
+            from __future__ import annotations
+            import os.path, json as j
+            from .models import (
+                User,
+                Group,
+            )
+
+            def f():
+                from ..core import *
+        ''')
+
+        sites = collect_import_sites(code, "app.api.views", False)
+
+        assert sites == [
+            ["json", 2, 2],
+            ["os.path", 2, 2],
+            ["app.api.models.Group", 3, 6],
+            ["app.api.models.User", 3, 6],
+            ["app.core", 9, 9],
+        ]
+
+    def test_resolve_relative(self):
+        """Relative imports resolve against the module or package."""
+        assert resolve_relative("app.api.views", False, "models", 1) == "app.api.models"
+        assert resolve_relative("app.api", True, "models", 1) == "app.api.models"
+        assert resolve_relative("app.api.views", False, "", 2) == "app"
+        assert resolve_relative("views", False, "x", 3) is None
+        assert resolve_relative(None, False, "x", 1) is None
+        assert resolve_relative(None, False, "os", 0) == "os"
+
+
+# =============================================================================
+# ImportSiteIndex Tests
+# =============================================================================
+
+class TestImportSiteIndex:
+    """Tests for ImportSiteIndex lookups."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        app = tmp_path / "app"
+        app.mkdir()
+        (app / "__init__.py").write_text("")
+        (app / "utils.py").write_text("def helper():\n    pass\n")
+        (app / "a.py").write_text("from app.utils import helper\n")
+        (app / "b.py").write_text("from . import utils\n")
+        (app / "c.py").write_text("import app\n")
+        (app / "d.py").write_text("import json\n# app.utils\n")
+        return tmp_path
+
+    def test_sites(self, project: Path):
+        """Names inside, the name itself and containing packages are found."""
+        index = ImportSiteIndex(Rejig(str(project)))
+
+        sites = index.sites("app.utils")
+
+        assert [(s.file_path.name, s.target) for s in sites] == [
+            ("a.py", "app.utils.helper"),
+            ("b.py", "app.utils"),
+            ("c.py", "app"),
+        ]
+        assert str(sites[0]) == f"{project / 'app' / 'a.py'}:1: app.utils.helper"
+        assert index.files_importing("json") == [project / "app" / "d.py"]
+        assert index.module_name(project / "app" / "b.py") == "app.b"
+
+    def test_cached(self, project: Path):
+        """Rebuilding only re-parses files that changed."""
+        rj = Rejig(str(project))
+        ImportSiteIndex(rj).build()
+        (project / "app" / "d.py").write_text("import app.utils\n")
+
+        index = ImportSiteIndex(rj)
+        index.build()
+
+        assert project / "app" / "d.py" in index.files_importing("app.utils")
+        assert rj.cache.get("import_sites", project / "app" / "d.py") == [["app.utils", 1, 1]]
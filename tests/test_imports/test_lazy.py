@@ -0,0 +1,368 @@
+"""
+Tests for rejig.imports.lazy module.
+
+This module tests lazy-import conversion:
+- Moving imports into the functions that use them
+- TYPE_CHECKING imports for annotation-only names
+- The generated module __getattr__ for re-exported names
+- Imports that must stay at module level
+- LazyImportConverter.apply and Rejig.defer_imports
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.imports.lazy import LazyImportConverter, lazify_imports
+
+
+def lazify(code: str, *modules: str, **kwargs) -> tuple[str, list[str], list[str]]:
+    """Run lazify_imports on dedented code; skipped imports as strings."""
+    new_code, names, skipped = lazify_imports(textwrap.dedent(code), set(modules), **kwargs)
+    return new_code, names, [str(s) for s in skipped]
+
+
+# =============================================================================
+# Function-Local Import Tests
+# =============================================================================
+
+class TestFunctionImports:
+    """Tests for imports moved into functions."""
+
+    def test_moved_into_each_function(self):
+        """Each function using a name gets the import after its docstring."""
+        code, names, skipped = lazify('''\
+            import os
+            import pandas as pd
+            from matplotlib import pyplot as plt, colors
+
+
+            def load(path):
+                """Load a frame."""
+                return pd.read_csv(os.fspath(path))
+
+
+            class Report:
+                def draw(self, frame):
+                    plt.plot([c for c in colors.CSS4_COLORS])
+                    return pd.DataFrame(frame)
+        ''', "pandas", "matplotlib")
+
+        assert code == textwrap.dedent('''\
+            import os
+
+
+            def load(path):
+                """Load a frame."""
+                import pandas as pd
+                return pd.read_csv(os.fspath(path))
+
+
+            class Report:
+                def draw(self, frame):
+                    import pandas as pd
+                    from matplotlib import pyplot as plt, colors
+                    plt.plot([c for c in colors.CSS4_COLORS])
+                    return pd.DataFrame(frame)
+        ''')
+        assert names == ["pd", "plt", "colors"]
+        assert skipped == []
+
+    def test_partial_statement_and_one_line_function(self):
+        """Other names in the statement stay; one-line bodies are expanded."""
+        code, _, _ = lazify('''\
+            from numpy import array, pi
+
+            TWO_PI = 2 * pi
+
+            def make(x): return array(x)
+        ''', "numpy")
+
+        assert code == textwrap.dedent('''\
+            from numpy import pi
+
+            TWO_PI = 2 * pi
+
+            def make(x):
+                from numpy import array
+                return array(x)
+        ''')
+
+    def test_comment_kept(self):
+        """Comments above a removed import line are kept."""
+        code, _, _ = lazify('''\
+            import os
+            # Plotting is slow to import
+            import matplotlib
+            x = 1
+
+            def f():
+                return matplotlib
+        ''', "matplotlib")
+
+        assert code.startswith("import os\n# Plotting is slow to import\nx = 1\n")
+
+    def test_relative_and_submodule_imports(self):
+        """Relative imports resolve against the module; submodules match."""
+        code, names, _ = lazify('''\
+            from . import plots
+            from .. import other
+
+            def f():
+                return plots.draw(), other
+        ''', "app.plots", module_name="app.ui.views")
+
+        assert names == []
+        code, names, _ = lazify('''\
+            from . import plots
+
+            def f():
+                return plots.draw()
+        ''', "app.ui.plots", module_name="app.ui.views")
+
+        assert names == ["plots"]
+        assert "    from . import plots\n" in code
+
+
+# =============================================================================
+# TYPE_CHECKING and __getattr__ Tests
+# =============================================================================
+
+class TestTypeCheckingAndExports:
+    """Tests for annotation-only and re-exported names."""
+
+    def test_annotations_only(self):
+        """Postponed and string annotations don't need the import at runtime."""
+        code, names, _ = lazify('''\
+            from __future__ import annotations
+
+            import pandas as pd
+            from sklearn.base import BaseEstimator
+
+
+            def fit(model: BaseEstimator, frame: pd.DataFrame) -> "BaseEstimator":
+                return model.fit(pd.get_dummies(frame))
+        ''', "pandas", "sklearn")
+
+        assert code == textwrap.dedent('''\
+            from __future__ import annotations
+            from typing import TYPE_CHECKING
+
+            if TYPE_CHECKING:
+                import pandas as pd
+                from sklearn.base import BaseEstimator
+
+
+            def fit(model: BaseEstimator, frame: pd.DataFrame) -> "BaseEstimator":
+                import pandas as pd
+                return model.fit(pd.get_dummies(frame))
+        ''')
+        assert names == ["pd", "BaseEstimator"]
+
+    def test_existing_type_checking_block(self):
+        """Names are added to an existing TYPE_CHECKING block."""
+        code, _, _ = lazify('''\
+            import typing
+            from torch import Tensor
+
+            if typing.TYPE_CHECKING:
+                from os import PathLike
+
+            def f(x: "Tensor", p: "PathLike"):
+                pass
+        ''', "torch")
+
+        assert "if typing.TYPE_CHECKING:\n    from os import PathLike\n    from torch import Tensor\n" in code
+        assert "from typing import TYPE_CHECKING" not in code
+
+    def test_exports(self):
+        """Names in __all__ are served by __getattr__ and kept for type checkers."""
+        code, names, _ = lazify('''\
+            """Public API."""
+            import numpy as np
+            from pandas import DataFrame
+
+            __all__ = ["DataFrame", "total"]
+
+
+            def total(x):
+                return np.sum(x)
+        ''', "numpy", "pandas")
+
+        assert names == ["np", "DataFrame"]
+        assert '    "DataFrame": ("pandas", "DataFrame"),\n' in code
+        assert '"np"' not in code
+        assert "if TYPE_CHECKING:\n    from pandas import DataFrame\n" in code
+        assert "def __getattr__(name):" in code
+        compile(code, "api.py", "exec")
+
+    def test_getattr_loads_on_access(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """The generated loader imports on first access, including submodules."""
+        (tmp_path / "heavydep").mkdir()
+        (tmp_path / "heavydep" / "__init__.py").write_text("VALUE = 1\n")
+        (tmp_path / "heavydep" / "sub.py").write_text("NAME = 'sub'\n")
+        pkg = tmp_path / "lazypkg"
+        pkg.mkdir()
+        code, _, _ = lazify('''\
+            from heavydep import VALUE, sub
+        ''', "heavydep", module_name="lazypkg", is_package=True)
+        (pkg / "__init__.py").write_text(code)
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        lazypkg = importlib.import_module("lazypkg")
+        try:
+            assert "heavydep" not in sys.modules
+            assert lazypkg.VALUE == 1
+            assert lazypkg.sub.NAME == "sub"
+            with pytest.raises(AttributeError):
+                lazypkg.missing
+        finally:
+            for name in ("lazypkg", "heavydep", "heavydep.sub"):
+                sys.modules.pop(name, None)
+
+
+# =============================================================================
+# Refused Conversion Tests
+# =============================================================================
+
+class TestRefused:
+    """Tests for imports that must stay at module level."""
+
+    def test_import_time_uses(self):
+        """Module-level, class-body, decorator and default uses block the move."""
+        code, names, skipped = lazify('''\
+            import click
+            import numpy as np
+            import attrs
+            import scipy
+            from pydantic import Field
+
+
+            @click.command()
+            def main(n=scipy.pi):
+                return np.zeros(n)
+
+
+            class Config:
+                size = np.int64(3)
+                name: "Field"
+
+            handler = lambda: attrs
+        ''', "click", "numpy", "attrs", "scipy", "pydantic")
+
+        assert names == []
+        assert skipped == [
+            "line 1: click: used at import time (line 8)",
+            "line 2: np: used at import time (line 14)",
+            "line 3: attrs: used in a lambda outside any function (line 17)",
+            "line 4: scipy: used at import time (line 9)",
+            "line 5: Field: used in a class attribute annotation (line 15)",
+        ]
+
+    def test_rebound_and_side_effects(self):
+        """Rebound, global and unused names are left alone."""
+        _, names, skipped = lazify('''\
+            import numpy
+            import numpy.linalg
+            import pandas
+            import matplotlib
+            import seaborn
+
+            def f():
+                global pandas
+                return numpy.linalg, pandas, matplotlib
+        ''', "numpy", "pandas", "seaborn")
+
+        assert names == []
+        assert skipped == [
+            "line 1: numpy: name is rebound or declared global",
+            "line 2: numpy: name is rebound or declared global",
+            "line 3: pandas: name is rebound or declared global",
+            "line 5: seaborn: not used here; it may be imported for its side effects",
+        ]
+
+    def test_existing_getattr(self):
+        """Exports are not merged into an existing module __getattr__."""
+        _, names, skipped = lazify('''\
+            from pandas import DataFrame
+
+            __all__ = ["DataFrame"]
+
+            def __getattr__(name):
+                raise AttributeError(name)
+        ''', "pandas")
+
+        assert names == []
+        assert skipped == ["line 1: DataFrame: module already defines __getattr__"]
+
+
+# =============================================================================
+# LazyImportConverter Tests
+# =============================================================================
+
+class TestLazyImportConverter:
+    """Tests for LazyImportConverter and Rejig.defer_imports."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        app = tmp_path / "app"
+        app.mkdir()
+        (app / "__init__.py").write_text("")
+        (app / "report.py").write_text(textwrap.dedent('''\
+            import pandas as pd
+
+            def build():
+                return pd.DataFrame()
+        '''))
+        (app / "cli.py").write_text(textwrap.dedent('''\
+            import pandas as pd
+
+            DEFAULT = pd.DataFrame()
+        '''))
+        return tmp_path
+
+    def test_apply(self, project: Path):
+        """Files are changed together and skipped imports are reported."""
+        result = Rejig(str(project)).defer_imports(modules=["pandas"])
+
+        assert result.success
+        assert result.files_changed == [project / "app" / "report.py"]
+        assert result.data["converted"] == {project / "app" / "report.py": ["pd"]}
+        (skipped,) = result.data["skipped"]
+        assert skipped.file_path == project / "app" / "cli.py"
+        assert "    import pandas as pd\n" in (project / "app" / "report.py").read_text()
+
+    def test_dry_run(self, project: Path):
+        """In dry-run mode the diff is returned and nothing is written."""
+        before = (project / "app" / "report.py").read_text()
+
+        result = LazyImportConverter(Rejig(str(project), dry_run=True)).apply({"pandas"})
+
+        assert result.success
+        assert "+    import pandas as pd" in result.diff
+        assert (project / "app" / "report.py").read_text() == before
+
+    def test_min_us_needs_entry(self, project: Path):
+        """Selecting by import time needs an entry module to profile."""
+        result = Rejig(str(project)).defer_imports(min_us=1000)
+
+        assert not result.success
+        assert "entry" in result.message
+
+    def test_select_modules(self, project: Path):
+        """Heavy modules outside the project are selected from a profile."""
+        from rejig.imports.graph import ImportGraph
+        from rejig.imports.profiler import ImportProfile, parse_importtime
+
+        profile = ImportProfile("app.cli", parse_importtime(textwrap.dedent('''\
+            import time:       100 |      30100 |   pandas
+            import time:       900 |      31000 | app.cli
+            import time:        50 |         50 | json
+        ''')), ImportGraph(Rejig(str(project))))
+
+        assert LazyImportConverter.select_modules(profile, 10_000) == {"pandas"}
@@ -6,16 +6,20 @@ This module tests import organization (isort-like functionality):
 - organize() method
 - Import classification (future, stdlib, thirdparty, firstparty)
 - Import sorting within groups
+- ImportClassifier shared across files
+- Project-wide organization, serial and across workers
 """
 from __future__ import annotations
 
+import pickle
 import textwrap
 from pathlib import Path
 
 import pytest
 
 from rejig import Rejig
-from rejig.imports.organizer import ImportOrganizer, _get_stdlib_modules
+from rejig.imports.analyzer import ImportInfo
+from rejig.imports.organizer import ImportClassifier, ImportOrganizer, _get_stdlib_modules
 
 
 # =============================================================================
@@ -407,3 +411,124 @@ class TestEdgeCases:
         new_content = file_path.read_text()
         # TYPE_CHECKING block should still be present
         assert "if TYPE_CHECKING:" in new_content
+
+
+# =============================================================================
+# ImportClassifier Tests
+# =============================================================================
+
+class TestImportClassifier:
+    """Tests for the shared ImportClassifier."""
+
+    def test_for_project(self, tmp_path: Path):
+        """First-party packages are detected once, stdlib from the interpreter."""
+        (tmp_path / "myapp").mkdir()
+        (tmp_path / "myapp" / "__init__.py").write_text("")
+
+        classifier = ImportClassifier.for_project(tmp_path)
+
+        assert classifier.first_party == frozenset({"myapp"})
+        assert "os" in classifier.stdlib
+
+    def test_installed_distribution_packages(self, tmp_path: Path):
+        """The installed distribution named in pyproject.toml maps to its packages."""
+        (tmp_path / "pyproject.toml").write_text('[project]\nname = "libcst"\n')
+
+        classifier = ImportClassifier.for_project(tmp_path)
+
+        assert "libcst" in classifier.first_party
+
+    def test_classify(self):
+        """Imports are classified by set lookups against the shared cache."""
+        classifier = ImportClassifier(first_party=frozenset({"myapp"}))
+
+        def info(module: str) -> ImportInfo:
+            return ImportInfo(
+                module=module, names=["x"], aliases={}, is_from_import=True,
+                is_relative=False, relative_level=0, line_number=1,
+                import_statement=f"from {module} import x",
+            )
+
+        assert classifier.classify(info("os.path")) == "stdlib"
+        assert classifier.classify(info("myapp.core")) == "firstparty"
+        assert classifier.classify(info("numpy")) == "thirdparty"
+
+    def test_picklable(self):
+        """The classifier can be sent to worker processes."""
+        classifier = ImportClassifier(first_party=frozenset({"myapp"}))
+
+        assert pickle.loads(pickle.dumps(classifier)) == classifier
+
+    def test_organizer_uses_given_classifier(self, tmp_path: Path):
+        """An organizer reuses a classifier instead of detecting again."""
+        classifier = ImportClassifier(first_party=frozenset({"other"}))
+
+        organizer = ImportOrganizer(Rejig(str(tmp_path)), classifier=classifier)
+
+        assert organizer._first_party == {"other"}
+
+
+# =============================================================================
+# Project-Wide Organization Tests
+# =============================================================================
+
+class TestOrganizeAll:
+    """Tests for ImportOrganizer.organize_all and Rejig.organize_all_imports."""
+
+    UNORGANIZED = textwrap.dedent('''\
+        import numpy
+        from myapp import util
+        import os
+        from __future__ import annotations
+        import sys
+
+        VALUE = {n}
+    ''')
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        app = tmp_path / "myapp"
+        app.mkdir()
+        (app / "__init__.py").write_text("")
+        (app / "util.py").write_text("import os\n")
+        for n in range(130):
+            (app / f"mod{n}.py").write_text(self.UNORGANIZED.format(n=n))
+        return tmp_path
+
+    def test_organize_all(self, project: Path):
+        """Every file is organized in one transaction."""
+        result = Rejig(str(project)).organize_all_imports()
+
+        assert result.success, result.message
+        assert len(result.files_changed) == 130
+        assert result.message == "Organized imports in 130 files"
+        assert (project / "myapp" / "mod7.py").read_text() == textwrap.dedent('''\
+            from __future__ import annotations
+
+            import os
+            import sys
+
+            import numpy
+
+            from myapp import util
+
+            VALUE = 7
+        ''')
+        assert (project / "myapp" / "util.py").read_text() == "import os\n"
+
+    def test_workers_match_serial(self, project: Path):
+        """Organizing across workers gives byte-identical output."""
+        serial = Rejig(str(project), dry_run=True).organize_all_imports()
+        parallel = Rejig(str(project), dry_run=True).organize_all_imports(workers=2)
+
+        assert parallel.success
+        assert parallel.files_changed == serial.files_changed
+        assert parallel.diffs == serial.diffs
+
+    def test_dry_run(self, project: Path):
+        """In dry-run mode the combined diff is returned and nothing is written."""
+        result = Rejig(str(project), dry_run=True).organize_all_imports()
+
+        assert result.success
+        assert "+from __future__ import annotations" in result.diff
+        assert (project / "myapp" / "mod0.py").read_text() == self.UNORGANIZED.format(n=0)
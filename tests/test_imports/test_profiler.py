@@ -0,0 +1,193 @@
+"""
+Tests for rejig.imports.profiler module.
+
+This module tests import-time profiling:
+- Parsing -X importtime output into a runtime import tree
+- Attaching timings to ImportGraph modules and edges
+- Heaviest subtrees, heavy third-party imports and deferrable imports
+- Rejig.profile_imports running a real subprocess
+"""
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.imports.graph import ImportGraph
+from rejig.imports.profiler import ImportProfile, parse_importtime
+
+OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     slowlib.core
+import time:     20000 |      20100 |   slowlib
+import time:       300 |        300 |   json
+import time:       500 |      20900 | app.heavy
+import time:       200 |        200 |   app.util
+import time:        50 |      21150 | app.main
+some other stderr line
+"""
+
+
+# =============================================================================
+# Parsing Tests
+# =============================================================================
+
+class TestParseImporttime:
+    """Tests for parse_importtime."""
+
+    def test_tree(self):
+        """Children are attached to the next shallower module."""
+        timings = parse_importtime(OUTPUT)
+
+        assert list(timings) == [
+            "slowlib.core", "slowlib", "json", "app.heavy", "app.util", "app.main",
+        ]
+        assert timings["app.heavy"].self_us == 500
+        assert timings["app.heavy"].cumulative_us == 20900
+        assert timings["app.heavy"].children == ["slowlib", "json"]
+        assert timings["slowlib"].parent == "app.heavy"
+        assert timings["slowlib.core"].parent == "slowlib"
+        assert timings["slowlib.core"].depth == 2
+        assert timings["app.util"].parent == "app.main"
+        assert timings["app.main"].parent is None
+
+    def test_ignores_other_lines(self):
+        """Headers and unrelated lines are skipped."""
+        assert parse_importtime("Traceback ...\nimport time: self [us] | cumulative | x\n") == {}
+
+
+# =============================================================================
+# ImportProfile Tests
+# =============================================================================
+
+class TestImportProfile:
+    """Tests for ImportProfile reports."""
+
+    @pytest.fixture
+    def graph(self, tmp_path: Path) -> ImportGraph:
+        app = tmp_path / "app"
+        app.mkdir()
+        (app / "__init__.py").write_text("")
+        (app / "main.py").write_text("from app import heavy, util\n")
+        (app / "util.py").write_text("")
+        (app / "heavy.py").write_text(textwrap.dedent('''\
+            from __future__ import annotations
+
+            import json
+            import slowlib
+
+            __all__ = ["dumps"]
+
+
+            def dumps(value: slowlib.Value) -> str:
+                return json.dumps(slowlib.convert(value))
+
+
+            class Loader:
+                def load(self, text):
+                    return slowlib.parse(text)
+        '''))
+        return ImportGraph(Rejig(str(tmp_path)))
+
+    def test_timings_attached_to_graph(self, graph: ImportGraph):
+        """Edges are charged when their module imported the target first."""
+        ImportProfile("app.main", parse_importtime(OUTPUT), graph)
+
+        (edge,) = graph.get_edges_between("app.heavy", "slowlib")
+        assert edge.import_time_us == 20100
+        assert graph.get_import_time("app.main").cumulative_us == 21150
+        assert graph.get_import_time("missing") is None
+
+    def test_heaviest_subtrees(self, graph: ImportGraph):
+        """Modules are ranked by cumulative time."""
+        profile = ImportProfile("app.main", parse_importtime(OUTPUT), graph)
+
+        assert profile.total_us == 21150
+        assert [t.module for t in profile.heaviest_subtrees(3)] == [
+            "app.main", "app.heavy", "slowlib",
+        ]
+        assert [t.module for t in profile.heaviest_subtrees(first_party_only=True)] == [
+            "app.main", "app.heavy", "app.util",
+        ]
+
+    def test_heavy_third_party_imports(self, graph: ImportGraph):
+        """First-party edges into heavy third-party packages are reported."""
+        profile = ImportProfile("app.main", parse_importtime(OUTPUT), graph)
+
+        (heavy,) = profile.heavy_third_party_imports(min_us=1000)
+
+        assert str(heavy) == "app.heavy -> slowlib (20.1 ms)"
+        assert [(e.line_number, e.file_path.name) for e in heavy.edges] == [(4, "heavy.py")]
+
+    def test_deferrable_imports(self, graph: ImportGraph):
+        """Imports only used in function bodies are reported with the saving."""
+        profile = ImportProfile("app.main", parse_importtime(OUTPUT), graph)
+
+        (item,) = profile.deferrable_imports(min_us=1000)
+
+        assert item.module == "slowlib"
+        assert item.importer == "app.heavy"
+        assert item.line_number == 4
+        assert item.cumulative_us == 20100
+        assert item.functions == ["Loader.load", "dumps"]
+        assert "Deferrable imports:" in profile.summary()
+
+    def test_module_level_use_not_deferrable(self, graph: ImportGraph, tmp_path: Path):
+        """Decorators, class bodies and evaluated annotations run at import."""
+        (tmp_path / "app" / "heavy.py").write_text(textwrap.dedent('''\
+            import json
+            import slowlib
+
+
+            @slowlib.register
+            def dumps(value):
+                return json.dumps(value)
+        '''))
+        profile = ImportProfile("app.main", parse_importtime(OUTPUT), graph)
+
+        assert [d.module for d in profile.deferrable_imports(min_us=0)] == ["json"]
+
+
+# =============================================================================
+# Rejig.profile_imports Tests
+# =============================================================================
+
+class TestProfileImports:
+    """Tests for Rejig.profile_imports."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        site = tmp_path / "site"
+        site.mkdir()
+        (site / "slowlib.py").write_text("import time\ntime.sleep(0.02)\n")
+        monkeypatch.setenv("PYTHONPATH", str(site))
+
+        root = tmp_path / "proj"
+        app = root / "app"
+        app.mkdir(parents=True)
+        (app / "__init__.py").write_text("")
+        (app / "main.py").write_text("from app import heavy\n")
+        (app / "heavy.py").write_text(
+            "import slowlib\n\n\ndef use():\n    return slowlib\n"
+        )
+        return root
+
+    def test_profile(self, project: Path):
+        """The entry is imported in a subprocess and the timings mapped."""
+        result = Rejig(str(project)).profile_imports(entry="app.main")
+
+        assert result.success, result.message
+        profile = result.data["profile"]
+        assert profile.timings["slowlib"].parent == "app.heavy"
+        assert profile.timings["slowlib"].cumulative_us >= 15000
+        assert [h.module for h in profile.heavy_third_party_imports()] == ["slowlib"]
+        assert [d.module for d in profile.deferrable_imports()] == ["slowlib"]
+
+    def test_import_error(self, project: Path):
+        """A failing import is reported as an error result."""
+        result = Rejig(str(project)).profile_imports(entry="app.missing")
+
+        assert not result.success
+        assert "ModuleNotFoundError" in result.message
@@ -0,0 +1,188 @@
+"""
+Tests for rejig.modules.move module.
+
+This module tests moving classes and functions between modules:
+- Cutting the definition and the imports only it used
+- Adding it to the destination with the imports it needs
+- Rewriting absolute, relative, aliased and module-attribute importers
+- Rejig.move_class() and Rejig.move_function()
+"""
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.modules.move import DefinitionMover
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    app = tmp_path / "app"
+    (app / "sub").mkdir(parents=True)
+    (app / "__init__.py").write_text("")
+    (app / "sub" / "__init__.py").write_text("")
+    (app / "base.py").write_text("class Base:\n    pass\n")
+    (app / "models.py").write_text(textwrap.dedent('''\
+        """Models."""
+        import json
+        import os
+
+        from .base import Base
+
+        DEFAULT = 3
+
+
+        # The user model
+        class User(Base):
+            def dump(self):
+                return json.dumps({"d": DEFAULT})
+
+
+        def cwd():
+            return os.getcwd()
+    '''))
+    (app / "views.py").write_text(textwrap.dedent('''\
+        from app.models import User, cwd
+        from . import models
+        import app.models as m
+
+
+        def show():
+            return User(), models.User, m.User, cwd()
+    '''))
+    (app / "sub" / "api.py").write_text('from ..models import User as U\nprint("app.models.User")\n')
+    (app / "other.py").write_text("import json\n")
+    return tmp_path
+
+
+# =============================================================================
+# DefinitionMover Tests
+# =============================================================================
+
+class TestDefinitionMover:
+    """Tests for DefinitionMover.move()."""
+
+    def test_move_class(self, project: Path):
+        """The class, its imports and every importer are updated together."""
+        app = project / "app"
+
+        result = DefinitionMover(Rejig(str(project))).move(app / "models.py", "User", "app.accounts")
+
+        assert result.success, result.message
+        assert (app / "accounts.py").read_text() == textwrap.dedent('''\
+            import json
+            from .base import Base
+            from app.models import DEFAULT
+
+
+            # The user model
+            class User(Base):
+                def dump(self):
+                    return json.dumps({"d": DEFAULT})
+        ''')
+        assert (app / "models.py").read_text() == textwrap.dedent('''\
+            """Models."""
+            import os
+
+            DEFAULT = 3
+
+
+            def cwd():
+                return os.getcwd()
+        ''')
+        assert (app / "views.py").read_text() == textwrap.dedent('''\
+            from app.models import cwd
+            from app.accounts import User
+            from . import models
+            import app.models as m
+
+
+            def show():
+                return User(), User, User, cwd()
+        ''')
+        assert (app / "sub" / "api.py").read_text() == (
+            'from ..accounts import User as U\nprint("app.models.User")\n'
+        )
+        assert app / "other.py" not in result.files_changed
+
+    def test_source_still_uses_name(self, project: Path):
+        """The source imports the name back if it still uses it."""
+        app = project / "app"
+        (app / "models.py").write_text(textwrap.dedent('''\
+            import os
+
+
+            def cwd():
+                return os.getcwd()
+
+
+            def here():
+                return cwd()
+        '''))
+
+        result = Rejig(str(project)).move_function(app / "models.py", "cwd", "app.views")
+
+        assert result.success, result.message
+        assert (app / "models.py").read_text() == textwrap.dedent('''\
+            from app.views import cwd
+
+
+            def here():
+                return cwd()
+        ''')
+        views = (app / "views.py").read_text()
+        assert views.startswith(
+            "from app.models import User\nfrom . import models\nimport app.models as m\nimport os\n"
+        )
+        assert views.endswith("\n\n\ndef cwd():\n    return os.getcwd()\n")
+
+    def test_import_cycle_refused(self, project: Path):
+        """A move making the modules import each other is refused unless allowed."""
+        models = project / "app" / "models.py"
+        models.write_text(models.read_text() + "\n\ndef make():\n    return User()\n")
+        before = models.read_text()
+
+        result = Rejig(str(project)).move_class(models, "User", "app.accounts")
+
+        assert not result.success
+        assert "import each other" in result.message
+        assert "allow_cycle=True" in result.message
+        assert "+from app.models import DEFAULT" in result.diff
+        assert models.read_text() == before
+        assert not (project / "app" / "accounts.py").exists()
+
+        result = Rejig(str(project)).move_class(models, "User", "app.accounts", allow_cycle=True)
+
+        assert result.success, result.message
+        assert result.message.endswith("(app.models and app.accounts now import each other)")
+        assert "from app.accounts import User" in models.read_text()
+        assert "from app.models import DEFAULT" in (project / "app" / "accounts.py").read_text()
+
+    def test_dry_run(self, project: Path):
+        """In dry-run mode the diff is returned and nothing is written."""
+        before = (project / "app" / "models.py").read_text()
+
+        rj = Rejig(str(project), dry_run=True)
+
+        result = rj.move_class(project / "app" / "models.py", "User", "app.accounts")
+
+        assert result.success
+        assert result.message == "[DRY RUN] Would move User to app.accounts"
+        assert "+class User(Base):" in result.diff
+        assert (project / "app" / "models.py").read_text() == before
+        assert not (project / "app" / "accounts.py").exists()
+
+    def test_errors(self, project: Path):
+        """Missing definitions, packages and name clashes fail without changes."""
+        rj = Rejig(str(project))
+        models = project / "app" / "models.py"
+        (project / "app" / "clash.py").write_text("User = None\n")
+
+        assert "Could not find class Missing" in rj.move_class(models, "Missing", "app.accounts").message
+        assert "Destination package not found" in rj.move_class(models, "User", "app.nope.x").message
+        assert "already defines User" in rj.move_class(models, "User", "app.clash").message
+        assert not rj.move_class(models, "User", "app.models").success
+        assert models.read_text().count("class User") == 1
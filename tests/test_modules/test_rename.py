@@ -0,0 +1,216 @@
+"""
+Tests for rejig.modules.rename module.
+
+This module tests renaming modules and names with import updates:
+- rename_in_code() for every import form and references through them
+- ModuleRenamer.rename_imports() opening only importing files
+- ModuleRenamer.rename() moving the module file
+- Rejig.rename_import()
+"""
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.imports.index import ImportSiteIndex
+from rejig.modules.rename import ModuleRenamer, rename_in_code
+
+
+def rename(code: str, old: str, new: str, module_name: str | None = None) -> str:
+    """Run rename_in_code on dedented code."""
+    return rename_in_code(textwrap.dedent(code), old, new, module_name)
+
+
+# =============================================================================
+# rename_in_code Tests
+# =============================================================================
+
+class TestRenameInCode:
+    """Tests for rewriting one module's imports."""
+
+    def test_import_and_attribute_references(self):
+        """Dotted references are updated; strings and comments are not."""
+        code = rename('''\
+            import myapp.old_utils
+
+            def run():
+                # myapp.old_utils is deprecated
+                print("myapp.old_utils")
+                return myapp.old_utils.helper(), myapp.other
+        ''', "myapp.old_utils", "myapp.core.utils")
+
+        assert code == textwrap.dedent('''\
+            import myapp.core.utils
+
+            def run():
+                # myapp.old_utils is deprecated
+                print("myapp.old_utils")
+                return myapp.core.utils.helper(), myapp.other
+        ''')
+
+    def test_aliased_and_package_imports(self):
+        """Aliases keep their names; package imports reach submodules."""
+        assert rename(
+            "import myapp.old as o\no.run()\n", "myapp.old", "lib.new"
+        ) == "import lib.new as o\no.run()\n"
+        assert rename(
+            "import myapp\nmyapp.old.run(myapp.old_value)\n", "myapp.old", "myapp.new"
+        ) == "import myapp\nmyapp.new.run(myapp.old_value)\n"
+
+    def test_from_imports(self):
+        """Modules of from-imports, and submodules imported by name, are renamed."""
+        assert rename(
+            "from myapp.old.sub import f\n", "myapp.old", "lib.new"
+        ) == "from lib.new.sub import f\n"
+        assert rename(
+            "from myapp import old, keep\nold.f(keep)\n", "myapp.old", "myapp.new"
+        ) == "from myapp import new, keep\nnew.f(keep)\n"
+
+    def test_renamed_name_moved_to_new_statement(self):
+        """A name moving to another module gets its own statement."""
+        code = rename('''\
+            from myapp.models import (
+                Group,
+                OldUser,
+            )
+            from myapp.models import OldUser as U
+
+            def load() -> OldUser:
+                return OldUser(), U()
+        ''', "myapp.models.OldUser", "myapp.accounts.User")
+
+        assert code == textwrap.dedent('''\
+            from myapp.models import (
+                Group,
+            )
+            from myapp.accounts import User
+            from myapp.accounts import User as U
+
+            def load() -> User:
+                return User(), U()
+        ''')
+
+    def test_relative_imports(self):
+        """Relative imports stay relative when the new location allows it."""
+        code = rename('''\
+            from . import old
+            from .old import f
+        ''', "pkg.old", "pkg.sub.new", module_name="pkg.views")
+
+        assert code == "from .sub import new\nfrom .sub.new import f\n"
+        assert rename(
+            "from .old import f\n", "pkg.old", "lib.new", module_name="pkg.views"
+        ) == "from lib.new import f\n"
+
+    def test_shadowed_name_untouched(self):
+        """Only references bound by the import change."""
+        code = rename('''\
+            from myapp import old
+
+            def f(old):
+                return old
+        ''', "myapp.old", "myapp.new")
+
+        assert code == "from myapp import new\n\ndef f(old):\n    return old\n"
+
+    def test_reference_through_module_import(self):
+        """A name leaving the imported module is imported from its new home."""
+        code = rename('''\
+            from myapp import models
+
+            models.User(models.Group())
+        ''', "myapp.models.User", "myapp.accounts.User")
+
+        assert code == textwrap.dedent('''\
+            from myapp import models
+            from myapp.accounts import User
+
+            User(models.Group())
+        ''')
+
+    def test_unrelated_code_unchanged(self):
+        """Source without matching imports is returned as is."""
+        code = "import myapp.older\nx = 'myapp.old'\n"
+
+        assert rename_in_code(code, "myapp.old", "myapp.new") is code
+
+
+# =============================================================================
+# ModuleRenamer Tests
+# =============================================================================
+
+class TestModuleRenamer:
+    """Tests for project-wide renames."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        app = tmp_path / "myapp"
+        app.mkdir()
+        (app / "__init__.py").write_text("")
+        (app / "old_utils.py").write_text("from myapp import config\n\ndef helper():\n    return config\n")
+        (app / "config.py").write_text("")
+        (app / "views.py").write_text(textwrap.dedent('''\
+            from myapp.old_utils import helper
+            from . import old_utils
+
+            MESSAGE = "see myapp.old_utils"
+        '''))
+        (app / "unrelated.py").write_text("# mentions myapp.old_utils\nimport json\n")
+        return tmp_path
+
+    def test_rename_imports_opens_only_importers(self, project: Path, monkeypatch: pytest.MonkeyPatch):
+        """Files that don't import the module are never read by the rename."""
+        rj = Rejig(str(project))
+        renamer = ModuleRenamer(rj)
+        ImportSiteIndex(rj).build()
+        read: list[Path] = []
+        original = Path.read_text
+
+        def tracking_read_text(self, *args, **kwargs):
+            read.append(self)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "read_text", tracking_read_text)
+        result = renamer.rename_imports("myapp.old_utils", "myapp.helpers")
+
+        assert result.success, result.message
+        assert result.files_changed == [project / "myapp" / "views.py"]
+        assert project / "myapp" / "unrelated.py" not in read
+        assert (project / "myapp" / "views.py").read_text() == textwrap.dedent('''\
+            from myapp.helpers import helper
+            from . import helpers
+
+            MESSAGE = "see myapp.old_utils"
+        ''')
+
+    def test_rename_module(self, project: Path):
+        """The file is moved and importers are updated."""
+        result = ModuleRenamer(Rejig(str(project))).rename("myapp.old_utils", "myapp.core.utils")
+
+        assert result.success, result.message
+        assert not (project / "myapp" / "old_utils.py").exists()
+        assert (project / "myapp" / "core" / "utils.py").exists()
+        assert "from myapp.core.utils import helper\n" in (project / "myapp" / "views.py").read_text()
+        assert "from .core import utils\n" in (project / "myapp" / "views.py").read_text()
+
+    def test_rename_module_dry_run(self, project: Path):
+        """In dry-run mode the diff is returned and nothing is moved."""
+        result = ModuleRenamer(Rejig(str(project), dry_run=True)).rename("myapp.old_utils", "myapp.helpers")
+
+        assert result.success
+        assert project / "myapp" / "views.py" in result.files_changed
+        assert "+from myapp.helpers import helper" in result.diff
+        assert (project / "myapp" / "old_utils.py").exists()
+
+    def test_rejig_rename_import(self, project: Path):
+        """Rejig.rename_import renames a name and its uses."""
+        result = Rejig(str(project)).rename_import("myapp.old_utils.helper", "myapp.old_utils.assist")
+
+        assert result.success
+        assert result.message == "Updated imports in 1 files"
+        assert (project / "myapp" / "views.py").read_text().startswith(
+            "from myapp.old_utils import assist\n"
+        )
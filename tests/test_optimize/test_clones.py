@@ -0,0 +1,239 @@
+"""
+Tests for rejig.optimize.clones module.
+
+This module tests winnowing clone detection:
+- tokenize_source normalisation
+- winnow fingerprint selection
+- CloneDetector Type-1/2/3 clones
+- OptimizeTargetList integration
+"""
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.optimize.clones import CloneDetector, tokenize_source, winnow
+from rejig.optimize.dry import DRYAnalyzer
+from rejig.optimize.targets import OptimizeType
+
+ORIGINAL = '''
+def summarize(orders, threshold):
+    totals = {}
+    for order in orders:
+        if order.status != "cancelled" and order.amount > threshold:
+            key = (order.customer_id, order.region)
+            totals[key] = totals.get(key, 0) + order.amount * order.quantity
+    result = []
+    for (customer, region), total in sorted(totals.items()):
+        result.append({"customer": customer, "region": region, "total": round(total, 2)})
+    return result
+'''
+
+RENAMED = '''
+def aggregate(items, limit):
+    sums = {}
+    for item in items:
+        if item.status != "void" and item.amount > limit:
+            k = (item.customer_id, item.region)
+            sums[k] = sums.get(k, 1) + item.amount * item.quantity
+    out = []
+    for (cust, reg), value in sorted(sums.items()):
+        out.append({"customer": cust, "region": reg, "total": round(value, 3)})
+    return out
+'''
+
+EDITED = '''
+def summarize_active(orders, threshold):
+    totals = {}
+    for order in orders:
+        if order.status != "cancelled" and order.amount > threshold:
+            log.debug("including %s", order.id)
+            key = (order.customer_id, order.region)
+            totals[key] = totals.get(key, 0) + order.amount * order.quantity
+    result = []
+    for (customer, region), total in sorted(totals.items()):
+        result.append({"customer": customer, "region": region, "total": round(total, 2)})
+    return result
+'''
+
+UNRELATED = '''
+class Config:
+    def __init__(self, path):
+        self.path = path
+        self.values = {}
+
+    def load(self):
+        with open(self.path) as f:
+            for line in f:
+                name, _, value = line.partition("=")
+                self.values[name.strip()] = value.strip()
+        return self
+'''
+
+
+@pytest.fixture
+def create_project(tmp_path: Path):
+    """Factory fixture creating a project from {filename: content}."""
+    def _create(files: dict[str, str]) -> Rejig:
+        for name, content in files.items():
+            (tmp_path / name).write_text(textwrap.dedent(content))
+        return Rejig(str(tmp_path))
+    return _create
+
+
+# =============================================================================
+# Tokenizer Tests
+# =============================================================================
+
+class TestTokenizeSource:
+    """Tests for tokenize_source."""
+
+    def test_names_and_literals_abstracted(self):
+        """Names, numbers and strings should be abstracted; keywords kept."""
+        normalized, raw, _ = tokenize_source("if count > 10:\n    return 'big'\n")
+
+        assert normalized == ["if", "$", ">", "0", ":", ";", "return", '"', ";"]
+        assert raw[:4] == ["if", "count", ">", "10"]
+
+    def test_imports_comments_and_layout_dropped(self):
+        """Imports, comments and bracketed line breaks should not produce tokens."""
+        source = textwrap.dedent('''\
+            import os
+            from typing import (
+                Any,
+            )
+            x = [  # comment
+                1,
+            ]
+        ''')
+
+        normalized, _, lines = tokenize_source(source)
+
+        assert normalized == ["$", "=", "[", "0", ",", "]", ";"]
+        assert lines[0] == 5
+
+    def test_line_numbers_after_multiline_string(self):
+        """Line numbers should account for multi-line strings."""
+        source = 'x = """a\nb\nc"""\ny = 1\n'
+
+        normalized, _, lines = tokenize_source(source)
+
+        assert lines[normalized.index("$", 1)] == 4
+
+
+# =============================================================================
+# Winnowing Tests
+# =============================================================================
+
+class TestWinnow:
+    """Tests for winnow."""
+
+    def test_rightmost_minimum(self):
+        """Each window should select its rightmost minimum, once."""
+        assert winnow([5, 1, 3, 1, 4, 6, 2], 3) == [(1, 1), (1, 3), (2, 6)]
+
+    def test_short_sequence(self):
+        """Fewer hashes than the window should select the overall minimum."""
+        assert winnow([3, 2, 4], 8) == [(2, 1)]
+        assert winnow([], 4) == []
+
+
+# =============================================================================
+# CloneDetector Tests
+# =============================================================================
+
+class TestCloneDetector:
+    """Tests for CloneDetector."""
+
+    def test_type1_clone(self, create_project):
+        """Exact copies should be Type-1 clones."""
+        rj = create_project({"a.py": ORIGINAL, "b.py": "import os\n" + ORIGINAL})
+
+        clones = CloneDetector(rj).detect()
+
+        assert len(clones) == 1
+        clone = clones[0]
+        assert clone.clone_type == 1
+        assert clone.similarity == 1.0
+        assert (clone.file_path.name, clone.other_file.name) == ("a.py", "b.py")
+        assert (clone.line_number, clone.other_line) == (2, 3)
+
+    def test_type2_clone(self, create_project):
+        """Copies with renamed identifiers and literals should be Type-2."""
+        rj = create_project({"a.py": ORIGINAL, "b.py": RENAMED})
+
+        clones = CloneDetector(rj).detect()
+
+        assert [c.clone_type for c in clones] == [2]
+
+    def test_type3_clone(self, create_project):
+        """Copies with an inserted statement should be Type-3."""
+        rj = create_project({"a.py": ORIGINAL, "b.py": EDITED})
+
+        clones = CloneDetector(rj).detect()
+
+        assert len(clones) == 1
+        assert clones[0].clone_type == 3
+        assert 0.8 <= clones[0].similarity < 1.0
+        assert clones[0].end_line - clones[0].line_number >= 8
+
+    def test_unrelated_code(self, create_project):
+        """Unrelated code should not be reported."""
+        rj = create_project({"a.py": ORIGINAL, "b.py": UNRELATED})
+
+        assert CloneDetector(rj).detect() == []
+
+    def test_clone_within_file(self, create_project):
+        """Copies within one file should be found."""
+        rj = create_project({"a.py": ORIGINAL + "\n" + RENAMED})
+
+        clones = CloneDetector(rj).detect()
+
+        assert len(clones) == 1
+        assert clones[0].file_path == clones[0].other_file
+
+    def test_min_tokens(self, create_project):
+        """Clones smaller than min_tokens should be ignored."""
+        rj = create_project({"a.py": ORIGINAL, "b.py": RENAMED})
+
+        assert CloneDetector(rj).detect(min_tokens=500) == []
+
+    def test_boilerplate_ignored(self, create_project):
+        """Fingerprints shared by too many files should be ignored."""
+        rj = create_project({f"m{i}.py": ORIGINAL for i in range(4)})
+
+        assert len(CloneDetector(rj).detect()) == 6
+        assert CloneDetector(rj, max_occurrences=3).detect() == []
+
+
+# =============================================================================
+# Integration Tests
+# =============================================================================
+
+class TestCloneFindings:
+    """Tests for CODE_CLONE findings."""
+
+    def test_find_code_clones(self, create_project):
+        """Clones should be reported as CODE_CLONE findings."""
+        rj = create_project({"a.py": ORIGINAL, "b.py": EDITED})
+
+        findings = CloneDetector(rj).find_code_clones()
+
+        assert len(findings) == 1
+        finding = findings[0].finding
+        assert finding.type == OptimizeType.CODE_CLONE
+        assert finding.context["clone_type"] == 3
+        assert finding.context["other_file"].name == "b.py"
+        assert "Type-3 clone of" in finding.message
+        assert len(findings.dry_issues()) == 1
+
+    def test_dry_analyzer(self, create_project):
+        """DRYAnalyzer should expose clone detection."""
+        rj = create_project({"a.py": ORIGINAL, "b.py": RENAMED})
+
+        findings = DRYAnalyzer(rj).find_code_clones()
+
+        assert len(findings.by_type(OptimizeType.CODE_CLONE)) == 1
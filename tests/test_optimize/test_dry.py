@@ -417,6 +417,123 @@ class TestDRYAnalyzer:
         findings = analyzer.find_similar_functions()
 
         assert isinstance(findings, OptimizeTargetList)
+        assert {f.name for f in findings} == {"process_users", "process_orders"}
+        assert all(f.finding.context["similarity"] == 1.0 for f in findings)
+
+    def test_find_similar_functions_near_duplicates(self, create_project):
+        """
+        Edited copies should be reported above the threshold only.
+        """
+        rj = create_project({
+            "file1.py": '''\
+                def load_users(db, limit):
+                    rows = db.query("users")
+                    result = []
+                    for row in rows:
+                        if row.active:
+                            result.append(row.name)
+                    result.sort()
+                    return result[:limit]
+            ''',
+            "file2.py": '''\
+                def load_orders(conn, count):
+                    records = conn.query("orders")
+                    out = []
+                    for rec in records:
+                        if rec.active:
+                            out.append(rec.total)
+                    out.sort()
+                    log(out)
+                    return out[:count]
+            ''',
+        })
+
+        analyzer = DRYAnalyzer(rj)
+        similar = analyzer.find_similar_functions(similarity_threshold=0.7)
+        strict = analyzer.find_similar_functions(similarity_threshold=0.99)
+
+        assert len(similar) == 2
+        assert all("similar structure" in f.finding.message for f in similar)
+        assert sorted(f.finding.context["similarity"] for f in similar)[0] < 1.0
+        assert all(f.finding.context["similarity"] >= 0.7 for f in similar)
+        assert len(strict) == 0
+
+    def test_find_similar_functions_clusters(self, create_project):
+        """
+        Similar functions should be grouped around one representative.
+        """
+        body = textwrap.dedent('''\
+            def {name}(items):
+                total = 0
+                for item in items:
+                    if item.price > 10:
+                        total += item.price * item.qty
+                return total
+        ''')
+        rj = create_project({
+            "a.py": body.format(name="total_a") + "\n" + body.format(name="total_b"),
+            "b.py": body.format(name="total_c"),
+            "c.py": '''\
+                def unrelated(path):
+                    with open(path) as f:
+                        return [line.strip() for line in f]
+            ''',
+        })
+
+        findings = DRYAnalyzer(rj).find_similar_functions()
+
+        assert len(findings) == 3
+        contexts = [f.finding.context for f in findings]
+        assert {c["cluster_id"] for c in contexts} == {0}
+        assert {c["representative"] for c in contexts} == {"total_a"}
+        assert all(c["cluster_size"] == 3 for c in contexts)
+        assert sorted(contexts[0]["similar_functions"]) == ["total_b", "total_c"]
+
+    def test_find_similar_functions_ignores_stubs(self, create_project):
+        """
+        Trivial bodies such as stubs should not be reported.
+        """
+        rj = create_project({
+            "file1.py": '''\
+                def a():
+                    pass
+
+                def b():
+                    pass
+            ''',
+        })
+
+        assert len(DRYAnalyzer(rj).find_similar_functions()) == 0
+
+    def test_find_similar_functions_uses_cache(self, create_project):
+        """
+        Unchanged files should be served from the analysis cache.
+        """
+        rj = create_project({
+            "file1.py": '''\
+                def f(items):
+                    out = []
+                    for item in items:
+                        out.append(item * 2)
+                    return out
+
+                def g(values):
+                    res = []
+                    for v in values:
+                        res.append(v * 2)
+                    return res
+            ''',
+        })
+        analyzer = DRYAnalyzer(rj)
+        first = analyzer.find_similar_functions()
+
+        def fail(file_path, visitors):
+            raise AssertionError(f"{file_path} was parsed again")
+
+        analyzer._visit_file = fail
+        second = analyzer.find_similar_functions()
+
+        assert len(first) == len(second) == 2
 
     # === Find All Issues ===
 
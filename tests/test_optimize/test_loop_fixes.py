@@ -0,0 +1,399 @@
+"""
+Tests for rejig.optimize.loop_fixes module.
+
+This module tests automatic rewriting of slow loops:
+- Comprehension, sum(), join(), any()/all() and enumerate() rewrites
+- Scoping and side-effect checks that keep loops unchanged
+- LoopOptimizer.apply and OptimizeTargetList.fix_all
+"""
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.optimize.loop_fixes import rewrite_loops
+from rejig.optimize.loops import LoopOptimizer
+
+
+def rewrite(code: str) -> str:
+    """Rewrite all fixable loops in dedented code."""
+    new_code, _ = rewrite_loops(textwrap.dedent(code))
+    return new_code
+
+
+def unchanged(code: str) -> bool:
+    """Check that no loop in dedented code is rewritten."""
+    code = textwrap.dedent(code)
+    new_code, lines = rewrite_loops(code)
+    return new_code == code and not lines
+
+
+# =============================================================================
+# Rewrite Tests
+# =============================================================================
+
+class TestRewrites:
+    """Tests for the loop rewrites."""
+
+    def test_filtered_list_comprehension(self):
+        """An append loop after an empty list becomes a comprehension."""
+        result = rewrite('''
+            def f(items):
+                out = []
+                for x in items:
+                    if x > 0:
+                        out.append(x * 2)
+                return out
+        ''')
+
+        assert "out = [x * 2 for x in items if x > 0]" in result
+        assert "append" not in result
+
+    def test_extend_without_initialiser(self):
+        """Without an empty initialiser the comprehension extends the list."""
+        result = rewrite('''
+            def f(items, out):
+                for x in items:
+                    out.append(str(x))
+        ''')
+
+        assert "out.extend([str(x) for x in items])" in result
+
+    def test_list_and_set_conversion(self):
+        """Copy loops become list()/set() calls."""
+        result = rewrite('''
+            def f(items):
+                seen = set()
+                for x in items:
+                    seen.add(x)
+                copy = []
+                for y in items:
+                    copy.append(y)
+                return seen, copy
+        ''')
+
+        assert "seen = set(items)" in result
+        assert "copy = list(items)" in result
+
+    def test_dict_comprehension(self):
+        """Dict assignment loops become dict comprehensions."""
+        result = rewrite('''
+            def f(pairs):
+                d = {}
+                for k, v in pairs:
+                    d[k] = v + 1
+                return d
+        ''')
+
+        assert "d = {k: v + 1 for k, v in pairs}" in result
+
+    def test_sum_and_join(self):
+        """Number and empty-string accumulators become sum() and join()."""
+        result = rewrite('''
+            def f(items, words):
+                total = 0
+                for x in items:
+                    total += x.price
+                extra = 10
+                for y in items:
+                    extra += y
+                text = ""
+                for w in words:
+                    text += w.upper()
+                return total, extra, text
+        ''')
+
+        assert "total = sum(x.price for x in items)" in result
+        assert "extra = sum(items, 10)" in result
+        assert 'text = "".join(w.upper() for w in words)' in result
+
+    def test_any_and_all(self):
+        """Early-return loops become any() and not any()."""
+        result = rewrite('''
+            def has_bad(items):
+                for x in items:
+                    if x.bad:
+                        return True
+                return False
+
+            def all_ok(items):
+                for x in items:
+                    if not x.ok:
+                        return False
+                return True
+        ''')
+
+        assert "return any(x.bad for x in items)" in result
+        assert "return not any(not x.ok for x in items)" in result
+        assert "return False" not in result
+
+    def test_enumerate(self):
+        """A manual counter becomes enumerate()."""
+        result = rewrite('''
+            def f(pairs):
+                i = 1
+                for a, b in pairs:
+                    print(i, a, b)
+                    i += 1
+        ''')
+
+        assert "for i, (a, b) in enumerate(pairs, 1):" in result
+        assert "i = 1" not in result
+        assert "i += 1" not in result
+        assert "print(i, a, b)" in result
+
+    def test_annotated_initialiser(self):
+        """Annotations on the initialiser are kept."""
+        result = rewrite('''
+            def f(params):
+                names: list[str] = []
+                for p in params:
+                    names.append(p.name)
+                return names
+        ''')
+
+        assert "names: list[str] = [p.name for p in params]" in result
+
+    def test_leading_comment_kept(self):
+        """Comments above the initialiser are kept."""
+        result = rewrite('''
+            def f(items):
+                # collect names
+                names = []
+                for x in items:
+                    names.append(x.name)
+                return names
+        ''')
+
+        assert "    # collect names\n    names = [x.name for x in items]" in result
+
+    def test_module_level(self):
+        """Loops at module level are rewritten too."""
+        result = rewrite('''
+            squares = []
+            for n in range(10):
+                squares.append(n * n)
+        ''')
+
+        assert result.strip() == "squares = [n * n for n in range(10)]"
+
+
+# =============================================================================
+# Safety Tests
+# =============================================================================
+
+class TestSafety:
+    """Tests for loops that must not be rewritten."""
+
+    def test_loop_variable_used_later(self):
+        """The loop variable leaks out of a for loop but not a comprehension."""
+        assert unchanged('''
+            def f(items):
+                out = []
+                for x in items:
+                    out.append(x)
+                return x
+        ''')
+
+    def test_counter_used_after_loop(self):
+        """enumerate() doesn't leave the counter one past the end."""
+        assert unchanged('''
+            def f(items):
+                i = 0
+                for x in items:
+                    print(x)
+                    i += 1
+                return i
+        ''')
+
+    def test_counter_with_continue(self):
+        """A continue skips the increment, so enumerate() would differ."""
+        assert unchanged('''
+            def f(items):
+                i = 0
+                for x in items:
+                    if not x:
+                        continue
+                    print(i, x)
+                    i += 1
+        ''')
+
+    def test_accumulator_read_in_loop(self):
+        """The accumulator can't be read while it is being built."""
+        assert unchanged('''
+            def f(items):
+                out = []
+                for x in items:
+                    out.append(len(out) + x)
+                return out
+        ''')
+
+    def test_accumulator_is_loop_variable(self):
+        """Appending to each item is not building a list."""
+        assert unchanged('''
+            def f(lists):
+                for items in lists:
+                    items.append(0)
+        ''')
+
+    def test_class_body(self):
+        """Comprehensions in class bodies can't see class variables."""
+        assert unchanged('''
+            class K:
+                out = []
+                for x in range(3):
+                    out.append(x)
+        ''')
+
+    def test_loop_else_and_comments(self):
+        """for-else loops and loops with comments are left alone."""
+        assert unchanged('''
+            def f(items):
+                out = []
+                for x in items:
+                    out.append(x)  # keep me
+                return out
+
+            def g(items):
+                out = []
+                for x in items:
+                    out.append(x)
+                else:
+                    out.append(None)
+                return out
+        ''')
+
+    def test_any_without_final_return(self):
+        """any() needs the loop to be followed by the opposite return."""
+        assert unchanged('''
+            def f(items):
+                for x in items:
+                    if x:
+                        return True
+                print("none")
+        ''')
+
+    def test_sum_without_initialiser(self):
+        """+= loops need a known start value."""
+        assert unchanged('''
+            def f(items, total):
+                for x in items:
+                    total += x
+                return total
+        ''')
+
+    def test_walrus(self):
+        """Assignment expressions would bind in a different scope."""
+        assert unchanged('''
+            def f(items):
+                out = []
+                for x in items:
+                    out.append(y := x + 1)
+                return out, y
+        ''')
+
+    def test_selected_lines_only(self):
+        """Only loops at the requested lines are rewritten."""
+        code = textwrap.dedent('''
+            a = []
+            for x in range(3):
+                a.append(x)
+            b = []
+            for y in range(3):
+                b.append(y)
+        ''')
+
+        new_code, lines = rewrite_loops(code, {6})
+
+        assert lines == [6]
+        assert "a.append(x)" in new_code
+        assert "b = list(range(3))" in new_code
+
+
+# =============================================================================
+# Apply Tests
+# =============================================================================
+
+class TestApply:
+    """Tests for LoopOptimizer.apply and OptimizeTargetList.fix_all."""
+
+    SOURCE = '''
+        def build(items):
+            out = []
+            for x in items:
+                out.append(x * 2)
+            return out
+
+        def has_bad(items):
+            for x in items:
+                if x.bad:
+                    return True
+            return False
+
+        def leaky(items):
+            out = []
+            for x in items:
+                out.append(x)
+            return out, x
+    '''
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        (tmp_path / "a.py").write_text(textwrap.dedent(self.SOURCE))
+        (tmp_path / "b.py").write_text("for i in range(3):\n    print(i)\n")
+        return tmp_path
+
+    def test_fix_all(self, project: Path):
+        """fix_all rewrites safe loops, counts the rest and writes the file."""
+        rj = Rejig(str(project))
+        findings = LoopOptimizer(rj).find_all_issues()
+
+        result = findings.fix_all()
+
+        assert result.success
+        assert result.data["fixed"] == 2
+        assert result.data["skipped"] == 1
+        assert result.files_changed == [project / "a.py"]
+        content = (project / "a.py").read_text()
+        assert "out = [x * 2 for x in items]" in content
+        assert "return any(x.bad for x in items)" in content
+        assert "return out, x" in content
+        compile(content, "a.py", "exec")
+
+    def test_dry_run(self, project: Path):
+        """In dry-run mode the diff is returned and nothing is written."""
+        before = (project / "a.py").read_text()
+        rj = Rejig(str(project), dry_run=True)
+
+        result = LoopOptimizer(rj).apply()
+
+        assert result.success
+        assert "+    out = [x * 2 for x in items]" in result.diff
+        assert (project / "a.py").read_text() == before
+
+    def test_inside_transaction(self, project: Path):
+        """Inside a transaction the changes wait for the commit."""
+        rj = Rejig(str(project))
+        before = (project / "a.py").read_text()
+
+        with rj.transaction() as tx:
+            result = LoopOptimizer(rj).apply()
+            assert result.data["fixed"] == 2
+            assert (project / "a.py").read_text() == before
+            tx.commit()
+
+        assert "return any(" in (project / "a.py").read_text()
+
+    def test_nothing_to_fix(self, tmp_path: Path):
+        """Without fixable findings apply reports success and no changes."""
+        (tmp_path / "a.py").write_text("x = 1\n")
+        rj = Rejig(str(tmp_path))
+
+        result = LoopOptimizer(rj).apply()
+
+        assert result.success
+        assert result.files_changed == []
+        assert result.data["fixed"] == 0
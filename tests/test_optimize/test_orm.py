@@ -0,0 +1,336 @@
+"""
+Tests for rejig.optimize.orm module.
+
+This module tests N+1 query detection:
+- Django and SQLAlchemy relationship maps, including reverse accessors
+- Loops and comprehensions over querysets and query results
+- Eager loading already present in the query
+- NPlusOneAnalyzer.apply inserting the eager-loading calls
+"""
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import libcst as cst
+import pytest
+
+from rejig import Rejig
+from rejig.optimize.orm import ModelRelationship, NPlusOneAnalyzer, add_eager_loads
+from rejig.optimize.targets import OptimizeType
+
+DJANGO_MODELS = '''
+    from django.db import models
+
+    class Author(models.Model):
+        name = models.CharField(max_length=100)
+
+    class Profile(models.Model):
+        author = models.OneToOneField(Author, on_delete=models.CASCADE)
+
+    class Tag(models.Model):
+        label = models.CharField(max_length=20)
+
+    class Post(models.Model):
+        author = models.ForeignKey("blog.Author", on_delete=models.CASCADE)
+        parent = models.ForeignKey("self", null=True, on_delete=models.SET_NULL, related_name="+")
+        tags = models.ManyToManyField(Tag, related_name="posts")
+'''
+
+SQLALCHEMY_MODELS = '''
+    from sqlalchemy.orm import Mapped, relationship
+
+    class User(Base):
+        __tablename__ = "users"
+        addresses: Mapped[list["Address"]] = relationship(back_populates="user")
+        group = relationship("Group", backref="members", uselist=False)
+        roles = relationship("Role", lazy="selectin")
+
+    class Address(Base):
+        __tablename__ = "addresses"
+        user: Mapped["User"] = relationship(back_populates="addresses")
+'''
+
+
+def write(root: Path, name: str, code: str) -> Path:
+    path = root / name
+    path.write_text(textwrap.dedent(code))
+    return path
+
+
+@pytest.fixture
+def django_project(tmp_path: Path) -> Path:
+    write(tmp_path, "models.py", DJANGO_MODELS)
+    return tmp_path
+
+
+@pytest.fixture
+def sqlalchemy_project(tmp_path: Path) -> Path:
+    write(tmp_path, "models.py", SQLALCHEMY_MODELS)
+    return tmp_path
+
+
+def issues(root: Path) -> list[tuple[int, str]]:
+    """(line, relationship) of each finding."""
+    result = NPlusOneAnalyzer(Rejig(str(root))).find_all_issues()
+    return [(t.line_number, t.finding.context["relationship"]) for t in result]
+
+
+# =============================================================================
+# Relationship Map Tests
+# =============================================================================
+
+class TestRelationships:
+    """Tests for the model and relationship map."""
+
+    def test_django(self, django_project: Path):
+        """Forward fields and reverse accessors are mapped."""
+        models = NPlusOneAnalyzer(Rejig(str(django_project))).find_relationships()
+
+        assert models["Post"]["author"].target == "Author"
+        assert models["Post"]["author"].loader == "select_related"
+        assert models["Post"]["tags"].loader == "prefetch_related"
+        assert models["Post"]["parent"].target == "Post"
+        assert models["Author"]["post_set"].reverse
+        assert models["Author"]["post_set"].loader == "prefetch_related"
+        assert models["Author"]["profile"].loader == "select_related"
+        assert models["Tag"]["posts"].target == "Post"
+        # related_name="+" disables the reverse accessor
+        assert "post_set" not in models.get("Post", {})
+
+    def test_sqlalchemy(self, sqlalchemy_project: Path):
+        """Targets, collections and lazy strategies come from the declaration."""
+        models = NPlusOneAnalyzer(Rejig(str(sqlalchemy_project))).find_relationships()
+
+        assert models["User"]["addresses"].target == "Address"
+        assert models["User"]["addresses"].loader == "selectinload"
+        assert models["Address"]["user"].loader == "joinedload"
+        assert models["User"]["group"].loader == "joinedload"
+        assert models["User"]["roles"].lazy is False
+        assert models["Group"]["members"] == ModelRelationship(
+            "Group", "members", "User", "sqlalchemy", many=True, reverse=True
+        )
+
+
+# =============================================================================
+# Django Detection Tests
+# =============================================================================
+
+class TestDjango:
+    """Tests for N+1 detection in Django code."""
+
+    def test_loop_over_queryset(self, django_project: Path):
+        """Forward and many-to-many relations accessed in a loop are reported."""
+        write(django_project, "views.py", '''
+            from .models import Post
+
+            def index():
+                for post in Post.objects.filter(published=True):
+                    print(post.author.name, post.author_id)
+                    print([t.label for t in post.tags.all()])
+        ''')
+
+        result = NPlusOneAnalyzer(Rejig(str(django_project))).find_all_issues()
+
+        assert [(t.line_number, t.type) for t in result] == [
+            (6, OptimizeType.N_PLUS_ONE_QUERY),
+            (7, OptimizeType.N_PLUS_ONE_QUERY),
+        ]
+        assert result[0].finding.suggested_code == (
+            'Post.objects.select_related("author")'
+            '.prefetch_related("tags").filter(published=True)'
+        )
+        assert result[0].finding.context["loop_line"] == 5
+        assert result[0].finding.name == "index"
+
+    def test_already_loaded(self, django_project: Path):
+        """select_related/prefetch_related calls, also on query variables, count."""
+        write(django_project, "views.py", '''
+            from .models import Author, Post
+
+            def index():
+                posts = Post.objects.select_related("author__profile")
+                posts = posts.prefetch_related(Prefetch("tags"))
+                for post in posts:
+                    print(post.author, post.tags.all())
+                for post in Post.objects.select_related():
+                    print(post.author)
+        ''')
+
+        assert issues(django_project) == []
+
+    def test_comprehension_and_reverse(self, django_project: Path):
+        """Comprehensions over querysets and reverse accessors are checked."""
+        write(django_project, "views.py", '''
+            from .models import Author
+
+            counts = {a.name: a.post_set.count() for a in Author.objects.all()}
+        ''')
+
+        assert issues(django_project) == [(4, "post_set")]
+
+    def test_not_reported(self, django_project: Path):
+        """Values querysets, requerying managers and assignments are fine."""
+        write(django_project, "views.py", '''
+            from .models import Post
+
+            def index(posts, author):
+                for row in Post.objects.values("author"):
+                    print(row.author)
+                for post in Post.objects.all():
+                    post.tags.filter(label="x")
+                    post.author = author
+                for post in posts:
+                    print(post.author)
+        ''')
+
+        assert issues(django_project) == []
+
+
+# =============================================================================
+# SQLAlchemy Detection Tests
+# =============================================================================
+
+class TestSQLAlchemy:
+    """Tests for N+1 detection in SQLAlchemy code."""
+
+    def test_session_query(self, sqlalchemy_project: Path):
+        """Lazy relationships on session.query() results are reported."""
+        write(sqlalchemy_project, "service.py", '''
+            from .models import User
+
+            def emails(session):
+                for user in session.query(User).filter(User.active):
+                    print(user.addresses, user.roles, user.group)
+        ''')
+
+        result = NPlusOneAnalyzer(Rejig(str(sqlalchemy_project))).find_all_issues()
+
+        assert [t.finding.context["relationship"] for t in result] == ["addresses", "group"]
+        assert result[0].finding.suggested_code == (
+            "session.query(User).options(selectinload(User.addresses), "
+            "joinedload(User.group)).filter(User.active)"
+        )
+
+    def test_select_statements(self, sqlalchemy_project: Path):
+        """scalars() results are models; execute() rows are not."""
+        write(sqlalchemy_project, "service.py", '''
+            from sqlalchemy import select
+            from sqlalchemy.orm import selectinload
+            from .models import Address, User
+
+            def run(session):
+                stmt = select(Address).where(Address.id > 1)
+                for address in session.scalars(stmt):
+                    address.user
+                for row in session.execute(select(Address)):
+                    row.user
+                query = select(User).options(selectinload(User.addresses))
+                for user in session.execute(query).scalars():
+                    user.addresses
+        ''')
+
+        assert issues(sqlalchemy_project) == [(9, "user")]
+
+    def test_flask_model_query(self, sqlalchemy_project: Path):
+        """Flask-SQLAlchemy Model.query and backrefs are supported."""
+        write(sqlalchemy_project, "views.py", '''
+            from .models import Group
+
+            def groups():
+                return [len(g.members) for g in Group.query.all()]
+        ''')
+
+        assert issues(sqlalchemy_project) == [(5, "members")]
+
+
+# =============================================================================
+# Eager Loading Tests
+# =============================================================================
+
+class TestAddEagerLoads:
+    """Tests for add_eager_loads."""
+
+    def code(self, query: str, framework: str, *relationships: tuple[str, bool]) -> str:
+        node = add_eager_loads(
+            cst.parse_expression(query),
+            framework,
+            "M",
+            [ModelRelationship("M", name, "T", framework, many) for name, many in relationships],
+        )
+        return cst.Module(body=[]).code_for_node(node)
+
+    def test_extends_existing_call(self):
+        """Arguments are added to an existing loading call."""
+        assert self.code(
+            'M.objects.filter(x=1).prefetch_related("a")', "django", ("b", True)
+        ) == 'M.objects.filter(x=1).prefetch_related("a", "b")'
+        assert self.code(
+            "session.query(M).options(joinedload(M.a))", "sqlalchemy", ("b", False)
+        ) == "session.query(M).options(joinedload(M.a), joinedload(M.b))"
+
+    def test_empty_select_related_not_narrowed(self):
+        """select_related() loads every forward key; it gets a new call."""
+        assert self.code("M.objects.select_related()", "django", ("a", False)) == (
+            'M.objects.select_related("a").select_related()'
+        )
+
+
+# =============================================================================
+# Apply Tests
+# =============================================================================
+
+class TestApply:
+    """Tests for NPlusOneAnalyzer.apply."""
+
+    VIEWS = '''
+        from .models import Address, Post
+
+        def index(session):
+            for post in Post.objects.all():
+                print(post.author, post.tags.all())
+            for address in session.query(Address):
+                print(address.user)
+    '''
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        write(tmp_path, "models.py", DJANGO_MODELS + SQLALCHEMY_MODELS)
+        write(tmp_path, "views.py", self.VIEWS)
+        return tmp_path
+
+    def test_apply(self, project: Path):
+        """Each query gets one change and loader imports are added."""
+        analyzer = NPlusOneAnalyzer(Rejig(str(project)))
+
+        result = analyzer.apply()
+
+        assert result.success
+        assert result.data["fixed"] == 2
+        assert result.files_changed == [project / "views.py"]
+        content = (project / "views.py").read_text()
+        assert (
+            'for post in Post.objects.select_related("author")'
+            '.prefetch_related("tags").all():'
+        ) in content
+        assert "session.query(Address).options(joinedload(Address.user))" in content
+        assert "from sqlalchemy.orm import joinedload" in content
+        assert len(analyzer.find_all_issues()) == 0
+
+    def test_dry_run(self, project: Path):
+        """In dry-run mode the diff is returned and nothing is written."""
+        before = (project / "views.py").read_text()
+
+        result = NPlusOneAnalyzer(Rejig(str(project), dry_run=True)).apply()
+
+        assert result.success
+        assert '+    for post in Post.objects.select_related("author")' in result.diff
+        assert (project / "views.py").read_text() == before
+
+    def test_nothing_to_fix(self, django_project: Path):
+        """Without findings apply reports success and no changes."""
+        result = NPlusOneAnalyzer(Rejig(str(django_project))).apply()
+
+        assert result.success
+        assert result.files_changed == []
+        assert result.data["fixed"] == 0
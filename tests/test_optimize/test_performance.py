@@ -0,0 +1,342 @@
+"""
+Tests for rejig.optimize.performance module.
+
+This module tests runtime performance anti-pattern detection:
+- Membership tests on lists and constant sequences inside loops
+- Regex calls with constant patterns in loops and loop-called functions
+- String concatenation, repeated lookups, list queues, deepcopy and sorting
+- The combined pass with LoopPatternVisitor
+"""
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.optimize.performance import PerformanceAnalyzer, PerformanceVisitor
+from rejig.optimize.targets import OptimizeTargetList, OptimizeType
+from rejig.optimize.visitors import visit_combined
+
+
+def findings(code: str) -> list:
+    """Run PerformanceVisitor over dedented code."""
+    visitor = PerformanceVisitor(Path("test.py"))
+    visit_combined(textwrap.dedent(code), [visitor])
+    return visitor.findings
+
+
+def types(code: str) -> list[tuple[int, OptimizeType]]:
+    """(line, type) of each finding."""
+    return [(f.line_number, f.type) for f in findings(code)]
+
+
+# =============================================================================
+# Membership Tests
+# =============================================================================
+
+class TestMembership:
+    """Tests for list membership tests inside loops."""
+
+    def test_local_list(self):
+        """A list built in the function and tested in a loop is reported."""
+        result = findings('''
+            def f(items):
+                seen = []
+                for x in items:
+                    if x not in seen:
+                        seen.append(x)
+        ''')
+
+        assert [f.type for f in result] == [OptimizeType.LIST_MEMBERSHIP_IN_LOOP]
+        assert result[0].line_number == 5
+        assert result[0].context["container"] == "seen"
+        assert "set(seen)" in result[0].suggested_code
+
+    def test_global_parameter_and_attribute(self):
+        """Module lists, list-annotated parameters and self attributes count."""
+        result = types('''
+            ALLOWED = ["a", "b"]
+
+            class C:
+                def __init__(self):
+                    self.names = []
+
+                def run(self, items, extra: list[str]):
+                    for x in items:
+                        if x in ALLOWED or x in extra or x in self.names:
+                            pass
+        ''')
+
+        assert result == [(10, OptimizeType.LIST_MEMBERSHIP_IN_LOOP)] * 3
+
+    def test_not_a_list(self):
+        """Sets, unknown containers and rebound containers are not reported."""
+        assert types('''
+            def f(items, other):
+                seen = set()
+                window = []
+                for x in items:
+                    if x in seen or x in other or x in window:
+                        pass
+                    window = [x]
+        ''') == []
+
+    def test_constant_sequence(self):
+        """Long constant sequences suggest a set literal."""
+        result = findings('''
+            def f(items):
+                for x in items:
+                    if x in ("a", "b", "c", "d"):
+                        pass
+                    if x in ("a", "b"):
+                        pass
+        ''')
+
+        assert len(result) == 1
+        assert result[0].suggested_code == '... in {"a", "b", "c", "d"}'
+
+    def test_comprehension(self):
+        """Comprehension conditions are loops too."""
+        assert types('''
+            def f(items):
+                seen = [1, 2]
+                return [x for x in items if x in seen]
+        ''') == [(4, OptimizeType.LIST_MEMBERSHIP_IN_LOOP)]
+
+    def test_outside_loop(self):
+        """A single membership test is fine."""
+        assert types('''
+            def f(x):
+                items = [1, 2, 3]
+                return x in items
+        ''') == []
+
+
+# =============================================================================
+# Regex Tests
+# =============================================================================
+
+class TestRegex:
+    """Tests for regex calls with constant patterns."""
+
+    def test_in_loop(self):
+        """Constant patterns in loops are reported, variable ones are not."""
+        result = findings('''
+            import re
+
+            def f(lines, pattern):
+                for line in lines:
+                    re.match(r"^\\d+", line)
+                    re.match(pattern, line)
+        ''')
+
+        assert [(f.line_number, f.type) for f in result] == [
+            (6, OptimizeType.REGEX_IN_LOOP)
+        ]
+        assert 're.compile(r"^\\d+")' in result[0].suggested_code
+
+    def test_from_import_and_alias(self):
+        """Imported names are followed; other modules named re are not."""
+        assert types('''
+            from re import compile as rx
+
+            def f(lines):
+                for line in lines:
+                    rx("a+")
+        ''') == [(6, OptimizeType.REGEX_IN_LOOP)]
+        assert types('''
+            import regex as re
+
+            def f(lines):
+                for line in lines:
+                    re.match("a+", line)
+        ''') == []
+
+    def test_function_called_in_loop(self):
+        """Regex calls in a function called from a loop are reported."""
+        result = findings('''
+            import re
+
+            def parse(line):
+                return re.search("key=(\\\\w+)", line)
+
+            def unused(line):
+                return re.search("x", line)
+
+            def run(lines):
+                for line in lines:
+                    parse(line)
+        ''')
+
+        assert len(result) == 1
+        assert result[0].name == "parse"
+        assert result[0].context["called_from_line"] == 12
+        assert "called in a loop at line 12" in result[0].message
+
+
+# =============================================================================
+# Other Pattern Tests
+# =============================================================================
+
+class TestOtherPatterns:
+    """Tests for the remaining anti-patterns."""
+
+    def test_string_concatenation(self):
+        """String += in a loop is reported; number += is not."""
+        assert types('''
+            def f(items):
+                out = ""
+                total = 0
+                for x in items:
+                    out += x
+                    total += x
+                    out = out + ", "
+        ''') == [
+            (6, OptimizeType.INEFFICIENT_STRING_CONCAT),
+            (8, OptimizeType.INEFFICIENT_STRING_CONCAT),
+        ]
+
+    def test_repeated_lookups(self):
+        """Invariant chains in tight innermost loops are reported once per loop."""
+        result = findings('''
+            import os
+
+            def f(self, names):
+                for name in names:
+                    self.out.paths.append(os.path.join("a", name))
+                for node in names:
+                    node.child.visit()
+        ''')
+
+        assert [f.type for f in result] == [OptimizeType.REPEATED_LOOKUP_IN_LOOP]
+        assert result[0].context["lookups"] == ["self.out.paths.append", "os.path.join"]
+        assert "join = os.path.join" in result[0].suggested_code
+
+    def test_list_as_queue(self):
+        """pop(0) and insert(0, x) are reported, more severely in loops."""
+        result = findings('''
+            def f(queue, item):
+                queue.insert(0, item)
+                while queue:
+                    queue.pop(0)
+                    queue.pop()
+        ''')
+
+        assert [(f.line_number, f.severity) for f in result] == [
+            (3, "suggestion"),
+            (5, "warning"),
+        ]
+        assert all(f.type == OptimizeType.LIST_AS_QUEUE for f in result)
+        assert "popleft()" in result[1].suggested_code
+
+    def test_deepcopy(self):
+        """deepcopy in a loop is reported however it is imported."""
+        assert types('''
+            import copy
+            from copy import deepcopy
+
+            def f(items, template):
+                for x in items:
+                    a = copy.deepcopy(template)
+                    b = deepcopy(template)
+                    c = copy.copy(template)
+        ''') == [
+            (7, OptimizeType.DEEPCOPY_IN_LOOP),
+            (8, OptimizeType.DEEPCOPY_IN_LOOP),
+        ]
+
+    def test_sort(self):
+        """Sorting an invariant container in a loop is reported."""
+        assert types('''
+            def f(items, groups):
+                for x in items:
+                    groups.append(x)
+                    groups.sort()
+                for group in groups:
+                    group.sort()
+                    y = sorted(group)
+                for x in sorted(items):
+                    pass
+        ''') == [(5, OptimizeType.SORT_IN_LOOP)]
+
+    def test_nested_function_not_in_loop(self):
+        """A function defined inside a loop body runs outside that loop."""
+        assert types('''
+            import copy
+
+            def f(items):
+                for x in items:
+                    def g(y):
+                        return copy.deepcopy(y)
+        ''') == []
+
+
+# =============================================================================
+# PerformanceAnalyzer Tests
+# =============================================================================
+
+class TestPerformanceAnalyzer:
+    """Tests for PerformanceAnalyzer."""
+
+    @pytest.fixture
+    def rejig(self, tmp_path: Path) -> Rejig:
+        (tmp_path / "app.py").write_text(textwrap.dedent('''
+            import re
+            from copy import deepcopy
+
+            def build(items):
+                text = ""
+                for item in items:
+                    text += item
+                return text
+
+            def check(items, seen: list):
+                for x in items:
+                    if x in seen:
+                        deepcopy(x)
+                        re.search("a", x)
+        '''))
+        return Rejig(str(tmp_path))
+
+    def test_find_all_issues(self, rejig: Rejig):
+        """All categories are found and returned as OptimizeTargetList."""
+        result = PerformanceAnalyzer(rejig).find_all_issues()
+
+        assert isinstance(result, OptimizeTargetList)
+        assert sorted(t.type.name for t in result) == [
+            "DEEPCOPY_IN_LOOP",
+            "INEFFICIENT_STRING_CONCAT",
+            "LIST_MEMBERSHIP_IN_LOOP",
+            "REGEX_IN_LOOP",
+        ]
+        assert len(result.performance_issues()) == 4
+        assert len(result.warnings()) == 2
+
+    def test_category_methods(self, rejig: Rejig):
+        """Each find_* method returns only its own category."""
+        analyzer = PerformanceAnalyzer(rejig)
+
+        assert [t.line_number for t in analyzer.find_membership_tests()] == [13]
+        assert [t.line_number for t in analyzer.find_deepcopy_in_loops()] == [14]
+        assert [t.line_number for t in analyzer.find_regex_in_loops()] == [15]
+        assert [t.line_number for t in analyzer.find_string_concatenation()] == [8]
+        assert len(analyzer.find_sorts_in_loops()) == 0
+
+    def test_include_loops(self, rejig: Rejig):
+        """Loop patterns come from the same pass, without duplicate joins."""
+        result = PerformanceAnalyzer(rejig).find_all_issues(include_loops=True)
+
+        names = sorted(t.type.name for t in result)
+        assert "SLOW_LOOP_TO_JOIN" in names
+        assert "INEFFICIENT_STRING_CONCAT" not in names
+        assert "DEEPCOPY_IN_LOOP" in names
+
+    def test_invalid_file_skipped(self, tmp_path: Path):
+        """Files that don't parse are skipped."""
+        (tmp_path / "bad.py").write_text("def broken(:\n")
+
+        result = PerformanceAnalyzer(Rejig(str(tmp_path))).find_all_issues()
+
+        assert len(result) == 0
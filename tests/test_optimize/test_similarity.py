@@ -0,0 +1,176 @@
+"""
+Tests for rejig.optimize.similarity module.
+
+This module tests the near-duplicate search used for similar functions:
+- Structural labels and shingles of CST subtrees
+- MinHash signatures and LSH band selection
+- MinHashIndex candidate search with exact verification
+"""
+from __future__ import annotations
+
+import random
+import textwrap
+
+import libcst as cst
+
+from rejig.optimize.similarity import (
+    MinHashIndex,
+    jaccard,
+    lsh_params,
+    minhash_signature,
+    node_labels,
+    node_shingles,
+)
+
+
+def body(code: str) -> cst.BaseSuite:
+    """Parse a single function and return its body."""
+    func = cst.parse_module(textwrap.dedent(code)).body[0]
+    assert isinstance(func, cst.FunctionDef)
+    return func.body
+
+
+# =============================================================================
+# Shingle Tests
+# =============================================================================
+
+class TestShingles:
+    """Tests for node_labels and node_shingles."""
+
+    def test_names_and_literals_abstracted(self):
+        """Renamed copies with different literals should have equal shingles."""
+        a = body('''
+            def f(items):
+                total = 0
+                for item in items:
+                    total += item.price * 2
+                return total
+        ''')
+        b = body('''
+            def g(rows):
+                acc = 10
+                for row in rows:
+                    acc += row.cost * 3  # comment
+                return acc
+        ''')
+
+        assert node_shingles(a) == node_shingles(b)
+
+    def test_builtins_kept(self):
+        """Common builtins should keep their names."""
+        labels = node_labels(body('''
+            def f(x):
+                return len(x)
+        '''))
+
+        assert "len" in labels
+        assert "x" not in labels
+
+    def test_structure_matters(self):
+        """Different structures should have different shingles."""
+        a = body('''
+            def f(x):
+                return x + 1
+        ''')
+        b = body('''
+            def f(x):
+                return [x]
+        ''')
+
+        assert node_shingles(a) != node_shingles(b)
+
+    def test_repeats_counted(self):
+        """Repeated statements should add shingles."""
+        once = body('''
+            def f(x):
+                x.append(1)
+        ''')
+        twice = body('''
+            def f(x):
+                x.append(1)
+                x.append(1)
+        ''')
+
+        assert set(node_shingles(once)) < set(node_shingles(twice))
+
+
+# =============================================================================
+# MinHash Tests
+# =============================================================================
+
+class TestMinHash:
+    """Tests for minhash_signature and lsh_params."""
+
+    def test_signature_estimates_jaccard(self):
+        """Matching signature positions should approximate Jaccard similarity."""
+        rng = random.Random(0)
+        errors = []
+        for _ in range(50):
+            base = rng.sample(range(1 << 32), 200)
+            a = set(base)
+            b = set(base[:rng.randint(50, 200)]) | set(rng.sample(range(1 << 32), 50))
+            sig_a, sig_b = minhash_signature(a), minhash_signature(b)
+            estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+            errors.append(abs(estimate - jaccard(a, b)))
+
+        assert sum(errors) / len(errors) < 0.06
+
+    def test_small_sets_densified(self):
+        """Sets smaller than the signature should still fill every position."""
+        sig = minhash_signature({1, 2, 3}, num_perm=64)
+
+        assert len(sig) == 64
+        assert len(set(sig)) == 64
+        assert minhash_signature([]) == []
+
+    def test_lsh_params_recall(self):
+        """The chosen layout should find pairs at the threshold."""
+        for threshold in (0.5, 0.8, 0.9):
+            bands, rows = lsh_params(threshold)
+            assert bands * rows <= 128
+            assert 1 - (1 - threshold ** rows) ** bands >= 0.95
+
+        # Higher thresholds need fewer, longer bands
+        assert lsh_params(0.9)[1] > lsh_params(0.5)[1]
+
+
+# =============================================================================
+# MinHashIndex Tests
+# =============================================================================
+
+class TestMinHashIndex:
+    """Tests for MinHashIndex."""
+
+    def test_similar_pairs_verified(self):
+        """Only pairs at or above the threshold should be returned."""
+        base = list(range(1000, 1100))
+        index = MinHashIndex(threshold=0.8)
+        index.add("a", base)
+        index.add("b", base[:95])
+        index.add("c", base[:50])
+        index.add("d", range(5000, 5100))
+
+        pairs = index.similar_pairs()
+
+        assert [(a, b) for a, b, _ in pairs] == [("a", "b")]
+        assert pairs[0][2] == 0.95
+
+    def test_empty_and_duplicate_keys_ignored(self):
+        """Empty sets and repeated keys should not be indexed."""
+        index = MinHashIndex()
+        index.add("a", [])
+        index.add("b", [1, 2, 3])
+        index.add("b", [4, 5, 6])
+
+        assert len(index) == 1
+        assert "b" in index
+        assert index.similarity("b", "b") == 1.0
+
+    def test_sub_quadratic_candidates(self):
+        """Unrelated sets should rarely become candidates."""
+        rng = random.Random(1)
+        index = MinHashIndex(threshold=0.9)
+        for i in range(300):
+            index.add(i, rng.sample(range(1 << 32), 60))
+
+        assert len(index.candidates()) < 30
@@ -0,0 +1,232 @@
+"""
+Tests for rejig.patching.matcher and context-anchored patch application.
+
+Coverage targets:
+- HunkMatcher placing hunks at their hinted position or an offset
+- Whitespace-insensitive matching and fuzz
+- Rejecting hunks whose context or deleted lines aren't in the file
+- PatchConverter.apply() and PatchHunkTarget.apply() on diverged files
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.patching import HunkMatcher, HunkPlacement, PatchConverter, PatchTarget, parse_patch
+
+BASE = "".join(f"line {i}\n" for i in range(1, 21))
+
+
+def patch_for(*hunks: str, path: str = "mod.py"):
+    return parse_patch(f"--- a/{path}\n+++ b/{path}\n" + "".join(hunks))
+
+
+CHANGE_LINE_10 = (
+    "@@ -7,7 +7,7 @@\n"
+    " line 7\n"
+    " line 8\n"
+    " line 9\n"
+    "-line 10\n"
+    "+LINE TEN\n"
+    " line 11\n"
+    " line 12\n"
+    " line 13\n"
+)
+
+
+def hunks(*text: str):
+    return patch_for(*text).files[0].hunks
+
+
+# =============================================================================
+# HunkMatcher Tests
+# =============================================================================
+
+class TestHunkMatcher:
+    """Tests for placing hunks."""
+
+    def test_exact(self):
+        content, placements, failed = HunkMatcher(BASE).apply(hunks(CHANGE_LINE_10))
+
+        assert failed == []
+        assert content == BASE.replace("line 10\n", "LINE TEN\n")
+        assert placements[0].exact
+        assert str(placements[0]) == "Hunk #1 succeeded at 7"
+
+    def test_offset(self):
+        shifted = "new 1\nnew 2\nnew 3\n" + BASE
+
+        content, placements, _ = HunkMatcher(shifted).apply(hunks(CHANGE_LINE_10))
+
+        assert content == shifted.replace("line 10\n", "LINE TEN\n")
+        assert placements[0].offset == 3
+        assert str(placements[0]) == "Hunk #1 succeeded at 10 (offset +3 lines)"
+
+    def test_nearest_match_wins(self):
+        """With repeated text, the occurrence closest to the hint is patched."""
+        block = "a\nb\nc\n"
+        content = block + "x\n" * 10 + block
+        hunk = hunks("@@ -15,3 +15,3 @@\n a\n-b\n+B\n c\n")
+
+        new_content, placements, _ = HunkMatcher(content).apply(hunk)
+
+        assert placements[0].start == 13
+        assert new_content == block + "x\n" * 10 + "a\nB\nc\n"
+
+    def test_deleted_lines_must_match(self):
+        """A hunk whose deleted line differs is rejected, not spliced blindly."""
+        changed = BASE.replace("line 10\n", "line 10 edited\n")
+
+        content, placements, failed = HunkMatcher(changed).apply(hunks(CHANGE_LINE_10))
+
+        assert failed == [1]
+        assert placements == []
+        assert content == changed
+
+    def test_whitespace(self):
+        indented = BASE.replace("line 9\n", "line   9  \n")
+
+        content, placements, _ = HunkMatcher(indented).apply(hunks(CHANGE_LINE_10))
+
+        assert placements[0].whitespace
+        # The file's own context lines are kept
+        assert "line   9  \nLINE TEN\n" in content
+        assert HunkMatcher(indented, ignore_whitespace=False).apply(hunks(CHANGE_LINE_10))[2] == [1]
+
+    def test_fuzz(self):
+        diverged = BASE.replace("line 7\n", "line seven\n").replace("line 13\n", "line thirteen\n")
+
+        content, placements, _ = HunkMatcher(diverged, fuzz=1).apply(hunks(CHANGE_LINE_10))
+
+        assert placements[0].fuzz == 1
+        assert placements[0].offset == 0
+        assert "line seven\nline 8\nline 9\nLINE TEN\n" in content
+        assert HunkMatcher(diverged, fuzz=0).apply(hunks(CHANGE_LINE_10))[2] == [1]
+
+    def test_fuzz_keeps_additions(self):
+        """Added lines next to fuzzed-away context are still inserted."""
+        text = "outer 0\nc1\nc2\nold\nc3\nc4\nouter 5\n"
+        hunk = hunks(
+            "@@ -1,7 +1,9 @@\n"
+            " c0\n"
+            "+top\n"
+            " c1\n"
+            " c2\n"
+            "-old\n"
+            "+new\n"
+            " c3\n"
+            " c4\n"
+            "+bottom\n"
+            " c5\n"
+        )
+
+        content, placements, failed = HunkMatcher(text, fuzz=3).apply(hunk)
+
+        assert failed == []
+        assert placements[0].fuzz == 1
+        assert content == "outer 0\ntop\nc1\nc2\nnew\nc3\nc4\nbottom\nouter 5\n"
+
+    def test_fuzz_keeps_leading_insertion(self):
+        text = "other\nc1\nc2\nold\n"
+
+        content, _, failed = HunkMatcher(text, fuzz=1).apply(
+            hunks("@@ -1,4 +1,4 @@\n c0\n+ins\n c1\n c2\n-old\n")
+        )
+
+        assert failed == []
+        assert content == "other\nins\nc1\nc2\n"
+
+    def test_offset_carries_to_later_hunks(self):
+        text = "".join(f"line {i}\n" for i in range(1, 41))
+        patch_hunks = hunks(
+            "@@ -2,3 +2,4 @@\n line 2\n+inserted\n line 3\n line 4\n",
+            "@@ -30,3 +31,3 @@\n line 30\n-line 31\n+LINE 31\n line 32\n",
+        )
+
+        content, placements, _ = HunkMatcher("top\n" * 5 + text).apply(patch_hunks)
+
+        assert [p.offset for p in placements] == [5, 5]
+        assert "line 2\ninserted\nline 3\n" in content
+        assert "line 30\nLINE 31\nline 32\n" in content
+
+    def test_pure_insertion(self):
+        """A "-N,0" hunk inserts after line N."""
+        content, placements, _ = HunkMatcher("a\nb\n").apply(hunks("@@ -1,0 +2 @@\n+new\n"))
+
+        assert content == "a\nnew\nb\n"
+        assert isinstance(placements[0], HunkPlacement)
+
+    def test_crlf_and_missing_final_newline(self):
+        content, _, _ = HunkMatcher("a\r\nb\r\nc").apply(hunks("@@ -2,2 +2,3 @@\n b\n c\n+d\n"))
+
+        assert content == "a\r\nb\r\nc\r\nd\r\n"
+
+    def test_large_patch_is_fast(self):
+        text = "".join(f"value_{i} = compute({i})\n" for i in range(10_000))
+        patch_hunks = hunks(*(
+            f"@@ -{i + 1},3 +{i + 1},3 @@\n"
+            f" value_{i} = compute({i})\n"
+            f"-value_{i + 1} = compute({i + 1})\n"
+            f"+value_{i + 1} = compute({i + 1}) * 2\n"
+            f" value_{i + 2} = compute({i + 2})\n"
+            for i in range(0, 10_000 - 3, 20)
+        ))
+        assert len(patch_hunks) == 500
+
+        started = time.perf_counter()
+        content, placements, failed = HunkMatcher("# header\n" * 7 + text).apply(patch_hunks)
+        elapsed = time.perf_counter() - started
+
+        assert failed == []
+        assert all(p.offset == 7 for p in placements)
+        assert content.count("* 2\n") == 500
+        assert elapsed < 1.0
+
+
+# =============================================================================
+# Patch Application Tests
+# =============================================================================
+
+class TestApplyDivergedFiles:
+    """Tests for applying patches to files that changed since the patch."""
+
+    @pytest.fixture
+    def rj(self, tmp_path: Path) -> Rejig:
+        (tmp_path / "mod.py").write_text("import os\n\n" + BASE)
+        return Rejig(str(tmp_path))
+
+    def test_apply_reports_offset(self, rj: Rejig, tmp_path: Path):
+        result = PatchConverter(rj).apply(patch_for(CHANGE_LINE_10))
+
+        assert result.success
+        assert "offset or fuzz" in result.message
+        placements = result.data[tmp_path / "mod.py"]
+        assert placements[0].offset == 2
+        assert "LINE TEN\n" in (tmp_path / "mod.py").read_text()
+
+    def test_apply_failure_leaves_file(self, rj: Rejig, tmp_path: Path):
+        broken = "@@ -3,3 +3,3 @@\n line 3\n-line 4 changed upstream\n+x\n line 5\n"
+
+        result = PatchConverter(rj).apply(patch_for(CHANGE_LINE_10, broken))
+
+        assert not result.success
+        assert "hunks FAILED" in result.message
+        assert "LINE TEN" not in (tmp_path / "mod.py").read_text()
+
+    def test_fuzz_option(self, rj: Rejig, tmp_path: Path):
+        path = tmp_path / "mod.py"
+        path.write_text(path.read_text().replace("line 13\n", "line thirteen\n"))
+
+        assert not PatchConverter(rj, fuzz=0).apply(patch_for(CHANGE_LINE_10)).success
+        assert PatchConverter(rj, fuzz=1).apply(patch_for(CHANGE_LINE_10)).success
+
+    def test_hunk_target_apply(self, rj: Rejig, tmp_path: Path):
+        target = PatchTarget(rj, patch_for(CHANGE_LINE_10))
+
+        result = target.file("mod.py").hunk(0).apply()
+
+        assert result.success
+        assert "LINE TEN\n" in (tmp_path / "mod.py").read_text()
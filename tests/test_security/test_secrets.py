@@ -7,9 +7,11 @@ This module tests hardcoded secrets detection:
 - SECRET_VAR_NAMES constant
 - SecretAssignmentCollector visitor
 - SecretsScanner class
+- Entropy scoring, the keyword prefilter, skipped files and worker processes
 """
 from __future__ import annotations
 
+import keyword
 import textwrap
 from pathlib import Path
 
@@ -17,12 +19,17 @@ import libcst as cst
 import pytest
 
 from rejig import Rejig
+from rejig.security.files import MINIFIED_LINE_LENGTH
 from rejig.security.secrets import (
     SECRET_PATTERNS,
     SECRET_VAR_NAMES,
     SecretAssignmentCollector,
     SecretPattern,
     SecretsScanner,
+    is_secret_assignment,
+    scan_file,
+    shannon_entropy,
+    should_skip_file,
 )
 from rejig.security.targets import SecurityType
 
@@ -387,6 +394,143 @@ class TestSecretsScanner:
         assert isinstance(findings, object)
 
 
+# =============================================================================
+# Entropy and Prefilter Tests
+# =============================================================================
+
+GITHUB_TOKEN = "ghp_" + "a1B2c3D4e5F6g7H8i9J0k1L2m3N4o5P6q7R8"
+
+
+class TestEntropyScoring:
+    """Tests for shannon_entropy() and is_secret_assignment()."""
+
+    def test_shannon_entropy(self):
+        assert shannon_entropy("") == 0
+        assert shannon_entropy("aaaaaaaa") == 0
+        assert shannon_entropy("abcd") == pytest.approx(2.0)
+
+    def test_known_name_accepts_any_real_value(self):
+        assert is_secret_assignment("db_password", "hunter2!")
+        assert not is_secret_assignment("db_password", "changeme")
+
+    def test_hint_name_needs_random_value(self):
+        """Key-like names are reported only for high-entropy values."""
+        assert is_secret_assignment("stripe_key_live", "q8Vz2LmX7pR4tN9wK3sB")
+        assert not is_secret_assignment("cache_key_prefix", "user-profile-cache")
+        assert not is_secret_assignment("cache_key_prefix", "a1b2")
+
+
+class TestKeywordPrefilter:
+    """The prefilter must let through every assignment the detectors report."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        return tmp_path
+
+    def test_every_secret_name_reaches_detector(self, project: Path):
+        missed = []
+        # "pass" can't be assigned in Python; it is covered by test_config_file_names
+        names = sorted(n for n in SECRET_VAR_NAMES if not keyword.iskeyword(n))
+        for i, name in enumerate(names):
+            path = project / f"mod_{i}.py"
+            path.write_text(f'{name} = "Zq8vN2kL5xR7wT4y"\n')
+            if [f.name for f in scan_file(path)] != [name]:
+                missed.append(name)
+
+        assert missed == []
+
+    @pytest.mark.parametrize("line", [
+        'passphrase = "correct-horse-battery-staple"',
+        'connection_string = "Server=db;User=sa;Pw=Sup3rS3cret"',
+        'client.connection_string = "Server=db;User=sa;Pw=Sup3rS3cret"',
+    ])
+    def test_names_outside_hints(self, project: Path, line: str):
+        path = project / "settings.py"
+        path.write_text(line + "\n")
+
+        assert len(scan_file(path)) == 1
+
+    def test_config_file_names(self, project: Path):
+        path = project / ".env"
+        path.write_text("PASSPHRASE=correct-horse-battery-staple\nDEBUG=true\nPASS=Sup3rS3cretValue\n")
+
+        findings = scan_file(path)
+
+        assert [f.name for f in findings] == ["PASSPHRASE", "PASS"]
+
+    def test_lines_without_keywords_not_reported(self, project: Path):
+        path = project / "mod.py"
+        path.write_text('greeting = "Zq8vN2kL5xR7wT4y"\n')
+
+        assert scan_file(path) == []
+
+
+class TestSkippedFiles:
+    """Tests for lockfiles, examples, binary and minified files."""
+
+    def test_lockfiles_skipped(self, tmp_path: Path):
+        path = tmp_path / "package-lock.json"
+        path.write_text(f'{{"token": "{GITHUB_TOKEN}"}}\n')
+
+        assert should_skip_file(path)
+        assert should_skip_file(tmp_path / "poetry.lock")
+        assert scan_file(path) == []
+
+    def test_example_files_skipped(self, tmp_path: Path):
+        assert should_skip_file(tmp_path / "example_config.py")
+        assert should_skip_file(tmp_path / "settings.sample.py")
+        assert should_skip_file(tmp_path / "config-example.yaml")
+        assert should_skip_file(tmp_path / "examples" / "app.py")
+        assert should_skip_file(tmp_path / "samples" / "client.py")
+
+    def test_example_substring_not_skipped(self, tmp_path: Path):
+        """Only whole name tokens mark examples, not words containing them."""
+        for name in ("resample.py", "downsampler.py", "counterexample.py"):
+            assert not should_skip_file(tmp_path / name)
+
+        path = tmp_path / "resample.py"
+        path.write_text('password = "hunter2hunter2"\n')
+
+        assert len(scan_file(path)) >= 1
+
+    def test_binary_file_skipped(self, tmp_path: Path):
+        path = tmp_path / "blob.py"
+        path.write_bytes(b"\0\0" + f'token = "{GITHUB_TOKEN}"\n'.encode())
+
+        assert scan_file(path) == []
+
+    def test_minified_file_skipped(self, tmp_path: Path):
+        path = tmp_path / "bundle.js"
+        path.write_text("var a=1;" * (MINIFIED_LINE_LENGTH // 8 + 1) + f'var t="{GITHUB_TOKEN}";\n')
+
+        assert scan_file(path) == []
+
+    def test_regular_file_scanned(self, tmp_path: Path):
+        path = tmp_path / "deploy.sh"
+        path.write_text(f"export GH_TOKEN={GITHUB_TOKEN}\n")
+
+        assert len(scan_file(path)) >= 1
+
+
+class TestWorkers:
+    """Tests for scanning in worker processes."""
+
+    def test_workers_match_serial_scan(self, tmp_path: Path):
+        for i in range(140):
+            content = f'db_password = "Sup3rS3cret{i}"\n' if i % 10 == 0 else f"x = {i}\n"
+            (tmp_path / f"mod_{i}.py").write_text(content)
+        rejig = Rejig(str(tmp_path))
+
+        def key(finding):
+            return (finding.file_path.name, finding.line_number, finding.name)
+
+        serial = sorted(map(key, SecretsScanner(rejig).find_hardcoded_secrets()))
+        parallel = sorted(map(key, SecretsScanner(rejig, workers=2).find_hardcoded_secrets()))
+
+        assert len(serial) == 14
+        assert parallel == serial
+
+
 # =============================================================================
 # Integration Tests
 # =============================================================================
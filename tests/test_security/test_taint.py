@@ -0,0 +1,371 @@
+"""
+Tests for rejig.security.taint module.
+
+This module tests intra-procedural taint tracking:
+- TaintValue lattice
+- TaintConfig sources and sinks
+- TaintAnalyzer propagation through assignments and string building
+- VulnerabilityScanner integration
+"""
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import libcst as cst
+import pytest
+from libcst.metadata import MetadataWrapper
+
+from rejig import Rejig
+from rejig.security.taint import (
+    TaintAnalyzer,
+    TaintConfig,
+    TaintLevel,
+    TaintSink,
+    TaintValue,
+)
+from rejig.security.targets import SecurityType
+from rejig.security.vulnerabilities import VulnerabilityScanner
+
+
+def analyze(code: str, config: TaintConfig | None = None):
+    """Run the taint analyzer on a snippet and return its findings."""
+    analyzer = TaintAnalyzer(Path("test.py"), config)
+    MetadataWrapper(cst.parse_module(textwrap.dedent(code))).visit(analyzer)
+    return analyzer.findings
+
+
+# =============================================================================
+# Lattice Tests
+# =============================================================================
+
+class TestTaintValue:
+    """Tests for TaintValue."""
+
+    def test_join_takes_higher_level(self):
+        """Join should keep the higher level and its source."""
+        tainted = TaintValue(TaintLevel.TAINTED, source="input()")
+        joined = TaintValue(TaintLevel.UNKNOWN, built=True).join(tainted)
+
+        assert joined.level == TaintLevel.TAINTED
+        assert joined.source == "input()"
+        assert joined.built
+
+    def test_join_constants(self):
+        """Joining constants should stay constant."""
+        assert TaintValue().join(TaintValue()).level == TaintLevel.CONSTANT
+
+
+# =============================================================================
+# TaintConfig Tests
+# =============================================================================
+
+class TestTaintConfig:
+    """Tests for TaintConfig."""
+
+    def test_source_prefix(self):
+        """Accesses through a source should count as sources."""
+        config = TaintConfig()
+        assert config.is_source("request.args")
+        assert config.is_source("request.args.get")
+        assert not config.is_source("request.user")
+
+    def test_method_sink(self):
+        """Method sinks should match on any receiver."""
+        config = TaintConfig()
+        assert config.sink_for("cursor.execute").security_type == SecurityType.SQL_INJECTION
+        assert config.sink_for("self.db.execute") is not None
+        assert config.sink_for("os.system") is not None
+        assert config.sink_for("my.os.system") is None
+        assert config.sink_for("webbrowser.open") is None
+
+    def test_may_call_sink(self):
+        """The textual prefilter should only match sink calls."""
+        config = TaintConfig()
+        assert config.may_call_sink("cursor.execute(q)")
+        assert config.may_call_sink("os.system(cmd)", [SecurityType.SHELL_INJECTION])
+        assert not config.may_call_sink("os.system(cmd)", [SecurityType.SQL_INJECTION])
+        assert not config.may_call_sink("soup.get_text()")
+        assert not config.may_call_sink("execute = 1")
+
+
+# =============================================================================
+# TaintAnalyzer Tests
+# =============================================================================
+
+class TestTaintAnalyzer:
+    """Tests for TaintAnalyzer propagation."""
+
+    def test_constant_fstring_not_flagged(self):
+        """f-strings built from constants should not be reported."""
+        findings = analyze('''
+            TABLE = "users"
+
+            def count(cursor):
+                cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+        ''')
+        assert findings == []
+
+    def test_concatenated_query_through_variable(self):
+        """Building a query into a variable should still be caught."""
+        findings = analyze('''
+            def find(cursor, name):
+                q = "SELECT * FROM users WHERE name = '" + name + "'"
+                cursor.execute(q)
+        ''')
+        assert len(findings) == 1
+        assert findings[0].type == SecurityType.SQL_INJECTION
+        assert findings[0].line_number == 4
+        assert findings[0].context["confidence"] == "medium"
+
+    def test_tainted_source_reaches_sink(self):
+        """Values from a source should be reported with that source."""
+        findings = analyze('''
+            from flask import request
+
+            def search(cursor):
+                term = request.args.get("q")
+                sql = "SELECT * FROM t WHERE name = '%s'" % term
+                cursor.execute(sql)
+        ''')
+        assert len(findings) == 1
+        assert findings[0].severity == "critical"
+        assert findings[0].context["source"] == "request.args.get()"
+        assert findings[0].context["confidence"] == "high"
+
+    def test_tainted_passthrough(self):
+        """Tainted values should be reported even without string building."""
+        findings = analyze('''
+            import sys
+
+            path = sys.argv[1]
+            with open(path) as f:
+                data = f.read()
+        ''')
+        assert [f.type for f in findings] == [SecurityType.PATH_TRAVERSAL]
+
+    def test_unknown_passthrough_not_flagged(self):
+        """Parameters passed straight to a SQL sink should not be reported."""
+        findings = analyze('''
+            def run(cursor, query, params):
+                cursor.execute(query, params)
+        ''')
+        assert findings == []
+
+    def test_sanitizer_clears_taint(self):
+        """Sanitized values should not be reported."""
+        findings = analyze('''
+            import os, shlex
+
+            def backup(name):
+                name = input()
+                os.system("tar czf backup.tgz " + shlex.quote(name))
+                user_id = int(input())
+                cursor.execute("SELECT * FROM t WHERE id = %d" % user_id)
+        ''')
+        assert findings == []
+
+    def test_reassignment_clears_taint(self):
+        """A straight-line overwrite should replace the tainted value."""
+        findings = analyze('''
+            def handler(cursor):
+                q = input()
+                q = "SELECT 1"
+                cursor.execute(q)
+        ''')
+        assert findings == []
+
+    def test_branch_assignment_joins(self):
+        """An overwrite inside a branch should not clear taint."""
+        findings = analyze('''
+            def handler(cursor, flag):
+                q = "SELECT * FROM t WHERE a = " + input()
+                if flag:
+                    q = "SELECT 1"
+                cursor.execute(q)
+        ''')
+        assert len(findings) == 1
+
+    def test_augmented_assignment(self):
+        """+= should propagate taint and mark the value as built."""
+        findings = analyze('''
+            def handler(cursor, extra):
+                q = "SELECT * FROM t WHERE 1=1"
+                q += " AND " + extra
+                cursor.execute(q)
+        ''')
+        assert len(findings) == 1
+
+    def test_format_and_join(self):
+        """.format() and str.join should count as string building."""
+        findings = analyze('''
+            def handler(cursor, table, cols):
+                cursor.execute("SELECT * FROM {}".format(table))
+                cursor.execute("SELECT " + ", ".join(cols) + " FROM t")
+        ''')
+        assert len(findings) == 2
+
+    def test_flask_route_parameters_tainted(self):
+        """Route handler parameters should be tainted."""
+        findings = analyze('''
+            from flask import Flask, send_file
+
+            app = Flask(__name__)
+
+            @app.route("/files/<name>")
+            def download(name):
+                return send_file(name)
+        ''')
+        assert len(findings) == 1
+        assert "request handler parameter 'name'" in findings[0].message
+
+    def test_handler_object_imported_into_framework_module(self):
+        """An app object imported from the project counts in a file using the framework."""
+        findings = analyze('''
+            from flask import send_file
+
+            from myproject.web import bp
+
+            @bp.get("/files/<name>")
+            def download(name):
+                return send_file(name)
+        ''')
+        assert len(findings) == 1
+
+    def test_framework_decorator_function(self):
+        """Bare decorators resolving to a framework mark handlers."""
+        findings = analyze('''
+            from rest_framework.decorators import api_view
+
+            @api_view(["GET"])
+            def report(request, name):
+                return open(name)
+        ''')
+        assert len(findings) == 1
+
+    def test_non_framework_decorator_not_handler(self):
+        """Decorators named like routes but not from a framework don't taint parameters."""
+        findings = analyze('''
+            import functools
+
+            cache = make_cache()
+
+            @cache.get("key")
+            def load(name):
+                return send_file(name)
+
+            @functools.wraps(load)
+            def route(path):
+                return send_file(path)
+        ''')
+        assert findings == []
+
+    def test_fastapi_dependencies_not_tainted(self):
+        """FastAPI Depends() parameters should not be tainted."""
+        findings = analyze('''
+            from fastapi import APIRouter, Depends
+
+            router = APIRouter()
+
+            @router.get("/items")
+            def items(q, db=Depends(get_db)):
+                return db.execute(build())
+        ''')
+        assert findings == []
+
+    def test_django_request(self):
+        """Django request.GET accesses should be tainted."""
+        findings = analyze('''
+            def view(request):
+                name = request.GET["name"]
+                User.objects.raw("SELECT * FROM auth_user WHERE username = '%s'" % name)
+        ''')
+        assert len(findings) == 1
+        assert findings[0].context["source"] == "request.GET"
+
+    def test_subprocess_without_shell(self):
+        """subprocess with a list and no shell should not be reported."""
+        findings = analyze('''
+            import subprocess
+
+            def run(name):
+                subprocess.run(["ls", input()])
+                subprocess.run("ls " + name, shell=True)
+        ''')
+        assert len(findings) == 1
+        assert findings[0].line_number == 6
+
+    def test_nested_function_sees_enclosing_taint(self):
+        """Nested functions should see taint from the enclosing scope."""
+        findings = analyze('''
+            def outer():
+                cmd = input()
+
+                def inner():
+                    os.system(cmd)
+        ''')
+        assert len(findings) == 1
+
+    def test_custom_config(self):
+        """Custom sources and sinks should be used."""
+        config = TaintConfig(
+            sources=frozenset({"get_param"}),
+            sinks=(TaintSink("run_query", SecurityType.SQL_INJECTION),),
+        )
+        findings = analyze('''
+            run_query(get_param("id"))
+            cursor.execute("SELECT " + input())
+        ''', config)
+        assert len(findings) == 1
+        assert findings[0].name == "run_query"
+
+
+# =============================================================================
+# Scanner Integration Tests
+# =============================================================================
+
+class TestScannerIntegration:
+    """Tests for taint tracking in VulnerabilityScanner."""
+
+    @pytest.fixture
+    def rejig(self, tmp_path: Path) -> Rejig:
+        """Create a Rejig instance."""
+        return Rejig(str(tmp_path))
+
+    def test_constant_fstring_suppressed(self, rejig: Rejig, tmp_path: Path):
+        """Constant f-string queries should no longer be reported."""
+        (tmp_path / "db.py").write_text(textwrap.dedent('''
+            TABLE = "users"
+            cursor.execute(f"SELECT * FROM {TABLE}")
+        '''))
+
+        assert len(VulnerabilityScanner(rejig).find_sql_injection_risks()) == 0
+
+    def test_patterns_without_taint(self, rejig: Rejig, tmp_path: Path):
+        """With taint disabled, the line patterns should be used."""
+        (tmp_path / "db.py").write_text(textwrap.dedent('''
+            TABLE = "users"
+            cursor.execute(f"SELECT * FROM {TABLE}")
+        '''))
+
+        assert len(VulnerabilityScanner(rejig, taint=False).find_sql_injection_risks()) == 1
+
+    def test_variable_query_found(self, rejig: Rejig, tmp_path: Path):
+        """Queries built into a variable should be reported."""
+        (tmp_path / "db.py").write_text(textwrap.dedent('''
+            def find(cursor, user):
+                q = "SELECT * FROM users WHERE name = '" + user + "'"
+                cursor.execute(q)
+        '''))
+
+        findings = VulnerabilityScanner(rejig).find_sql_injection_risks()
+
+        assert len(findings) == 1
+        assert findings[0].line_number == 4
+        assert findings[0].code_snippet == "cursor.execute(q)"
+
+    def test_invalid_python_falls_back_to_patterns(self, rejig: Rejig, tmp_path: Path):
+        """Unparseable files should still get the line patterns."""
+        (tmp_path / "db.py").write_text('cursor.execute(f"SELECT {x}")\ndef broken(:\n')
+
+        assert len(VulnerabilityScanner(rejig).find_sql_injection_risks()) == 1
@@ -16,6 +16,7 @@ import pytest
 
 from rejig import Rejig
 from rejig.security.vulnerabilities import (
+    ALL_PATTERNS,
     EVAL_EXEC_PATTERNS,
     INSECURE_RANDOM_PATTERNS,
     PATH_TRAVERSAL_PATTERNS,
@@ -24,6 +25,7 @@ from rejig.security.vulnerabilities import (
     SSL_PATTERNS,
     UNSAFE_DESERIALIZATION_PATTERNS,
     WEAK_CRYPTO_PATTERNS,
+    PatternIndex,
     VulnerabilityPattern,
     VulnerabilityScanner,
 )
@@ -96,6 +98,66 @@ class TestPatternConstants:
         assert len(SSL_PATTERNS) > 0
 
 
+# =============================================================================
+# PatternIndex Tests
+# =============================================================================
+
+class TestPatternIndex:
+    """Tests for single-pass pattern scanning."""
+
+    def _per_pattern(self, content: str) -> list[tuple[str, int, int]]:
+        return sorted(
+            (p.name, m.start(), m.end())
+            for p in ALL_PATTERNS
+            for m in p.pattern.finditer(content)
+        )
+
+    def test_all_patterns_anchored(self):
+        """Every built-in pattern has anchors, so none is scanned in full."""
+        assert all(p.anchors for p in ALL_PATTERNS)
+
+    def test_matches_per_pattern_finditer(self):
+        """Single-pass results equal one finditer per pattern."""
+        content = textwrap.dedent('''
+            cursor.execute(f"SELECT {x}" + y)
+            CURSOR.EXECUTE("SELECT %s" % (x,))
+            db.query("a".format(b)); db.raw(f"x")
+            os.popen(f"ls {d}")
+            shelve.open("a" + name)
+            data = pickle.loads(blob); cPickle.load(f)
+            yaml.load(stream)
+            requests.get(url, verify=False)
+            ctx.verify_mode = ssl.CERT_NONE
+            eval(expr); exec(code)
+            h = hashlib.md5(b); DES3.new(k)
+        ''')
+        index = PatternIndex(ALL_PATTERNS)
+        found = sorted((p.name, m.start(), m.end()) for p, m in index.scan(content))
+        assert found == self._per_pattern(content)
+        assert len(found) > 10
+
+    def test_overlapping_anchors(self):
+        """Anchors starting inside another anchor are still checked."""
+        content = 'os.popen("a" + b)\n'
+        index = PatternIndex(ALL_PATTERNS)
+        names = {p.name for p, _ in index.scan(content)}
+        assert names == {"os.popen", "open with user input"}
+
+    def test_unanchored_pattern(self):
+        """Patterns without anchors fall back to a full scan."""
+        import re
+        pattern = VulnerabilityPattern(
+            name="todo",
+            pattern=re.compile(r"TODO"),
+            security_type=SecurityType.DEBUG_CODE,
+            severity="low",
+            message="",
+            recommendation="",
+        )
+        index = PatternIndex([pattern])
+        assert len(index.scan("a TODO b TODO")) == 2
+
+
 # =============================================================================
 # VulnerabilityScanner Tests
 # =============================================================================
@@ -261,6 +323,25 @@ class TestVulnerabilityScanner:
 
         assert len(findings) >= 1
 
+    def test_eval_not_reported_twice(self, rejig: Rejig, tmp_path: Path):
+        """Pattern and call checks on the same line are merged."""
+        (tmp_path / "eval.py").write_text('result = eval(user_input)')
+
+        findings = VulnerabilityScanner(rejig).find_unsafe_eval()
+
+        assert len(findings) == 1
+        assert findings[0].line_number == 1
+
+    def test_call_check_findings_merged(self, rejig: Rejig, tmp_path: Path):
+        """Call-level checks add issues the patterns miss."""
+        (tmp_path / "paths.py").write_text('x = 1\nf = open("/data/%s" % name)\n')
+
+        findings = VulnerabilityScanner(rejig).find_path_traversal_risks()
+
+        assert len(findings) == 1
+        assert findings[0].line_number == 2
+        assert findings[0].code_snippet.startswith("f = open(")
+
     # -------------------------------------------------------------------------
     # Path Traversal Detection
     # -------------------------------------------------------------------------
@@ -357,6 +438,20 @@ class TestVulnerabilityScanner:
 
         assert len(findings) >= 1
 
+    @pytest.mark.parametrize("unrelated", ["open(path)", "subprocess.run(['ls'])"])
+    def test_sql_pattern_kept_next_to_unrelated_sink(self, rejig: Rejig, tmp_path: Path, unrelated: str):
+        """A call covered by taint analysis doesn't hide patterns of other types."""
+        query = 'def f(conn, user):\n    return conn.query(f"SELECT * FROM users WHERE name = {user}")\n'
+        (tmp_path / "plain.py").write_text(query)
+        (tmp_path / "mixed.py").write_text(f"import subprocess\n\n{query}\n\ndef g(path):\n    {unrelated}\n")
+
+        scanner = VulnerabilityScanner(rejig)
+        everything = [f for f in scanner.find_all_vulnerabilities() if f.type == SecurityType.SQL_INJECTION]
+        sql = scanner.find_sql_injection_risks()
+
+        assert sorted(f.file_path.name for f in everything) == ["mixed.py", "plain.py"]
+        assert sorted(f.file_path.name for f in sql) == ["mixed.py", "plain.py"]
+
     # -------------------------------------------------------------------------
     # Find All Vulnerabilities
     # -------------------------------------------------------------------------
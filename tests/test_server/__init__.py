@@ -0,0 +1 @@
+"""Tests for rejig.server module."""
@@ -0,0 +1,266 @@
+"""
+Tests for rejig.server.server and rejig.server.client modules.
+
+This module tests the JSON-RPC server:
+- Evaluating fluent API chains against the warm Rejig instance
+- Direct Rejig method calls, transactions and housekeeping methods
+- JSON-RPC errors, notifications and batches
+- Picking up created files between requests
+- The stdio and Unix-socket transports, the client and the CLI
+"""
+from __future__ import annotations
+
+import io
+import json
+import socket
+import textwrap
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from rejig.cli import main
+from rejig.core.results import ErrorResult, Result
+from rejig.server import RejigClient, RejigServer, RpcError, to_jsonable
+
+
+def rpc(server: RejigServer, method: str, params: Any = None, request_id: int = 1) -> dict[str, Any]:
+    """Send one request through the JSON layer and decode the response."""
+    message: dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        message["params"] = params
+    return json.loads(server.handle(json.dumps(message)))
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    app = tmp_path / "myapp"
+    app.mkdir()
+    (app / "__init__.py").write_text("")
+    (app / "models.py").write_text(textwrap.dedent('''\
+        class User:
+            name: str = ""
+
+            def save(self):
+                pass
+    '''))
+    (app / "utils.py").write_text("import os\n\ndef helper():\n    return 1\n")
+    return tmp_path
+
+
+# =============================================================================
+# Serialization Tests
+# =============================================================================
+
+class TestToJsonable:
+    """Tests for converting return values."""
+
+    def test_results(self):
+        """Results keep their fields with paths as strings."""
+        result = Result(success=True, message="OK", files_changed=[Path("a.py")], data={1: Path("b")})
+
+        data = to_jsonable(result)
+
+        assert data == {
+            "success": True,
+            "message": "OK",
+            "files_changed": ["a.py"],
+            "data": {"1": "b"},
+            "diff": None,
+            "diffs": {},
+        }
+        error = to_jsonable(ErrorResult(message="bad", operation="op", exception=ValueError("x")))
+        assert error["success"] is False
+        assert error["operation"] == "op"
+        assert error["exception"] == "ValueError('x')"
+
+    def test_other_values(self):
+        """Collections become lists; unknown objects their repr."""
+        assert to_jsonable(({"b", "a"}, (1, None))) == [["a", "b"], [1, None]]
+        assert to_jsonable(object).startswith("<class")
+
+
+# =============================================================================
+# Dispatch Tests
+# =============================================================================
+
+class TestDispatch:
+    """Tests for RPC methods."""
+
+    def test_call_chain(self, project: Path):
+        """A find_class chain reads only the defining file once warm."""
+        server = RejigServer(str(project))
+        server.warm()
+
+        response = rpc(server, "call", {"chain": [["find_class", "User"], ["get_content"]]})
+
+        assert response["id"] == 1
+        assert response["result"]["success"] is True
+        assert response["result"]["data"].startswith("class User:")
+
+    def test_warm_lookup_reads_one_file(self, project: Path, monkeypatch: pytest.MonkeyPatch):
+        """The symbol index replaces the scan over every file."""
+        server = RejigServer(str(project))
+        server.warm()
+        read: list[Path] = []
+        original = Path.read_text
+
+        def tracking_read_text(self, *args, **kwargs):
+            read.append(self)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "read_text", tracking_read_text)
+        response = rpc(server, "call", {"chain": [["find_function", "helper"], ["get_content"]]})
+
+        assert response["result"]["success"] is True
+        assert set(read) == {project / "myapp" / "utils.py"}
+
+    def test_not_found(self, project: Path):
+        """Missing names fail the way the fluent API does."""
+        server = RejigServer(str(project))
+
+        response = rpc(server, "call", {"chain": [["find_class", "Missing"], ["get_content"]]})
+
+        assert response["result"]["success"] is False
+        assert response["result"]["message"] == "Class 'Missing' not found"
+
+    def test_direct_method_and_properties(self, project: Path):
+        """Rejig methods are callable by name; properties end a chain."""
+        server = RejigServer(str(project))
+
+        unused = rpc(server, "find_unused_imports")
+        dry_run = rpc(server, "call", {"chain": ["dry_run"]})
+        path = rpc(server, "call", {"chain": [
+            {"method": "file", "args": [{"$path": "myapp/models.py"}]},
+            "path",
+        ]})
+
+        assert len(unused["result"]) == 1
+        assert dry_run["result"] is False
+        assert path["result"] == str(project / "myapp" / "models.py")
+
+    def test_transaction(self, project: Path):
+        """Chains in a transaction are committed together."""
+        (project / "myapp" / "models.py").write_text("import sys\n\nclass User:\n    pass\n")
+        server = RejigServer(str(project))
+
+        response = rpc(server, "transaction", {"calls": [
+            [{"method": "file", "args": [{"$path": "myapp/models.py"}]}, ["remove_unused_imports"]],
+            [{"method": "file", "args": [{"$path": "myapp/utils.py"}]}, ["remove_unused_imports"]],
+        ]})
+
+        result = response["result"]
+        assert "-import sys" in result["preview"]
+        assert result["commit"]["success"] is True
+        assert len(result["commit"]["files_changed"]) == 2
+        assert "import sys" not in (project / "myapp" / "models.py").read_text()
+        assert "import os" not in (project / "myapp" / "utils.py").read_text()
+
+    def test_transaction_rolled_back_on_failure(self, project: Path):
+        """A failing chain discards the others' pending changes."""
+        server = RejigServer(str(project))
+        original = (project / "myapp" / "utils.py").read_text()
+
+        response = rpc(server, "transaction", {"calls": [
+            [{"method": "file", "args": [{"$path": "myapp/utils.py"}]}, ["remove_unused_imports"]],
+            [["find_class", "Missing"], ["rename", "Other"]],
+        ]})
+
+        assert response["result"]["results"][1]["success"] is False
+        assert response["result"]["commit"]["message"] == "Rolled back 1 pending changes"
+        assert (project / "myapp" / "utils.py").read_text() == original
+
+    def test_new_files_picked_up(self, project: Path):
+        """Files created between requests are found without a refresh."""
+        server = RejigServer(str(project))
+        server.warm()
+        (project / "myapp" / "accounts.py").write_text("class Account:\n    pass\n")
+
+        response = rpc(server, "call", {"chain": [["find_class", "Account"], ["get_content"]]})
+        status = rpc(server, "status")
+
+        assert response["result"]["success"] is True
+        assert status["result"]["files"] == 4
+
+    def test_errors(self, project: Path):
+        """Protocol errors use the JSON-RPC codes."""
+        server = RejigServer(str(project))
+
+        assert json.loads(server.handle("{not json"))["error"]["code"] == -32700
+        assert json.loads(server.handle('{"id": 1}'))["error"]["code"] == -32600
+        assert rpc(server, "nope")["error"]["code"] == -32601
+        assert rpc(server, "call", {"chain": ["_files"]})["error"]["code"] == -32601
+        assert rpc(server, "call", {"chain": [["find_class"]]})["error"]["code"] == -32602
+        assert rpc(server, "call", {"chain": [42]})["error"]["code"] == -32602
+
+    def test_notifications_and_batches(self, project: Path):
+        """Notifications get no response; batches get a list."""
+        server = RejigServer(str(project))
+
+        assert server.handle('{"jsonrpc": "2.0", "method": "status"}') is None
+        responses = server.dispatch([
+            {"jsonrpc": "2.0", "id": 1, "method": "status"},
+            {"jsonrpc": "2.0", "method": "status"},
+            {"jsonrpc": "2.0", "id": 2, "method": "nope"},
+        ])
+
+        assert [r["id"] for r in responses] == [1, 2]
+        assert "error" in responses[1]
+
+
+# =============================================================================
+# Transport Tests
+# =============================================================================
+
+class TestTransports:
+    """Tests for stdio, Unix sockets, the client and the CLI."""
+
+    def test_stdio(self, project: Path):
+        """Requests are read line by line until shutdown."""
+        stdin = io.StringIO(
+            '{"jsonrpc": "2.0", "id": 1, "method": "status"}\n'
+            "\n"
+            '{"jsonrpc": "2.0", "id": 2, "method": "shutdown"}\n'
+            '{"jsonrpc": "2.0", "id": 3, "method": "status"}\n'
+        )
+        stdout = io.StringIO()
+
+        RejigServer(str(project)).serve_stdio(stdin, stdout)
+
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert [r["id"] for r in responses] == [1, 2]
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available")
+    def test_unix_socket_client(self, project: Path, tmp_path_factory: pytest.TempPathFactory):
+        """The client talks to a socket server until it shuts down."""
+        socket_path = tmp_path_factory.mktemp("sock") / "rejig.sock"
+        server = RejigServer(str(project))
+        ready = threading.Event()
+        thread = threading.Thread(target=server.serve_unix, args=(socket_path, ready), daemon=True)
+        thread.start()
+        assert ready.wait(5)
+
+        with RejigClient(socket_path, timeout=5) as client:
+            content = client.call(["find_class", "User"], ["get_content"])
+            with pytest.raises(RpcError) as excinfo:
+                client.request("nope")
+            client.request("shutdown")
+
+        thread.join(5)
+        assert content["data"].startswith("class User:")
+        assert excinfo.value.code == -32601
+        assert not thread.is_alive()
+        assert not socket_path.exists()
+
+    def test_cli_serve_stdio(self, project: Path, monkeypatch: pytest.MonkeyPatch):
+        """`rejig serve PATH` serves stdio."""
+        monkeypatch.setattr("sys.stdin", io.StringIO('{"jsonrpc": "2.0", "id": 1, "method": "status"}\n'))
+        stdout = io.StringIO()
+        monkeypatch.setattr("sys.stdout", stdout)
+
+        assert main(["serve", str(project), "--dry-run"]) == 0
+
+        status = json.loads(stdout.getvalue())["result"]
+        assert status["dry_run"] is True
+        assert status["indexed"] is True
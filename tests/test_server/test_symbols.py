@@ -0,0 +1,102 @@
+"""
+Tests for rejig.server.symbols module.
+
+This module tests the symbol index:
+- Collecting class and function names from source
+- Locating the first defining file in working-set order
+- Noticing edited files without re-parsing unchanged ones
+"""
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from rejig import Rejig
+from rejig.server.symbols import SymbolIndex, collect_symbols
+
+
+# =============================================================================
+# Collection Tests
+# =============================================================================
+
+class TestCollectSymbols:
+    """Tests for collect_symbols."""
+
+    def test_classes_and_functions(self):
+        """Nested classes count; methods and nested functions don't."""
+        symbols = collect_symbols(textwrap.dedent('''\
+            class Outer:
+                class Inner:
+                    pass
+
+                def method(self):
+                    pass
+
+            def helper():
+                class Local:
+                    pass
+
+                def nested():
+                    pass
+
+            if True:
+                async def conditional():
+                    pass
+        '''))
+
+        assert sorted(symbols["classes"]) == ["Inner", "Outer"]
+        assert sorted(symbols["functions"]) == ["conditional", "helper"]
+
+    def test_syntax_error(self):
+        """Unparseable source raises."""
+        with pytest.raises(SyntaxError):
+            collect_symbols("class (:\n")
+
+
+# =============================================================================
+# SymbolIndex Tests
+# =============================================================================
+
+class TestSymbolIndex:
+    """Tests for locating definitions."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        (tmp_path / "a.py").write_text("class User:\n    pass\n")
+        (tmp_path / "b.py").write_text("class User:\n    pass\n\ndef helper():\n    pass\n")
+        (tmp_path / "broken.py").write_text("def (:\n")
+        return tmp_path
+
+    def test_locate(self, project: Path):
+        """The first file in working-set order wins, as for find_class."""
+        index = SymbolIndex(Rejig(str(project)))
+
+        assert index.locate("class", "User") == project / "a.py"
+        assert index.locate("function", "helper") == project / "b.py"
+        assert index.locate("function", "User") is None
+        assert index.built
+
+    def test_edits_are_picked_up(self, project: Path, monkeypatch: pytest.MonkeyPatch):
+        """Changed files are re-parsed on lookup; unchanged files are not."""
+        index = SymbolIndex(Rejig(str(project)))
+        index.build()
+        (project / "a.py").write_text("class Account:\n    pass\n\n\n")
+        read: list[Path] = []
+        original = Path.read_text
+
+        def tracking_read_text(self, *args, **kwargs):
+            read.append(self)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "read_text", tracking_read_text)
+
+        assert index.locate("class", "User") == project / "b.py"
+        assert index.locate("class", "Account") == project / "a.py"
+        assert read == [project / "a.py"]
+
+    def test_unknown_kind(self, project: Path):
+        """Only classes and functions are indexed."""
+        with pytest.raises(ValueError):
+            SymbolIndex(Rejig(str(project))).locate("method", "save")